@@ -9,9 +9,9 @@ Version 0.2 changes vs MVP:
 Deterministic and test-first: golden vectors + invariants.
 """
 
-from .types import Pillar, FourPillars, BaziInput, BaziResult, SolarTerm
+from .types import Pillar, FourPillars, BaziInput, BaziResult, SolarTerm, BodyTable
 from .bazi import compute_bazi
 
 __version__ = "1.0.0-rc1-20260220"
 
-__all__ = ["Pillar","FourPillars","BaziInput","BaziResult","SolarTerm","compute_bazi","__version__"]
+__all__ = ["Pillar","FourPillars","BaziInput","BaziResult","SolarTerm","BodyTable","compute_bazi","__version__"]
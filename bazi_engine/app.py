@@ -7,24 +7,34 @@ and mounts all routers. No business logic lives here.
 from __future__ import annotations
 
 from contextlib import asynccontextmanager
-from typing import Any
+from typing import Any, Awaitable, Callable, MutableMapping
 
 import math
+import time
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
+from .bafe.artifact_hash import start_startup_prehash
 from .exc import BaziEngineError, EphemerisUnavailableError
-from . import __version__
-from .routers import info, bazi, western, fusion, validate, chart, webhooks, transit
+from . import __version__, timing
+from .routers import info, bazi, western, fusion, validate, chart, webhooks, transit, jobs
+from .services.jobs import start_job_workers, stop_job_workers
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     import logging
     logging.getLogger("uvicorn").info(f"FuFirE starting: {__version__}")
-    yield
+    prehash = start_startup_prehash()
+    start_job_workers()
+    try:
+        yield
+    finally:
+        stop_job_workers()
+        if prehash is not None:
+            prehash.shutdown(wait=False, cancel_futures=True)
 
 
 app = FastAPI(
@@ -35,6 +45,59 @@ app = FastAPI(
 )
 
 
+# ── Request latency and stage timing (BAZI_TIMING=1) ────────────────────────
+
+_Message = MutableMapping[str, Any]
+
+
+class ServerTimingMiddleware:
+    """Times every request per route; with BAZI_TIMING=1 also records
+    pipeline stages and reports them as Server-Timing.
+
+    Plain ASGI (no BaseHTTPMiddleware) so that with timing disabled a request
+    costs two clock reads and one histogram update.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]]) -> None:
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: _Message,
+        receive: Callable[[], Awaitable[_Message]],
+        send: Callable[[_Message], Awaitable[None]],
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        t0 = time.perf_counter()
+        try:
+            if not timing.timing_enabled():
+                await self.app(scope, receive, send)
+                return
+            with timing.recording() as rec:
+                async def send_with_timing(message: _Message) -> None:
+                    if message["type"] == "http.response.start":
+                        header = rec.server_timing()
+                        if header:
+                            message = dict(message)
+                            message["headers"] = [
+                                *message.get("headers", []), (b"server-timing", header.encode("latin-1")),
+                            ]
+                    await send(message)
+
+                await self.app(scope, receive, send_with_timing)
+        finally:
+            # The router stores the matched route in the scope in place.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            timing.route_histograms().observe_value(
+                f"{scope['method']} {route}", time.perf_counter() - t0,
+            )
+
+
+app.add_middleware(ServerTimingMiddleware)
+
+
 # ── Global exception handlers ─────────────────────────────────────────────────
 
 @app.exception_handler(BaziEngineError)
@@ -92,9 +155,11 @@ app.include_router(validate.router)
 app.include_router(bazi.router)
 app.include_router(western.router)
 app.include_router(fusion.router)
+app.include_router(fusion.matrix_router)
 app.include_router(chart.router)
 app.include_router(webhooks.router)
 app.include_router(transit.router)
+app.include_router(jobs.router)
 
 
 # ── OpenAPI customization ────────────────────────────────────────────────────
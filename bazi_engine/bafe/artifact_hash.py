@@ -0,0 +1,217 @@
+"""
+bafe/artifact_hash.py — Cached SHA-256 of refdata artifacts.
+
+Hashing a multi-megabyte SE1 file on every /validate call is wasted work:
+the file almost never changes. ``ArtifactHashCache`` remembers the digest
+per file, keyed by ``(path, size, mtime_ns, inode)`` — any change to the file
+invalidates the entry — and, if configured, persists it in a small JSON
+sidecar so restarts stay warm.
+
+``prehash_in_background`` hashes a set of artifacts in a thread pool (used at
+startup, opt-in via BAFE_REFDATA_PREHASH) so that request-time lookups are a
+``stat`` plus a dict hit.
+
+Environment:
+    BAFE_REFDATA_HASH_CACHE   sidecar path (opt-in; unset or "off" keeps the
+                              cache in memory only)
+    BAFE_REFDATA_PREHASH      "1" to hash artifacts in the background at startup
+    BAFE_REFDATA_ROOT         extra artifact directory for the startup prehash
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_CHUNK = 1024 * 1024
+_SIDECAR_VERSION = 1
+_PATH_LOCKS = 64  # striped per-path locks: bounded, collisions only serialize
+
+FileKey = Tuple[int, int, int]  # (size, mtime_ns, inode)
+
+
+def sha256_file(path: Path) -> str:
+    """Stream *path* through SHA-256 in 1 MiB chunks."""
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _file_key(st: os.stat_result) -> FileKey:
+    return (int(st.st_size), int(st.st_mtime_ns), int(st.st_ino))
+
+
+class ArtifactHashCache:
+    """Thread-safe per-file digest cache with an optional JSON sidecar."""
+
+    def __init__(self, sidecar: Optional[Path] = None) -> None:
+        self.sidecar = sidecar
+        self._entries: Dict[str, Tuple[FileKey, str]] = {}
+        self._lock = threading.Lock()
+        self._path_locks = [threading.Lock() for _ in range(_PATH_LOCKS)]
+        self.hits = 0
+        self.misses = 0
+        if sidecar is not None:
+            self._load()
+
+    # ── persistence ──────────────────────────────────────────────────────────
+
+    def _load(self) -> None:
+        assert self.sidecar is not None
+        try:
+            data = json.loads(self.sidecar.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != _SIDECAR_VERSION:
+            return
+        for path, e in (data.get("entries") or {}).items():
+            try:
+                key = (int(e["size"]), int(e["mtime_ns"]), int(e["inode"]))
+                digest = str(e["sha256"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._entries[path] = (key, digest)
+
+    def _save_locked(self) -> None:
+        if self.sidecar is None:
+            return
+        entries = {
+            path: {"size": k[0], "mtime_ns": k[1], "inode": k[2], "sha256": d}
+            for path, (k, d) in sorted(self._entries.items())
+        }
+        payload = json.dumps({"version": _SIDECAR_VERSION, "entries": entries}, indent=1)
+        try:
+            self.sidecar.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.sidecar.with_name(f"{self.sidecar.name}.{os.getpid()}.tmp")
+            tmp.write_text(payload, encoding="utf-8")
+            os.replace(tmp, self.sidecar)
+        except OSError:
+            # A read-only cache dir must never break validation.
+            pass
+
+    # ── lookup ───────────────────────────────────────────────────────────────
+
+    def peek(self, path: Path) -> Optional[str]:
+        """Return the cached digest if still valid, without hashing."""
+        resolved = str(Path(path).resolve())
+        try:
+            key = _file_key(os.stat(resolved))
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(resolved)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        return None
+
+    def info(self) -> Dict[str, int]:
+        """Hit/miss counters and number of cached digests."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def sha256(self, path: Path) -> str:
+        """Digest of *path*; hashes (once, even under concurrency) on a miss.
+
+        Raises:
+            OSError: if the file cannot be stat'ed or read.
+        """
+        resolved = str(Path(path).resolve())
+        with self._path_locks[hash(resolved) % _PATH_LOCKS]:
+            key = _file_key(os.stat(resolved))
+            with self._lock:
+                entry = self._entries.get(resolved)
+                if entry is not None and entry[0] == key:
+                    self.hits += 1
+                    return entry[1]
+                self.misses += 1
+            digest = sha256_file(Path(resolved))
+            # Re-stat: if the file changed while we read it, don't cache.
+            if _file_key(os.stat(resolved)) != key:
+                return digest
+            with self._lock:
+                self._entries[resolved] = (key, digest)
+                self._save_locked()
+            return digest
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def _default_sidecar() -> Optional[Path]:
+    env = os.environ.get("BAFE_REFDATA_HASH_CACHE", "").strip()
+    if not env or env.lower() == "off":
+        return None
+    return Path(env)
+
+
+_DEFAULT: Optional[ArtifactHashCache] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_hash_cache() -> ArtifactHashCache:
+    """Process-wide cache (sidecar location from BAFE_REFDATA_HASH_CACHE)."""
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = ArtifactHashCache(_default_sidecar())
+        return _DEFAULT
+
+
+def prehash_in_background(
+    paths: Iterable[Path],
+    *,
+    cache: Optional[ArtifactHashCache] = None,
+    max_workers: int = 4,
+) -> Tuple[ThreadPoolExecutor, List["Future[str]"]]:
+    """Hash *paths* in a thread pool; returns (executor, futures).
+
+    The caller owns the executor (``shutdown(wait=False, cancel_futures=True)``
+    on exit). Unreadable files surface as exceptions on their future only.
+    """
+    c = cache or default_hash_cache()
+    files = [Path(p) for p in paths if Path(p).is_file()]
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="refdata-hash")
+    futures = [executor.submit(c.sha256, p) for p in files]
+    return executor, futures
+
+
+def discover_artifacts(*roots: Optional[Path], patterns: Iterable[str] = ("*.se1",)) -> List[Path]:
+    """Files matching *patterns* directly under each existing root (sorted)."""
+    found: List[Path] = []
+    pats = list(patterns)
+    for root in roots:
+        if root is None or not Path(root).is_dir():
+            continue
+        for pat in pats:
+            found.extend(p for p in Path(root).glob(pat) if p.is_file())
+    return sorted(set(found))
+
+
+def start_startup_prehash() -> Optional[ThreadPoolExecutor]:
+    """Kick off background hashing if BAFE_REFDATA_PREHASH is enabled.
+
+    Covers ``*.se1`` in the Swiss Ephemeris directory and every file directly
+    under BAFE_REFDATA_ROOT (if set). Returns the executor, or None when
+    disabled or there is nothing to hash.
+    """
+    if os.environ.get("BAFE_REFDATA_PREHASH", "").strip().lower() not in {"1", "true", "yes", "on"}:
+        return None
+    from ..ephemeris import _resolve_ephe_path
+
+    files = discover_artifacts(_resolve_ephe_path(None))
+    extra_root = os.environ.get("BAFE_REFDATA_ROOT")
+    if extra_root:
+        files += discover_artifacts(Path(extra_root), patterns=("*",))
+    if not files:
+        return None
+    executor, _ = prehash_in_background(sorted(set(files)))
+    return executor
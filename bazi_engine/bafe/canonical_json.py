@@ -2,7 +2,12 @@ from __future__ import annotations
 
 import hashlib
 import json
-from typing import Any, Dict, Optional
+import math
+import threading
+from json.encoder import encode_basestring, encode_basestring_ascii
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from cachetools import LRUCache  # type: ignore[import-untyped]
 
 def _round_floats(obj: Any, *, decimals: int) -> Any:
     if isinstance(obj, float):
@@ -45,6 +50,146 @@ def canonical_json_dumps(
 def sha256_hex(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
+# ── Streaming encoder ────────────────────────────────────────────────────────
+
+_FLUSH_BYTES = 1 << 16
+
+def _float_token(x: float) -> str:
+    if math.isnan(x) or math.isinf(x):
+        raise ValueError("Out of range float values are not JSON compliant: " + repr(x))
+    return float.__repr__(x)
+
+def _iter_canonical(
+    obj: Any,
+    *,
+    sorted_keys: bool,
+    enc_str: Callable[[str], str],
+    decimals: Optional[int],
+) -> Iterator[str]:
+    """Yield the tokens of ``canonical_json_dumps(obj)`` without joining them.
+
+    Mirrors ``json.dumps(separators=(",", ":"), allow_nan=False)``: strings go
+    through the same C-accelerated escaper, ints and floats through their
+    ``__repr__``. Dict keys must be ``str`` — callers fall back to the
+    one-shot path for anything else, since ``json`` coerces non-str keys.
+    """
+    if isinstance(obj, str):
+        yield enc_str(obj)
+    elif obj is None:
+        yield "null"
+    elif obj is True:
+        yield "true"
+    elif obj is False:
+        yield "false"
+    elif isinstance(obj, int):
+        yield int.__repr__(obj)
+    elif isinstance(obj, float):
+        yield _float_token(round(obj, decimals) if decimals is not None else obj)
+    elif isinstance(obj, (list, tuple)):
+        yield "["
+        first = True
+        for item in obj:
+            if not first:
+                yield ","
+            first = False
+            yield from _iter_canonical(item, sorted_keys=sorted_keys, enc_str=enc_str, decimals=decimals)
+        yield "]"
+    elif isinstance(obj, dict):
+        keys = list(obj)
+        if not all(type(k) is str for k in keys):
+            raise TypeError("streaming canonical encoder requires str keys")
+        if sorted_keys:
+            keys.sort()
+        yield "{"
+        first = True
+        for k in keys:
+            if not first:
+                yield ","
+            first = False
+            yield enc_str(k)
+            yield ":"
+            yield from _iter_canonical(obj[k], sorted_keys=sorted_keys, enc_str=enc_str, decimals=decimals)
+        yield "}"
+    else:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def canonical_json_update(
+    h: Any,
+    obj: Any,
+    *,
+    sorted_keys: bool = True,
+    utf8: bool = True,
+    float_mode: str = "shortest_roundtrip",
+    fixed_decimals: Optional[int] = None,
+) -> None:
+    """Feed ``canonical_json_dumps(obj, ...)`` as UTF-8 into hash object *h*.
+
+    Byte-identical to ``h.update(canonical_json_dumps(obj, ...).encode())``
+    but never materializes the full string (and, in fixed-float mode, never
+    rebuilds the structure to round it).
+    """
+    if float_mode == "fixed":
+        if fixed_decimals is None:
+            raise ValueError("fixed_decimals is required when float_mode='fixed'")
+        decimals: Optional[int] = int(fixed_decimals)
+    elif float_mode == "shortest_roundtrip":
+        decimals = None
+    else:
+        raise ValueError(f"Unsupported float_mode: {float_mode}")
+
+    enc_str = encode_basestring if utf8 else encode_basestring_ascii
+    buf: list = []
+    size = 0
+    for tok in _iter_canonical(obj, sorted_keys=bool(sorted_keys), enc_str=enc_str, decimals=decimals):
+        buf.append(tok)
+        size += len(tok)
+        if size >= _FLUSH_BYTES:
+            h.update("".join(buf).encode("utf-8"))
+            buf.clear()
+            size = 0
+    if buf:
+        h.update("".join(buf).encode("utf-8"))
+
+# ── Fingerprint memo ─────────────────────────────────────────────────────────
+
+_FINGERPRINT_CACHE: LRUCache = LRUCache(maxsize=256)
+_FINGERPRINT_LOCK = threading.Lock()
+_FINGERPRINT_STATS = {"hits": 0, "misses": 0}
+
+def _structural_key(obj: Any, sorted_keys: bool = True) -> Any:
+    """Hashable snapshot of a JSON value that distinguishes every input
+    ``canonical_json_dumps`` would serialize differently.
+
+    With ``sorted_keys=False`` dict key order is part of the output and
+    therefore of the key. Raises TypeError for values that should not be
+    cached (non-str keys, non-JSON leaves).
+    """
+    t = type(obj)
+    if t is str or obj is None:
+        return obj
+    if t is bool or t is int or t is float:
+        # True, 1 and 1.0 compare equal but serialize differently.
+        return (t, obj)
+    if t is dict:
+        if not all(type(k) is str for k in obj):
+            raise TypeError("non-str key")
+        items = tuple((k, _structural_key(v, sorted_keys)) for k, v in obj.items())
+        return (dict, tuple(sorted(items)) if sorted_keys else items)
+    if t is list or t is tuple:
+        return (list, tuple(_structural_key(x, sorted_keys) for x in obj))
+    raise TypeError(f"uncacheable type {t.__name__}")
+
+def fingerprint_cache_info() -> Dict[str, int]:
+    """Hit/miss counters and current size of the config_fingerprint memo."""
+    with _FINGERPRINT_LOCK:
+        return {**_FINGERPRINT_STATS, "size": len(_FINGERPRINT_CACHE), "maxsize": int(_FINGERPRINT_CACHE.maxsize)}
+
+def fingerprint_cache_clear() -> None:
+    with _FINGERPRINT_LOCK:
+        _FINGERPRINT_CACHE.clear()
+        _FINGERPRINT_STATS["hits"] = 0
+        _FINGERPRINT_STATS["misses"] = 0
+
 def config_fingerprint(
     engine_config: Dict[str, Any],
     *,
@@ -54,9 +199,30 @@ def config_fingerprint(
     float_format_policy: Dict[str, Any],
     json_canonicalization: Dict[str, Any],
 ) -> str:
+    """SHA-256 over the canonical JSON of config + ruleset + refdata pack.
+
+    Memoized in a bounded LRU keyed by the structure of all arguments; the
+    digest is computed with the streaming encoder (byte-identical to hashing
+    ``canonical_json_dumps``).
+    """
+    sorted_keys = (json_canonicalization or {}).get("sorted_keys", True)
+    try:
+        key: Optional[Tuple[Any, ...]] = (
+            _structural_key(engine_config, bool(sorted_keys)), ruleset_id, ruleset_version, refdata_pack_id,
+            _structural_key(float_format_policy), _structural_key(json_canonicalization),
+        )
+    except TypeError:
+        key = None
+    if key is not None:
+        with _FINGERPRINT_LOCK:
+            cached = _FINGERPRINT_CACHE.get(key)
+            if cached is not None:
+                _FINGERPRINT_STATS["hits"] += 1
+                return str(cached)
+            _FINGERPRINT_STATS["misses"] += 1
+
     float_mode = (float_format_policy or {}).get("mode", "shortest_roundtrip")
     fixed_decimals = (float_format_policy or {}).get("fixed_decimals", None)
-    sorted_keys = (json_canonicalization or {}).get("sorted_keys", True)
     utf8 = (json_canonicalization or {}).get("utf8", True)
 
     payload = {
@@ -64,11 +230,26 @@ def config_fingerprint(
         "ruleset": {"id": ruleset_id, "version": ruleset_version},
         "refdata": {"refdata_pack_id": refdata_pack_id},
     }
-    s = canonical_json_dumps(
+    if key is None:
+        # Non-str keys etc.: json's own coercion rules apply.
+        return sha256_hex(canonical_json_dumps(
+            payload,
+            sorted_keys=sorted_keys,
+            utf8=utf8,
+            float_mode=float_mode,
+            fixed_decimals=fixed_decimals,
+        ))
+
+    h = hashlib.sha256()
+    canonical_json_update(
+        h,
         payload,
         sorted_keys=sorted_keys,
         utf8=utf8,
         float_mode=float_mode,
         fixed_decimals=fixed_decimals,
     )
-    return sha256_hex(s)
+    fp = h.hexdigest()
+    with _FINGERPRINT_LOCK:
+        _FINGERPRINT_CACHE[key] = fp
+    return fp
@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from .artifact_hash import default_hash_cache
 from .errors import make_issue
 
 def _parse_dt(dt_str: str) -> Optional[datetime]:
@@ -18,12 +19,8 @@ def _parse_dt(dt_str: str) -> Optional[datetime]:
         return None
 
 def _sha256_file(path: Path) -> str:
-    import hashlib
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    # Cached by (path, size, mtime_ns, inode); see artifact_hash.py.
+    return default_hash_cache().sha256(path)
 
 def _artifact_from_manifest(manifest: Dict[str, Any], logical_id: str) -> Optional[Dict[str, Any]]:
     arts = manifest.get("artifacts")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -12,7 +13,38 @@ def _repo_root_from_here() -> Path:
 def _spec_rulesets_dir() -> Path:
     return _repo_root_from_here() / "spec" / "rulesets"
 
+
+class _ReadOnlyDict(Dict[str, Any]):
+    """dict that rejects mutation; the cached ruleset is shared by all callers.
+
+    ``copy.copy`` / ``copy.deepcopy`` return plain (mutable) dicts.
+    """
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("Rulesets are read-only; copy.deepcopy() one to modify it")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self) -> Any:
+        return (dict, (dict(self),))
+
+
+def _freeze(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return _ReadOnlyDict({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+@lru_cache(maxsize=8)
 def load_ruleset(ruleset_id: str) -> Dict[str, Any]:
+    """Load a ruleset from spec/rulesets/ (cached per id).
+
+    The result is shared between callers and therefore read-only: nested
+    dicts reject assignment and JSON arrays are tuples.
+    """
     # Canonical mapping: id -> filename
     filename = f"{ruleset_id}.json"
     path = _spec_rulesets_dir() / filename
@@ -21,14 +53,15 @@ def load_ruleset(ruleset_id: str) -> Dict[str, Any]:
     data = json.loads(path.read_text(encoding="utf-8"))
     if data.get("ruleset_id") != ruleset_id:
         raise ValueError("Ruleset id mismatch in file")
-    return data
+    result: Dict[str, Any] = _freeze(data)
+    return result
 
 def ruleset_version(ruleset: Dict[str, Any]) -> str:
     return str(ruleset.get("ruleset_version", "MISSING"))
 
 def branch_order(ruleset: Dict[str, Any]) -> List[str]:
     bo = ruleset.get("branch_order")
-    if not isinstance(bo, list) or len(bo) != 12:
+    if not isinstance(bo, (list, tuple)) or len(bo) != 12:
         raise ValueError("ruleset.branch_order must be a 12-item list")
     return [str(x) for x in bo]
 
@@ -38,7 +71,7 @@ def hidden_stems_for_branch(ruleset: Dict[str, Any], branch: str) -> List[str]:
     if branch not in mapping:
         raise KeyError(f"hidden stems missing for branch: {branch}")
     lst = mapping[branch]
-    if not isinstance(lst, list):
+    if not isinstance(lst, (list, tuple)):
         raise TypeError("hidden stems entry must be a list")
     return [str(x) for x in lst]
 
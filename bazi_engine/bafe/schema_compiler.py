@@ -0,0 +1,244 @@
+"""
+bafe/schema_compiler.py — Draft-07 JSON Schema → generated Python checker.
+
+``Draft7Validator.iter_errors`` walks the schema through a generic keyword
+dispatcher on every call. For the hot /validate path we only need a yes/no
+answer; the detailed error is only required when the answer is "no".
+
+``compile_validator(schema)`` generates one plain Python function per schema
+node (type checks, required keys, enums, bounds …), ``exec``s the source once
+and returns a ``Callable[[Any], bool]``. Semantics follow jsonschema's Draft-07
+type checker (bool is not a number, 1.0 is an integer, enum/const compare
+bool and int as distinct). ``format`` is an annotation only, exactly as with
+a ``Draft7Validator`` constructed without a ``format_checker``.
+
+Schemas that use a keyword outside the supported subset fall back to
+``Draft7Validator(schema).is_valid`` so callers never get a weaker check.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from jsonschema import Draft7Validator
+
+Checker = Callable[[Any], bool]
+
+# Keywords with no validation effect (Draft7Validator without format_checker).
+_ANNOTATIONS = frozenset({
+    "$id", "$schema", "$comment", "title", "description", "default",
+    "examples", "definitions", "format", "readOnly", "writeOnly",
+})
+
+_SUPPORTED = frozenset({
+    "type", "enum", "const", "properties", "required", "additionalProperties",
+    "items", "minItems", "maxItems", "minimum", "maximum", "exclusiveMinimum",
+    "exclusiveMaximum", "minLength", "maxLength", "pattern", "allOf", "anyOf",
+    "oneOf", "not", "$ref",
+}) | _ANNOTATIONS
+
+_TYPE_EXPR: Dict[str, str] = {
+    "object":  "type({v}) is dict",
+    "array":   "type({v}) is list",
+    "string":  "type({v}) is str",
+    "boolean": "type({v}) is bool",
+    "null":    "{v} is None",
+    "number":  "(type({v}) is int or type({v}) is float)",
+    "integer": "(type({v}) is int or (type({v}) is float and {v}.is_integer()))",
+}
+
+
+class UnsupportedSchemaError(ValueError):
+    """Raised when a schema uses a keyword the compiler does not implement."""
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """JSON equality with bool and number kept distinct (jsonschema semantics)."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    return bool(a == b)
+
+
+class _Compiler:
+    def __init__(self, root: Dict[str, Any]) -> None:
+        self.root = root
+        self.lines: List[str] = []
+        self.consts: Dict[str, Any] = {}
+        self.ref_funcs: Dict[str, str] = {}
+        self.counter = 0
+
+    def _name(self, prefix: str) -> str:
+        self.counter += 1
+        return f"_{prefix}{self.counter}"
+
+    def _const(self, value: Any) -> str:
+        name = self._name("c")
+        self.consts[name] = value
+        return name
+
+    def _resolve(self, ref: str) -> Any:
+        if not ref.startswith("#"):
+            raise UnsupportedSchemaError(f"Only local $ref supported, got {ref!r}")
+        node: Any = self.root
+        for part in [p for p in ref[1:].split("/") if p]:
+            part = part.replace("~1", "/").replace("~0", "~")
+            node = node[part]
+        return node
+
+    def compile_ref(self, ref: str) -> str:
+        if ref not in self.ref_funcs:
+            # Register before compiling so recursive schemas terminate.
+            fname = self._name("r")
+            self.ref_funcs[ref] = fname
+            target = self._resolve(ref)
+            body = self.compile_node(target)
+            self.lines.append(f"def {fname}(x):")
+            self.lines.append(f"    return {body}(x)")
+        return self.ref_funcs[ref]
+
+    def compile_node(self, schema: Any) -> str:
+        """Emit a checker function for *schema* and return its name."""
+        fname = self._name("v")
+        if schema is True or schema == {}:
+            self.lines.append(f"def {fname}(x):")
+            self.lines.append("    return True")
+            return fname
+        if schema is False:
+            self.lines.append(f"def {fname}(x):")
+            self.lines.append("    return False")
+            return fname
+        if not isinstance(schema, dict):
+            raise UnsupportedSchemaError(f"Schema must be an object or boolean, got {type(schema).__name__}")
+
+        unknown = set(schema) - _SUPPORTED
+        if unknown:
+            raise UnsupportedSchemaError(f"Unsupported keyword(s): {sorted(unknown)}")
+
+        body: List[str] = []
+
+        if "$ref" in schema:
+            # Draft-07: $ref siblings are ignored.
+            target = self.compile_ref(schema["$ref"])
+            self.lines.append(f"def {fname}(x):")
+            self.lines.append(f"    return {target}(x)")
+            return fname
+
+        if "type" in schema:
+            types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            exprs = []
+            for t in types:
+                if t not in _TYPE_EXPR:
+                    raise UnsupportedSchemaError(f"Unsupported type {t!r}")
+                exprs.append(_TYPE_EXPR[t].format(v="x"))
+            body.append(f"if not ({' or '.join(exprs)}): return False")
+
+        if "enum" in schema:
+            c = self._const(list(schema["enum"]))
+            body.append(f"if not any(_eq(x, e) for e in {c}): return False")
+        if "const" in schema:
+            c = self._const(schema["const"])
+            body.append(f"if not _eq(x, {c}): return False")
+
+        num = "(type(x) is int or type(x) is float)"
+        for kw, op in (("minimum", "<"), ("maximum", ">"),
+                       ("exclusiveMinimum", "<="), ("exclusiveMaximum", ">=")):
+            if kw in schema:
+                body.append(f"if {num} and x {op} {schema[kw]!r}: return False")
+
+        if "minLength" in schema:
+            body.append(f"if type(x) is str and len(x) < {int(schema['minLength'])}: return False")
+        if "maxLength" in schema:
+            body.append(f"if type(x) is str and len(x) > {int(schema['maxLength'])}: return False")
+        if "pattern" in schema:
+            c = self._const(re.compile(schema["pattern"]))
+            body.append(f"if type(x) is str and not {c}.search(x): return False")
+
+        obj_body: List[str] = []
+        for key in schema.get("required", []):
+            obj_body.append(f"if {key!r} not in x: return False")
+        props: Dict[str, Any] = schema.get("properties", {})
+        for key, sub in props.items():
+            sub_fn = self.compile_node(sub)
+            obj_body.append(f"if {key!r} in x and not {sub_fn}(x[{key!r}]): return False")
+        if "additionalProperties" in schema:
+            ap = schema["additionalProperties"]
+            known = self._const(frozenset(props))
+            if ap is False:
+                obj_body.append(f"if not {known}.issuperset(x): return False")
+            elif ap is not True:
+                ap_fn = self.compile_node(ap)
+                obj_body.append("for k in x:")
+                obj_body.append(f"    if k not in {known} and not {ap_fn}(x[k]): return False")
+        if obj_body:
+            body.append("if type(x) is dict:")
+            body.extend("    " + line for line in obj_body)
+
+        arr_body: List[str] = []
+        if "minItems" in schema:
+            arr_body.append(f"if len(x) < {int(schema['minItems'])}: return False")
+        if "maxItems" in schema:
+            arr_body.append(f"if len(x) > {int(schema['maxItems'])}: return False")
+        if "items" in schema:
+            items = schema["items"]
+            if isinstance(items, list):
+                for i, sub in enumerate(items):
+                    sub_fn = self.compile_node(sub)
+                    arr_body.append(f"if len(x) > {i} and not {sub_fn}(x[{i}]): return False")
+            else:
+                item_fn = self.compile_node(items)
+                arr_body.append("for it in x:")
+                arr_body.append(f"    if not {item_fn}(it): return False")
+        if arr_body:
+            body.append("if type(x) is list:")
+            body.extend("    " + line for line in arr_body)
+
+        if "allOf" in schema:
+            fns = [self.compile_node(s) for s in schema["allOf"]]
+            body.append(f"if not ({' and '.join(f + '(x)' for f in fns)}): return False")
+        if "anyOf" in schema:
+            fns = [self.compile_node(s) for s in schema["anyOf"]]
+            body.append(f"if not ({' or '.join(f + '(x)' for f in fns)}): return False")
+        if "oneOf" in schema:
+            fns = [self.compile_node(s) for s in schema["oneOf"]]
+            body.append(f"if ({' + '.join(f'bool({f}(x))' for f in fns)}) != 1: return False")
+        if "not" in schema:
+            not_fn = self.compile_node(schema["not"])
+            body.append(f"if {not_fn}(x): return False")
+
+        self.lines.append(f"def {fname}(x):")
+        self.lines.extend("    " + line for line in body)
+        self.lines.append("    return True")
+        return fname
+
+
+def compile_validator_source(schema: Dict[str, Any]) -> tuple[str, Dict[str, Any], str]:
+    """Return (python_source, constants, entry_function_name) for *schema*.
+
+    Raises:
+        UnsupportedSchemaError: if the schema uses keywords outside the subset.
+    """
+    comp = _Compiler(schema)
+    entry = comp.compile_node(schema)
+    return "\n".join(comp.lines) + "\n", comp.consts, entry
+
+
+def compile_validator(schema: Dict[str, Any], *, fallback: Optional[Draft7Validator] = None) -> Checker:
+    """Compile *schema* into a fast ``is_valid`` predicate.
+
+    Falls back to ``Draft7Validator.is_valid`` when the schema cannot be
+    compiled, so the returned checker is never weaker than the reference.
+    """
+    try:
+        source, consts, entry = compile_validator_source(schema)
+    except UnsupportedSchemaError:
+        validator = fallback or Draft7Validator(schema)
+        return validator.is_valid
+
+    namespace: Dict[str, Any] = {"_eq": _json_equal, **consts}
+    exec(compile(source, "<bafe-schema>", "exec"), namespace)  # noqa: S102
+    checker: Checker = namespace[entry]
+    return checker
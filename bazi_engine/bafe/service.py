@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import json
+import os
+import random
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from jsonschema import Draft7Validator
 
+from .. import timing
 from .errors import make_issue
+from .schema_compiler import compile_validator
 from .refdata import evaluate_refdata
 from .time_model import evaluate_time
 from .ruleset_loader import load_ruleset, ruleset_version, day_cycle_anchor_status
@@ -33,6 +37,19 @@ _VALIDATE_RESPONSE_SCHEMA = _load_schema("ValidateResponse.schema.json")
 _REQ_VALIDATOR = Draft7Validator(_VALIDATE_REQUEST_SCHEMA)
 _RESP_VALIDATOR = Draft7Validator(_VALIDATE_RESPONSE_SCHEMA)
 
+# Generated yes/no checkers for the hot path. The Draft7Validator instances
+# above are only consulted to build a deterministic message once a document
+# is already known to be invalid.
+_REQ_CHECK = compile_validator(_VALIDATE_REQUEST_SCHEMA, fallback=_REQ_VALIDATOR)
+_RESP_CHECK = compile_validator(_VALIDATE_RESPONSE_SCHEMA, fallback=_RESP_VALIDATOR)
+
+# Response self-check policy (BAFE_RESPONSE_SELF_CHECK):
+#   "always"  — validate every response against the contract schema (default)
+#   "sampled" — validate a random fraction (BAFE_RESPONSE_SELF_CHECK_RATE, default 0.01)
+#   "off"     — skip the self-check (contract then relies on the test suite)
+SELF_CHECK_MODES = ("always", "sampled", "off")
+_DEFAULT_SELF_CHECK_RATE = 0.01
+
 def _now_utc(now_override: Optional[str]) -> datetime:
     if now_override:
         s = str(now_override).replace("Z", "+00:00")
@@ -61,20 +78,44 @@ def _apply_defaults_engine_config(engine_config: Dict[str, Any]) -> Dict[str, An
     cfg.setdefault("float_format_policy", {"mode": "shortest_roundtrip", "fixed_decimals": None})
     return cfg
 
+def _self_check_mode(override: Optional[str]) -> str:
+    mode = (override or os.environ.get("BAFE_RESPONSE_SELF_CHECK") or "always").lower()
+    # Unknown values never weaken the contract.
+    return mode if mode in SELF_CHECK_MODES else "always"
+
+def _should_self_check(mode: str) -> bool:
+    if mode == "always":
+        return True
+    if mode == "off":
+        return False
+    try:
+        rate = float(os.environ.get("BAFE_RESPONSE_SELF_CHECK_RATE", _DEFAULT_SELF_CHECK_RATE))
+    except ValueError:
+        rate = _DEFAULT_SELF_CHECK_RATE
+    return random.random() < rate
+
 def _issue_list_sorted(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     # Deterministic ordering for CI stability
     return sorted(issues, key=lambda x: (x.get("code",""), x.get("severity",""), x.get("path") or "", x.get("message","")))
 
-def validate_request(payload: Dict[str, Any]) -> Dict[str, Any]:
+def validate_request(payload: Dict[str, Any], *, self_check: Optional[str] = None) -> Dict[str, Any]:
     """
     Contract-first validator. Raises ValueError on invalid request schema.
-    Returns ValidateResponse dict (guaranteed schema-valid by self-check).
+    Returns ValidateResponse dict (schema-valid; verified by the response
+    self-check according to ``self_check`` / BAFE_RESPONSE_SELF_CHECK).
     """
-    errs = list(_REQ_VALIDATOR.iter_errors(payload))
-    if errs:
-        # Prefer deterministic first error message
-        e = sorted(errs, key=lambda x: x.path)[0]
-        raise ValueError(f"ValidateRequest schema violation: {e.message}")
+    with timing.span("bafe.validate"):
+        return _validate_request(payload, self_check=self_check)
+
+
+def _validate_request(payload: Dict[str, Any], *, self_check: Optional[str]) -> Dict[str, Any]:
+    if not _REQ_CHECK(payload):
+        errs = list(_REQ_VALIDATOR.iter_errors(payload))
+        if errs:
+            # Prefer deterministic first error message
+            e = sorted(errs, key=lambda x: x.path)[0]
+            raise ValueError(f"ValidateRequest schema violation: {e.message}")
+    check_mode = _self_check_mode(self_check)
 
     validate_level = str(payload.get("validate_level", "BASIC")).upper()
     now_utc = _now_utc(payload.get("now_utc_override"))
@@ -311,9 +352,10 @@ def validate_request(payload: Dict[str, Any]) -> Dict[str, Any]:
     }
 
     # Self-check: response must validate against contract schema.
-    resp_errs = list(_RESP_VALIDATOR.iter_errors(resp))
-    if resp_errs:
-        first_err = sorted(resp_errs, key=lambda x: x.path)[0]
-        raise RuntimeError(f"ValidateResponse schema violation (BUG): {first_err.message} at {list(first_err.path)}")
+    if _should_self_check(check_mode) and not _RESP_CHECK(resp):
+        resp_errs = list(_RESP_VALIDATOR.iter_errors(resp))
+        if resp_errs:
+            first_err = sorted(resp_errs, key=lambda x: x.path)[0]
+            raise RuntimeError(f"ValidateResponse schema violation (BUG): {first_err.message} at {list(first_err.path)}")
 
     return resp
@@ -6,6 +6,7 @@ from zoneinfo import ZoneInfo
 
 from .errors import make_issue
 from ..solar_time import true_solar_time
+from ..tz_index import classify_local
 
 def _parse_local_datetime(local_dt_str: str) -> datetime:
     # Accept ISO string without timezone
@@ -17,6 +18,11 @@ def _detect_local_time_status(naive: datetime, tz: ZoneInfo) -> Tuple[str, Optio
     status in {"ok", "ambiguous", "nonexistent"}
     fold_to_use: suggested fold for ambiguous times (0 by default)
     """
+    cls = classify_local(naive, tz)
+    if cls is not None:
+        if cls.status == "nonexistent":
+            return "nonexistent", None
+        return cls.status, 0
     ok_folds: List[int] = []
     offsets: List[Optional[timedelta]] = []
     for fold in (0, 1):
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-from datetime import datetime
+from bisect import bisect_right
+from datetime import datetime, tzinfo
+from typing import List, Optional, Sequence, overload
 
 import swisseph as swe
 
-from .types import BaziInput, BaziResult, Pillar, FourPillars, SolarTerm
+from .types import BaziInput, BaziResult, Pillar, FourPillars, SolarTerm, pillar_of
 from .time_utils import parse_local_iso, to_chart_local, apply_day_boundary
-from .ephemeris import SwissEphBackend, datetime_utc_to_jd_ut, jd_ut_to_datetime_utc
+from .ephemeris import EphemerisBackend, make_backend, datetime_utc_to_jd_ut, jd_ut_to_datetime_utc
 from .jieqi import compute_month_boundaries_from_lichun, compute_24_solar_terms_for_window
-from .exc import CalculationError, NotSupportedError
+from .exc import CalculationError
+from . import timing
 
 from .constants import DAY_OFFSET
 from .bafe.ruleset_loader import (
@@ -29,7 +32,7 @@ def sexagenary_day_index_from_date(y: int, m: int, d: int, offset: int = DAY_OFF
     return (jdn_gregorian(y, m, d) + offset) % 60
 
 def pillar_from_index60(idx60: int) -> Pillar:
-    return Pillar(idx60 % 10, idx60 % 12)
+    return pillar_of(idx60 % 10, idx60 % 12)
 
 def year_pillar_from_solar_year(solar_year: int) -> Pillar:
     idx60 = (solar_year - 1984) % 60
@@ -45,7 +48,7 @@ def month_pillar_from_year_stem(
         stem_index = month_stem_for_year_stem(ruleset, year_stem_index, month_index)
     else:
         stem_index = (year_stem_index * 2 + 2 + month_index) % 10
-    return Pillar(stem_index, branch_index)
+    return pillar_of(stem_index, branch_index)
 
 def hour_branch_index(dt_local: datetime) -> int:
     return ((dt_local.hour + 1) // 2) % 12
@@ -59,9 +62,9 @@ def hour_pillar_from_day_stem(
         stem_index = hour_stem_for_day_stem(ruleset, day_stem_index, hour_branch)
     else:
         stem_index = (day_stem_index * 2 + hour_branch) % 10
-    return Pillar(stem_index, hour_branch)
+    return pillar_of(stem_index, hour_branch)
 
-def _lichun_jd_ut_for_year(year: int, backend: SwissEphBackend) -> float:
+def _lichun_jd_ut_for_year(year: int, backend: EphemerisBackend) -> float:
     jd0 = swe.julday(year, 1, 1, 0.0)
     result = backend.solcross_ut(315.0, jd0)
     if result is None:
@@ -71,36 +74,86 @@ def _lichun_jd_ut_for_year(year: int, backend: SwissEphBackend) -> float:
         )
     return float(result)
 
-def compute_bazi(inp: BaziInput) -> BaziResult:
-    if inp.ephemeris_backend.lower() != "swisseph":
-        raise NotSupportedError("v0.2 ships a skyfield stub only; swisseph is implemented.")
 
+class _LocalDatetimesFromJD(Sequence[datetime]):
+    """Month boundaries as local datetimes, converted only when accessed.
+
+    compute_bazi decides everything on JD floats; most callers read at most
+    one boundary (the current month's), so the other conversions are skipped.
+    """
+
+    __slots__ = ("_jds", "_tz", "_cache")
+
+    def __init__(self, jds: Sequence[float], tz: Optional[tzinfo]) -> None:
+        self._jds = list(jds)
+        self._tz = tz
+        self._cache: List[Optional[datetime]] = [None] * len(self._jds)
+
+    def _at(self, i: int) -> datetime:
+        dt = self._cache[i]
+        if dt is None:
+            dt = jd_ut_to_datetime_utc(self._jds[i]).astimezone(self._tz)
+            self._cache[i] = dt
+        return dt
+
+    @overload
+    def __getitem__(self, i: int) -> datetime: ...
+    @overload
+    def __getitem__(self, i: slice) -> List[datetime]: ...
+
+    def __getitem__(self, i):  # type: ignore[no-untyped-def]
+        if isinstance(i, slice):
+            return [self._at(k) for k in range(*i.indices(len(self._jds)))]
+        if i < 0:
+            i += len(self._jds)
+        if not 0 <= i < len(self._jds):
+            raise IndexError(i)
+        return self._at(i)
+
+    def __len__(self) -> int:
+        return len(self._jds)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+def compute_bazi(inp: BaziInput) -> BaziResult:
     # Load externalized ruleset for stem lookup tables
     try:
         ruleset = load_ruleset(_DEFAULT_RULESET_ID)
     except (FileNotFoundError, ValueError):
         ruleset = None  # Graceful fallback to formula-based calculation
 
-    backend = SwissEphBackend(ephe_path=inp.ephe_path)
+    laps = timing.laps("bazi")
+    backend = make_backend(inp.ephemeris_backend, ephe_path=inp.ephe_path)
 
-    birth_local_dt = parse_local_iso(
-        inp.birth_local,
-        inp.timezone,
-        strict=inp.strict_local_time,
-        fold=int(inp.fold),
-    )
+    birth_local_dt = inp.birth_local_dt
+    if birth_local_dt is None:
+        birth_local_dt = parse_local_iso(
+            inp.birth_local,
+            inp.timezone,
+            strict=inp.strict_local_time,
+            fold=int(inp.fold),
+        )
     chart_local_dt, birth_utc_dt = to_chart_local(birth_local_dt, inp.longitude_deg, inp.time_standard)
 
     jd_ut = datetime_utc_to_jd_ut(birth_utc_dt)
     delta_t_seconds = backend.delta_t_seconds(jd_ut)
     jd_tt = backend.jd_tt_from_jd_ut(jd_ut)
+    laps.lap("time")
 
     # Year by LiChun
+    # All boundary decisions compare JD(UT) floats; the chart instant is
+    # jd_ut regardless of the chart's local time standard.
     y = chart_local_dt.year
     jd_lichun_this = _lichun_jd_ut_for_year(y, backend)
-    lichun_this_local = jd_ut_to_datetime_utc(jd_lichun_this).astimezone(chart_local_dt.tzinfo)
 
-    before_lichun = chart_local_dt < lichun_this_local
+    before_lichun = jd_ut < jd_lichun_this
     if before_lichun:
         solar_year = y - 1
         jd_lichun_used = _lichun_jd_ut_for_year(y - 1, backend)
@@ -111,6 +164,7 @@ def compute_bazi(inp: BaziInput) -> BaziResult:
         jd_lichun_next = _lichun_jd_ut_for_year(y + 1, backend)
 
     year_p = year_pillar_from_solar_year(solar_year)
+    laps.lap("lichun")
 
     # Month boundaries
     month_bounds_ut = compute_month_boundaries_from_lichun(
@@ -118,13 +172,11 @@ def compute_bazi(inp: BaziInput) -> BaziResult:
         jd_lichun_used,
         accuracy_seconds=inp.accuracy_seconds,
     )
-    month_bounds_local = [jd_ut_to_datetime_utc(jd).astimezone(chart_local_dt.tzinfo) for jd in month_bounds_ut]
+    month_bounds_local = _LocalDatetimesFromJD(month_bounds_ut, chart_local_dt.tzinfo)
+    laps.lap("month_boundaries")
 
-    month_index = 11
-    for k in range(12):
-        if month_bounds_local[k] <= chart_local_dt < month_bounds_local[k + 1]:
-            month_index = k
-            break
+    k = bisect_right(month_bounds_ut, jd_ut) - 1
+    month_index = k if 0 <= k < 12 else 11
     month_p = month_pillar_from_year_stem(year_p.stem_index, month_index, ruleset=ruleset)
 
     # Day pillar
@@ -148,27 +200,31 @@ def compute_bazi(inp: BaziInput) -> BaziResult:
     hour_p = hour_pillar_from_day_stem(day_p.stem_index, hb, ruleset=ruleset)
 
     pillars = FourPillars(year=year_p, month=month_p, day=day_p, hour=hour_p)
+    laps.lap("pillars")
 
     # Diagnostics: 24 terms in LiChun->next LiChun window
     solar_terms = None
-    try:
-        term_pairs = compute_24_solar_terms_for_window(
-            backend,
-            month_bounds_ut[0],
-            month_bounds_ut[-1],
-            accuracy_seconds=inp.accuracy_seconds,
-        )
-        solar_terms = [
-            SolarTerm(
-                index=idx,
-                target_lon_deg=15.0 * idx,
-                utc_dt=jd_ut_to_datetime_utc(jd),
-                local_dt=jd_ut_to_datetime_utc(jd).astimezone(chart_local_dt.tzinfo),
+    if inp.include_solar_terms:
+        try:
+            term_pairs = compute_24_solar_terms_for_window(
+                backend,
+                month_bounds_ut[0],
+                month_bounds_ut[-1],
+                accuracy_seconds=inp.accuracy_seconds,
             )
-            for (idx, jd) in term_pairs
-        ]
-    except Exception:
-        solar_terms = None
+            terms: List[SolarTerm] = []
+            for (idx, jd) in term_pairs:
+                utc_dt = jd_ut_to_datetime_utc(jd)
+                terms.append(SolarTerm(
+                    index=idx,
+                    target_lon_deg=15.0 * idx,
+                    utc_dt=utc_dt,
+                    local_dt=utc_dt.astimezone(chart_local_dt.tzinfo),
+                ))
+            solar_terms = terms
+        except Exception:
+            solar_terms = None
+        laps.lap("solar_terms")
 
     return BaziResult(
         input=inp,
@@ -186,4 +242,5 @@ def compute_bazi(inp: BaziInput) -> BaziResult:
         is_before_lichun=before_lichun,
         lichun_next_local_dt=jd_ut_to_datetime_utc(jd_lichun_next).astimezone(chart_local_dt.tzinfo),
         solar_terms_local_dt=solar_terms,
+        ephemeris_id=backend.ephemeris_id,
     )
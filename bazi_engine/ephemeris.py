@@ -1,15 +1,17 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Protocol, Tuple
+from typing import Iterable, Optional, Protocol, Tuple
 import os
 
 import swisseph as swe
 
-from .exc import EphemerisUnavailableError
+from . import timing
+from .exc import EphemerisUnavailableError, NotSupportedError
 
 
 def norm360(deg: float) -> float:
@@ -53,6 +55,8 @@ def assert_no_moseph_fallback(requested_flags: int, returned_flags: int) -> None
 
 
 class EphemerisBackend(Protocol):
+    @property
+    def ephemeris_id(self) -> str: ...
     def delta_t_seconds(self, jd_ut: float) -> float: ...
     def jd_tt_from_jd_ut(self, jd_ut: float) -> float: ...
     def sun_lon_deg_ut(self, jd_ut: float) -> float: ...
@@ -64,8 +68,14 @@ class SwissEphBackend:
     flags: int = swe.FLG_SWIEPH
     ephe_path: Optional[str] = None
     mode: str = "SWIEPH"
+    # False: calc_ut is answered from the shared interpolated position cache
+    # (ephemeris_cache, bounded arc-second error). EPHEMERIS_EXACT=1 forces
+    # exact calls everywhere.
+    exact: bool = True
 
     def __post_init__(self) -> None:
+        if os.environ.get("EPHEMERIS_EXACT", "").lower() in {"1", "true", "yes"}:
+            self.exact = True
         mode = self.mode.upper()
         env_mode = os.environ.get("EPHEMERIS_MODE")
         if env_mode:
@@ -88,6 +98,11 @@ class SwissEphBackend:
         self.flags = swe.FLG_SWIEPH
         self.mode = "SWIEPH"
 
+    @property
+    def ephemeris_id(self) -> str:
+        """Provenance id of the data actually used (see provenance.build_provenance)."""
+        return "moshier_analytic" if self.mode == "MOSEPH" else "swieph_sepl18"
+
     def delta_t_seconds(self, jd_ut: float) -> float:
         return swe.deltat(jd_ut) * 86400.0
 
@@ -95,7 +110,7 @@ class SwissEphBackend:
         return jd_ut + swe.deltat(jd_ut)
 
     def sun_lon_deg_ut(self, jd_ut: float) -> float:
-        (lon, _lat, _dist, *_), ret = swe.calc_ut(jd_ut, swe.SUN, self.flags)
+        (lon, _lat, _dist, *_), ret = timing.timed("swe.calc_ut", swe.calc_ut)(jd_ut, swe.SUN, self.flags)
         assert_no_moseph_fallback(self.flags, ret)
         return norm360(lon)
 
@@ -104,7 +119,19 @@ class SwissEphBackend:
         # so we cannot detect MOSEPH fallback here at runtime.
         # Protection is at __post_init__: SWIEPH mode refuses to start
         # without SE1 files, so solcross_ut will always use the correct backend.
-        return swe.solcross_ut(target_lon_deg, jd_start_ut, self.flags)
+        return timing.timed("swe.solcross_ut", swe.solcross_ut)(target_lon_deg, jd_start_ut, self.flags)
+
+    def sun_lon_deg_ut_many(self, jds_ut: Iterable[float]) -> array:
+        """sun_lon_deg_ut for many instants (one swe call each)."""
+        return array("d", (self.sun_lon_deg_ut(jd) for jd in jds_ut))
+
+    def solcross_ut_many(self, targets_deg: Iterable[float], jds_start_ut: Iterable[float]) -> array:
+        """solcross_ut for many (target, start) pairs; NaN where none is found."""
+        out = array("d")
+        for target, start in zip(targets_deg, jds_start_ut):
+            jd = self.solcross_ut(target, start)
+            out.append(float("nan") if jd is None else jd)
+        return out
 
     def calc_ut(
         self, jd_ut: float, planet_id: int, extra_flags: int = 0,
@@ -113,13 +140,43 @@ class SwissEphBackend:
 
         Returns the (result_tuple, flags) pair, raising
         EphemerisUnavailableError if MOSEPH was used unexpectedly.
+        With ``exact=False`` the shared PositionCache answers instead.
         """
         combined = self.flags | extra_flags
-        result, ret = swe.calc_ut(jd_ut, planet_id, combined)
+        if not self.exact:
+            from .ephemeris_cache import shared_position_cache
+            return shared_position_cache().calc_ut(jd_ut, planet_id, combined)
+        result, ret = timing.timed("swe.calc_ut", swe.calc_ut)(jd_ut, planet_id, combined)
         assert_no_moseph_fallback(combined, ret)
         return result, ret
 
 
+EPHEMERIS_BACKENDS = ("swisseph", "skyfield")
+
+
+def make_backend(name: str = "swisseph", *, ephe_path: Optional[str] = None) -> EphemerisBackend:
+    """Instantiate the ephemeris backend selected by *name*.
+
+    "skyfield" is imported lazily and needs the optional ``skyfield`` extra
+    plus a local JPL kernel (see ephemeris_skyfield); its backend is shared
+    per kernel file.
+
+    Raises:
+        NotSupportedError: unknown backend name, or skyfield not installed.
+        EphemerisUnavailableError: the backend's data files are missing.
+    """
+    key = name.lower()
+    if key == "swisseph":
+        return SwissEphBackend(ephe_path=ephe_path)
+    if key == "skyfield":
+        from .ephemeris_skyfield import skyfield_backend
+        return skyfield_backend(ephe_path=ephe_path)
+    raise NotSupportedError(
+        f"Unknown ephemeris backend {name!r}",
+        detail={"supported": list(EPHEMERIS_BACKENDS)},
+    )
+
+
 def datetime_utc_to_jd_ut(dt_utc: datetime) -> float:
     if dt_utc.tzinfo is None or dt_utc.utcoffset() != timedelta(0):
         raise ValueError("Expected aware UTC datetime")
@@ -144,6 +201,51 @@ def jd_ut_to_datetime_utc(jd_ut: float) -> datetime:
     return base + timedelta(hours=hour, minutes=minute, seconds=second, microseconds=micro)
 
 
+# ── Batch conversions ────────────────────────────────────────────────────────
+#
+# Plain arithmetic on the Unix epoch (JD 2440587.5, proleptic Gregorian like
+# swe.julday's default). Results agree with the scalar helpers above to
+# float rounding (< 1 microsecond); use the scalar ones where a value is
+# reported to users, these where many instants are compared or fed back to
+# the ephemeris.
+
+JD_UNIX_EPOCH = 2440587.5
+_UNIX_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def jd_ut_from_unix_seconds(seconds: Iterable[float]) -> array:
+    """Unix seconds (UTC) → JD(UT), as ``array('d')``."""
+    return array("d", (JD_UNIX_EPOCH + s / 86400.0 for s in seconds))
+
+
+def unix_seconds_from_jd_ut(jds: Iterable[float]) -> array:
+    """JD(UT) → Unix seconds (UTC), as ``array('d')``."""
+    return array("d", ((jd - JD_UNIX_EPOCH) * 86400.0 for jd in jds))
+
+
+def datetimes_utc_to_jd_ut(dts: Iterable[datetime]) -> array:
+    """Aware datetimes (any offset) → JD(UT), as ``array('d')``."""
+    one_us = timedelta(microseconds=1)
+    out = array("d")
+    for dt in dts:
+        if dt.tzinfo is None:
+            raise ValueError("Expected aware datetime")
+        out.append(JD_UNIX_EPOCH + ((dt - _UNIX_EPOCH_UTC) // one_us) / 86_400_000_000.0)
+    return out
+
+
+def delta_t_seconds_many(jds: Iterable[float]) -> array:
+    """ΔT = TT − UT (seconds) for many JD(UT) values, as ``array('d')``."""
+    deltat = swe.deltat
+    return array("d", (deltat(jd) * 86400.0 for jd in jds))
+
+
+def jd_tt_from_jd_ut_many(jds: Iterable[float]) -> array:
+    """JD(TT) for many JD(UT) values, as ``array('d')``."""
+    deltat = swe.deltat
+    return array("d", (jd + deltat(jd) for jd in jds))
+
+
 EPHEMERIS_FILES_REQUIRED = [
     "sepl_18.se1",
     "semo_18.se1",
@@ -0,0 +1,282 @@
+"""
+ephemeris_cache.py — Interpolated planet-position cache over Swiss Ephemeris.
+
+Transit, timeline and webhook requests query positions for timestamps that
+cluster heavily (today, this week). PositionCache answers those queries from
+per-planet Chebyshev segments instead of calling ``swe.calc_ut`` each time:
+
+- A segment covers a fixed span of days per body (1 day for the Moon, up to
+  16 days for slow outer planets) aligned to J2000, and is fitted on demand
+  from ``degree + 1`` exact ``swe.calc_ut`` samples at the Chebyshev nodes.
+- Every fit is validated against exact positions midway between the nodes.
+  A segment whose longitude, latitude or distance error exceeds the
+  tolerance is refitted at twice the degree and, failing that, marked
+  exact-only (queries in it go straight to ``swe.calc_ut``).
+- Segments are evicted least-recently-used.
+- Speeds are the derivatives of the fitted polynomials.
+
+Results depend only on (jd, body, flags, tolerance), never on what happens
+to be cached, so a warm and a cold cache answer identically.
+
+Only the plain flag set (ephemeris selection and FLG_SPEED) is cached;
+sidereal, topocentric, equatorial etc. always go to ``swe.calc_ut``, since
+they depend on global Swiss Ephemeris state. The osculating true node and
+apogee are never cached either (see UNCACHED_BODIES).
+"""
+from __future__ import annotations
+
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import swisseph as swe
+
+from . import timing
+from .ephemeris import assert_no_moseph_fallback
+
+__all__ = [
+    "DEFAULT_TOLERANCE_ARCSEC",
+    "SEGMENT_DAYS",
+    "UNCACHED_BODIES",
+    "PositionCache",
+    "shared_position_cache",
+]
+
+#: Default bound for longitude/latitude error (and distance error, as angle).
+DEFAULT_TOLERANCE_ARCSEC = 0.1
+
+#: Segment span per body in days; bodies not listed use DEFAULT_SEGMENT_DAYS.
+SEGMENT_DAYS: Dict[int, float] = {
+    swe.MOON: 1.0,
+    swe.MEAN_NODE: 8.0,
+    swe.MERCURY: 2.0,
+    swe.VENUS: 4.0,
+    swe.SUN: 8.0,
+    swe.MARS: 8.0,
+    swe.JUPITER: 16.0,
+    swe.SATURN: 16.0,
+    swe.URANUS: 16.0,
+    swe.NEPTUNE: 16.0,
+    swe.PLUTO: 16.0,
+}
+DEFAULT_SEGMENT_DAYS = 4.0
+
+#: Osculating points whose distance is too noisy to interpolate; always exact.
+UNCACHED_BODIES = frozenset({swe.TRUE_NODE, swe.OSCU_APOG})
+DEFAULT_DEGREE = 8
+MAX_SEGMENTS = 4096
+
+_CACHEABLE_FLAGS = swe.FLG_SWIEPH | swe.FLG_MOSEPH | swe.FLG_JPLEPH | swe.FLG_SPEED
+_EPOCH = 2451545.0
+_ARCSEC = 1.0 / 3600.0
+
+
+class _Segment(NamedTuple):
+    mid: float                      # centre JD
+    inv_half: float                 # 1 / half-span (days⁻¹)
+    coeffs: Tuple[Tuple[float, ...], ...]  # monomial coefficients: lon, lat, dist
+    deriv: Tuple[Tuple[float, ...], ...]   # d/dx of the above
+    retflags: int
+
+
+def _chebyshev_to_monomial(c: Sequence[float]) -> Tuple[float, ...]:
+    """Σ c_k T_k(x) as ascending power-series coefficients."""
+    n = len(c)
+    out = [0.0] * n
+    t_prev, t_cur = [1.0] + [0.0] * n, [0.0, 1.0] + [0.0] * (n - 1)  # T_0, T_1
+    for k, ck in enumerate(c):
+        if k >= 2:
+            # T_k = 2x·T_{k-1} − T_{k-2}
+            t_next = [0.0] + [2.0 * a for a in t_cur[:-1]]
+            t_prev, t_cur = t_cur, [a - b for a, b in zip(t_next, t_prev)]
+        t_k = t_prev if k == 0 else t_cur
+        for i in range(n):
+            out[i] += ck * t_k[i]
+    return tuple(out)
+
+
+def _horner(coeffs: Sequence[float], x: float) -> float:
+    acc = 0.0
+    for a in reversed(coeffs):
+        acc = acc * x + a
+    return acc
+
+
+def _fit(samples: List[Tuple[float, ...]], nodes: List[float]) -> Tuple[Tuple[float, ...], ...]:
+    """Chebyshev interpolation through samples at nodes, per component."""
+    n = len(nodes)
+    out = []
+    for comp in range(3):
+        values = [s[comp] for s in samples]
+        cheb = []
+        for k in range(n):
+            acc = sum(v * math.cos(k * math.acos(x)) for v, x in zip(values, nodes))
+            cheb.append(acc * (1.0 if k == 0 else 2.0) / n)
+        out.append(_chebyshev_to_monomial(cheb))
+    return tuple(out)
+
+
+class PositionCache:
+    """LRU cache of Chebyshev segments answering ``swe.calc_ut`` queries.
+
+    Args:
+        tolerance_arcsec: Maximum accepted interpolation error (longitude,
+            latitude, and distance expressed as an angle at unit distance).
+        max_segments: LRU capacity across all bodies.
+        degree: Polynomial degree of the first fit (a rejected fit is
+            retried once at twice the degree).
+    """
+
+    def __init__(
+        self,
+        tolerance_arcsec: float = DEFAULT_TOLERANCE_ARCSEC,
+        max_segments: int = MAX_SEGMENTS,
+        degree: int = DEFAULT_DEGREE,
+    ) -> None:
+        if tolerance_arcsec <= 0:
+            raise ValueError("tolerance_arcsec must be positive")
+        self.tolerance_arcsec = tolerance_arcsec
+        self.max_segments = max_segments
+        self.degree = degree
+        self._segments: OrderedDict[Tuple[int, int, int], Optional[_Segment]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.exact_only = 0
+
+    # ── public API ──────────────────────────────────────────────────────────
+
+    def calc_ut(self, jd_ut: float, planet_id: int, flags: int) -> Tuple[Tuple[float, ...], int]:
+        """Drop-in for ``swe.calc_ut`` (result tuple, return flags)."""
+        if flags & ~_CACHEABLE_FLAGS or planet_id in UNCACHED_BODIES:
+            return self._exact(jd_ut, planet_id, flags)
+        span = SEGMENT_DAYS.get(planet_id, DEFAULT_SEGMENT_DAYS)
+        index = math.floor((jd_ut - _EPOCH) / span)
+        key = (planet_id, flags, index)
+        with self._lock:
+            found = key in self._segments
+            seg = self._segments.get(key)
+            if found:
+                self._segments.move_to_end(key)
+                self.hits += 1
+        if not found:
+            seg = self._build(planet_id, flags, _EPOCH + index * span, span)
+            with self._lock:
+                self.misses += 1
+                if seg is None:
+                    self.exact_only += 1
+                self._segments[key] = seg
+                while len(self._segments) > self.max_segments:
+                    self._segments.popitem(last=False)
+        timing.count("ephemeris_cache.hit" if found else "ephemeris_cache.miss")
+        if seg is None:
+            return self._exact(jd_ut, planet_id, flags)
+        return self._evaluate(seg, jd_ut, flags), seg.retflags
+
+    def info(self) -> Dict[str, float]:
+        """Counters for monitoring (hits, misses, exact_only, size)."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "exact_only": self.exact_only,
+                "size": len(self._segments),
+                "tolerance_arcsec": self.tolerance_arcsec,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._segments.clear()
+            self.hits = self.misses = self.exact_only = 0
+
+    # ── internals ───────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _exact(jd_ut: float, planet_id: int, flags: int) -> Tuple[Tuple[float, ...], int]:
+        result, ret = timing.timed("swe.calc_ut", swe.calc_ut)(jd_ut, planet_id, flags)
+        assert_no_moseph_fallback(flags, ret)
+        return result, ret
+
+    @staticmethod
+    def _evaluate(seg: _Segment, jd_ut: float, flags: int) -> Tuple[float, ...]:
+        x = (jd_ut - seg.mid) * seg.inv_half
+        lon_c, lat_c, dist_c = seg.coeffs
+        lon = _horner(lon_c, x) % 360.0
+        lat = _horner(lat_c, x)
+        dist = _horner(dist_c, x)
+        if not flags & swe.FLG_SPEED:
+            return (lon, lat, dist, 0.0, 0.0, 0.0)
+        dlon_c, dlat_c, ddist_c = seg.deriv
+        k = seg.inv_half
+        return (
+            lon, lat, dist,
+            _horner(dlon_c, x) * k, _horner(dlat_c, x) * k, _horner(ddist_c, x) * k,
+        )
+
+    def _build(self, planet_id: int, flags: int, start: float, span: float) -> Optional[_Segment]:
+        half = span / 2.0
+        mid = start + half
+        tol = self.tolerance_arcsec * _ARCSEC
+        # The samples never need speeds; they come from the derivative.
+        sample_flags = flags & ~swe.FLG_SPEED
+        for degree in (self.degree, 2 * self.degree):
+            n = degree + 1
+            nodes = [math.cos(math.pi * (j + 0.5) / n) for j in range(n)]
+            samples = []
+            for x in nodes:
+                sample, ret = self._sample(mid + x * half, planet_id, sample_flags)
+                samples.append(sample)
+            _unwrap(samples)
+            coeffs = _fit(samples, nodes)
+            # Validate midway between neighbouring nodes (plus the ends).
+            checks = [1.0, -1.0] + [
+                math.cos(math.pi * (j + 1.0) / n) for j in range(n - 1)
+            ]
+            ok = True
+            for x in checks:
+                exact, _ = self._sample(mid + x * half, planet_id, sample_flags)
+                lon = _horner(coeffs[0], x)
+                err_lon = abs((lon - exact[0] + 180.0) % 360.0 - 180.0)
+                err_lat = abs(_horner(coeffs[1], x) - exact[1])
+                err_dist = math.degrees(abs(_horner(coeffs[2], x) - exact[2]) / max(exact[2], 1e-9))
+                if max(err_lon, err_lat, err_dist) > tol:
+                    ok = False
+                    break
+            if ok:
+                deriv = tuple(
+                    tuple((i + 1) * a for i, a in enumerate(c[1:])) or (0.0,) for c in coeffs
+                )
+                return _Segment(mid, 1.0 / half, coeffs, deriv, ret | (flags & swe.FLG_SPEED))
+        return None
+
+    @staticmethod
+    def _sample(jd: float, planet_id: int, flags: int) -> Tuple[Tuple[float, ...], int]:
+        result, ret = timing.timed("swe.calc_ut", swe.calc_ut)(jd, planet_id, flags)
+        assert_no_moseph_fallback(flags, ret)
+        return result[:3], ret
+
+
+def _unwrap(samples: List[Tuple[float, ...]]) -> None:
+    """Make longitudes continuous across 0°/360° (in place)."""
+    prev = samples[0][0]
+    for i in range(1, len(samples)):
+        lon = samples[i][0]
+        lon = prev + (lon - prev + 180.0) % 360.0 - 180.0
+        samples[i] = (lon,) + tuple(samples[i][1:])
+        prev = lon
+
+
+_shared: Optional[PositionCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_position_cache() -> PositionCache:
+    """Process-wide cache; tolerance from EPHEMERIS_CACHE_TOLERANCE_ARCSEC."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            tol = float(os.environ.get("EPHEMERIS_CACHE_TOLERANCE_ARCSEC", DEFAULT_TOLERANCE_ARCSEC))
+            _shared = PositionCache(tolerance_arcsec=tol)
+        return _shared
@@ -0,0 +1,230 @@
+"""
+ephemeris_skyfield.py — EphemerisBackend on Skyfield and a JPL DE4xx SPK kernel.
+
+Optional: needs the ``skyfield`` extra (``pip install bazi_engine[skyfield]``,
+which brings numpy and jplephem). Nothing here is imported unless the backend
+is requested, so the core engine keeps working without it.
+
+The kernel is opened through jplephem, which memory-maps the SPK file: only
+the Chebyshev segments that are actually evaluated are paged in, and several
+worker processes share the same pages. The backend never downloads anything;
+the kernel is looked up (first match wins) at
+
+    1. the ``kernel_path`` argument,
+    2. SKYFIELD_KERNEL (a file path),
+    3. de440s.bsp / de440.bsp / de421.bsp in the Swiss Ephemeris directory
+       (``ephe_path`` / SE_EPHE_PATH / ~/.cache/bazi_engine/swisseph).
+
+Every position method has a ``*_many`` form that takes an array of JD(UT)
+values and evaluates them in one Skyfield call; ``solcross_ut_many`` runs the
+root search for all targets side by side (secant steps from a mean-motion
+guess, with a bracketing scan as safety net), so a batch costs five Skyfield
+calls regardless of its size. Sun longitudes are apparent geocentric, ecliptic and equinox of
+date, matching SwissEphBackend.sun_lon_deg_ut.
+
+make_backend("skyfield") hands out one shared SkyfieldBackend per kernel file
+(``skyfield_backend``): opening the kernel and building the timescale costs
+far more than a chart, so requests must not repeat it.
+
+Per-call cost is the other way round: one Skyfield evaluation carries ~2 ms
+of numpy set-up, so single charts stay faster on Swiss Ephemeris; the batch
+methods win from a few thousand instants up (scripts/bench_ephemeris_backends.py).
+
+Delta-T comes from Skyfield's built-in table, which differs from Swiss
+Ephemeris' model by well under a second for 1900-2100.
+"""
+from __future__ import annotations
+
+import math
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional, Sequence, Tuple
+
+from . import timing
+from .ephemeris import _resolve_ephe_path
+from .exc import EphemerisUnavailableError, NotSupportedError
+
+KERNEL_CANDIDATES: Tuple[str, ...] = ("de440s.bsp", "de440.bsp", "de421.bsp")
+
+# Mean solar motion (deg/day) for the first guess. The equation of centre is
+# below 2°, so the guess lands within ~4 days of the crossing.
+_MEAN_MOTION = 0.9856473598
+_SECANT_STEPS = 2
+_CONVERGED_DEG = 1e-5     # |residual| after the last step (~1 s of motion)
+_REFINE_STEPS = 4         # regula falsi steps on a 1-day bracket (fallback)
+
+
+def _import_skyfield() -> Tuple[Any, Any, Any, Any, Any]:
+    try:
+        import numpy as np
+        from skyfield.api import Loader, load_file
+        from skyfield.framelib import ecliptic_frame
+        from skyfield.nutationlib import iau2000b_radians
+    except ImportError as exc:
+        raise NotSupportedError(
+            "The skyfield ephemeris backend needs the optional dependency: "
+            "pip install 'bazi_engine[skyfield]'",
+            detail={"missing_module": getattr(exc, "name", None) or "skyfield"},
+        ) from exc
+    return np, Loader, load_file, ecliptic_frame, iau2000b_radians
+
+
+def resolve_kernel_path(kernel_path: Optional[str] = None, ephe_path: Optional[str] = None) -> Path:
+    """Locate the SPK kernel (see module docstring for the search order).
+
+    Raises:
+        EphemerisUnavailableError: if no kernel file exists.
+    """
+    if kernel_path:
+        candidates = [Path(kernel_path)]
+    elif os.environ.get("SKYFIELD_KERNEL"):
+        candidates = [Path(os.environ["SKYFIELD_KERNEL"])]
+    else:
+        root = _resolve_ephe_path(ephe_path)
+        candidates = [root / name for name in KERNEL_CANDIDATES]
+    for path in candidates:
+        if path.is_file():
+            return path
+    raise EphemerisUnavailableError(
+        "JPL SPK kernel not found. Provide one via SKYFIELD_KERNEL or place "
+        f"one of {list(KERNEL_CANDIDATES)} in the ephemeris directory.",
+        detail={"searched": [str(p) for p in candidates]},
+    )
+
+
+def skyfield_backend(kernel_path: Optional[str] = None, ephe_path: Optional[str] = None) -> "SkyfieldBackend":
+    """Shared SkyfieldBackend for the kernel that *kernel_path*/*ephe_path* resolve to.
+
+    The lookup runs on every call (so SKYFIELD_KERNEL changes take effect),
+    the backend itself is built once per resolved kernel file.
+
+    Raises:
+        NotSupportedError: skyfield is not installed.
+        EphemerisUnavailableError: no kernel file exists.
+    """
+    _import_skyfield()
+    return _backend_for_kernel(str(resolve_kernel_path(kernel_path, ephe_path).resolve()))
+
+
+@lru_cache(maxsize=8)
+def _backend_for_kernel(kernel_path: str) -> "SkyfieldBackend":
+    return SkyfieldBackend(kernel_path=kernel_path)
+
+
+class SkyfieldBackend:
+    """EphemerisBackend backed by a memory-mapped JPL kernel."""
+
+    def __init__(self, kernel_path: Optional[str] = None, ephe_path: Optional[str] = None) -> None:
+        np, Loader, load_file, ecliptic_frame, iau2000b_radians = _import_skyfield()
+        self.kernel_path = resolve_kernel_path(kernel_path, ephe_path)
+        self._np = np
+        self._frame = ecliptic_frame
+        self._nutation = iau2000b_radians
+        # builtin=True: bundled leap-second and delta-T tables, no downloads.
+        self._ts = Loader(str(self.kernel_path.parent), verbose=False).timescale(builtin=True)
+        self._kernel = load_file(str(self.kernel_path))
+        self._earth = self._kernel["earth"]
+        self._sun = self._kernel["sun"]
+        self.ephemeris_id = f"skyfield_{self.kernel_path.stem}"
+
+    # ── scalar EphemerisBackend protocol ─────────────────────────────────────
+
+    def delta_t_seconds(self, jd_ut: float) -> float:
+        return float(self._ts.ut1_jd(jd_ut).delta_t)
+
+    def jd_tt_from_jd_ut(self, jd_ut: float) -> float:
+        return float(self._ts.ut1_jd(jd_ut).tt)
+
+    def sun_lon_deg_ut(self, jd_ut: float) -> float:
+        return float(self.sun_lon_deg_ut_many([jd_ut])[0])
+
+    def solcross_ut(self, target_lon_deg: float, jd_start_ut: float) -> Optional[float]:
+        result = self.solcross_ut_many([target_lon_deg], [jd_start_ut])[0]
+        return None if math.isnan(result) else float(result)
+
+    # ── vectorized ───────────────────────────────────────────────────────────
+
+    def delta_t_seconds_many(self, jds_ut: Sequence[float]) -> Any:
+        return self._np.asarray(self._ts.ut1_jd(self._np.asarray(jds_ut, dtype=float)).delta_t, dtype=float)
+
+    def sun_lon_deg_ut_many(self, jds_ut: Any) -> Any:
+        """Apparent geocentric ecliptic longitude of date (deg) for an array of JD(UT)."""
+        np = self._np
+        jds = np.asarray(jds_ut, dtype=float)
+        flat = jds.reshape(-1)
+        timing.count("skyfield.sun_positions", int(flat.size))
+        t = self._ts.ut1_jd(flat)
+        # IAU 2000B nutation (Skyfield's documented low-cost override): within
+        # 1 mas of 2000A and ~4x cheaper, which dominates large batches.
+        t._nutation_angles_radians = self._nutation(t)
+        _lat, lon, _dist = self._earth.at(t).observe(self._sun).apparent().frame_latlon(self._frame)
+        return np.mod(np.asarray(lon.degrees, dtype=float), 360.0).reshape(jds.shape)
+
+    def solcross_ut_many(self, targets_deg: Sequence[float], jds_start_ut: Sequence[float]) -> Any:
+        """First JD(UT) >= start at which the Sun reaches each target longitude.
+
+        Rows whose crossing cannot be bracketed come back as NaN.
+        """
+        np = self._np
+        targets = np.mod(np.asarray(targets_deg, dtype=float), 360.0)
+        starts = np.asarray(jds_start_ut, dtype=float)
+        n = targets.shape[0]
+        result = np.full(n, np.nan)
+        if n == 0:
+            return result
+
+        lon0 = self.sun_lon_deg_ut_many(starts)
+        exact = lon0 == targets
+        result[exact] = starts[exact]
+
+        # Secant iteration from the mean-motion guess. f is smooth and
+        # monotonic within days of the crossing, and the guess is at most
+        # ~2 days off, so three evaluations reach well below a millisecond.
+        x0 = starts + np.mod(targets - lon0, 360.0) / _MEAN_MOTION
+        f0 = self._diff(x0, targets)
+        x1 = x0 - f0 / _MEAN_MOTION
+        f1 = self._diff(x1, targets)
+        for _ in range(_SECANT_STEPS):
+            denom = np.where(f1 == f0, 1.0, f1 - f0)
+            x2 = np.where(f1 == f0, x1, x1 - f1 * (x1 - x0) / denom)
+            x0, f0 = x1, f1
+            x1, f1 = x2, self._diff(x2, targets)
+        result[:] = x1 - f1 / _MEAN_MOTION
+        result[exact] = starts[exact]
+
+        # Safety net: rows that did not converge (or landed before their
+        # start) are bracketed by a one-year daily scan and refined by
+        # regula falsi; rows that cannot be bracketed stay NaN.
+        lost = np.nonzero(~exact & ((np.abs(f1) > _CONVERGED_DEG) | (result < starts)))[0]
+        if lost.size:
+            result[lost] = self._scan_and_refine(targets[lost], starts[lost])
+        return result
+
+    def _diff(self, jds: Any, targets: Any) -> Any:
+        """wrap180(sun_lon(jds) - targets), elementwise."""
+        np = self._np
+        return np.mod(self.sun_lon_deg_ut_many(jds) - targets + 180.0, 360.0) - 180.0
+
+    def _scan_and_refine(self, targets: Any, starts: Any) -> Any:
+        np = self._np
+        grid = starts[:, None] + np.arange(0.0, 371.0, 1.0)[None, :]
+        found, x0, x1, f0, f1 = self._bracket(grid, targets)
+        for _ in range(_REFINE_STEPS):
+            x = x0 - f0 * (x1 - x0) / np.where(found, f1 - f0, 1.0)
+            f = self._diff(x, targets)
+            below = f < 0.0
+            x0, f0 = np.where(below, x, x0), np.where(below, f, f0)
+            x1, f1 = np.where(below, x1, x), np.where(below, f1, f)
+        out = x0 - f0 * (x1 - x0) / np.where(found, f1 - f0, 1.0)
+        return np.where(found, out, np.nan)
+
+    def _bracket(self, grid: Any, targets: Any) -> Tuple[Any, Any, Any, Any, Any]:
+        """Per grid row: (found, x_lo, x_hi, f_lo, f_hi) of the first upward crossing."""
+        np = self._np
+        f = self._diff(grid, targets[:, None])
+        # f[i] < 0 <= f[i+1], excluding the ±180° wrap where f jumps by ~360°.
+        up = (f[:, :-1] < 0.0) & (f[:, 1:] >= 0.0) & ((f[:, 1:] - f[:, :-1]) < 90.0)
+        i = np.argmax(up, axis=1)
+        k = np.arange(grid.shape[0])
+        return up.any(axis=1), grid[k, i], grid[k, i + 1], f[k, i], f[k, i + 1]
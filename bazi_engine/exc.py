@@ -6,7 +6,10 @@ and machine-readable error codes. All other modules raise these instead of
 bare RuntimeError/ValueError so that app.py can map them correctly.
 
 HTTP status conventions:
+  404 NotFoundError          — referenced resource (e.g. a stored chart) does not exist
+  409 ConflictError          — the resource is in a state that forbids the request
   422 InputError             — caller sent bad data (DST gap, invalid coords, …)
+  429 TooManyRequestsError   — a server-side capacity limit is reached (e.g. job queue full)
   501 NotSupportedError      — feature is not yet implemented
   503 EphemerisUnavailableError — ephemeris files missing / service dependency down
   500 CalculationError       — internal numerical failure (should never reach users)
@@ -54,6 +57,33 @@ class InputError(BaziEngineError):
     error_code = "input_error"
 
 
+class NotFoundError(BaziEngineError):
+    """A referenced resource does not exist.
+
+    Examples: unknown chart_id in the chart store.
+    """
+    http_status = 404
+    error_code = "not_found"
+
+
+class ConflictError(BaziEngineError):
+    """The request conflicts with the current state of the resource.
+
+    Examples: deleting a job while a worker is running it.
+    """
+    http_status = 409
+    error_code = "conflict"
+
+
+class TooManyRequestsError(BaziEngineError):
+    """A server-side capacity limit is reached; the caller should retry later.
+
+    Examples: the background job queue is full.
+    """
+    http_status = 429
+    error_code = "too_many_requests"
+
+
 class EphemerisUnavailableError(BaziEngineError):
     """Swiss Ephemeris data files are missing or inaccessible.
 
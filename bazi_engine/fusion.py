@@ -34,6 +34,7 @@ from .wuxing import (                                        # noqa: F401
     interpret_harmony,
 )
 from .wuxing.calibration import calibrate_harmony
+from . import timing
 # ─────────────────────────────────────────────────────────────────────────────
 
 
@@ -98,10 +99,12 @@ def compute_fusion_analysis(
         Dict with wu_xing_vectors, harmony_index, calibration,
         elemental_comparison, cosmic_state, and fusion_interpretation.
     """
+    laps = timing.laps("fusion")
     western_wuxing, western_ledger = calculate_wuxing_vector_from_planets_with_ledger(
         western_bodies, ascendant=ascendant,
     )
     bazi_wuxing, bazi_ledger = calculate_wuxing_from_bazi_with_ledger(bazi_pillars)
+    laps.lap("wuxing")
     harmony = calculate_harmony_index(western_wuxing, bazi_wuxing)
 
     # Calibrate H relative to empirical baseline for this input density
@@ -123,6 +126,7 @@ def compute_fusion_analysis(
         "n_west": cal.n_west,
         "n_bazi_contributions": cal.n_bazi_contributions,
     }
+    laps.lap("harmony")
 
     western_norm = western_wuxing.normalize()
     bazi_norm = bazi_wuxing.normalize()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+import math
+from typing import List, Sequence, Tuple
 
 from .ephemeris import EphemerisBackend, norm360, wrap180
 from .exc import CalculationError
@@ -71,20 +72,40 @@ def find_crossing(
         detail={"target_lon_deg": target_lon_deg, "jd_start_ut": jd_start_ut},
     )
 
+def find_crossings(
+    backend: EphemerisBackend,
+    targets_deg: Sequence[float],
+    jds_start_ut: Sequence[float],
+    *,
+    accuracy_seconds: float,
+    max_span_days: float = 40.0,
+) -> List[float]:
+    """find_crossing for many (target, start) pairs.
+
+    Backends with ``solcross_ut_many`` answer all pairs in one batch (one
+    vectorized root search on Skyfield); rows the batch leaves as NaN, and
+    backends without it, go through find_crossing one by one.
+    """
+    many = getattr(backend, "solcross_ut_many", None)
+    found = list(many(targets_deg, jds_start_ut)) if many is not None else [math.nan] * len(targets_deg)
+    return [
+        float(jd) if not math.isnan(jd) else find_crossing(
+            backend, target, start, accuracy_seconds=accuracy_seconds, max_span_days=max_span_days,
+        )
+        for target, start, jd in zip(targets_deg, jds_start_ut, found)
+    ]
+
 def compute_month_boundaries_from_lichun(
     backend: EphemerisBackend,
     jd_lichun_ut: float,
     *,
     accuracy_seconds: float,
 ) -> List[float]:
-    bounds: List[float] = [jd_lichun_ut]
-    jd_cursor = jd_lichun_ut + 1e-6
-    for k in range(1, 13):
-        target = norm360(315.0 + 30.0 * k)
-        jd_next = find_crossing(backend, target, jd_cursor, accuracy_seconds=accuracy_seconds)
-        bounds.append(jd_next)
-        jd_cursor = jd_next + 1e-6
-    return bounds
+    # The twelve jie are crossed in order, so searching each one from just
+    # after Lichun finds the same instants as chaining from the previous one.
+    targets = [norm360(315.0 + 30.0 * k) for k in range(1, 13)]
+    starts = [jd_lichun_ut + 1e-6] * len(targets)
+    return [jd_lichun_ut] + find_crossings(backend, targets, starts, accuracy_seconds=accuracy_seconds)
 
 def compute_24_solar_terms_for_window(
     backend: EphemerisBackend,
@@ -93,10 +114,12 @@ def compute_24_solar_terms_for_window(
     *,
     accuracy_seconds: float,
 ) -> List[Tuple[int, float]]:
-    out: List[Tuple[int, float]] = []
-    for idx, target in enumerate(SOLAR_TERM_TARGETS_DEG):
-        jd = find_crossing(backend, target, jd_start_ut, accuracy_seconds=accuracy_seconds, max_span_days=30.0)
-        if jd_start_ut <= jd <= jd_end_ut:
-            out.append((idx, jd))
+    crossings = find_crossings(
+        backend, SOLAR_TERM_TARGETS_DEG, [jd_start_ut] * len(SOLAR_TERM_TARGETS_DEG),
+        accuracy_seconds=accuracy_seconds, max_span_days=30.0,
+    )
+    out: List[Tuple[int, float]] = [
+        (idx, jd) for idx, jd in enumerate(crossings) if jd_start_ut <= jd <= jd_end_ut
+    ]
     out.sort(key=lambda x: x[1])
     return out
@@ -35,6 +35,18 @@ _TEMPLATES = {
             "Der Mond verst\u00e4rkt die Sensibilit\u00e4t in deinem $sign-Bereich."
         ),
     },
+    "lunar_phase": {
+        "headline": "$description",
+        "body": (
+            "Der Mond steht dabei in deinem Sektor $sector ($sign). "
+            "$personal_context. "
+            "Mondphasen markieren die Wendepunkte im monatlichen Rhythmus."
+        ),
+        "advice": (
+            "Richte deine Aufmerksamkeit heute auf dein $sign-Feld: "
+            "was dort beginnt, reift oder sich abschlie\u00dft."
+        ),
+    },
     "dominance_shift": {
         "headline": "Dein Schwerpunkt verschiebt sich",
         "body": (
@@ -102,6 +114,7 @@ def generate_narrative(transit_state: Dict[str, Any]) -> Dict[str, Any]:
         "sign": sign_de,
         "sector": sector,
         "personal_context": personal_context,
+        "description": primary.get("description_de", ""),
     }
 
     headline = string.Template(template["headline"]).safe_substitute(fmt)
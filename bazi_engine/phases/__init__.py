@@ -11,19 +11,43 @@ und vollständig unabhängig vom individuellen Elementarprofil.
 from .jieqi_phase import (
     JieqiPhase,
     classify_jieqi_phase,
+    classify_jieqi_indices,
+    jieqi_phase_from_index,
     JIEQI_PHASES,
 )
+from .solar_model import (
+    solar_longitude,
+    solar_longitude_at,
+    solar_longitude_many,
+)
 from .lunar_phase import (
     LunarPhase,
     classify_lunar_phase,
+    classify_lunar_indices,
+    lunar_phase_from_index,
     LUNAR_PHASES,
 )
+from .moon_table import (
+    MoonEvent,
+    moon_sun_angle_at,
+    moon_events_between,
+)
 
 __all__ = [
     "JieqiPhase",
     "classify_jieqi_phase",
+    "classify_jieqi_indices",
+    "jieqi_phase_from_index",
     "JIEQI_PHASES",
+    "solar_longitude",
+    "solar_longitude_at",
+    "solar_longitude_many",
     "LunarPhase",
     "classify_lunar_phase",
+    "classify_lunar_indices",
+    "lunar_phase_from_index",
     "LUNAR_PHASES",
+    "MoonEvent",
+    "moon_sun_angle_at",
+    "moon_events_between",
 ]
@@ -11,17 +11,22 @@ Fusion-Analyse:
   • Vollständig external: unabhängig vom individuellen Chart
 
 WICHTIG: Diese Phase-Klassifikation setzt eine bekannte Sonnenlänge voraus.
-Ohne Ephemeris-Berechnung wird die Sonnenlänge aus dem Datum approximiert
-(Spencer-Formel, ±1°). Für Forschungszwecke ist Swiss Ephemeris zu bevorzugen.
+Ohne Ephemeris-Berechnung wird die Sonnenlänge aus dem Datum mit dem
+analytischen Sonnenmodell (phases.solar_model, ±8″ für 1900–2100) berechnet;
+nur Zeitpunkte wenige Minuten vor/nach einem Jieqi können dabei in die
+Nachbarphase fallen.
 
 Periodennummern: 0–23, beginnend bei Lichun (315°, ~3. Februar).
 Die Ordnung folgt der BaZi-Jahresgrenze (Holz = Frühling = Jahresanfang).
 """
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from .solar_model import solar_longitude_at
 
 # ── Jieqi-Definitionen ────────────────────────────────────────────────────────
 # Format: (Startlänge °, Name_zh_pinyin, Name_de, Wu-Xing-Qualität)
@@ -56,8 +61,13 @@ JIEQI_PHASES: list[tuple[float, str, str, str]] = [
 
 _N = len(JIEQI_PHASES)  # 24
 
+# "Holz_Yang" → ("Holz", "Yang"), einmalig statt bei jedem Property-Zugriff
+_QUALITY_PARTS: dict[str, tuple[str, str]] = {
+    q: (q.split("_")[0], q.split("_")[1]) for _, _, _, q in JIEQI_PHASES
+}
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class JieqiPhase:
     """Klassifikationsergebnis: Jieqi-Phase für einen Zeitpunkt."""
     index:           int     # 0–23
@@ -71,12 +81,12 @@ class JieqiPhase:
     @property
     def element(self) -> str:
         """Nur das Element (ohne Yin/Yang)."""
-        return self.wuxing_quality.split("_")[0]
+        return _QUALITY_PARTS[self.wuxing_quality][0]
 
     @property
     def polarity(self) -> str:
         """Yang oder Yin."""
-        return self.wuxing_quality.split("_")[1]
+        return _QUALITY_PARTS[self.wuxing_quality][1]
 
     @property
     def is_yang(self) -> bool:
@@ -84,26 +94,15 @@ class JieqiPhase:
 
 
 def _approximate_solar_longitude(dt: datetime) -> float:
-    """Approximiert die Sonnenlänge aus dem Datum (Spencer-Formel, ±1°).
+    """Sonnenlänge aus dem Datum über das analytische Sonnenmodell (±8″).
 
-    Für Produktionsnutzung Swiss Ephemeris verwenden.
-    Für Forschung/Test ist diese Approximation ausreichend.
+    Naive Datetimes gelten als UTC. Für Produktionsnutzung (exakte
+    Jieqi-Grenzen) Swiss Ephemeris verwenden.
 
     Returns:
         Sonnenlänge in Grad [0, 360).
     """
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    dt_utc = dt.astimezone(timezone.utc)
-
-    # Day of year (1–366)
-    day_of_year = dt_utc.timetuple().tm_yday
-
-    # Spencer-Formel für Sonnenlänge (vereinfacht)
-    # Referenz: vernal equinox ≈ 21. März = Tag 80
-    # Sonnenlänge = (day_of_year - 80) / 365.25 * 360
-    raw = (day_of_year - 80) / 365.25 * 360.0
-    return raw % 360.0
+    return solar_longitude_at(dt)
 
 
 def classify_jieqi_phase(
@@ -137,17 +136,46 @@ def classify_jieqi_phase(
     offset = (solar_longitude - 315.0) % 360.0  # 0–360, relativ zu Lichun
 
     phase_idx = int(offset / 15.0) % _N
-    start_lon = JIEQI_PHASES[phase_idx][0]
     position = (offset % 15.0) / 15.0  # 0.0–1.0
 
-    _, name_py, name_de, quality = JIEQI_PHASES[phase_idx]
+    return jieqi_phase_from_index(phase_idx, solar_longitude, position)
+
+
+def jieqi_phase_from_index(index: int, solar_longitude: float, position: float) -> JieqiPhase:
+    """Baut das JieqiPhase-Objekt aus einem (Batch-)Klassifikationsergebnis.
 
+    Liefert dasselbe Objekt wie ``classify_jieqi_phase(solar_longitude)``,
+    wenn index/position aus ``classify_jieqi_indices`` stammen.
+    """
+    start_lon, name_py, name_de, quality = JIEQI_PHASES[index]
     return JieqiPhase(
-        index=phase_idx,
+        index=index,
         start_longitude=start_lon,
         name_pinyin=name_py,
         name_de=name_de,
         wuxing_quality=quality,
-        solar_longitude=round(solar_longitude, 4),
+        solar_longitude=round(solar_longitude % 360.0, 4),
         position_in_phase=round(position, 4),
     )
+
+
+def classify_jieqi_indices(solar_longitudes: Iterable[float]) -> tuple[Any, Any]:
+    """Batch-Klassifikation: (Phasenindizes 0–23, Positionen 0.0–1.0).
+
+    Gleiche Arithmetik wie ``classify_jieqi_phase``, aber ohne ein Objekt
+    pro Zeitpunkt. Für Listen/Iterables ``array('b')`` und ``array('d')``;
+    numpy-Eingaben liefern numpy-Arrays (int8/float64) gleicher Form.
+    Die Positionen sind ungerundet.
+    """
+    if type(solar_longitudes).__module__ == "numpy":
+        import numpy as np
+        offset = np.mod(np.mod(np.asarray(solar_longitudes, dtype=float), 360.0) - 315.0, 360.0)
+        idx = (np.floor(offset / 15.0).astype(np.int64) % _N).astype(np.int8)
+        return idx, np.mod(offset, 15.0) / 15.0
+    indices = array("b")
+    positions = array("d")
+    for lon in solar_longitudes:
+        offset = (lon % 360.0 - 315.0) % 360.0
+        indices.append(int(offset / 15.0) % _N)
+        positions.append((offset % 15.0) / 15.0)
+    return indices, positions
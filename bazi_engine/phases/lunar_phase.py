@@ -15,15 +15,19 @@ Die Mondphase ist astronomisch präzise und realweltlich beobachtbar.
 Sie hat eine Periode von ~29.5 Tagen und ist vollständig extern —
 unabhängig vom individuellen Chart.
 
-HINWEIS: Ohne Ephemeris-Daten wird der Mond-Sonne-Winkel approximiert.
-Approximationsgenauigkeit: ±3–5° (~6–10 Stunden). Für Forschungszwecke
-mit Mondphasen-Granularität ist Swiss Ephemeris zu bevorzugen.
+HINWEIS: Ohne bekannten Winkel wird der Mond-Sonne-Winkel für 1800–2200 aus
+der vorberechneten Mondphasen-Tabelle (phases.moon_table) bestimmt —
+Phasenzuordnung exakt, Winkel innerhalb der Phase auf < 1° genau. Außerhalb
+dieses Zeitraums greift die lineare Näherung (±5°, ~10 Stunden).
 """
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Iterable, Optional
+
+from .moon_table import moon_sun_angle_at
 
 # ── Mondphasen-Definitionen ───────────────────────────────────────────────────
 # Format: (Startwinkel °, Name_de, Energie-Qualität)
@@ -42,7 +46,7 @@ LUNAR_PHASES: list[tuple[float, str, str]] = [
 _N = len(LUNAR_PHASES)  # 8
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LunarPhase:
     """Klassifikationsergebnis: Mondphase für einen Zeitpunkt."""
     index:               int    # 0–7
@@ -70,17 +74,21 @@ class LunarPhase:
 
 
 def _approximate_moon_sun_angle(dt: datetime) -> float:
-    """Approximiert den Mond-Sonne-Winkel (Elongation) aus dem Datum.
+    """Mond-Sonne-Winkel (Elongation) aus dem Datum.
 
-    Methode: Lineare Näherung basierend auf einem bekannten Neumond-Referenzpunkt.
+    1800–2200: aus der Mondphasen-Tabelle. Sonst lineare Näherung
+    basierend auf einem bekannten Neumond-Referenzpunkt.
     Referenz: 2024-01-11 11:57 UTC (Neumond)
     Mondperiode: 29.530589 Tage
 
-    Genauigkeit: ±5° (±10 Stunden). Ausreichend für Phasenzuordnung,
-    aber nicht für präzise astronomische Berechnungen.
+    Genauigkeit der Näherung: ±5° (±10 Stunden). Ausreichend für
+    Phasenzuordnung, aber nicht für präzise astronomische Berechnungen.
     """
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
+    angle = moon_sun_angle_at(dt)
+    if angle is not None:
+        return angle
     dt_utc = dt.astimezone(timezone.utc)
 
     # Referenz-Neumond: 2024-01-11T11:57:00 UTC
@@ -118,13 +126,37 @@ def classify_lunar_phase(
     phase_idx = int(moon_sun_angle / 45.0) % _N
     position = (moon_sun_angle % 45.0) / 45.0
 
-    start_angle, name_de, energy = LUNAR_PHASES[phase_idx]
+    return lunar_phase_from_index(phase_idx, moon_sun_angle, position)
+
 
+def lunar_phase_from_index(index: int, moon_sun_angle: float, position: float) -> LunarPhase:
+    """Baut das LunarPhase-Objekt aus einem (Batch-)Klassifikationsergebnis."""
+    start_angle, name_de, energy = LUNAR_PHASES[index]
     return LunarPhase(
-        index=phase_idx,
+        index=index,
         start_angle=start_angle,
         name_de=name_de,
         energy_quality=energy,
-        moon_sun_angle=round(moon_sun_angle, 4),
+        moon_sun_angle=round(moon_sun_angle % 360.0, 4),
         position_in_phase=round(position, 4),
     )
+
+
+def classify_lunar_indices(moon_sun_angles: Iterable[float]) -> tuple[Any, Any]:
+    """Batch-Klassifikation: (Phasenindizes 0–7, Positionen 0.0–1.0).
+
+    Für Listen/Iterables ``array('b')`` und ``array('d')``; numpy-Eingaben
+    liefern numpy-Arrays (int8/float64) gleicher Form. Positionen ungerundet.
+    """
+    if type(moon_sun_angles).__module__ == "numpy":
+        import numpy as np
+        angle = np.mod(np.asarray(moon_sun_angles, dtype=float), 360.0)
+        idx = (np.floor(angle / 45.0).astype(np.int64) % _N).astype(np.int8)
+        return idx, np.mod(angle, 45.0) / 45.0
+    indices = array("b")
+    positions = array("d")
+    for angle in moon_sun_angles:
+        angle = angle % 360.0
+        indices.append(int(angle / 45.0) % _N)
+        positions.append((angle % 45.0) / 45.0)
+    return indices, positions
@@ -0,0 +1,254 @@
+"""
+phases/moon_table.py — Vorberechnete Mondphasen-Ereignisse 1800–2200.
+
+Die Tabelle enthält für jede Lunation die exakten Zeitpunkte (JD, UT), zu
+denen die Elongation Mond − Sonne ein Vielfaches von 45° erreicht — also den
+Beginn jeder der 8 Mondphasen aus ``lunar_phase.LUNAR_PHASES``. Die geraden
+Indizes sind die Hauptphasen: 0 = Neumond, 2 = Erstes Viertel,
+4 = Vollmond, 6 = Letztes Viertel.
+
+Die Zeitpunkte werden einmalig mit Swiss Ephemeris bestimmt
+(``build_moon_event_table`` bzw. ``scripts/build_moon_table.py``) und als
+kompakte Binärdatei ``moon_events.bin`` mit dem Paket ausgeliefert. Zur
+Laufzeit sind keine Ephemeris-Aufrufe nötig: ein ``bisect`` über die
+sortierten Zeitpunkte liefert die laufende Phase, die Elongation wird
+innerhalb des 45°-Segments linear interpoliert (exakt an den Grenzen,
+Phasenzuordnung damit exakt).
+
+Dateiformat (little-endian):
+  Header  ``<8sHBxidddI`` — Magic, Version, Ephemeris-Modus
+          (0 = SWIEPH, 1 = MOSEPH), k0, Referenz-JD, Schrittweite (Tage),
+          Einheit der Abweichungen (Sekunden), Anzahl.
+  Daten   ``int16`` je Ereignis: Abweichung vom mittleren Zeitpunkt
+          ``ref + k·step`` (k = k0 + n) in Einheiten von ``unit`` Sekunden.
+          Der Phasenindex des Ereignisses ist ``k mod 8``.
+"""
+from __future__ import annotations
+
+import math
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+TABLE_PATH = Path(__file__).with_name("moon_events.bin")
+
+_MAGIC = b"BZMOONEV"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHBxidddI")
+_MODES = ("SWIEPH", "MOSEPH")
+
+# Mittlerer Neumond k = 0 (Meeus, Kap. 49) und mittlere Dauer einer Achtel-Lunation
+_REF_JD = 2451550.09766
+_SYNODIC_MONTH = 29.530588861
+_STEP = _SYNODIC_MONTH / 8.0
+_UNIT_S = 3.0  # int16 × 3 s deckt ±27 h (real: ±19.5 h) bei ±1.5 s Rundung
+
+#: Abgedeckter Zeitraum der ausgelieferten Tabelle (JD UT, 1800-01-01 bis 2200-01-01)
+DEFAULT_START_JD = 2378496.5
+DEFAULT_END_JD = 2524593.5
+
+PRINCIPAL_PHASES: tuple[int, ...] = (0, 2, 4, 6)
+
+_JD_UNIX_EPOCH = 2440587.5
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _jd_from_datetime(dt: datetime) -> float:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return _JD_UNIX_EPOCH + (dt - _EPOCH).total_seconds() / 86400.0
+
+
+@dataclass(frozen=True, slots=True)
+class MoonEvent:
+    """Beginn einer Mondphase: Elongation = 45° · phase_index."""
+    phase_index: int   # 0–7, Index in LUNAR_PHASES
+    jd_ut:       float
+
+    @property
+    def elongation(self) -> float:
+        return 45.0 * self.phase_index
+
+    @property
+    def is_principal(self) -> bool:
+        """Neumond, Viertel oder Vollmond."""
+        return self.phase_index % 2 == 0
+
+    @property
+    def datetime_utc(self) -> datetime:
+        return _EPOCH + timedelta(days=self.jd_ut - _JD_UNIX_EPOCH)
+
+
+class MoonEventTable:
+    """Sortierte Mondphasen-Ereignisse mit bisect-Lookup."""
+
+    __slots__ = ("k0", "jd", "mode")
+
+    def __init__(self, k0: int, jd: array, mode: str) -> None:
+        self.k0 = k0
+        self.jd = jd
+        self.mode = mode
+
+    def __len__(self) -> int:
+        return len(self.jd)
+
+    @property
+    def start_jd(self) -> float:
+        return self.jd[0]
+
+    @property
+    def end_jd(self) -> float:
+        return self.jd[-1]
+
+    def covers(self, jd_ut: float) -> bool:
+        return self.jd[0] <= jd_ut < self.jd[-1]
+
+    def event(self, i: int) -> MoonEvent:
+        return MoonEvent(phase_index=(self.k0 + i) % 8, jd_ut=self.jd[i])
+
+    def moon_sun_angle(self, jd_ut: float) -> Optional[float]:
+        """Elongation [0, 360°) zum Zeitpunkt; None außerhalb der Tabelle."""
+        i = bisect_right(self.jd, jd_ut) - 1
+        if i < 0 or i + 1 >= len(self.jd):
+            return None
+        t0 = self.jd[i]
+        frac = (jd_ut - t0) / (self.jd[i + 1] - t0)
+        return (45.0 * ((self.k0 + i) % 8 + frac)) % 360.0
+
+    def events_between(
+        self,
+        start_jd: float,
+        end_jd: float,
+        phases: Iterable[int] = PRINCIPAL_PHASES,
+    ) -> list[MoonEvent]:
+        """Ereignisse mit start_jd ≤ JD < end_jd, gefiltert nach Phasenindex."""
+        wanted = frozenset(phases)
+        lo = bisect_right(self.jd, start_jd - 1e-9)
+        hi = bisect_right(self.jd, end_jd - 1e-9)
+        return [ev for ev in map(self.event, range(lo, hi)) if ev.phase_index in wanted]
+
+    def next_event(self, jd_ut: float, phases: Iterable[int] = PRINCIPAL_PHASES) -> Optional[MoonEvent]:
+        """Erstes Ereignis nach jd_ut (exklusiv); None am Tabellenende."""
+        wanted = frozenset(phases)
+        for i in range(bisect_right(self.jd, jd_ut), len(self.jd)):
+            if (self.k0 + i) % 8 in wanted:
+                return self.event(i)
+        return None
+
+
+# ── Binärformat ──────────────────────────────────────────────────────────────
+
+def encode_table(k0: int, jds: Sequence[float], mode: str = "SWIEPH") -> bytes:
+    """Kodiert Ereignis-Zeitpunkte (k0, k0+1, …) ins Binärformat."""
+    devs = array("h")
+    for n, jd in enumerate(jds):
+        dev = round((jd - (_REF_JD + (k0 + n) * _STEP)) * 86400.0 / _UNIT_S)
+        if not -32768 <= dev <= 32767:
+            raise ValueError(f"Abweichung außerhalb int16 bei k={k0 + n}: {dev}")
+        devs.append(dev)
+    if sys.byteorder == "big":  # pragma: no cover - Format ist little-endian
+        devs.byteswap()
+    header = _HEADER.pack(_MAGIC, _VERSION, _MODES.index(mode), k0, _REF_JD, _STEP, _UNIT_S, len(devs))
+    return header + devs.tobytes()
+
+
+def decode_table(data: bytes) -> MoonEventTable:
+    """Gegenstück zu ``encode_table``."""
+    magic, version, mode, k0, ref, step, unit, count = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Keine Mondphasen-Tabelle (Magic/Version unbekannt)")
+    devs = array("h")
+    devs.frombytes(data[_HEADER.size:_HEADER.size + 2 * count])
+    if len(devs) != count:
+        raise ValueError("Mondphasen-Tabelle ist abgeschnitten")
+    if sys.byteorder == "big":  # pragma: no cover
+        devs.byteswap()
+    scale = unit / 86400.0
+    jd = array("d", (ref + (k0 + n) * step + d * scale for n, d in enumerate(devs)))
+    return MoonEventTable(k0=k0, jd=jd, mode=_MODES[mode])
+
+
+@lru_cache(maxsize=4)
+def load_moon_event_table(path: Optional[str] = None) -> MoonEventTable:
+    """Lädt (einmalig) die ausgelieferte oder eine eigene Tabelle."""
+    return decode_table(Path(path or TABLE_PATH).read_bytes())
+
+
+def moon_sun_angle_at(dt: datetime) -> Optional[float]:
+    """Elongation [0, 360°) aus der Tabelle (naiv = UTC); None außerhalb 1800–2200."""
+    return load_moon_event_table().moon_sun_angle(_jd_from_datetime(dt))
+
+
+def moon_sun_angles_at(dts: Sequence[datetime]) -> list[Optional[float]]:
+    """``moon_sun_angle_at`` für viele Zeitpunkte (eine Tabelle, ein bisect je Wert)."""
+    table = load_moon_event_table()
+    return [table.moon_sun_angle(_jd_from_datetime(dt)) for dt in dts]
+
+
+def moon_events_between(
+    start: datetime,
+    end: datetime,
+    phases: Iterable[int] = PRINCIPAL_PHASES,
+) -> list[MoonEvent]:
+    """Mondphasen-Ereignisse mit start ≤ t < end (Standard: nur Hauptphasen)."""
+    return load_moon_event_table().events_between(
+        _jd_from_datetime(start), _jd_from_datetime(end), phases,
+    )
+
+
+# ── Erzeugung (einmalig, mit Swiss Ephemeris) ────────────────────────────────
+
+def build_moon_event_table(
+    start_jd: float = DEFAULT_START_JD,
+    end_jd: float = DEFAULT_END_JD,
+    ephe_path: Optional[str] = None,
+) -> tuple[int, array, str]:
+    """Bestimmt alle 45°-Elongationsdurchgänge in [start_jd, end_jd].
+
+    Newton-Iteration auf Elongation = λ_Mond − λ_Sonne (scheinbar,
+    geozentrisch) ab dem mittleren Zeitpunkt, Konvergenz < 0.01 s.
+
+    Returns:
+        (k0, Zeitpunkte als array('d'), Ephemeris-Modus) — Eingabe für
+        ``encode_table``.
+    """
+    import swisseph as swe
+
+    from ..ephemeris import SwissEphBackend, assert_no_moseph_fallback
+
+    backend = SwissEphBackend(ephe_path=ephe_path)
+    flags = backend.flags | swe.FLG_SPEED
+
+    def elongation(jd: float) -> tuple[float, float]:
+        moon, ret = swe.calc_ut(jd, swe.MOON, flags)
+        assert_no_moseph_fallback(flags, ret)
+        sun, ret = swe.calc_ut(jd, swe.SUN, flags)
+        assert_no_moseph_fallback(flags, ret)
+        return moon[0] - sun[0], moon[3] - sun[3]
+
+    k_first = math.ceil((start_jd - _REF_JD) / _STEP) - 2
+    k_last = math.floor((end_jd - _REF_JD) / _STEP) + 2
+    k0: Optional[int] = None
+    jds = array("d")
+    for k in range(k_first, k_last + 1):
+        target = 45.0 * (k % 8)
+        jd = _REF_JD + k * _STEP
+        for _ in range(20):
+            elong, rate = elongation(jd)
+            step = ((elong - target + 180.0) % 360.0 - 180.0) / rate
+            jd -= step
+            if abs(step) < 1e-7:
+                break
+        if start_jd <= jd <= end_jd:
+            if k0 is None:
+                k0 = k
+            jds.append(jd)
+    if k0 is None:
+        raise ValueError("Leerer Zeitraum")
+    return k0, jds, backend.mode
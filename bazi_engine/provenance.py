@@ -117,17 +117,18 @@ def build_provenance(
     ruleset_id: str = "traditional_bazi_2026",
     house_system: str = "placidus",
     zodiac_mode: str = "tropical",
+    ephemeris_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Build a provenance dict for inclusion in API responses.
 
     Parameters can be overridden per-endpoint when the request specifies
-    a non-default house system or zodiac mode.
+    a non-default house system, zodiac mode or ephemeris backend.
     """
     prov = Provenance(
         engine_version=__version__,
         parameter_set_id=parameter_set_id,
         ruleset_id=ruleset_id,
-        ephemeris_id=_EPHEMERIS_ID,
+        ephemeris_id=ephemeris_id or _EPHEMERIS_ID,
         tzdb_version_id=_detect_tzdb_version(),
         house_system=house_system,
         zodiac_mode=zodiac_mode,
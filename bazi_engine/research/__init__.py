@@ -18,6 +18,7 @@ from .pattern_analysis import (
     phase_zone_frequencies,
     detect_pipeline_bias,
     BiasReport,
+    PhaseStatsAggregator,
 )
 
 __all__ = [
@@ -29,4 +30,5 @@ __all__ = [
     "phase_zone_frequencies",
     "detect_pipeline_bias",
     "BiasReport",
+    "PhaseStatsAggregator",
 ]
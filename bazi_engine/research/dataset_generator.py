@@ -9,13 +9,21 @@ Wichtig: Die generierten Daten sind synthetisch (zufällige Stämme/Zweige/
 Planetenpositionen). Sie dienen ausschließlich der Validierung, ob das
 Pipeline-System überhaupt stabile Muster erzeugen KANN — nicht zur
 Beschreibung realer astrologischer Muster.
+
+Speicher: Charts halten ihre Daten kompakt — Pfeiler als Pfeiler-Codes
+(``PillarSet``), Planeten spaltenweise (``BodyTable``), Element-Features
+als ``ElementMap`` —, lesen sich aber wie die ursprünglichen Dicts.
 """
 from __future__ import annotations
 
 import random
+from array import array
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from ..types import BodyTable
 from ..wuxing.constants import WUXING_ORDER
+from ..wuxing.pillar_table import PILLAR_NAMES, PillarSet, pillar_code
+from ..wuxing.vector import ElementMap
 from ..wuxing.analysis import (
     calculate_wuxing_vector_from_planets,
     calculate_wuxing_from_bazi,
@@ -23,8 +31,10 @@ from ..wuxing.analysis import (
 )
 from ..wuxing.zones import classify_zones
 from ..wuxing.calibration import calibrate_harmony, CalibrationResult
-from ..phases.jieqi_phase import classify_jieqi_phase, JieqiPhase
-from ..phases.lunar_phase import classify_lunar_phase, LunarPhase
+from ..phases.jieqi_phase import classify_jieqi_indices, jieqi_phase_from_index, JieqiPhase
+from ..phases.lunar_phase import classify_lunar_indices, lunar_phase_from_index, LunarPhase
+from ..phases.moon_table import moon_sun_angles_at
+from ..phases.solar_model import solar_longitudes_at
 
 # ── Domänenkonstanten ─────────────────────────────────────────────────────────
 
@@ -32,16 +42,22 @@ _STEMS = ["Jia","Yi","Bing","Ding","Wu","Ji","Geng","Xin","Ren","Gui"]
 _BRANCHES = ["Zi","Chou","Yin","Mao","Chen","Si","Wu","Wei","Shen","You","Xu","Hai"]
 _PLANETS = ["Sun","Moon","Mercury","Venus","Mars","Jupiter","Saturn",
             "Uranus","Neptune","Pluto","Chiron"]
+_BODY_KEYS = ("longitude", "is_retrograde")
+# Validierter Bereich des analytischen Sonnenmodells
+_DATE_RANGE = (
+    datetime(1900, 1, 1, tzinfo=timezone.utc),
+    datetime(2100, 1, 1, tzinfo=timezone.utc),
+)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SyntheticBirthChart:
     """Ein einzelner synthetischer Geburts-Datensatz mit allen Features."""
 
     # Eingabedaten
     birth_dt:         datetime
-    bazi_pillars:     dict
-    western_bodies:   dict
+    bazi_pillars:     PillarSet
+    western_bodies:   BodyTable
     solar_longitude:  float   # Sonnenlänge [0, 360°) — für Jieqi
     moon_sun_angle:   float   # Mond-Sonne-Winkel [0, 360°) — für Mondphase
 
@@ -49,18 +65,19 @@ class SyntheticBirthChart:
     h_raw:            float
     h_calibrated:     float
     calibration:      CalibrationResult
-    western_vector:   dict   # normiert
-    bazi_vector:      dict   # normiert
-    diffs:            dict   # d_i pro Element
-    resonance:        dict   # r_i = west_i * bazi_i (Resonanzachse)
+    western_vector:   ElementMap   # normiert
+    bazi_vector:      ElementMap   # normiert
+    diffs:            ElementMap   # d_i pro Element
+    resonance:        ElementMap   # r_i = west_i * bazi_i (Resonanzachse)
     dominant_west:    str    # Element mit max west_i
     dominant_bazi:    str    # Element mit max bazi_i
     resonance_axis:   str    # Element mit max r_i
-    zones:            dict   # ZoneResult.zones
+    zones:            ElementMap   # ZoneResult.zones
 
-    # Externe Phasen
-    jieqi:            JieqiPhase
-    lunar:            LunarPhase
+    # Externe Phasen als Integer-Codes (JIEQI_PHASES / LUNAR_PHASES-Index);
+    # die Dataclasses entstehen erst bei Zugriff auf .jieqi / .lunar
+    jieqi_index:      int
+    lunar_index:      int
 
     # Abgeleitete Indikatoren
     n_tension:        int    # Anzahl Tension-Elemente
@@ -68,28 +85,37 @@ class SyntheticBirthChart:
     n_development:    int    # Anzahl Development-Elemente
     quality:          str    # "ok" | "sparse" | "degenerate"
 
+    @property
+    def jieqi(self) -> JieqiPhase:
+        position = ((self.solar_longitude % 360.0 - 315.0) % 360.0 % 15.0) / 15.0
+        return jieqi_phase_from_index(self.jieqi_index, self.solar_longitude, position)
 
-def _random_pillars(rng: random.Random) -> dict:
-    """Zufällige Vier Pfeiler."""
-    return {
-        p: {"stem": rng.choice(_STEMS), "branch": rng.choice(_BRANCHES)}
-        for p in ("year", "month", "day", "hour")
-    }
+    @property
+    def lunar(self) -> LunarPhase:
+        position = (self.moon_sun_angle % 360.0 % 45.0) / 45.0
+        return lunar_phase_from_index(self.lunar_index, self.moon_sun_angle, position)
+
+
+def _random_pillars(rng: random.Random) -> PillarSet:
+    """Zufällige Vier Pfeiler (Stamm, dann Zweig je Pfeiler)."""
+    return PillarSet([
+        pillar_code(rng.randrange(len(_STEMS)), rng.randrange(len(_BRANCHES)))
+        for _ in PILLAR_NAMES
+    ])
 
 
-def _random_bodies(rng: random.Random, n_planets: int = 7) -> dict:
+def _random_bodies(rng: random.Random, n_planets: int = 7) -> BodyTable:
     """Zufällige Planetenpositionen."""
     planets = rng.sample(_PLANETS, min(n_planets, len(_PLANETS)))
-    return {
-        pl: {
-            "longitude": rng.uniform(0.0, 360.0),
-            "is_retrograde": rng.random() < 0.18,  # ~18% retrograd (empirisch)
-        }
-        for pl in planets
-    }
+    longitudes = array("d")
+    retrograde = []
+    for _ in planets:
+        longitudes.append(rng.uniform(0.0, 360.0))
+        retrograde.append(rng.random() < 0.18)  # ~18% retrograd (empirisch)
+    return BodyTable(planets, _BODY_KEYS, [longitudes, tuple(retrograde)])
 
 
-def _compute_chart(pillars: dict, bodies: dict) -> dict:
+def _compute_chart(pillars: PillarSet, bodies: BodyTable) -> dict:
     """Berechnet alle Fusion-Features für ein Chart."""
     v_west = calculate_wuxing_vector_from_planets(bodies)
     v_bazi = calculate_wuxing_from_bazi(pillars)
@@ -101,8 +127,8 @@ def _compute_chart(pillars: dict, bodies: dict) -> dict:
 
     west_d = w_norm.to_dict()
     bazi_d = b_norm.to_dict()
-    diffs = {e: round(west_d[e] - bazi_d[e], 6) for e in WUXING_ORDER}
-    resonance = {e: round(west_d[e] * bazi_d[e], 6) for e in WUXING_ORDER}
+    diffs = ElementMap([round(west_d[e] - bazi_d[e], 6) for e in WUXING_ORDER])
+    resonance = ElementMap([round(west_d[e] * bazi_d[e], 6) for e in WUXING_ORDER])
 
     dominant_west = max(west_d, key=lambda k: west_d[k])
     dominant_bazi = max(bazi_d, key=lambda k: bazi_d[k])
@@ -115,14 +141,14 @@ def _compute_chart(pillars: dict, bodies: dict) -> dict:
         "h_raw": h_raw,
         "h_calibrated": cal.h_calibrated,
         "calibration": cal,
-        "western_vector": west_d,
-        "bazi_vector": bazi_d,
+        "western_vector": ElementMap(w_norm.to_list()),
+        "bazi_vector": ElementMap(b_norm.to_list()),
         "diffs": diffs,
         "resonance": resonance,
         "dominant_west": dominant_west,
         "dominant_bazi": dominant_bazi,
         "resonance_axis": resonance_axis,
-        "zones": zone_result.zones,
+        "zones": ElementMap.from_mapping(zone_result.zones),
         "n_tension": len(zone_result.tension_elements()),
         "n_strength": len(zone_result.strength_elements()),
         "n_development": len(zone_result.development_elements()),
@@ -135,6 +161,7 @@ def generate_synthetic_dataset(
     seed: int = 42,
     n_planets: int = 7,
     stratify_by_jieqi: bool = True,
+    solar_from_dates: bool = False,
 ) -> list[SyntheticBirthChart]:
     """Erzeugt einen synthetischen Datensatz.
 
@@ -145,6 +172,13 @@ def generate_synthetic_dataset(
         stratify_by_jieqi:  Falls True, werden n_total/24 Charts pro
                             Jieqi-Phase erzeugt (balanced sampling).
                             Falls False, rein zufällig.
+        solar_from_dates:   Falls True, werden Geburtszeitpunkte gleichverteilt
+                            in 1900–2100 gezogen und die Sonnenlänge daraus
+                            mit dem analytischen Sonnenmodell berechnet
+                            (realistische Jieqi-Verteilung, ohne
+                            Ephemeris-Aufrufe); der Mond-Sonne-Winkel kommt
+                            dann aus der Mondphasen-Tabelle statt aus dem
+                            Zufallsgenerator. Ersetzt stratify_by_jieqi.
 
     Returns:
         Liste von SyntheticBirthChart-Objekten.
@@ -152,7 +186,12 @@ def generate_synthetic_dataset(
     rng = random.Random(seed)
     charts: list[SyntheticBirthChart] = []
 
-    if stratify_by_jieqi:
+    birth_dts: list[datetime] = []
+    if solar_from_dates:
+        span_s = (_DATE_RANGE[1] - _DATE_RANGE[0]).total_seconds()
+        birth_dts = [_DATE_RANGE[0] + timedelta(seconds=rng.uniform(0.0, span_s)) for _ in range(n_total)]
+        solar_lons = list(solar_longitudes_at(birth_dts))
+    elif stratify_by_jieqi:
         per_phase = max(1, n_total // 24)
         solar_lons = [
             (phase_idx * 15.0 + rng.uniform(0.0, 15.0)) % 360.0
@@ -169,16 +208,28 @@ def generate_synthetic_dataset(
     # Referenzdatum: 2000-01-01 (irrelevant für statische Approximation)
     base_dt = datetime(2000, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
 
-    for i, solar_lon in enumerate(solar_lons):
+    inputs = []
+    for _ in solar_lons:
         pillars = _random_pillars(rng)
         bodies  = _random_bodies(rng, n_planets)
         moon_angle = rng.uniform(0.0, 360.0)  # zufällig, unabhängig von Sonne
+        inputs.append((pillars, bodies, moon_angle))
+
+    if birth_dts:
+        # Zufallswinkel wurden trotzdem gezogen, damit Pfeiler/Planeten
+        # denselben Zufallsstrom behalten.
+        real_angles = moon_sun_angles_at(birth_dts)
+        inputs = [
+            (p, b, drawn if real is None else real)
+            for (p, b, drawn), real in zip(inputs, real_angles)
+        ]
 
-        features = _compute_chart(pillars, bodies)
+    jieqi_idx, _ = classify_jieqi_indices(solar_lons)
+    lunar_idx, _ = classify_lunar_indices(moon for _, _, moon in inputs)
 
-        birth_dt = base_dt + timedelta(days=i)
-        jieqi = classify_jieqi_phase(solar_longitude=solar_lon)
-        lunar = classify_lunar_phase(moon_sun_angle=moon_angle)
+    for i, (solar_lon, (pillars, bodies, moon_angle)) in enumerate(zip(solar_lons, inputs)):
+        features = _compute_chart(pillars, bodies)
+        birth_dt = birth_dts[i] if birth_dts else base_dt + timedelta(days=i)
 
         charts.append(SyntheticBirthChart(
             birth_dt=birth_dt,
@@ -186,8 +237,8 @@ def generate_synthetic_dataset(
             western_bodies=bodies,
             solar_longitude=solar_lon,
             moon_sun_angle=moon_angle,
-            jieqi=jieqi,
-            lunar=lunar,
+            jieqi_index=jieqi_idx[i],
+            lunar_index=lunar_idx[i],
             **features,
         ))
 
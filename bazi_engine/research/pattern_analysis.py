@@ -12,6 +12,14 @@ METHODISCHE SICHERHEITSMASSNAHMEN:
   5. Minimum-n pro Gruppe (n_min=10) als Validitätsschwelle
   6. Separater Permutationstest für Validierung
 
+EINPASS-AGGREGATION:
+  ``PhaseStatsAggregator`` sammelt alle deskriptiven Feature-Statistiken je
+  Phase, die Zonenfrequenzen und die Bias-Zähler in einem Durchlauf über
+  beliebig viele Chart-Blöcke (Welford + Quantil-Skizze statt Listen und
+  Sortieren); Teilergebnisse aus mehreren Prozessen werden mit ``merge``
+  zusammengeführt. ``analyse_feature_by_phase``, ``phase_zone_frequencies``
+  und ``detect_pipeline_bias`` sind dünne Hüllen darum.
+
 INTERPRETATIONSREGELN:
   • p < 0.05 nach Bonferroni + η² ≥ 0.01 (kleiner Effekt): möglicherweise real
   • p < 0.01 nach Bonferroni + η² ≥ 0.06 (mittlerer Effekt): wahrscheinlich real
@@ -21,10 +29,20 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterable, Optional, Sequence
 
+from ..phases.jieqi_phase import JIEQI_PHASES
+from ..phases.lunar_phase import LUNAR_PHASES
 from ..wuxing.constants import WUXING_ORDER
 from .dataset_generator import SyntheticBirthChart
+from .streaming_stats import DEFAULT_SKETCH_K, QuantileSketch, RunningMoments
+
+# phase_attr → (Index-Feld am Chart, Phasenname pro Index). Gruppiert wird
+# auf den Integer-Codes; Namen werden erst für das Ergebnis aufgelöst.
+_PHASE_CODES: dict[str, tuple[str, tuple[str, ...]]] = {
+    "jieqi": ("jieqi_index", tuple(p[1] for p in JIEQI_PHASES)),
+    "lunar": ("lunar_index", tuple(p[1] for p in LUNAR_PHASES)),
+}
 
 # ── Typen ─────────────────────────────────────────────────────────────────────
 
@@ -95,23 +113,6 @@ def _mean(values: list[float]) -> float:
     return sum(values) / len(values) if values else 0.0
 
 
-def _std(values: list[float]) -> float:
-    if len(values) < 2:
-        return 0.0
-    m = _mean(values)
-    return math.sqrt(sum((x - m) ** 2 for x in values) / (len(values) - 1))
-
-
-def _percentile(sorted_vals: list[float], p: float) -> float:
-    """p in [0, 1]."""
-    if not sorted_vals:
-        return 0.0
-    idx = p * (len(sorted_vals) - 1)
-    lo = int(idx)
-    hi = min(lo + 1, len(sorted_vals) - 1)
-    return sorted_vals[lo] + (idx - lo) * (sorted_vals[hi] - sorted_vals[lo])
-
-
 def _chi2_p_value(h: float, df: int) -> float:
     """Approximierter p-Wert aus χ²-Verteilung (für Kruskal-Wallis).
     Nutzung der regularisierten unvollständigen Gamma-Funktion.
@@ -156,23 +157,258 @@ def _rank_all(groups: list[list[float]]) -> list[list[float]]:
     return group_ranks
 
 
-# ── Kernfunktionen ────────────────────────────────────────────────────────────
+def _phase_code_field(phase_attr: str) -> tuple[str, tuple[str, ...]]:
+    try:
+        return _PHASE_CODES[phase_attr]
+    except KeyError:
+        raise ValueError(
+            f"Unbekanntes phase_attr {phase_attr!r}; erlaubt: {sorted(_PHASE_CODES)}"
+        ) from None
 
-def _group_stats(name: str, values: list[float]) -> PhaseGroupStats:
-    s = sorted(values)
-    return PhaseGroupStats(
-        phase_name=name,
-        n=len(s),
-        mean=round(_mean(s), 5),
-        std=round(_std(s), 5),
-        median=round(_percentile(s, 0.5), 5),
-        q25=round(_percentile(s, 0.25), 5),
-        q75=round(_percentile(s, 0.75), 5),
-    )
 
+def _group_by_phase(
+    charts: list[SyntheticBirthChart],
+    phase_attr: str,
+    feature: str,
+    element: Optional[str],
+) -> dict[str, list[float]]:
+    """Feature-Werte je Phase (nicht-degenerierte Charts), nach Phasenname."""
+    code_field, names = _phase_code_field(phase_attr)
+    groups: dict[int, list[float]] = {}
+    for chart in charts:
+        if chart.quality == "degenerate":
+            continue
+        val = _get_val(chart, feature, element)
+        if val is None:
+            continue
+        code = getattr(chart, code_field)
+        bucket = groups.get(code)
+        if bucket is None:
+            groups[code] = bucket = []
+        bucket.append(val)
+    return {names[code]: vals for code, vals in groups.items()}
+
+
+# ── Einpass-Aggregation ───────────────────────────────────────────────────────
+
+FeatureKey = tuple[str, Optional[str]]
+
+#: Alle Features mit deskriptiver Statistik: (feature, element).
+ALL_FEATURES: tuple[FeatureKey, ...] = (
+    ("h_raw", None),
+    ("h_calibrated", None),
+    ("n_tension", None),
+    *(("diff", e) for e in WUXING_ORDER),
+    *(("resonance", e) for e in WUXING_ORDER),
+)
+
+
+class FeatureAccumulator:
+    """Mittelwert/Streuung (Welford) und Quantile (Skizze) eines Features."""
+
+    __slots__ = ("moments", "sketch")
+
+    def __init__(self, sketch_k: int = DEFAULT_SKETCH_K) -> None:
+        self.moments = RunningMoments()
+        self.sketch = QuantileSketch(sketch_k)
+
+    def add(self, x: float) -> None:
+        self.moments.add(x)
+        self.sketch.add(x)
+
+    def merge(self, other: FeatureAccumulator) -> None:
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+
+    def group_stats(self, name: str) -> PhaseGroupStats:
+        q = self.sketch.quantile
+        return PhaseGroupStats(
+            phase_name=name,
+            n=self.moments.n,
+            mean=round(self.moments.mean, 5),
+            std=round(self.moments.std, 5),
+            median=round(q(0.5), 5),
+            q25=round(q(0.25), 5),
+            q75=round(q(0.75), 5),
+        )
+
+
+class PhaseStatsAggregator:
+    """Alle Phasen-Statistiken eines Datensatzes in einem Durchlauf.
+
+    Charts werden blockweise mit ``update`` aufgenommen; Aggregatoren aus
+    anderen Prozessen (gleiches phase_attr, gleiche Features) werden mit
+    ``merge`` addiert. Die Quantile sind exakt, solange eine Gruppe höchstens
+    ``sketch_k`` Werte hat.
+
+    Args:
+        phase_attr: "jieqi" oder "lunar".
+        features:   Zu aggregierende (feature, element)-Paare; Standard alle.
+        sketch_k:   Kapazität der Quantil-Skizzen.
+    """
+
+    __slots__ = ("phase_attr", "features", "sketch_k", "_code_field", "_names",
+                 "_stats", "_tension", "_phase_counts",
+                 "n", "n_degenerate", "n_sparse", "n_h_zero", "n_h_one", "n_extreme")
+
+    def __init__(
+        self,
+        phase_attr: str = "jieqi",
+        features: Sequence[FeatureKey] = ALL_FEATURES,
+        sketch_k: int = DEFAULT_SKETCH_K,
+    ) -> None:
+        self.phase_attr = phase_attr
+        self._code_field, self._names = _phase_code_field(phase_attr)
+        self.features = tuple(features)
+        self.sketch_k = sketch_k
+        # Phasencode → Akkumulator je Feature (Reihenfolge wie self.features)
+        self._stats: dict[int, list[FeatureAccumulator]] = {}
+        # Phasencode → [n, TENSION-Zähler pro Element] (nicht-degeneriert)
+        self._tension: dict[int, list[int]] = {}
+        # Phasencode → Anzahl aller Charts
+        self._phase_counts: dict[int, int] = {}
+        self.n = 0
+        self.n_degenerate = 0
+        self.n_sparse = 0
+        self.n_h_zero = 0
+        self.n_h_one = 0
+        self.n_extreme = 0
+
+    def add(self, chart: SyntheticBirthChart) -> None:
+        code = getattr(chart, self._code_field)
+        self.n += 1
+        self._phase_counts[code] = self._phase_counts.get(code, 0) + 1
+        if chart.h_raw == 0.0:
+            self.n_h_zero += 1
+        elif chart.h_raw >= 0.9999:
+            self.n_h_one += 1
+        if any(abs(v) > 0.45 for v in chart.diffs.values()):
+            self.n_extreme += 1
+        if chart.quality == "sparse":
+            self.n_sparse += 1
+        elif chart.quality == "degenerate":
+            self.n_degenerate += 1
+            return
+
+        counts = self._tension.get(code)
+        if counts is None:
+            self._tension[code] = counts = [0] * (len(WUXING_ORDER) + 1)
+        counts[0] += 1
+        zones = chart.zones
+        for i, elem in enumerate(WUXING_ORDER, 1):
+            if zones[elem] == "TENSION":
+                counts[i] += 1
+
+        accs = self._stats.get(code)
+        for i, (feature, element) in enumerate(self.features):
+            val = _get_val(chart, feature, element)
+            if val is None:
+                continue
+            if accs is None:
+                self._stats[code] = accs = [FeatureAccumulator(self.sketch_k) for _ in self.features]
+            accs[i].add(val)
+
+    def update(self, charts: Iterable[SyntheticBirthChart]) -> PhaseStatsAggregator:
+        """Nimmt einen Block von Charts auf (gibt self zurück)."""
+        for chart in charts:
+            self.add(chart)
+        return self
+
+    def merge(self, other: PhaseStatsAggregator) -> PhaseStatsAggregator:
+        """Addiert ein Teilergebnis (z. B. aus einem anderen Prozess)."""
+        if (other.phase_attr, other.features, other.sketch_k) != (self.phase_attr, self.features, self.sketch_k):
+            raise ValueError("Aggregatoren mit unterschiedlicher Konfiguration")
+        for code, accs in other._stats.items():
+            mine = self._stats.get(code)
+            if mine is None:
+                self._stats[code] = mine = [FeatureAccumulator(self.sketch_k) for _ in self.features]
+            for a, b in zip(mine, accs):
+                a.merge(b)
+        for code, counts in other._tension.items():
+            if code in self._tension:
+                self._tension[code] = [a + b for a, b in zip(self._tension[code], counts)]
+            else:
+                self._tension[code] = list(counts)
+        for code, n in other._phase_counts.items():
+            self._phase_counts[code] = self._phase_counts.get(code, 0) + n
+        self.n += other.n
+        self.n_degenerate += other.n_degenerate
+        self.n_sparse += other.n_sparse
+        self.n_h_zero += other.n_h_zero
+        self.n_h_one += other.n_h_one
+        self.n_extreme += other.n_extreme
+        return self
+
+    def feature_stats(self, feature: str, element: Optional[str] = None) -> dict[str, PhaseGroupStats]:
+        """phase_name → PhaseGroupStats eines aggregierten Features."""
+        try:
+            i = self.features.index((feature, element))
+        except ValueError:
+            raise ValueError(f"Feature {(feature, element)!r} wurde nicht aggregiert") from None
+        return {
+            self._names[code]: accs[i].group_stats(self._names[code])
+            for code, accs in self._stats.items()
+            if accs[i].moments.n
+        }
+
+    def zone_frequencies(self) -> dict[str, dict[str, float]]:
+        """phase_name → {element → TENSION-Rate (0–1)}."""
+        return {
+            self._names[code]: {
+                elem: round(counts[i] / counts[0], 4)
+                for i, elem in enumerate(WUXING_ORDER, 1)
+            }
+            for code, counts in self._tension.items()
+        }
+
+    def bias_report(self) -> BiasReport:
+        """Pipeline-Bias-Bericht aus den Zählern (siehe detect_pipeline_bias)."""
+        n = self.n
+        if n == 0:
+            return BiasReport(0, 0, 0, 0, 0, 0, 0)
+
+        n_deg = self.n_degenerate / n
+        n_sparse = self.n_sparse / n
+        h_zero = self.n_h_zero / n
+        h_one = self.n_h_one / n
+        extreme = self.n_extreme / n
+
+        # Phase-Balance
+        if self._phase_counts:
+            max_n = max(self._phase_counts.values())
+            min_n = max(1, min(self._phase_counts.values()))
+            imbalance = max_n / min_n
+        else:
+            imbalance = 0.0
+
+        warnings = []
+        if n_deg > 0.05:
+            warnings.append(f"KRITISCH: {n_deg*100:.1f}% Nullvektoren (degenerate)")
+        if imbalance > 3.0:
+            warnings.append(f"KRITISCH: Phase-Imbalance {imbalance:.1f}x (max/min)")
+        if h_zero > 0.05:
+            warnings.append(f"WARNUNG: {h_zero*100:.1f}% H=0.0 Artefakte")
+        if n_sparse > 0.20:
+            warnings.append(f"WARNUNG: {n_sparse*100:.1f}% sparse-Qualität")
+        if extreme > 0.10:
+            warnings.append(f"INFO: {extreme*100:.1f}% Charts mit Extrem-d_i > 0.45")
+
+        return BiasReport(
+            n_total=n,
+            n_degenerate=round(n_deg, 4),
+            n_sparse=round(n_sparse, 4),
+            phase_imbalance=round(imbalance, 2),
+            h_raw_at_zero=round(h_zero, 4),
+            h_raw_at_one=round(h_one, 4),
+            extreme_diff_rate=round(extreme, 4),
+            warnings=warnings,
+        )
+
+
+# ── Kernfunktionen ────────────────────────────────────────────────────────────
 
 def analyse_feature_by_phase(
-    charts: list[SyntheticBirthChart],
+    charts: Iterable[SyntheticBirthChart],
     feature: str,
     phase_attr: str = "jieqi",
     element: Optional[str] = None,
@@ -180,7 +416,7 @@ def analyse_feature_by_phase(
     """Berechnet deskriptive Statistiken für ein Feature, gruppiert nach Phase.
 
     Args:
-        charts:      Liste von SyntheticBirthChart.
+        charts:      SyntheticBirthCharts (ein Durchlauf genügt).
         feature:     Feature-Name: "h_raw"|"h_calibrated"|"diff"|"resonance"
         phase_attr:  "jieqi" oder "lunar".
         element:     Für "diff"/"resonance": welches Element (z.B. "Feuer").
@@ -188,31 +424,8 @@ def analyse_feature_by_phase(
     Returns:
         Dict: phase_name → PhaseGroupStats.
     """
-    groups: dict[str, list[float]] = {}
-
-    for chart in charts:
-        if chart.quality == "degenerate":
-            continue
-
-        phase = getattr(chart, phase_attr)
-        phase_name = phase.name_pinyin if phase_attr == "jieqi" else phase.name_de
-
-        if feature == "h_raw":
-            val = chart.h_raw
-        elif feature == "h_calibrated":
-            val = chart.h_calibrated
-        elif feature == "diff" and element:
-            val = chart.diffs[element]
-        elif feature == "resonance" and element:
-            val = chart.resonance[element]
-        elif feature == "n_tension":
-            val = float(chart.n_tension)
-        else:
-            continue
-
-        groups.setdefault(phase_name, []).append(val)
-
-    return {name: _group_stats(name, vals) for name, vals in groups.items()}
+    agg = PhaseStatsAggregator(phase_attr, features=[(feature, element)])
+    return agg.update(charts).feature_stats(feature, element)
 
 
 def kruskal_wallis_test(
@@ -236,30 +449,7 @@ def kruskal_wallis_test(
     Returns:
         KruskalWallisResult mit H-Statistik, p-Wert, Effektstärke.
     """
-    groups_data = analyse_feature_by_phase(charts, feature, phase_attr, element)
-    _group_values = [
-        [c for c in [
-            (getattr(chart, phase_attr).name_pinyin
-             if phase_attr == "jieqi"
-             else getattr(chart, phase_attr).name_de)
-            == name and chart.quality != "degenerate"
-            and (_get_val(chart, feature, element) is not None)
-            for chart in charts
-        ]]
-        for name in groups_data
-    ]
-
-    # Direkter Aufbau der Gruppen
-    phase_groups: dict[str, list[float]] = {}
-    for chart in charts:
-        if chart.quality == "degenerate":
-            continue
-        val = _get_val(chart, feature, element)
-        if val is None:
-            continue
-        phase = getattr(chart, phase_attr)
-        name = phase.name_pinyin if phase_attr == "jieqi" else phase.name_de
-        phase_groups.setdefault(name, []).append(val)
+    phase_groups = _group_by_phase(charts, phase_attr, feature, element)
 
     # Gruppen mit zu wenig Daten ausfiltern
     valid_groups = {k: v for k, v in phase_groups.items() if len(v) >= n_min_per_group}
@@ -321,7 +511,7 @@ def _get_val(chart: SyntheticBirthChart, feature: str, element: Optional[str]) -
 
 
 def phase_zone_frequencies(
-    charts: list[SyntheticBirthChart],
+    charts: Iterable[SyntheticBirthChart],
     phase_attr: str = "jieqi",
 ) -> dict[str, dict[str, float]]:
     """Berechnet Zonenfrequenzen (TENSION/STRENGTH/DEVELOPMENT) pro Phase.
@@ -329,31 +519,11 @@ def phase_zone_frequencies(
     Returns:
         Dict: phase_name → {element → TENSION-Rate (0–1)}
     """
-    phase_tension: dict[str, dict[str, list[int]]] = {}
-
-    for chart in charts:
-        if chart.quality == "degenerate":
-            continue
-        phase = getattr(chart, phase_attr)
-        name = phase.name_pinyin if phase_attr == "jieqi" else phase.name_de
-        if name not in phase_tension:
-            phase_tension[name] = {e: [] for e in WUXING_ORDER}
-        for elem in WUXING_ORDER:
-            phase_tension[name][elem].append(
-                1 if chart.zones[elem] == "TENSION" else 0
-            )
-
-    return {
-        name: {
-            elem: round(sum(vals) / len(vals), 4) if vals else 0.0
-            for elem, vals in elem_data.items()
-        }
-        for name, elem_data in phase_tension.items()
-    }
+    return PhaseStatsAggregator(phase_attr, features=()).update(charts).zone_frequencies()
 
 
 def detect_pipeline_bias(
-    charts: list[SyntheticBirthChart],
+    charts: Iterable[SyntheticBirthChart],
     phase_attr: str = "jieqi",
 ) -> BiasReport:
     """Erkennt systematische Bias-Quellen im generierten Datensatz.
@@ -364,53 +534,4 @@ def detect_pipeline_bias(
       - H-Klemmungsartefakte (H == 0.0 oder H == 1.0)
       - Extreme d_i-Werte (Outlier)
     """
-    n = len(charts)
-    if n == 0:
-        return BiasReport(0, 0, 0, 0, 0, 0, 0)
-
-    n_deg = sum(1 for c in charts if c.quality == "degenerate") / n
-    n_sparse = sum(1 for c in charts if c.quality == "sparse") / n
-    h_zero = sum(1 for c in charts if c.h_raw == 0.0) / n
-    h_one  = sum(1 for c in charts if c.h_raw >= 0.9999) / n
-
-    extreme = sum(
-        1 for c in charts
-        if any(abs(v) > 0.45 for v in c.diffs.values())
-    ) / n
-
-    # Phase-Balance
-    phase_counts: dict[str, int] = {}
-    for chart in charts:
-        phase = getattr(chart, phase_attr)
-        name = phase.name_pinyin if phase_attr == "jieqi" else phase.name_de
-        phase_counts[name] = phase_counts.get(name, 0) + 1
-
-    if phase_counts:
-        max_n = max(phase_counts.values())
-        min_n = max(1, min(phase_counts.values()))
-        imbalance = max_n / min_n
-    else:
-        imbalance = 0.0
-
-    warnings = []
-    if n_deg > 0.05:
-        warnings.append(f"KRITISCH: {n_deg*100:.1f}% Nullvektoren (degenerate)")
-    if imbalance > 3.0:
-        warnings.append(f"KRITISCH: Phase-Imbalance {imbalance:.1f}x (max/min)")
-    if h_zero > 0.05:
-        warnings.append(f"WARNUNG: {h_zero*100:.1f}% H=0.0 Artefakte")
-    if n_sparse > 0.20:
-        warnings.append(f"WARNUNG: {n_sparse*100:.1f}% sparse-Qualität")
-    if extreme > 0.10:
-        warnings.append(f"INFO: {extreme*100:.1f}% Charts mit Extrem-d_i > 0.45")
-
-    return BiasReport(
-        n_total=n,
-        n_degenerate=round(n_deg, 4),
-        n_sparse=round(n_sparse, 4),
-        phase_imbalance=round(imbalance, 2),
-        h_raw_at_zero=round(h_zero, 4),
-        h_raw_at_one=round(h_one, 4),
-        extreme_diff_rate=round(extreme, 4),
-        warnings=warnings,
-    )
+    return PhaseStatsAggregator(phase_attr, features=()).update(charts).bias_report()
@@ -0,0 +1,148 @@
+"""
+research/streaming_stats.py — Mergebare Einpass-Statistiken.
+
+Bausteine für die Aggregation großer Datensätze in Blöcken und über
+Prozesse hinweg: jedes Objekt nimmt Werte einzeln auf (``add``), lässt sich
+mit einem gleichartigen Objekt zusammenführen (``merge``) und ist picklebar.
+
+  RunningMoments  Welford-Algorithmus: n, Mittelwert, Stichproben-Varianz;
+                  Zusammenführung nach Chan et al. (numerisch stabil).
+  QuantileSketch  KLL-artiger Kompaktor-Stapel: exakt bis ``k`` Werte
+                  (dann identisch mit linear interpolierten Perzentilen der
+                  sortierten Werte), darüber Speicher O(k · log(n/k)) und
+                  Rangfehler in der Größenordnung log2(n/k) / k.
+"""
+from __future__ import annotations
+
+import math
+from typing import Iterable, List
+
+DEFAULT_SKETCH_K = 4096
+
+
+class RunningMoments:
+    """Anzahl, Mittelwert und Varianz in einem Durchlauf (Welford)."""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def update(self, values: Iterable[float]) -> None:
+        for x in values:
+            self.add(x)
+
+    def merge(self, other: RunningMoments) -> None:
+        if other.n == 0:
+            return
+        if self.n == 0:
+            self.n, self.mean, self.m2 = other.n, other.mean, other.m2
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+
+    @property
+    def variance(self) -> float:
+        """Stichproben-Varianz (n − 1); 0.0 für n < 2."""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(max(self.variance, 0.0))
+
+
+class QuantileSketch:
+    """Mergebare Quantil-Skizze (Kompaktoren mit Kapazität ``k`` je Ebene).
+
+    Ebene h hält Werte mit Gewicht 2^h. Läuft eine Ebene über, wird sie
+    sortiert und jeder zweite Wert (abwechselnd gerade / ungerade Positionen,
+    deterministisch) mit doppeltem Gewicht eine Ebene höher geschoben.
+    """
+
+    __slots__ = ("k", "n", "_levels", "_flip")
+
+    def __init__(self, k: int = DEFAULT_SKETCH_K) -> None:
+        if k < 2:
+            raise ValueError("QuantileSketch braucht k >= 2")
+        self.k = k
+        self.n = 0
+        self._levels: List[List[float]] = [[]]
+        self._flip = 0
+
+    @property
+    def is_exact(self) -> bool:
+        """True, solange noch nicht kompaktiert wurde (alle Werte vorhanden)."""
+        return len(self._levels) == 1
+
+    def add(self, x: float) -> None:
+        level = self._levels[0]
+        level.append(x)
+        self.n += 1
+        if len(level) > self.k:
+            self._compact()
+
+    def update(self, values: Iterable[float]) -> None:
+        for x in values:
+            self.add(x)
+
+    def merge(self, other: QuantileSketch) -> None:
+        if other.k != self.k:
+            raise ValueError("QuantileSketch mit unterschiedlichem k")
+        for h, items in enumerate(other._levels):
+            if h == len(self._levels):
+                self._levels.append([])
+            self._levels[h].extend(items)
+        self.n += other.n
+        self._compact()
+
+    def _compact(self) -> None:
+        h = 0
+        while h < len(self._levels):
+            level = self._levels[h]
+            if len(level) > self.k:
+                level.sort()
+                keep = [level.pop()] if len(level) % 2 else []
+                promoted = level[self._flip::2]
+                self._flip ^= 1
+                self._levels[h] = keep
+                if h + 1 == len(self._levels):
+                    self._levels.append([])
+                self._levels[h + 1].extend(promoted)
+            h += 1
+
+    def quantile(self, p: float) -> float:
+        """Wert am Quantil p ∈ [0, 1]; 0.0 ohne Werte.
+
+        Exakt: lineare Interpolation zwischen benachbarten Rängen der
+        sortierten Werte. Kompaktiert: Wert am gewichteten Rang p · (n − 1).
+        """
+        if self.n == 0:
+            return 0.0
+        if self.is_exact:
+            s = sorted(self._levels[0])
+            idx = p * (len(s) - 1)
+            lo = int(idx)
+            hi = min(lo + 1, len(s) - 1)
+            return s[lo] + (idx - lo) * (s[hi] - s[lo])
+        items = sorted(
+            (x, 1 << h) for h, level in enumerate(self._levels) for x in level
+        )
+        total = sum(w for _, w in items)
+        target = p * (total - 1)
+        seen = 0
+        for x, w in items:
+            seen += w
+            if seen > target:
+                return x
+        return items[-1][0]
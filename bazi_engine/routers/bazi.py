@@ -15,8 +15,8 @@ from ..bazi import compute_bazi, jdn_gregorian, sexagenary_day_index_from_date,
 from ..constants import STEMS, BRANCHES, ANIMALS, DAY_OFFSET
 from ..exc import BaziEngineError
 from ..provenance import build_provenance
-from ..time_utils import resolve_local_iso, AmbiguousTimeChoice, NonexistentTimePolicy, apply_day_boundary
-from ..types import BaziInput, BaziResult, Fold
+from ..time_utils import normalize_birth_input, AmbiguousTimeChoice, NonexistentTimePolicy, apply_day_boundary
+from ..types import BaziInput, BaziResult, EphemerisBackendName
 from .shared import format_pillar, ProvenanceResponse
 
 _log = logging.getLogger(__name__)
@@ -33,6 +33,10 @@ class BaziRequest(BaseModel):
     boundary: Literal["midnight", "zi"] = Field("midnight")
     ambiguousTime: AmbiguousTimeChoice = Field("earlier")
     nonexistentTime: NonexistentTimePolicy = Field("error")
+    ephemeris: EphemerisBackendName = Field(
+        "swisseph",
+        description="Ephemeris backend; 'skyfield' needs the optional extra and a local JPL kernel",
+    )
 
 
 class PillarDetail(BaseModel):
@@ -138,21 +142,14 @@ def _build_derivation_trace(res: BaziResult, inp: BaziInput) -> Dict[str, Any]:
 @router.post("/bazi", response_model=BaziResponse)
 def calculate_bazi_endpoint(req: BaziRequest) -> Dict[str, Any]:
     try:
-        dt_local, _ = resolve_local_iso(
-            req.date, req.tz,
+        birth = normalize_birth_input(
+            req.date, req.tz, req.lon, req.lat,
             ambiguous=req.ambiguousTime, nonexistent=req.nonexistentTime,
         )
-        resolved_naive = dt_local.replace(tzinfo=None).isoformat()
-        fold: Fold = 0 if req.ambiguousTime == "earlier" else 1
-        inp = BaziInput(
-            birth_local=resolved_naive,
-            timezone=req.tz,
-            longitude_deg=req.lon,
-            latitude_deg=req.lat,
+        inp = birth.bazi_input(
             time_standard=req.standard,
             day_boundary=req.boundary,
-            strict_local_time=True,
-            fold=fold,
+            ephemeris_backend=req.ephemeris,
         )
         res = compute_bazi(inp)
         return {
@@ -185,7 +182,7 @@ def calculate_bazi_endpoint(req: BaziRequest) -> Dict[str, Any]:
                 "lichun_next": res.lichun_next_local_dt.isoformat() if res.lichun_next_local_dt else None,
             },
             "solar_terms_count": len(res.solar_terms_local_dt) if res.solar_terms_local_dt else 0,
-            "provenance": build_provenance(),
+            "provenance": build_provenance(ephemeris_id=res.ephemeris_id),
             "derivation_trace": _build_derivation_trace(res, inp),
         }
     except BaziEngineError:
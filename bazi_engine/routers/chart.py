@@ -1,19 +1,20 @@
 """
 routers/chart.py — POST /chart (combined BaZi + Western + Wu-Xing chart)
+
+GET /chart/{chart_id} returns a chart persisted with ``persist=true``.
 """
 from __future__ import annotations
 
 import os
-from datetime import timezone
 from typing import Any, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Path
 from pydantic import BaseModel, Field
 
 from ..bazi import compute_bazi
 from ..bafe import validate_request as bafe_validate_request
 from ..constants import STEMS, BRANCHES, ANIMALS
-from ..exc import BaziEngineError
+from ..exc import BaziEngineError, NotFoundError
 from ..fusion import (
     calculate_harmony_index,
     calculate_wuxing_from_bazi,
@@ -21,16 +22,21 @@ from ..fusion import (
     equation_of_time,
     true_solar_time,
 )
-from ..time_utils import resolve_local_iso, AmbiguousTimeChoice, NonexistentTimePolicy, LocalTimeError
-from ..types import BaziInput, Fold, Pillar
+from ..time_utils import (
+    AmbiguousTimeChoice, LocalTimeError, NonexistentTimePolicy, NormalizedBirth, normalize_birth_input,
+)
+from ..types import Pillar
+from ..services.chart_store import CHART_ID_PATTERN, chart_id_for, get_chart_store
 from ..western import compute_western_chart
-from .shared import ZODIAC_SIGNS_DE, STEM_TO_ELEMENT
+from .shared import ZODIAC_SIGNS_DE, STEM_TO_ELEMENT, respond
 
 from .. import __version__ as _ENGINE_VERSION
+from .. import timing
 
 router = APIRouter(tags=["Chart"])
 
 _BUILD_VERSION = os.environ.get("BUILD_VERSION", _ENGINE_VERSION)
+_PARAMETER_SET_ID = "pz_2026_02_core"
 
 ZODIAC_SIGNS_EN = [
     "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
@@ -50,6 +56,11 @@ class ChartRequest(BaseModel):
     include_validation: bool = Field(False)
     time_standard: Literal["CIVIL", "LMT"] = Field("CIVIL")
     day_boundary: Literal["midnight", "zi"] = Field("midnight")
+    persist: bool = Field(
+        False,
+        description="Store the chart and return its chart_id; a repeat request "
+                    "with identical inputs is served from the store.",
+    )
 
 
 class TimeScaleQuality(BaseModel):
@@ -129,6 +140,7 @@ class ValidationResult(BaseModel):
     error: Optional[str] = None
 
 class ChartResponse(BaseModel):
+    chart_id: Optional[str] = Field(None, description="Store key; set when the chart was persisted.")
     engine_version: str
     parameter_set_id: str
     time_scales: TimeScales
@@ -160,22 +172,73 @@ def _format_pillar_spec(pillar: Pillar) -> Dict[str, Any]:
 @router.post("/chart", response_model=ChartResponse)
 def chart_endpoint(req: ChartRequest) -> Dict[str, Any]:
     """Combined chart: Western positions + BaZi pillars + time scales + Wu-Xing."""
+    return respond(build_chart(req))
+
+
+def build_chart(req: ChartRequest) -> Dict[str, Any]:
+    """Chart payload for a request; with ``persist`` served from / written to the store."""
+    birth = _normalize(req)
+    if not req.persist:
+        return _compute_chart(req, birth)
+    chart_id = chart_id_for(
+        {"birth": list(birth.key), **req.model_dump(exclude=_BIRTH_FIELDS | {"persist"})},
+        engine_version=_BUILD_VERSION,
+        parameter_set_id=_PARAMETER_SET_ID,
+    )
+    store = get_chart_store()
+    stored = store.get(chart_id)
+    if stored is not None:
+        return stored
+    response = {**_compute_chart(req, birth), "chart_id": chart_id}
+    store.put(chart_id, response, engine_version=_BUILD_VERSION)
+    return response
+
+
+@router.get("/chart/{chart_id}", response_model=ChartResponse)
+def get_chart(
+    chart_id: str = Path(..., pattern=CHART_ID_PATTERN, description="ID returned by POST /chart with persist=true"),
+) -> Dict[str, Any]:
+    """Stored chart by ID (one key lookup, no recomputation)."""
+    stored = get_chart_store().get(chart_id)
+    if stored is None:
+        raise NotFoundError(f"Unknown chart_id {chart_id!r}", detail={"chart_id": chart_id})
+    return respond(stored)
+
+
+# Request fields subsumed by NormalizedBirth.key
+_BIRTH_FIELDS = {"local_datetime", "tz_id", "geo_lon_deg", "geo_lat_deg", "dst_policy"}
+
+
+def _normalize(req: ChartRequest) -> NormalizedBirth:
+    if req.dst_policy == "error":
+        ambiguous: AmbiguousTimeChoice = "earlier"
+        nonexistent: NonexistentTimePolicy = "error"
+    elif req.dst_policy == "earlier":
+        ambiguous = "earlier"
+        nonexistent = "shift_forward"
+    else:
+        ambiguous = "later"
+        nonexistent = "shift_forward"
     try:
-        if req.dst_policy == "error":
-            ambiguous: AmbiguousTimeChoice = "earlier"
-            nonexistent: NonexistentTimePolicy = "error"
-        elif req.dst_policy == "earlier":
-            ambiguous = "earlier"
-            nonexistent = "shift_forward"
-        else:
-            ambiguous = "later"
-            nonexistent = "shift_forward"
-
-        dt, time_res = resolve_local_iso(
-            req.local_datetime, req.tz_id,
+        return normalize_birth_input(
+            req.local_datetime, req.tz_id, req.geo_lon_deg, req.geo_lat_deg,
             ambiguous=ambiguous, nonexistent=nonexistent,
         )
-        dt_utc = dt.astimezone(timezone.utc)
+    except LocalTimeError as e:
+        raise _dst_error(e)
+
+
+def _dst_error(e: LocalTimeError) -> HTTPException:
+    return HTTPException(status_code=422, detail={
+        "error": str(e), "type": "dst_error",
+        "hint": "Use dst_policy='earlier' or 'later' to auto-resolve.",
+    })
+
+
+def _compute_chart(req: ChartRequest, birth: NormalizedBirth) -> Dict[str, Any]:
+    try:
+        dt, time_res = birth.local_dt, birth.resolution
+        dt_utc = birth.utc_dt
 
         # Western chart
         western = compute_western_chart(dt_utc, req.geo_lat_deg, req.geo_lon_deg)
@@ -200,18 +263,9 @@ def chart_endpoint(req: ChartRequest) -> Dict[str, Any]:
             })
 
         # BaZi pillars
-        fold: Fold = 0 if ambiguous == "earlier" else 1
-        bazi_input = BaziInput(
-            birth_local=dt.replace(tzinfo=None).isoformat(),
-            timezone=req.tz_id,
-            longitude_deg=req.geo_lon_deg,
-            latitude_deg=req.geo_lat_deg,
-            time_standard=req.time_standard,
-            day_boundary=req.day_boundary,
-            strict_local_time=True,
-            fold=fold,
-        )
-        bazi_result = compute_bazi(bazi_input)
+        bazi_result = compute_bazi(birth.bazi_input(
+            time_standard=req.time_standard, day_boundary=req.day_boundary,
+        ))
 
         bazi_section = {
             "ruleset_id": "standard_bazi_2026",
@@ -236,6 +290,7 @@ def chart_endpoint(req: ChartRequest) -> Dict[str, Any]:
         }
 
         # Wu-Xing
+        laps = timing.laps("chart")
         wuxing_planet = calculate_wuxing_vector_from_planets(bodies_raw)
         bazi_pillars_for_wuxing = {
             p: {"stem": STEMS[getattr(bazi_result.pillars, p).stem_index],
@@ -255,6 +310,7 @@ def chart_endpoint(req: ChartRequest) -> Dict[str, Any]:
             "dominant_planet": dominant_planet,
             "dominant_bazi":   dominant_bazi,
         }
+        laps.lap("wuxing")
 
         # Time scales
         day_of_year = dt.timetuple().tm_yday
@@ -284,7 +340,7 @@ def chart_endpoint(req: ChartRequest) -> Dict[str, Any]:
                     "branch_width_deg": 30.0,
                 },
                 "birth_event": {
-                    "local_datetime": req.local_datetime,
+                    "local_datetime": birth.input_local_iso,
                     "tz_id": req.tz_id,
                     "geo_lon_deg": req.geo_lon_deg,
                     "geo_lat_deg": req.geo_lat_deg,
@@ -297,23 +353,20 @@ def chart_endpoint(req: ChartRequest) -> Dict[str, Any]:
 
         response: Dict[str, Any] = {
             "engine_version":   _BUILD_VERSION,
-            "parameter_set_id": "pz_2026_02_core",
+            "parameter_set_id": _PARAMETER_SET_ID,
             "time_scales":      time_scales,
             "positions":        positions,
             "bazi":             bazi_section,
             "wuxing":           wuxing_section,
             "houses":           western.get("houses"),
             "angles":           western.get("angles"),
+            "validation":       validation,
+            "chart_id":         None,
         }
-        if validation is not None:
-            response["validation"] = validation
         return response
 
     except LocalTimeError as e:
-        raise HTTPException(status_code=422, detail={
-            "error": str(e), "type": "dst_error",
-            "hint": "Use dst_policy='earlier' or 'later' to auto-resolve.",
-        })
+        raise _dst_error(e)
     except BaziEngineError:
         raise
     except Exception:
@@ -5,19 +5,21 @@ Endpoints:
   POST /calculate/fusion   — Wu-Xing + Western harmony analysis
   POST /calculate/wuxing   — Wu-Xing vector from planetary positions
   POST /calculate/tst      — True Solar Time calculation
+  POST /fusion/matrix      — Harmony matrix between many charts
 """
 from __future__ import annotations
 
 from datetime import timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
 
 import logging
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, model_validator
 
 from ..bazi import compute_bazi
-from ..exc import BaziEngineError
+from ..exc import BaziEngineError, InputError, NotFoundError
 from ..provenance import build_provenance, normalize_house_system
 from ..fusion import (
     compute_fusion_analysis,
@@ -25,10 +27,13 @@ from ..fusion import (
     equation_of_time,
     true_solar_time,
 )
-from ..time_utils import resolve_local_iso, AmbiguousTimeChoice, NonexistentTimePolicy
-from ..types import BaziInput, Fold
+from ..time_utils import (
+    resolve_local_iso, normalize_birth_input, AmbiguousTimeChoice, NonexistentTimePolicy,
+)
+from ..services.chart_store import CHART_ID_PATTERN, get_chart_store
+from ..services.harmony_matrix import ChartVectors, harmony_blocks, harmony_matrix
 from ..western import compute_western_chart
-from .shared import format_pillar, ProvenanceResponse
+from .shared import dumps_compact, format_pillar, respond, ProvenanceResponse
 from .western import HouseQuality
 
 _log = logging.getLogger(__name__)
@@ -67,27 +72,16 @@ class FusionResponse(BaseModel):
 def calculate_fusion_endpoint(req: FusionRequest) -> Dict[str, Any]:
     """Wu-Xing + Western harmony analysis."""
     try:
-        dt_local, _ = resolve_local_iso(
-            req.date, req.tz,
+        birth = normalize_birth_input(
+            req.date, req.tz, req.lon, req.lat,
             ambiguous=req.ambiguousTime, nonexistent=req.nonexistentTime,
         )
-        dt_utc = dt_local.astimezone(timezone.utc)
+        dt_utc = birth.utc_dt
         western_chart = compute_western_chart(dt_utc, req.lat, req.lon)
 
         pillars = req.bazi_pillars
         if pillars is None:
-            fold: Fold = 0 if req.ambiguousTime == "earlier" else 1
-            inp = BaziInput(
-                birth_local=dt_local.replace(tzinfo=None).isoformat(),
-                timezone=req.tz,
-                longitude_deg=req.lon,
-                latitude_deg=req.lat,
-                time_standard="CIVIL",
-                day_boundary="midnight",
-                strict_local_time=True,
-                fold=fold,
-            )
-            bazi_result = compute_bazi(inp)
+            bazi_result = compute_bazi(birth.bazi_input())
             pillars = {
                 "year":  format_pillar(bazi_result.pillars.year),
                 "month": format_pillar(bazi_result.pillars.month),
@@ -104,7 +98,7 @@ def calculate_fusion_endpoint(req: FusionRequest) -> Dict[str, Any]:
             western_bodies=western_chart["bodies"],
             ascendant=ascendant,
         )
-        return {
+        return respond({
             "input": {"date": req.date, "tz": req.tz, "lon": req.lon, "lat": req.lat},
             "wu_xing_vectors":      fusion["wu_xing_vectors"],
             "harmony_index":        fusion["harmony_index"],
@@ -117,7 +111,7 @@ def calculate_fusion_endpoint(req: FusionRequest) -> Dict[str, Any]:
             "provenance": build_provenance(
                 house_system=normalize_house_system(western_chart.get("house_system")),
             ),
-        }
+        })
     except BaziEngineError:
         raise
     except Exception:
@@ -232,3 +226,200 @@ def calculate_tst_endpoint(req: TSTRequest) -> Dict[str, Any]:
     except Exception:
         _log.exception("Calculation failed")
         raise HTTPException(status_code=500, detail="Internal calculation error")
+
+
+# ── /fusion/matrix ───────────────────────────────────────────────────────────
+
+matrix_router = APIRouter(prefix="/fusion", tags=["Fusion / Wu-Xing"])
+
+MAX_MATRIX_CHARTS = 10_000
+# Birth data costs a full western + BaZi computation per chart, a stored
+# chart_id only a lookup; distinct birth inputs have their own, lower cap.
+MAX_MATRIX_BIRTH_CHARTS = 1_000
+MAX_JSON_CELLS = 250_000
+
+
+class MatrixChartInput(BaseModel):
+    """One chart of the matrix: a stored chart_id or birth data as for /calculate/fusion."""
+    chart_id: Optional[str] = Field(
+        None, pattern=CHART_ID_PATTERN, description="ID returned by POST /chart with persist=true",
+    )
+    date: Optional[str] = Field(None, description="ISO 8601 local date time")
+    tz: str = Field("Europe/Berlin", description="Timezone name")
+    lon: Optional[float] = Field(None, description="Longitude in degrees")
+    lat: Optional[float] = Field(None, description="Latitude in degrees")
+    ambiguousTime: AmbiguousTimeChoice = "earlier"
+    nonexistentTime: NonexistentTimePolicy = "error"
+    bazi_pillars: Optional[Dict[str, Dict[str, str]]] = Field(
+        None, description="BaZi pillars (auto-computed if omitted)"
+    )
+
+    @model_validator(mode="after")
+    def _chart_id_or_birth(self) -> MatrixChartInput:
+        if self.chart_id is not None:
+            if self.date is not None:
+                raise ValueError("give either chart_id or date/lon/lat, not both")
+        elif self.date is None or self.lon is None or self.lat is None:
+            raise ValueError("chart_id or date, lon and lat are required")
+        return self
+
+
+class FusionMatrixRequest(BaseModel):
+    charts: List[MatrixChartInput] = Field(
+        ..., min_length=1, max_length=MAX_MATRIX_CHARTS,
+        description="Row charts (western side of each cell); at most "
+                    f"{MAX_MATRIX_BIRTH_CHARTS} distinct birth inputs across charts and against",
+    )
+    against: Optional[List[MatrixChartInput]] = Field(
+        None, min_length=1, max_length=MAX_MATRIX_CHARTS,
+        description="Column charts (BaZi side of each cell); omitted = all pairs of `charts`",
+    )
+    format: Literal["json", "ndjson"] = Field(
+        "json",
+        description="'ndjson' streams a header line and then blocks of rows; "
+                    f"required above {MAX_JSON_CELLS} cells",
+    )
+
+
+class MatrixChart(BaseModel):
+    chart_id: Optional[str] = None
+    input: Optional[Dict[str, Any]] = None
+    wu_xing_vectors: Dict[str, Dict[str, float]]
+    n_west: int
+    n_bazi_contributions: int
+
+
+class FusionMatrixResponse(BaseModel):
+    rows: List[MatrixChart]
+    columns: List[MatrixChart]
+    harmony: List[List[float]]
+    cosmic_state: List[List[float]]
+    h_calibrated: List[List[float]]
+    sigma_above: List[List[float]]
+    provenance: ProvenanceResponse
+
+
+def _matrix_chart(item: MatrixChartInput, index: int) -> ChartVectors:
+    if item.chart_id is not None:
+        stored = get_chart_store().get(item.chart_id)
+        if stored is None:
+            raise NotFoundError(
+                f"Unknown chart_id {item.chart_id!r}",
+                detail={"chart_id": item.chart_id, "index": index},
+            )
+        return ChartVectors.from_stored_chart(stored)
+    assert item.date is not None and item.lon is not None and item.lat is not None
+    birth = normalize_birth_input(
+        item.date, item.tz, item.lon, item.lat,
+        ambiguous=item.ambiguousTime, nonexistent=item.nonexistentTime,
+    )
+    western_chart = compute_western_chart(birth.utc_dt, item.lat, item.lon)
+    pillars = item.bazi_pillars
+    if pillars is None:
+        bazi_result = compute_bazi(birth.bazi_input())
+        pillars = {
+            "year":  format_pillar(bazi_result.pillars.year),
+            "month": format_pillar(bazi_result.pillars.month),
+            "day":   format_pillar(bazi_result.pillars.day),
+            "hour":  format_pillar(bazi_result.pillars.hour),
+        }
+    return ChartVectors.from_chart(
+        western_chart["bodies"], pillars,
+        ascendant=western_chart.get("angles", {}).get("Ascendant"),
+    )
+
+
+def _check_matrix_size(req: FusionMatrixRequest) -> None:
+    """Reject oversized requests before any chart is computed or loaded."""
+    items = req.charts + (req.against or [])
+    births = {item.model_dump_json(exclude_defaults=True) for item in items if item.chart_id is None}
+    if len(births) > MAX_MATRIX_BIRTH_CHARTS:
+        raise InputError(
+            f"{len(births)} distinct birth inputs exceed {MAX_MATRIX_BIRTH_CHARTS}; "
+            "persist the charts (POST /chart) and pass their chart_id",
+            detail={"birth_charts": len(births), "max_birth_charts": MAX_MATRIX_BIRTH_CHARTS},
+        )
+    cells = len(req.charts) * len(req.against or req.charts)
+    if req.format == "json" and cells > MAX_JSON_CELLS:
+        raise InputError(
+            f"Matrix of {cells} cells exceeds {MAX_JSON_CELLS} for format='json'; "
+            "use format='ndjson'",
+            detail={"cells": cells, "max_json_cells": MAX_JSON_CELLS},
+        )
+
+
+def _resolve_charts(
+    items: List[MatrixChartInput], cache: Dict[str, ChartVectors],
+) -> Tuple[List[ChartVectors], List[Dict[str, Any]]]:
+    """Vectors and response metadata of each chart; repeated charts are computed once."""
+    vectors: List[ChartVectors] = []
+    meta: List[Dict[str, Any]] = []
+    for index, item in enumerate(items):
+        key = item.model_dump_json(exclude_defaults=True)
+        cv = cache.get(key)
+        if cv is None:
+            cv = cache[key] = _matrix_chart(item, index)
+        vectors.append(cv)
+        meta.append({
+            "chart_id": item.chart_id,
+            "input": None if item.chart_id is not None else
+                {"date": item.date, "tz": item.tz, "lon": item.lon, "lat": item.lat},
+            "wu_xing_vectors": {
+                "western_planets": cv.western.normalize().to_dict(),
+                "bazi_pillars": cv.bazi.normalize().to_dict(),
+            },
+            "n_west": cv.n_west,
+            "n_bazi_contributions": cv.n_bazi,
+        })
+    return vectors, meta
+
+
+@matrix_router.post("/matrix", response_model=FusionMatrixResponse)
+def fusion_matrix_endpoint(req: FusionMatrixRequest) -> Any:
+    """Harmony matrix between many charts (western of row i vs BaZi of column j).
+
+    The diagonal of an all-pairs matrix equals each chart's own
+    /calculate/fusion harmony_index, cosmic_state and calibration. With
+    ``format="ndjson"`` the response is ``application/x-ndjson``: a header
+    line with rows, columns, shape and provenance, then one line per block
+    of rows (``start`` and the four matrices for those rows).
+    """
+    _check_matrix_size(req)
+    try:
+        cache: Dict[str, ChartVectors] = {}
+        rows, row_meta = _resolve_charts(req.charts, cache)
+        if req.against is None:
+            columns, col_meta = rows, row_meta
+        else:
+            columns, col_meta = _resolve_charts(req.against, cache)
+    except BaziEngineError:
+        raise
+    except Exception:
+        _log.exception("Calculation failed")
+        raise HTTPException(status_code=500, detail="Internal calculation error")
+
+    if req.format == "json":
+        matrix = harmony_matrix(rows, columns)
+        return respond({
+            "rows": row_meta,
+            "columns": col_meta,
+            "harmony": matrix.harmony,
+            "cosmic_state": matrix.cosmic_state,
+            "h_calibrated": matrix.h_calibrated,
+            "sigma_above": matrix.sigma_above,
+            "provenance": build_provenance(),
+        })
+
+    header = {
+        "rows": row_meta,
+        "columns": col_meta,
+        "shape": [len(rows), len(columns)],
+        "provenance": build_provenance(),
+    }
+
+    def lines() -> Iterator[bytes]:
+        yield dumps_compact(header) + b"\n"
+        for block in harmony_blocks(rows, columns):
+            yield dumps_compact(block.to_dict()) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -1,7 +1,8 @@
 """
 routers/info.py — Informational and utility endpoints.
 
-Endpoints: GET /, /health, /build, /api (zodiac lookup), /info/wuxing-mapping
+Endpoints: GET /, /health, /build, /api (zodiac lookup), /info/wuxing-mapping,
+/metrics (Prometheus text format)
 """
 from __future__ import annotations
 
@@ -9,12 +10,14 @@ import os
 from typing import Any, Dict, Literal, Optional
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 
 from ..exc import BaziEngineError
 from ..fusion import PLANET_TO_WUXING, WUXING_ORDER
+from ..sun_sign import sun_sign_at
 from ..time_utils import resolve_local_iso
-from ..western import compute_western_chart
+from ..services.metrics import CONTENT_TYPE as _METRICS_CONTENT_TYPE, render_metrics
 from .shared import ZODIAC_SIGNS_DE
 
 from .. import __version__ as _ENGINE_VERSION
@@ -110,13 +113,8 @@ def api_endpoint(
             f"{datum}T{zeit}", tz,
             ambiguous=ambiguousTime, nonexistent=nonexistentTime,
         )
-        dt_utc = dt.astimezone(tz_mod.utc)
-        chart = compute_western_chart(dt_utc, lat, lon)
-        sun = chart.get("bodies", {}).get("Sun")
-        if not sun or "zodiac_sign" not in sun:
-            raise ValueError("Sonnenposition konnte nicht berechnet werden.")
-        sign_index = int(sun["zodiac_sign"])
-        sign_name = ZODIAC_SIGNS_DE[sign_index]
+        # Only the Sun's sign is returned: ingress table, no full chart.
+        sign_name = ZODIAC_SIGNS_DE[sun_sign_at(dt.astimezone(tz_mod.utc))]
         return {"sonne": sign_name, "input": {"datum": datum, "zeit": zeit, "ort": ort, "tz": tz, "lat": lat, "lon": lon}}
     except BaziEngineError:
         raise
@@ -134,3 +132,10 @@ def get_wuxing_mapping() -> Dict[str, Any]:
             "WUXING_ORDER": "Wu Xing cycle order: Holz -> Feuer -> Erde -> Metall -> Wasser",
         },
     }
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Request, stage, ephemeris, cache and process metrics for Prometheus scrapes."""
+    # async: the thread-pool gauges are read from the event loop's limiter.
+    return PlainTextResponse(render_metrics(), media_type=_METRICS_CONTENT_TYPE)
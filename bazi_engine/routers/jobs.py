@@ -0,0 +1,304 @@
+"""
+routers/jobs.py — Background jobs for long-running workloads.
+
+Endpoints:
+  POST /jobs                  — enqueue a batch chart, transit scan or research run
+  GET  /jobs/{job_id}         — status, progress and resource caps of a job
+  GET  /jobs/{job_id}/result  — NDJSON result written so far (complete chunks only)
+  DELETE /jobs/{job_id}       — remove a queued or finished job and its result file
+
+The queue, worker pool and checkpoints live in services/jobs.py; this module
+defines the request models and registers the job types, which wrap the same
+computations as POST /chart, GET /transit/now and bazi_engine.research.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Any, Dict, List, Literal, Optional, Tuple, Union
+
+from fastapi import APIRouter, Body, HTTPException, Path
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from ..exc import BaziEngineError, NotFoundError
+from ..research import PhaseStatsAggregator, generate_synthetic_dataset
+from ..research.pattern_analysis import ALL_FEATURES
+from ..services.jobs import (
+    JOB_ID_PATTERN, JobCaps, JobType, get_job_store, notify_job_workers, register_job_type,
+)
+from ..transit import compute_transit_now
+from .chart import ChartRequest, build_chart
+from .shared import respond
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+MAX_CHUNK_SIZE = 10_000
+MAX_SCAN_DAYS = 3660
+
+
+# ── Request / Response models ─────────────────────────────────────────────────
+
+class JobCapsRequest(BaseModel):
+    """Tighter limits for this job (server limits apply if omitted or larger)."""
+    max_seconds: Optional[float] = Field(None, gt=0, description="Compute time budget in seconds")
+    max_result_bytes: Optional[int] = Field(None, gt=0, description="Maximum size of the result file")
+
+
+class _JobRequestBase(BaseModel):
+    format: Literal["ndjson", "columnar"] = Field(
+        "ndjson",
+        description="'ndjson': one record per line; 'columnar': one line per chunk "
+                    "with a list of values per field",
+    )
+    chunk_size: Optional[int] = Field(
+        None, ge=1, le=MAX_CHUNK_SIZE,
+        description="Items per chunk (checkpoint interval); default depends on the job type",
+    )
+    caps: Optional[JobCapsRequest] = None
+
+
+class BatchChartJob(_JobRequestBase):
+    """POST /chart for many birth inputs; per-item errors become error records."""
+    type: Literal["batch_chart"]
+    charts: List[ChartRequest] = Field(..., min_length=1)
+
+
+class TransitScanJob(_JobRequestBase):
+    """GET /transit/now at regular steps over a time span."""
+    type: Literal["transit_scan"]
+    start: str = Field(..., description="ISO 8601 UTC start datetime")
+    days: int = Field(..., ge=1, le=MAX_SCAN_DAYS, description="Length of the scan in days")
+    step_hours: int = Field(24, ge=1, le=24 * 30, description="Hours between snapshots")
+
+    @field_validator("start")
+    @classmethod
+    def _iso_start(cls, v: str) -> str:
+        _parse_utc(v)
+        return v
+
+
+class ResearchRunJob(_JobRequestBase):
+    """Synthetic dataset run with phase statistics, generated chunk by chunk."""
+    type: Literal["research_run"]
+    n_total: int = Field(
+        ..., ge=1,
+        description="Number of synthetic charts; a multiple of 24 if stratify_by_jieqi",
+    )
+    seed: int = Field(42, description="Seed; chunk k uses a seed derived from (seed, k)")
+    n_planets: int = Field(7, ge=1, le=11)
+    stratify_by_jieqi: bool = True
+    phase_attr: Literal["jieqi", "lunar"] = "jieqi"
+    include_charts: bool = Field(False, description="Also write one feature record per chart")
+    sketch_k: int = Field(
+        256, ge=16, le=4096,
+        description="Quantile sketch capacity; quantiles are exact up to this many charts per phase",
+    )
+
+    @model_validator(mode="after")
+    def _stratified_chunks(self) -> ResearchRunJob:
+        # Every chunk is generated on its own; only whole rounds of 24 keep
+        # each chunk, including the last, stratified over the Jieqi phases.
+        if self.stratify_by_jieqi:
+            if self.n_total % 24:
+                raise ValueError("n_total must be a multiple of 24 for stratified runs (one chart per Jieqi phase)")
+            if self.chunk_size is not None and self.chunk_size % 24:
+                raise ValueError("chunk_size must be a multiple of 24 for stratified runs (one chart per Jieqi phase)")
+        return self
+
+
+JobRequest = Annotated[
+    Union[BatchChartJob, TransitScanJob, ResearchRunJob],
+    Field(discriminator="type"),
+]
+
+
+class JobCapsResponse(BaseModel):
+    max_seconds: float
+    max_result_bytes: int
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    type: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    format: str
+    chunk_size: int
+    total: int
+    done: int
+    progress: float
+    result_bytes: int
+    elapsed_seconds: float
+    caps: JobCapsResponse
+    error: Optional[Dict[str, Any]] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result_url: str
+
+
+class JobDeleteResponse(BaseModel):
+    job_id: str
+    deleted: bool
+
+
+# ── Job types ────────────────────────────────────────────────────────────────
+
+def _parse_utc(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _batch_chart_chunk(
+    params: Dict[str, Any], start: int, stop: int, state: Any,
+) -> Tuple[List[Dict[str, Any]], Any]:
+    records: List[Dict[str, Any]] = []
+    for i in range(start, stop):
+        try:
+            chart = build_chart(ChartRequest(**params["charts"][i]))
+        except BaziEngineError as e:
+            records.append({"index": i, "status": e.http_status, "error": e.to_dict()})
+        except HTTPException as e:
+            records.append({"index": i, "status": e.status_code, "error": e.detail})
+        else:
+            records.append({"index": i, "status": 200, "chart": chart})
+    return records, None
+
+
+def _scan_count(params: Dict[str, Any]) -> int:
+    return -(-params["days"] * 24 // params["step_hours"])
+
+
+def _transit_scan_chunk(
+    params: Dict[str, Any], start: int, stop: int, state: Any,
+) -> Tuple[List[Dict[str, Any]], Any]:
+    t0 = _parse_utc(params["start"])
+    step = timedelta(hours=params["step_hours"])
+    records = []
+    for i in range(start, stop):
+        dt = t0 + i * step
+        snapshot = compute_transit_now(dt_utc=dt)
+        records.append({
+            "datetime": dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "planets": snapshot["planets"],
+            "sector_intensity": snapshot["sector_intensity"],
+        })
+    return records, None
+
+
+def _research_chunk(
+    params: Dict[str, Any], start: int, stop: int, state: Any,
+) -> Tuple[List[Dict[str, Any]], Any]:
+    agg = state or PhaseStatsAggregator(params["phase_attr"], sketch_k=params["sketch_k"])
+    charts = generate_synthetic_dataset(
+        n_total=stop - start,
+        seed=(params["seed"] << 32) + start,
+        n_planets=params["n_planets"],
+        stratify_by_jieqi=params["stratify_by_jieqi"],
+    )
+    agg.update(charts)
+    records: List[Dict[str, Any]] = []
+    if params["include_charts"]:
+        records = [
+            {
+                "index": start + k,
+                "jieqi_index": c.jieqi_index,
+                "lunar_index": c.lunar_index,
+                "h_raw": c.h_raw,
+                "h_calibrated": c.h_calibrated,
+                "quality": c.quality,
+                "n_tension": c.n_tension,
+                "dominant_west": c.dominant_west,
+                "dominant_bazi": c.dominant_bazi,
+                "resonance_axis": c.resonance_axis,
+            }
+            for k, c in enumerate(charts)
+        ]
+    return records, agg
+
+
+def _research_summary(params: Dict[str, Any], agg: PhaseStatsAggregator) -> Dict[str, Any]:
+    features = {}
+    for feature, element in ALL_FEATURES:
+        name = feature if element is None else f"{feature}:{element}"
+        features[name] = {
+            phase: asdict(stats) for phase, stats in agg.feature_stats(feature, element).items()
+        }
+    return {
+        "n_total": agg.n,
+        "phase_attr": agg.phase_attr,
+        "bias": asdict(agg.bias_report()),
+        "zone_frequencies": agg.zone_frequencies(),
+        "features": features,
+    }
+
+
+register_job_type(JobType(
+    "batch_chart",
+    count=lambda p: len(p["charts"]),
+    run_chunk=_batch_chart_chunk,
+    default_chunk=50,
+))
+register_job_type(JobType(
+    "transit_scan",
+    count=_scan_count,
+    run_chunk=_transit_scan_chunk,
+    default_chunk=240,
+))
+register_job_type(JobType(
+    "research_run",
+    count=lambda p: p["n_total"],
+    run_chunk=_research_chunk,
+    finish=_research_summary,
+    default_chunk=2400,
+))
+
+
+# ── Endpoints ────────────────────────────────────────────────────────────────
+
+def _job_response(job_id: str) -> Dict[str, Any]:
+    job = get_job_store().get(job_id)
+    if job is None:
+        raise NotFoundError(f"Unknown job_id {job_id!r}", detail={"job_id": job_id})
+    return {**job.to_dict(), "result_url": f"/jobs/{job_id}/result"}
+
+
+@router.post("", response_model=JobResponse)
+def submit_job(req: JobRequest = Body(...)) -> Dict[str, Any]:
+    """Enqueue a job; poll GET /jobs/{job_id} for progress. 429 if the queue is full."""
+    caps = JobCaps.from_env()
+    if req.caps is not None:
+        caps = caps.limit(max_seconds=req.caps.max_seconds, max_result_bytes=req.caps.max_result_bytes)
+    params = req.model_dump(exclude={"format", "chunk_size", "caps", "type"})
+    job = get_job_store().submit(req.type, params, fmt=req.format, chunk_size=req.chunk_size, caps=caps)
+    notify_job_workers()
+    return respond(_job_response(job.job_id))
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: str = Path(..., pattern=JOB_ID_PATTERN, description="ID returned by POST /jobs"),
+) -> Dict[str, Any]:
+    """Status and progress of a job."""
+    return respond(_job_response(job_id))
+
+
+@router.get("/{job_id}/result", response_class=StreamingResponse, include_in_schema=False)
+def get_job_result(
+    job_id: str = Path(..., pattern=JOB_ID_PATTERN, description="ID returned by POST /jobs"),
+) -> StreamingResponse:
+    """Result file up to the last checkpoint, also while the job is running."""
+    _job_response(job_id)
+    return StreamingResponse(get_job_store().iter_result(job_id), media_type="application/x-ndjson")
+
+
+@router.delete("/{job_id}", response_model=JobDeleteResponse)
+def delete_job(
+    job_id: str = Path(..., pattern=JOB_ID_PATTERN, description="ID returned by POST /jobs"),
+) -> Dict[str, Any]:
+    """Delete a queued or finished job and its result file. 409 while the job is running."""
+    if not get_job_store().delete(job_id):
+        raise NotFoundError(f"Unknown job_id {job_id!r}", detail={"job_id": job_id})
+    return respond({"job_id": job_id, "deleted": True})
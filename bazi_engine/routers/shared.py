@@ -5,12 +5,23 @@ Extracted from app.py to avoid duplication. Imported by individual routers.
 """
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional, Union
 
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+_orjson: Any
+try:  # optional: pip install bazi_engine[fast]
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    _orjson = None
+
 from ..types import Pillar
 from ..constants import STEMS, BRANCHES
+from ..exc import CalculationError
 
 ZODIAC_SIGNS_DE = [
     "Widder", "Stier", "Zwillinge", "Krebs", "Löwe", "Jungfrau",
@@ -53,3 +64,76 @@ class ProvenanceResponse(BaseModel):
     zodiac_mode: str
     computation_timestamp: str
     parameter_set: Optional[Dict[str, Any]] = None
+
+
+# ── Fast response path ───────────────────────────────────────────────────────
+#
+# By default FastAPI validates every returned dict against the route's
+# response_model and re-encodes it with jsonable_encoder — a second full walk
+# of the nested payload. With BAZI_FAST_RESPONSES=1, endpoints that opt in
+# return the dict pre-encoded instead; conformance to the response model is
+# enforced by tests/test_fast_responses.py rather than per request.
+
+FAST_RESPONSES_ENV = "BAZI_FAST_RESPONSES"
+
+
+def fast_responses_enabled() -> bool:
+    return os.environ.get(FAST_RESPONSES_ENV, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _non_finite_path(obj: Any) -> Optional[List[Union[str, int]]]:
+    """Keys leading to the first NaN/Infinity in ``obj``, or None if there is none."""
+    if isinstance(obj, float):
+        return None if math.isfinite(obj) else []
+    if isinstance(obj, dict):
+        items: Any = obj.items()
+    elif isinstance(obj, (list, tuple)):
+        # Numeric lists (the bulk of large payloads) are checked in one
+        # sum(); anything else raises TypeError and is walked item by item.
+        try:
+            if math.isfinite(sum(obj)):
+                return None
+        except (TypeError, OverflowError):
+            pass
+        items = enumerate(obj)
+    else:
+        return None
+    for key, value in items:
+        path = _non_finite_path(value)
+        if path is not None:
+            return [key, *path]
+    return None
+
+
+def dumps_compact(content: Any) -> bytes:
+    """UTF-8 JSON without whitespace; orjson when installed, else json.
+
+    NaN and Infinity are not JSON. orjson would write them as null and json
+    (allow_nan=False) would raise ValueError, so both paths reject them
+    up front with the same CalculationError.
+    """
+    path = _non_finite_path(content)
+    if path is not None:
+        raise CalculationError(
+            "Result contains a non-finite number (NaN or Infinity)",
+            detail={"path": path},
+        )
+    if _orjson is not None:
+        return _orjson.dumps(content)  # type: ignore[no-any-return]
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson when installed, else compact json."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_compact(content)
+
+
+def respond(payload: Dict[str, Any]) -> Any:
+    """Return payload as-is (validated by FastAPI) or, in fast mode, pre-encoded."""
+    if fast_responses_enabled():
+        return FastJSONResponse(payload)
+    return payload
@@ -3,7 +3,7 @@ routers/transit.py — Transit API endpoints.
 
 GET  /transit/now        — Current planetary positions.
 GET  /transit/timeline   — Multi-day transit forecast.
-POST /transit/state      — Personalized transit state.
+POST /transit/state      — Personalized transit state (soulprint or ?chart_id=).
 POST /transit/narrative  — Text generation from transit state.
 """
 from __future__ import annotations
@@ -14,7 +14,11 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Query
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-from ..transit import compute_transit_now, compute_transit_state, compute_transit_timeline
+from ..exc import InputError, NotFoundError
+from ..services.chart_store import CHART_ID_PATTERN, get_chart_store
+from ..transit import (
+    compute_transit_now, compute_transit_state, compute_transit_timeline, natal_soulprint,
+)
 from ..narrative import generate_narrative
 
 router = APIRouter(prefix="/transit", tags=["Transit"])
@@ -83,12 +87,17 @@ class NarrativeResponse(BaseModel):
 class TransitStateRequest(BaseModel):
     model_config = ConfigDict(allow_inf_nan=False)
 
-    soulprint_sectors: List[float] = Field(..., min_length=12, max_length=12)
+    soulprint_sectors: Optional[List[float]] = Field(
+        None, min_length=12, max_length=12,
+        description="12-sector user soulprint. Omit when passing ?chart_id=.",
+    )
     quiz_sectors: List[float] = Field(..., min_length=12, max_length=12)
 
     @field_validator("soulprint_sectors", "quiz_sectors")
     @classmethod
-    def validate_sector_values(cls, v: List[float]) -> List[float]:
+    def validate_sector_values(cls, v: Optional[List[float]]) -> Optional[List[float]]:
+        if v is None:
+            return v
         for i, val in enumerate(v):
             if val < 0 or val > 1:
                 raise ValueError(f"Element {i} = {val} not in range [0, 1]")
@@ -101,7 +110,7 @@ class TransitEvent(BaseModel):
 
     type: str = Field(
         ...,
-        pattern=r"^(resonance_jump|dominance_shift|moon_event)$",
+        pattern=r"^(resonance_jump|dominance_shift|moon_event|lunar_phase)$",
         description="Event type identifier.",
     )
     priority: int = Field(..., ge=1, le=99, description="Priority (1 = highest).")
@@ -192,10 +201,33 @@ def transit_now(
 
 
 @router.post("/state", response_model=TransitStateResponse)
-def transit_state(body: TransitStateRequest) -> Dict[str, Any]:
+def transit_state(
+    body: TransitStateRequest,
+    chart_id: Optional[str] = Query(
+        None,
+        pattern=CHART_ID_PATTERN,
+        description="Stored chart (POST /chart with persist=true) to derive the soulprint from.",
+    ),
+) -> Dict[str, Any]:
     """Personalized transit state combining current transits with user profile."""
+    soulprint = body.soulprint_sectors
+    if chart_id is not None:
+        if soulprint is not None:
+            raise InputError(
+                "Pass either soulprint_sectors or chart_id, not both",
+                detail={"parameter": "chart_id"},
+            )
+        chart = get_chart_store().get(chart_id)
+        if chart is None:
+            raise NotFoundError(f"Unknown chart_id {chart_id!r}", detail={"chart_id": chart_id})
+        soulprint = natal_soulprint(chart.get("positions", []))
+    if soulprint is None:
+        raise InputError(
+            "soulprint_sectors is required unless chart_id is given",
+            detail={"parameter": "soulprint_sectors"},
+        )
     return compute_transit_state(
-        soulprint_sectors=body.soulprint_sectors,
+        soulprint_sectors=soulprint,
         quiz_sectors=body.quiz_sectors,
     )
 
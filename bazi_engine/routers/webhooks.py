@@ -3,10 +3,8 @@ routers/webhooks.py — POST /api/webhooks/chart (ElevenLabs voice agent integra
 """
 from __future__ import annotations
 
-import json
 import os
-from datetime import timezone
-from typing import Any, Dict, List, Literal, Optional, cast
+from typing import Any, Dict, List, Literal, Optional
 
 from fastapi import APIRouter, Header, HTTPException, Request
 from pydantic import BaseModel, Field
@@ -14,12 +12,12 @@ from pydantic import BaseModel, Field
 from ..bazi import compute_bazi
 from ..exc import BaziEngineError
 from ..fusion import compute_fusion_analysis
-from ..time_utils import resolve_local_iso, LocalTimeError
-from ..types import BaziInput, Fold
+from ..time_utils import normalize_birth_input, LocalTimeError
+from ..sun_sign import sun_sign_at
 from ..western import compute_western_chart
 from ..services.geocoding import geocode_place
 from ..services.auth import verify_request_auth
-from .shared import ZODIAC_SIGNS_DE, format_pillar
+from .shared import ZODIAC_SIGNS_DE, format_pillar, respond
 
 router = APIRouter(prefix="/api", tags=["Webhooks"])
 
@@ -62,18 +60,21 @@ class WebhookEasternSection(BaseModel):
     dayMaster: str
     hourAnimal: str
     hourElement: str
+    solarYear: int
+    isBeforeLiChun: bool
+    lichunNext: Optional[str] = None
 
 
 class WebhookFusionSection(BaseModel):
     harmonyIndex: float
     harmonyInterpretation: str
-    cosmicState: str
+    cosmicState: float
     westernDominantElement: str
     baziDominantElement: str
     wuXingWestern: Dict[str, float]
     wuXingBazi: Dict[str, float]
     elementalComparison: Dict[str, Any]
-    interpretation: Dict[str, Any]
+    interpretation: str
 
 
 class WebhookSummary(BaseModel):
@@ -117,8 +118,7 @@ async def elevenlabs_chart_webhook(
         raise HTTPException(status_code=401, detail="Invalid authentication")
 
     try:
-        data = json.loads(raw_body)
-        req = ElevenLabsChartRequest(**data)
+        req = ElevenLabsChartRequest.model_validate_json(raw_body)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid request: {e}")
 
@@ -144,32 +144,24 @@ async def elevenlabs_chart_webhook(
     datetime_str = f"{req.birthDate}T{birth_time}:00"
 
     try:
-        dt, time_res = resolve_local_iso(
-            datetime_str, tz,
+        birth = normalize_birth_input(
+            datetime_str, tz, lon, lat,
             ambiguous=req.ambiguousTime, nonexistent=req.nonexistentTime,
         )
-        dt_utc = dt.astimezone(timezone.utc)
+        time_res = birth.resolution
+        dt_utc = birth.utc_dt
 
-        western_chart = compute_western_chart(dt_utc, lat, lon)
+        # Only signs are reported: interpolated positions are plenty.
+        western_chart = compute_western_chart(dt_utc, lat, lon, exact=False)
         bodies = western_chart.get("bodies", {})
-        sun = bodies.get("Sun", {})
         moon = bodies.get("Moon", {})
 
-        sun_sign_idx  = int(sun.get("zodiac_sign", 0))
+        # Interpolated longitudes can land on the wrong side of an ingress;
+        # the sign itself comes from the exact ingress table.
+        sun_sign_idx  = sun_sign_at(dt_utc)
         moon_sign_idx = int(moon.get("zodiac_sign", 0))
 
-        resolved_naive_iso = dt.replace(tzinfo=None).isoformat()
-        inp = BaziInput(
-            birth_local=resolved_naive_iso,
-            timezone=tz,
-            longitude_deg=lon,
-            latitude_deg=lat,
-            time_standard="CIVIL",
-            day_boundary="midnight",
-            strict_local_time=True,
-            fold=cast(Fold, time_res.fold),
-        )
-        bazi_result = compute_bazi(inp)
+        bazi_result = compute_bazi(birth.bazi_input())
 
         year_pillar  = format_pillar(bazi_result.pillars.year)
         month_pillar = format_pillar(bazi_result.pillars.month)
@@ -203,7 +195,7 @@ async def elevenlabs_chart_webhook(
         if time_res.warning:
             warnings.append(time_res.warning)
 
-        return {
+        return respond({
             "western": {
                 "sunSign":             ZODIAC_SIGNS_DE[sun_sign_idx],
                 "moonSign":            ZODIAC_SIGNS_DE[moon_sign_idx],
@@ -265,7 +257,7 @@ async def elevenlabs_chart_webhook(
                     "birthPlace": req.birthPlace, "geocoded": geo_result,
                 },
             },
-        }
+        })
 
     except LocalTimeError as e:
         raise HTTPException(status_code=422, detail={
@@ -0,0 +1,186 @@
+"""
+services/chart_store.py — Local SQLite store for computed charts.
+
+Charts are deterministic in their inputs, so a chart computed once can be
+served again by key instead of being recomputed. Each chart is stored under
+a content-hash ID derived from the normalized request, the engine version
+and the parameter set; a changed engine therefore never serves stale
+charts, it simply misses.
+
+Storage: one SQLite file (WAL journal, one connection per thread), local
+only — no network database. Payloads are compact canonical JSON compressed
+with zlib, prefixed by a one-byte codec tag so the encoding can evolve.
+
+Size: the store keeps at most CHART_STORE_MAX_ROWS charts (default 100000,
+0 = unbounded). Every PRUNE_EVERY inserts, charts of other engine versions
+(which no new request maps to) are evicted first, then the oldest by
+created_at, so the table can overshoot the cap by fewer than PRUNE_EVERY
+rows. CHART_STORE_TTL_SECONDS (default 0 = off) additionally expires charts
+by age. An evicted chart_id answers 404; persisting the same request again
+with the same engine version recreates it under the same ID.
+
+Location: CHART_STORE_PATH, default ~/.cache/bazi_engine/charts.sqlite3.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+CHART_ID_PATTERN = r"^[0-9a-f]{32}$"
+
+_CODEC_ZLIB_JSON = b"\x01"
+
+DEFAULT_MAX_ROWS = 100_000
+PRUNE_EVERY = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS charts (
+    chart_id       TEXT PRIMARY KEY,
+    engine_version TEXT NOT NULL,
+    created_at     INTEGER NOT NULL,
+    payload        BLOB NOT NULL
+) WITHOUT ROWID
+"""
+_INDEX = "CREATE INDEX IF NOT EXISTS charts_created ON charts (created_at)"
+
+
+def _canonical(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def chart_id_for(request: Dict[str, Any], *, engine_version: str, parameter_set_id: str) -> str:
+    """Content-hash chart ID: 128-bit SHA-256 prefix over the normalized request."""
+    material = {"engine": engine_version, "params": parameter_set_id, "request": request}
+    return hashlib.sha256(_canonical(material)).hexdigest()[:32]
+
+
+def encode_payload(payload: Dict[str, Any]) -> bytes:
+    return _CODEC_ZLIB_JSON + zlib.compress(_canonical(payload), 6)
+
+
+def decode_payload(blob: bytes) -> Dict[str, Any]:
+    codec, body = blob[:1], blob[1:]
+    if codec != _CODEC_ZLIB_JSON:
+        raise ValueError(f"Unknown chart payload codec {codec!r}")
+    result: Dict[str, Any] = json.loads(zlib.decompress(body))
+    return result
+
+
+class ChartStore:
+    """Key-value store chart_id → chart payload on a local SQLite file.
+
+    ``max_rows`` and ``ttl_seconds`` default to CHART_STORE_MAX_ROWS and
+    CHART_STORE_TTL_SECONDS; 0 disables the limit.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_rows: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if max_rows is None:
+            max_rows = int(os.environ.get("CHART_STORE_MAX_ROWS", DEFAULT_MAX_ROWS))
+        if ttl_seconds is None:
+            ttl_seconds = float(os.environ.get("CHART_STORE_TTL_SECONDS", 0))
+        self.max_rows = max_rows
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._inserts = 0
+        self._inserts_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+            conn.execute(_INDEX)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, chart_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            "SELECT payload FROM charts WHERE chart_id = ?", (chart_id,),
+        ).fetchone()
+        return None if row is None else decode_payload(row[0])
+
+    def put(self, chart_id: str, payload: Dict[str, Any], *, engine_version: str) -> None:
+        """Store a chart; an existing entry for the same ID is kept.
+
+        Every PRUNE_EVERY inserts the size limits are applied (``prune``).
+        """
+        inserted = self._connect().execute(
+            "INSERT OR IGNORE INTO charts (chart_id, engine_version, created_at, payload) "
+            "VALUES (?, ?, ?, ?)",
+            (chart_id, engine_version, int(time.time()), encode_payload(payload)),
+        ).rowcount
+        if not inserted:
+            return
+        with self._inserts_lock:
+            self._inserts += 1
+            due = self._inserts % PRUNE_EVERY == 0
+        if due:
+            self.prune(engine_version=engine_version)
+
+    def prune(self, *, engine_version: str, now: Optional[float] = None) -> int:
+        """Apply the TTL and the row cap; returns the number of evicted charts.
+
+        Over the cap, charts of engine versions other than ``engine_version``
+        go first, then the oldest.
+        """
+        conn = self._connect()
+        evicted = 0
+        if self.ttl_seconds > 0:
+            cutoff = (time.time() if now is None else now) - self.ttl_seconds
+            evicted += conn.execute("DELETE FROM charts WHERE created_at < ?", (cutoff,)).rowcount
+        if self.max_rows > 0:
+            excess = len(self) - self.max_rows
+            if excess > 0:
+                evicted += conn.execute(
+                    "DELETE FROM charts WHERE chart_id IN (SELECT chart_id FROM charts "
+                    "ORDER BY engine_version = ?, created_at LIMIT ?)",
+                    (engine_version, excess),
+                ).rowcount
+        return evicted
+
+    def __contains__(self, chart_id: object) -> bool:
+        return self._connect().execute(
+            "SELECT 1 FROM charts WHERE chart_id = ?", (chart_id,),
+        ).fetchone() is not None
+
+    def __len__(self) -> int:
+        return int(self._connect().execute("SELECT COUNT(*) FROM charts").fetchone()[0])
+
+    def journal_mode(self) -> str:
+        return str(self._connect().execute("PRAGMA journal_mode").fetchone()[0])
+
+
+def _default_path() -> Path:
+    env = os.environ.get("CHART_STORE_PATH")
+    if env:
+        return Path(env)
+    return Path.home() / ".cache" / "bazi_engine" / "charts.sqlite3"
+
+
+@lru_cache(maxsize=8)
+def _store_for(path: str) -> ChartStore:
+    return ChartStore(path)
+
+
+def get_chart_store() -> ChartStore:
+    """Process-wide store for the configured path (CHART_STORE_PATH)."""
+    return _store_for(str(_default_path()))
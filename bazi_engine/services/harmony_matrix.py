@@ -0,0 +1,210 @@
+"""
+services/harmony_matrix.py — Harmony / cosmic_state matrices between many charts.
+
+``/calculate/fusion`` compares one chart's western (planet) Wu-Xing vector
+with its own BaZi vector. The matrix generalises this to pairs of charts:
+cell (i, j) compares the western vector of row chart i with the BaZi vector
+of column chart j, so the diagonal of an all-pairs matrix is each chart's
+own fusion result (``harmony_index``, ``cosmic_state``, ``calibration``).
+
+Each chart's vectors are computed once (``ChartVectors``). A block of rows
+is then one matrix product of unit vectors, W[rows] · Bᵀ, and the baseline
+calibration of ``calibrate_harmony`` is applied cell-wise with array
+arithmetic: the baseline depends only on the row's planet count and the
+column's Qi count, so it is a table gathered by (row, column) density.
+With numpy installed blocks are computed vectorized; without it the same
+blocks are computed in pure Python.
+
+Cell quality follows ``calibrate_harmony``: "degenerate" if the row's
+western or the column's BaZi vector is zero (H_calibrated and sigma_above
+are then 0), "sparse" if the row has < 3 planets or the column < 4 Qi
+contributions, else "ok". It is not materialised per cell; ``n_west`` and
+``n_bazi`` of the charts carry it.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from operator import mul
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from ..wuxing.analysis import calculate_wuxing_from_bazi, calculate_wuxing_vector_from_planets
+from ..wuxing.calibration import harmony_baseline, input_density
+from ..wuxing.constants import WUXING_ORDER
+from ..wuxing.vector import WuXingVector
+
+__all__ = ["ChartVectors", "HarmonyBlock", "harmony_blocks", "harmony_matrix"]
+
+#: Cells per block; rows per block = max(1, BLOCK_CELLS // columns).
+BLOCK_CELLS = 1 << 16
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - only without numpy
+        return None
+    return numpy
+
+
+@dataclass(frozen=True, slots=True)
+class ChartVectors:
+    """Raw Wu-Xing vectors and input density of one chart."""
+    western: WuXingVector
+    bazi: WuXingVector
+    n_west: int
+    n_bazi: int
+
+    @classmethod
+    def from_chart(
+        cls,
+        western_bodies: Mapping[str, Mapping[str, Any]],
+        bazi_pillars: Mapping[str, Any],
+        ascendant: Optional[float] = None,
+    ) -> ChartVectors:
+        """Vectors as ``compute_fusion_analysis`` derives them."""
+        n_west, n_bazi = input_density(western_bodies, bazi_pillars)
+        return cls(
+            western=calculate_wuxing_vector_from_planets(western_bodies, ascendant=ascendant),
+            bazi=calculate_wuxing_from_bazi(bazi_pillars),
+            n_west=n_west,
+            n_bazi=n_bazi,
+        )
+
+    @classmethod
+    def from_stored_chart(cls, payload: Mapping[str, Any]) -> ChartVectors:
+        """Vectors of a persisted ``POST /chart`` response (no ephemeris calls).
+
+        The western vector is rebuilt from the stored positions and the
+        stored Ascendant, as ``from_chart`` does for a birth input; the
+        stored ``wuxing.from_planets`` cannot be used because ``POST /chart``
+        derives it without the Ascendant (always a day chart). A chart
+        stored with a ``bodies`` filter only has those planets.
+        """
+        bodies = {
+            p["name"]: {"longitude": p["longitude_deg"], "is_retrograde": p.get("is_retrograde", False)}
+            for p in payload["positions"] if p.get("longitude_deg") is not None
+        }
+        ascendant = (payload.get("angles") or {}).get("Ascendant")
+        from_bazi = payload["wuxing"]["from_bazi"]
+        n_west, n_bazi = input_density(bodies, payload["bazi"]["pillars"])
+        return cls(
+            western=calculate_wuxing_vector_from_planets(bodies, ascendant=ascendant),
+            bazi=WuXingVector(*(float(from_bazi[e]) for e in WUXING_ORDER)),
+            n_west=n_west,
+            n_bazi=n_bazi,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class HarmonyBlock:
+    """Rows ``start`` .. ``start + len(harmony)`` of the matrices, as nested lists.
+
+    ``harmony`` and ``cosmic_state`` are rounded to 4 places like
+    ``harmony_index`` / ``cosmic_state`` of ``/calculate/fusion``;
+    ``h_calibrated`` (4 places) and ``sigma_above`` (3 places) match
+    ``calibrate_harmony`` applied to the cell's harmony.
+    """
+    start: int
+    harmony: List[List[float]]
+    cosmic_state: List[List[float]]
+    h_calibrated: List[List[float]]
+    sigma_above: List[List[float]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start": self.start,
+            "harmony": self.harmony,
+            "cosmic_state": self.cosmic_state,
+            "h_calibrated": self.h_calibrated,
+            "sigma_above": self.sigma_above,
+        }
+
+
+def _densities(ns: Sequence[int]) -> Tuple[List[int], List[int]]:
+    """Distinct values of ``ns`` and the position of each element among them."""
+    values = sorted(set(ns))
+    pos = {n: i for i, n in enumerate(values)}
+    return values, [pos[n] for n in ns]
+
+
+def harmony_blocks(
+    rows: Sequence[ChartVectors],
+    columns: Sequence[ChartVectors],
+    *,
+    block_cells: Optional[int] = None,
+) -> Iterator[HarmonyBlock]:
+    """Harmony matrices of ``rows`` × ``columns`` in blocks of whole rows.
+
+    ``block_cells`` bounds the cells per block (default ``BLOCK_CELLS``).
+    """
+    if not rows or not columns:
+        return
+    step = max(1, (block_cells or BLOCK_CELLS) // len(columns))
+    w_levels, w_pos = _densities([r.n_west for r in rows])
+    b_levels, b_pos = _densities([c.n_bazi for c in columns])
+    # Baseline mean/std for every (distinct n_west, distinct n_bazi) pair.
+    table = [[harmony_baseline(nw, nb) for nb in b_levels] for nw in w_levels]
+    w_unit = [r.western.normalize().to_list() for r in rows]
+    b_unit = [c.bazi.normalize().to_list() for c in columns]
+    w_zero = [r.western.magnitude() == 0.0 for r in rows]
+    b_zero = [c.bazi.magnitude() == 0.0 for c in columns]
+
+    np = _numpy()
+    if np is not None:
+        mean = np.array([[m for m, _ in line] for line in table])
+        std = np.array([[s for _, s in line] for line in table])
+        wn, bn = np.array(w_unit), np.array(b_unit)
+        wp, bp = np.array(w_pos), np.array(b_pos)
+        wz, bz = np.array(w_zero), np.array(b_zero)
+        for start in range(0, len(rows), step):
+            stop = min(start + step, len(rows))
+            dot = np.round(wn[start:stop] @ bn.T, 4)
+            h = np.maximum(dot, 0.0)
+            cell = (wp[start:stop, None], bp[None, :])
+            base, sigma = mean[cell], std[cell]
+            valid = ~(wz[start:stop, None] | bz[None, :]) & (sigma >= 1e-9)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                h_cal = np.where(valid, np.clip((h - base) / (1.0 - base), 0.0, 1.0), 0.0)
+                z = np.where(valid, (h - base) / sigma, 0.0)
+            yield HarmonyBlock(
+                start=start,
+                harmony=(h + 0.0).tolist(),
+                cosmic_state=(dot + 0.0).tolist(),
+                h_calibrated=np.round(h_cal, 4).tolist(),
+                sigma_above=np.round(z, 3).tolist(),
+            )
+        return
+
+    for start in range(0, len(rows), step):
+        stop = min(start + step, len(rows))
+        block = HarmonyBlock(start, [], [], [], [])
+        for i in range(start, stop):
+            w, line = w_unit[i], table[w_pos[i]]
+            dots = [round(sum(map(mul, w, b)), 4) for b in b_unit]
+            harmony = [max(0.0, d) for d in dots]
+            cal: List[float] = []
+            sig: List[float] = []
+            for j, h in enumerate(harmony):
+                base, sigma = line[b_pos[j]]
+                if w_zero[i] or b_zero[j] or sigma < 1e-9:
+                    cal.append(0.0)
+                    sig.append(0.0)
+                else:
+                    cal.append(round(max(0.0, min(1.0, (h - base) / (1.0 - base))), 4))
+                    sig.append(round((h - base) / sigma, 3))
+            block.harmony.append(harmony)
+            block.cosmic_state.append(dots)
+            block.h_calibrated.append(cal)
+            block.sigma_above.append(sig)
+        yield block
+
+
+def harmony_matrix(rows: Sequence[ChartVectors], columns: Sequence[ChartVectors]) -> HarmonyBlock:
+    """The full ``rows`` × ``columns`` matrices as one block."""
+    out = HarmonyBlock(0, [], [], [], [])
+    for block in harmony_blocks(rows, columns):
+        out.harmony.extend(block.harmony)
+        out.cosmic_state.extend(block.cosmic_state)
+        out.h_calibrated.extend(block.h_calibrated)
+        out.sigma_above.extend(block.sigma_above)
+    return out
@@ -0,0 +1,681 @@
+"""
+services/jobs.py — Local background job queue for long-running workloads.
+
+Batch charts, research dataset runs and multi-month transit scans do not fit
+into one HTTP request on a single-CPU machine. They are submitted as jobs to
+a queue kept in a local SQLite file (no broker) and executed by a small pool
+of worker threads — in a separate worker process or in the API process.
+
+A job type is a set of callbacks registered with ``register_job_type``: the
+number of items a job has, a function computing items ``[start, stop)`` and
+an optional summary. The runner processes a job in chunks; after every chunk
+the records are appended to the job's result file and the checkpoint (items
+done, bytes written, elapsed time, opaque type state) is committed in the
+same store. A job interrupted by a shutdown or a crash is requeued and
+continues from its last checkpoint — the result file is truncated to the
+checkpointed size, so no record is written twice.
+
+Result files (one per job, next to the store):
+    ndjson    one JSON record per line
+    columnar  one line per chunk: {"start", "count", "columns": {field: [values]}}
+A summary, if the job type produces one, is appended as {"summary": {...}}.
+
+Resource caps are enforced per job between chunks: number of items (at
+submission), cumulative compute time and result size. Jobs that exceed a cap
+fail with error ``resource_cap``; results written so far stay readable.
+The queue itself holds at most ``max_queued`` waiting jobs (JOB_MAX_QUEUED);
+further submissions are rejected with 429 until workers catch up.
+
+Finished jobs (row and result file) are deleted by the runner once they are
+older than JOB_RETENTION_SECONDS (default 7 days; 0 keeps them forever);
+DELETE /jobs/{job_id} removes one earlier.
+
+Location: JOB_STORE_PATH, default ~/.cache/bazi_engine/jobs.sqlite3.
+
+Workers: JOB_WORKERS threads in the API process, default 0. Chunks are
+CPU-bound and hold the GIL, so workers inside the API process slow down
+every request for as long as a job runs. Run them as their own process
+instead, against the same JOB_STORE_PATH:
+
+    python -m bazi_engine.worker --workers 1
+
+Setting JOB_WORKERS=1 on the API is the single-process alternative (one
+container, no extra service) at the cost of request latency during jobs.
+Without any worker, submitted jobs stay queued.
+"""
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..exc import BaziEngineError, ConflictError, InputError, TooManyRequestsError
+from .metrics import register_gauge
+
+JOB_ID_PATTERN = r"^[0-9a-f]{32}$"
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+FINISHED_STATUSES = ("succeeded", "failed")
+RESULT_FORMATS = ("ndjson", "columnar")
+
+DEFAULT_MAX_ITEMS = 100_000
+DEFAULT_MAX_SECONDS = 3600.0
+DEFAULT_MAX_RESULT_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_QUEUED = 32
+DEFAULT_RETENTION_SECONDS = 7 * 86400.0
+PURGE_INTERVAL_SECONDS = 600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id           TEXT PRIMARY KEY,
+    type             TEXT NOT NULL,
+    status           TEXT NOT NULL,
+    params           TEXT NOT NULL,
+    format           TEXT NOT NULL,
+    chunk_size       INTEGER NOT NULL,
+    total            INTEGER NOT NULL,
+    done             INTEGER NOT NULL DEFAULT 0,
+    result_bytes     INTEGER NOT NULL DEFAULT 0,
+    elapsed_seconds  REAL NOT NULL DEFAULT 0,
+    max_seconds      REAL NOT NULL,
+    max_result_bytes INTEGER NOT NULL,
+    state            BLOB,
+    error            TEXT,
+    owner            TEXT,
+    created_at       REAL NOT NULL,
+    started_at       REAL,
+    finished_at      REAL
+)
+"""
+_INDEX = "CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, created_at)"
+
+_COLUMNS = (
+    "job_id, type, status, params, format, chunk_size, total, done, result_bytes, "
+    "elapsed_seconds, max_seconds, max_result_bytes, error, owner, created_at, "
+    "started_at, finished_at"
+)
+
+
+# ── Job types ────────────────────────────────────────────────────────────────
+
+ChunkFn = Callable[[Dict[str, Any], int, int, Any], Tuple[List[Dict[str, Any]], Any]]
+
+
+@dataclass(frozen=True, slots=True)
+class JobType:
+    """Callbacks of one job type.
+
+    ``count(params)`` is the number of items; ``run_chunk(params, start, stop,
+    state)`` returns the records for items ``[start, stop)`` and the new state
+    (picklable, ``None`` initially); ``finish(params, state)`` returns an
+    optional summary record.
+    """
+
+    name: str
+    count: Callable[[Dict[str, Any]], int]
+    run_chunk: ChunkFn
+    finish: Optional[Callable[[Dict[str, Any], Any], Optional[Dict[str, Any]]]] = None
+    default_chunk: int = 100
+
+
+_job_types: Dict[str, JobType] = {}
+_job_types_lock = threading.Lock()
+
+
+def register_job_type(job_type: JobType) -> None:
+    """Make ``job_type`` available to submit and run (re-registering replaces)."""
+    with _job_types_lock:
+        _job_types[job_type.name] = job_type
+
+
+def get_job_type(name: str) -> Optional[JobType]:
+    with _job_types_lock:
+        return _job_types.get(name)
+
+
+# ── Caps and job records ─────────────────────────────────────────────────────
+
+@dataclass(frozen=True, slots=True)
+class JobCaps:
+    """Per-job resource limits; requests may lower but never raise them."""
+
+    max_items: int = DEFAULT_MAX_ITEMS
+    max_seconds: float = DEFAULT_MAX_SECONDS
+    max_result_bytes: int = DEFAULT_MAX_RESULT_BYTES
+    # Checked at submission against the whole queue, not stored per job.
+    max_queued: int = DEFAULT_MAX_QUEUED
+
+    @classmethod
+    def from_env(cls) -> JobCaps:
+        """Server limits: JOB_MAX_ITEMS, JOB_MAX_SECONDS, JOB_MAX_RESULT_BYTES, JOB_MAX_QUEUED."""
+        return cls(
+            max_items=int(os.environ.get("JOB_MAX_ITEMS", DEFAULT_MAX_ITEMS)),
+            max_seconds=float(os.environ.get("JOB_MAX_SECONDS", DEFAULT_MAX_SECONDS)),
+            max_result_bytes=int(os.environ.get("JOB_MAX_RESULT_BYTES", DEFAULT_MAX_RESULT_BYTES)),
+            max_queued=int(os.environ.get("JOB_MAX_QUEUED", DEFAULT_MAX_QUEUED)),
+        )
+
+    def limit(
+        self,
+        *,
+        max_seconds: Optional[float] = None,
+        max_result_bytes: Optional[int] = None,
+    ) -> JobCaps:
+        """Caps tightened by the requested values."""
+        return replace(
+            self,
+            max_seconds=min(self.max_seconds, max_seconds or self.max_seconds),
+            max_result_bytes=min(self.max_result_bytes, max_result_bytes or self.max_result_bytes),
+        )
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    """One row of the job table (without the type state)."""
+
+    job_id: str
+    type: str
+    status: str
+    params: Dict[str, Any]
+    format: str
+    chunk_size: int
+    total: int
+    done: int
+    result_bytes: int
+    elapsed_seconds: float
+    max_seconds: float
+    max_result_bytes: int
+    error: Optional[Dict[str, Any]]
+    owner: Optional[str]
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+    @classmethod
+    def from_row(cls, row: Tuple[Any, ...]) -> Job:
+        (job_id, type_, status, params, fmt, chunk_size, total, done, result_bytes,
+         elapsed, max_seconds, max_result_bytes, error, owner, created, started, finished) = row
+        return cls(
+            job_id, type_, status, json.loads(params), fmt, chunk_size, total, done,
+            result_bytes, elapsed, max_seconds, max_result_bytes,
+            None if error is None else json.loads(error), owner, created, started, finished,
+        )
+
+    @property
+    def progress(self) -> float:
+        return 1.0 if self.total == 0 else round(self.done / self.total, 4)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "type": self.type,
+            "status": self.status,
+            "format": self.format,
+            "chunk_size": self.chunk_size,
+            "total": self.total,
+            "done": self.done,
+            "progress": self.progress,
+            "result_bytes": self.result_bytes,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "caps": {
+                "max_seconds": self.max_seconds,
+                "max_result_bytes": self.max_result_bytes,
+            },
+            "error": self.error,
+            "created_at": _iso(self.created_at),
+            "started_at": _iso(self.started_at),
+            "finished_at": _iso(self.finished_at),
+        }
+
+
+def _line(record: Dict[str, Any]) -> bytes:
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def encode_records(records: List[Dict[str, Any]], fmt: str, start: int) -> bytes:
+    """Serialize one chunk of records in the job's result format."""
+    if fmt == "ndjson":
+        return b"".join(_line(r) for r in records)
+    if not records:
+        return b""
+    fields: Dict[str, None] = {}
+    for record in records:
+        fields.update(dict.fromkeys(record))
+    columns = {f: [r.get(f) for r in records] for f in fields}
+    return _line({"start": start, "count": len(records), "columns": columns})
+
+
+# ── Store ────────────────────────────────────────────────────────────────────
+
+class JobStore:
+    """Job table on a local SQLite file; result files in ``results_dir``."""
+
+    def __init__(self, path: str | Path, results_dir: str | Path | None = None) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.results_dir = Path(results_dir) if results_dir else self.path.with_suffix(".results")
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute(_SCHEMA)
+        conn.execute(_INDEX)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def result_path(self, job_id: str) -> Path:
+        return self.results_dir / f"{job_id}.ndjson"
+
+    def submit(
+        self,
+        type_name: str,
+        params: Dict[str, Any],
+        *,
+        fmt: str = "ndjson",
+        chunk_size: Optional[int] = None,
+        caps: Optional[JobCaps] = None,
+    ) -> Job:
+        """Enqueue a job.
+
+        Raises:
+            InputError: unknown type or format, or more items than ``caps.max_items``.
+            TooManyRequestsError: ``caps.max_queued`` jobs are already waiting.
+        """
+        job_type = get_job_type(type_name)
+        if job_type is None:
+            raise InputError(f"Unknown job type {type_name!r}", detail={"type": type_name})
+        if fmt not in RESULT_FORMATS:
+            raise InputError(f"Unknown result format {fmt!r}", detail={"format": fmt})
+        caps = caps or JobCaps.from_env()
+        total = job_type.count(params)
+        if total > caps.max_items:
+            raise InputError(
+                f"Job has {total} items, the limit is {caps.max_items}",
+                detail={"items": total, "max_items": caps.max_items},
+            )
+        job_id = uuid.uuid4().hex
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            queued = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            if queued >= caps.max_queued:
+                raise TooManyRequestsError(
+                    f"Job queue is full ({queued} jobs waiting), retry later",
+                    detail={"queued": queued, "max_queued": caps.max_queued},
+                )
+            conn.execute(
+                "INSERT INTO jobs (job_id, type, status, params, format, chunk_size, total, "
+                "max_seconds, max_result_bytes, created_at) VALUES (?, ?, 'queued', ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, type_name, json.dumps(params, sort_keys=True), fmt,
+                 chunk_size or job_type.default_chunk, total,
+                 caps.max_seconds, caps.max_result_bytes, time.time()),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        job = self.get(job_id)
+        assert job is not None
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._connect().execute(
+            f"SELECT {_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,),
+        ).fetchone()
+        return None if row is None else Job.from_row(row)
+
+    def count(self, status: str) -> int:
+        return int(self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = ?", (status,),
+        ).fetchone()[0])
+
+    def claim(self, owner: str) -> Optional[Job]:
+        """Mark the oldest queued job as running for ``owner`` and return it."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT job_id FROM jobs WHERE status = 'queued' ORDER BY created_at, rowid LIMIT 1",
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', owner = ?, "
+                    "started_at = COALESCE(started_at, ?) WHERE job_id = ?",
+                    (owner, time.time(), row[0]),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return None if row is None else self.get(row[0])
+
+    def load_state(self, job_id: str) -> Any:
+        row = self._connect().execute(
+            "SELECT state FROM jobs WHERE job_id = ?", (job_id,),
+        ).fetchone()
+        return None if row is None or row[0] is None else pickle.loads(row[0])
+
+    def checkpoint(self, job_id: str, *, done: int, result_bytes: int, elapsed: float, state: Any) -> None:
+        """Commit progress after a chunk; its records must already be on disk."""
+        self._connect().execute(
+            "UPDATE jobs SET done = ?, result_bytes = ?, elapsed_seconds = ?, state = ? WHERE job_id = ?",
+            (done, result_bytes, elapsed,
+             None if state is None else pickle.dumps(state, pickle.HIGHEST_PROTOCOL), job_id),
+        )
+
+    def finish(
+        self,
+        job_id: str,
+        status: str,
+        *,
+        result_bytes: Optional[int] = None,
+        elapsed: Optional[float] = None,
+        error: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Final status; the type state is no longer needed and is dropped."""
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, result_bytes = COALESCE(?, result_bytes), "
+            "elapsed_seconds = COALESCE(?, elapsed_seconds), error = ?, state = NULL, "
+            "finished_at = ? WHERE job_id = ?",
+            (status, result_bytes, elapsed, None if error is None else json.dumps(error),
+             time.time(), job_id),
+        )
+
+    def release(self, job_id: str) -> None:
+        """Return a running job to the queue (continues from its checkpoint)."""
+        self._connect().execute(
+            "UPDATE jobs SET status = 'queued', owner = NULL WHERE job_id = ? AND status = 'running'",
+            (job_id,),
+        )
+
+    def delete(self, job_id: str) -> bool:
+        """Delete a queued or finished job and its result file; False if it does not exist.
+
+        Raises:
+            ConflictError: the job is running (its worker still writes the result file).
+        """
+        deleted = self._connect().execute(
+            "DELETE FROM jobs WHERE job_id = ? AND status != 'running'", (job_id,),
+        ).rowcount
+        if not deleted:
+            if self.get(job_id) is None:
+                return False
+            raise ConflictError(
+                f"Job {job_id!r} is running and cannot be deleted",
+                detail={"job_id": job_id, "status": "running"},
+            )
+        self.result_path(job_id).unlink(missing_ok=True)
+        return True
+
+    def purge_finished(self, older_than: float) -> int:
+        """Delete finished jobs (rows and result files) that finished before ``older_than`` (epoch s)."""
+        conn = self._connect()
+        placeholders = ", ".join("?" * len(FINISHED_STATUSES))
+        job_ids = [row[0] for row in conn.execute(
+            f"SELECT job_id FROM jobs WHERE status IN ({placeholders}) AND finished_at < ?",
+            (*FINISHED_STATUSES, older_than),
+        )]
+        for job_id in job_ids:
+            conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            self.result_path(job_id).unlink(missing_ok=True)
+        return len(job_ids)
+
+    def requeue_orphans(self) -> int:
+        """Requeue running jobs whose owning process is gone (or was this PID before a restart)."""
+        conn = self._connect()
+        orphans = []
+        for job_id, owner in conn.execute("SELECT job_id, owner FROM jobs WHERE status = 'running'"):
+            pid = int(owner.rpartition(":")[0] or 0) if owner else 0
+            if pid == os.getpid() or not _pid_alive(pid):
+                orphans.append(job_id)
+        for job_id in orphans:
+            self.release(job_id)
+        return len(orphans)
+
+    def iter_result(self, job_id: str, chunk_bytes: int = 1 << 16) -> Iterator[bytes]:
+        """Checkpointed part of the result file (complete records only)."""
+        job = self.get(job_id)
+        if job is None or job.result_bytes == 0:
+            return
+        remaining = job.result_bytes
+        with open(self.result_path(job_id), "rb") as fh:
+            while remaining > 0:
+                data = fh.read(min(chunk_bytes, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# ── Runner ───────────────────────────────────────────────────────────────────
+
+class _ResourceCapExceeded(Exception):
+    def __init__(self, cap: str, limit: float) -> None:
+        super().__init__(f"Job exceeded {cap}={limit:g}")
+        self.cap = cap
+        self.limit = limit
+
+
+class JobRunner:
+    """Pool of worker threads executing queued jobs chunk by chunk.
+
+    Idle workers also apply the retention policy: at most every
+    PURGE_INTERVAL_SECONDS, finished jobs older than ``retention_seconds``
+    are deleted (``None`` reads JOB_RETENTION_SECONDS, 0 disables it).
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = 1,
+        poll_seconds: float = 1.0,
+        retention_seconds: Optional[float] = None,
+    ) -> None:
+        self.store = store
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        if retention_seconds is None:
+            retention_seconds = float(os.environ.get("JOB_RETENTION_SECONDS", DEFAULT_RETENTION_SECONDS))
+        self.retention_seconds = retention_seconds
+        self._next_purge = 0.0
+        self._purge_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        self.store.requeue_orphans()
+        self._stopping.clear()
+        for i in range(self.workers):
+            t = threading.Thread(target=self._loop, args=(i,), name=f"job-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop after the current chunk; running jobs go back to the queue."""
+        self._stopping.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        """Wake idle workers (called after a submission)."""
+        self._wake.set()
+
+    def _owner(self, worker: int) -> str:
+        return f"{os.getpid()}:{worker}"
+
+    def purge(self, now: Optional[float] = None) -> int:
+        """Apply the retention policy once; returns the number of deleted jobs."""
+        if self.retention_seconds <= 0:
+            return 0
+        now = time.time() if now is None else now
+        return self.store.purge_finished(now - self.retention_seconds)
+
+    def _maybe_purge(self) -> None:
+        if not self._purge_lock.acquire(blocking=False):
+            return
+        try:
+            now = time.time()
+            if now >= self._next_purge:
+                self._next_purge = now + PURGE_INTERVAL_SECONDS
+                self.purge(now)
+        finally:
+            self._purge_lock.release()
+
+    def _loop(self, worker: int) -> None:
+        while not self._stopping.is_set():
+            if self.run_once(worker) is None:
+                self._maybe_purge()
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+    def run_once(self, worker: int = 0) -> Optional[Job]:
+        """Claim and run one queued job in the calling thread; None if the queue is empty."""
+        job = self.store.claim(self._owner(worker))
+        if job is None:
+            return None
+        self._run(job)
+        return self.store.get(job.job_id)
+
+    def _run(self, job: Job) -> None:
+        store = self.store
+        job_type = get_job_type(job.type)
+        if job_type is None:
+            store.finish(job.job_id, "failed", error={
+                "error": "unknown_job_type", "message": f"No handler for job type {job.type!r}",
+                "detail": {"type": job.type},
+            })
+            return
+        done, size, elapsed = job.done, job.result_bytes, job.elapsed_seconds
+        path = store.result_path(job.job_id)
+        try:
+            state = store.load_state(job.job_id) if done else None
+            with open(path, "r+b" if path.exists() else "w+b") as fh:
+                fh.truncate(size)
+                fh.seek(size)
+
+                def append(data: bytes) -> None:
+                    nonlocal size
+                    if size + len(data) > job.max_result_bytes:
+                        raise _ResourceCapExceeded("max_result_bytes", job.max_result_bytes)
+                    fh.write(data)
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                    size += len(data)
+
+                while done < job.total:
+                    if self._stopping.is_set():
+                        store.release(job.job_id)
+                        return
+                    if elapsed > job.max_seconds:
+                        raise _ResourceCapExceeded("max_seconds", job.max_seconds)
+                    t0 = time.perf_counter()
+                    stop = min(done + job.chunk_size, job.total)
+                    records, state = job_type.run_chunk(job.params, done, stop, state)
+                    elapsed += time.perf_counter() - t0
+                    append(encode_records(records, job.format, done))
+                    done = stop
+                    store.checkpoint(job.job_id, done=done, result_bytes=size, elapsed=elapsed, state=state)
+
+                summary = job_type.finish(job.params, state) if job_type.finish else None
+                if summary is not None:
+                    append(_line({"summary": summary}))
+        except _ResourceCapExceeded as e:
+            store.finish(job.job_id, "failed", result_bytes=size, elapsed=elapsed, error={
+                "error": "resource_cap", "message": str(e),
+                "detail": {"cap": e.cap, "limit": e.limit, "done": done},
+            })
+            return
+        except BaziEngineError as e:
+            store.finish(job.job_id, "failed", result_bytes=size, elapsed=elapsed, error=e.to_dict())
+            return
+        except Exception as e:
+            store.finish(job.job_id, "failed", result_bytes=size, elapsed=elapsed, error={
+                "error": "internal_error", "message": f"{type(e).__name__}: {e}", "detail": {"done": done},
+            })
+            return
+        store.finish(job.job_id, "succeeded", result_bytes=size, elapsed=elapsed)
+
+
+# ── Process-wide instances ───────────────────────────────────────────────────
+
+def _default_path() -> Path:
+    env = os.environ.get("JOB_STORE_PATH")
+    if env:
+        return Path(env)
+    return Path.home() / ".cache" / "bazi_engine" / "jobs.sqlite3"
+
+
+@lru_cache(maxsize=8)
+def _store_for(path: str) -> JobStore:
+    return JobStore(path)
+
+
+def get_job_store() -> JobStore:
+    """Process-wide job store for the configured path (JOB_STORE_PATH)."""
+    return _store_for(str(_default_path()))
+
+
+_runner: Optional[JobRunner] = None
+
+
+def start_job_workers(workers: Optional[int] = None) -> Optional[JobRunner]:
+    """Register the queue gauges and start the worker pool (JOB_WORKERS threads, default 0)."""
+    global _runner
+    if workers is None:
+        workers = int(os.environ.get("JOB_WORKERS", "0"))
+    store = get_job_store()
+    register_gauge("bazi_jobs_queued", "Jobs waiting in the job queue.", lambda: store.count("queued"))
+    register_gauge("bazi_jobs_running", "Jobs currently being executed.", lambda: store.count("running"))
+    if workers <= 0 or _runner is not None:
+        return _runner
+    _runner = JobRunner(store, workers)
+    _runner.start()
+    return _runner
+
+
+def stop_job_workers(timeout: Optional[float] = 10.0) -> None:
+    global _runner
+    if _runner is not None:
+        _runner.stop(timeout)
+        _runner = None
+
+
+def notify_job_workers() -> None:
+    if _runner is not None:
+        _runner.notify()
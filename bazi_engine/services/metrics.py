@@ -0,0 +1,236 @@
+"""
+services/metrics.py — In-process metrics in the Prometheus text format.
+
+Everything is read from state the engine keeps anyway (timing histograms,
+cache counters, the AnyIO thread limiter, /proc); nothing here needs a
+client library or a push gateway.
+
+Families:
+    bazi_request_duration_seconds     histogram per route (always recorded)
+    bazi_stage_duration_seconds       histogram per pipeline stage (BAZI_TIMING=1)
+    bazi_ephemeris_calls_total        swe.*/skyfield.* call counts (BAZI_TIMING=1)
+    bazi_ephemeris_call_seconds_total time spent in those calls (BAZI_TIMING=1)
+    bazi_events_total                 other timing counters (cache hits, ...)
+    bazi_cache_{hits,misses}_total, bazi_cache_entries, bazi_cache_capacity,
+    bazi_cache_hit_ratio              per in-process cache
+    bazi_threadpool_*                 worker threads in use / capacity / queued
+    process_*                         RSS, peak RSS, CPU seconds, start time
+
+Further gauges (e.g. a job queue) plug in through ``register_gauge``.
+"""
+from __future__ import annotations
+
+import math
+import os
+import resource
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .. import __version__, timing
+from ..bafe.artifact_hash import default_hash_cache
+from ..bafe.canonical_json import fingerprint_cache_info
+from ..bafe.ruleset_loader import load_ruleset
+from ..ephemeris_cache import shared_position_cache
+from ..sun_sign import ingress_cache_info
+from ..time_utils import zone_cache_info
+from ..transit import transit_cache_info
+
+__all__ = ["CONTENT_TYPE", "register_gauge", "render_metrics"]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_START_TIME = time.time()
+
+# name -> (help, callback returning the current value)
+_gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+_gauges_lock = threading.Lock()
+
+
+def register_gauge(name: str, help_text: str, fn: Callable[[], float]) -> None:
+    """Expose ``fn()`` as gauge ``name`` on every scrape (re-registering replaces)."""
+    with _gauges_lock:
+        _gauges[name] = (help_text, fn)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _num(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Exposition:
+    """Collects samples grouped by family; HELP/TYPE emitted once per family."""
+
+    def __init__(self) -> None:
+        self._lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str,
+               samples: Iterable[Tuple[Mapping[str, str], float]], suffix: str = "") -> None:
+        rows = list(samples)
+        if not rows:
+            return
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {kind}")
+        for labels, value in rows:
+            self._lines.append(f"{name}{suffix}{_labels(labels)} {_num(value)}")
+
+    def histogram(self, name: str, help_text: str, label: str,
+                  snapshot: Mapping[str, Mapping[str, object]],
+                  split: Optional[Callable[[str], Dict[str, str]]] = None) -> None:
+        if not snapshot:
+            return
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} histogram")
+        for key in sorted(snapshot):
+            h = snapshot[key]
+            base = split(key) if split else {label: key}
+            buckets: List[Tuple[float, int]] = h["buckets"]  # type: ignore[assignment]
+            for le_ms, cumulative in buckets:
+                le = "+Inf" if math.isinf(le_ms) else _num(le_ms / 1e3)
+                self._lines.append(f"{name}_bucket{_labels({**base, 'le': le})} {cumulative}")
+            self._lines.append(f"{name}_sum{_labels(base)} {_num(h['sum_seconds'])}")  # type: ignore[arg-type]
+            self._lines.append(f"{name}_count{_labels(base)} {h['count']}")
+
+    def text(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+
+def _split_route(key: str) -> Dict[str, str]:
+    method, _, route = key.partition(" ")
+    return {"method": method, "route": route or "unmatched"}
+
+
+def _cache_stats() -> Dict[str, Dict[str, float]]:
+    caches: Dict[str, Dict[str, float]] = {}
+    for name, info in transit_cache_info().items():
+        caches[name] = {k: float(v) for k, v in info.items()}
+    pos = shared_position_cache().info()
+    caches["ephemeris_positions"] = {"hits": pos["hits"], "misses": pos["misses"], "size": pos["size"]}
+    caches["config_fingerprint"] = {k: float(v) for k, v in fingerprint_cache_info().items()}
+    caches["artifact_hash"] = {k: float(v) for k, v in default_hash_cache().info().items()}
+    ruleset = load_ruleset.cache_info()
+    caches["ruleset"] = {
+        "hits": ruleset.hits, "misses": ruleset.misses,
+        "size": ruleset.currsize, "maxsize": ruleset.maxsize or 0,
+    }
+    caches["sun_sign_ingress"] = {k: float(v) for k, v in ingress_cache_info().items()}
+    caches["zoneinfo"] = {k: float(v) for k, v in zone_cache_info().items()}
+    return caches
+
+
+def _threadpool() -> Optional[Dict[str, float]]:
+    """AnyIO default limiter (sync endpoints run there); None outside an event loop."""
+    try:
+        import anyio.to_thread
+
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        stats = limiter.statistics()
+    except Exception:
+        return None
+    return {
+        "busy": float(stats.borrowed_tokens),
+        "capacity": float(stats.total_tokens),
+        "queued": float(stats.tasks_waiting),
+    }
+
+
+def _rss_bytes() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as fh:
+            return float(int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _max_rss_bytes() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return float(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def render_metrics() -> str:
+    """Current metrics as a Prometheus text exposition (format 0.0.4)."""
+    out = _Exposition()
+
+    out.family("bazi_build_info", "gauge", "Engine version.", [({"version": __version__}, 1)])
+
+    out.histogram(
+        "bazi_request_duration_seconds", "End-to-end request latency per route.",
+        "route", timing.route_histograms().snapshot(), split=_split_route,
+    )
+    stages = timing.stage_histograms()
+    out.histogram(
+        "bazi_stage_duration_seconds", "Pipeline stage latency (recorded with BAZI_TIMING=1).",
+        "stage", stages.snapshot(),
+    )
+    totals = stages.counter_totals()
+    call_seconds = stages.call_seconds_totals()
+    out.family(
+        "bazi_ephemeris_calls_total", "counter", "Ephemeris calls (recorded with BAZI_TIMING=1).",
+        [({"call": k}, totals.get(k, 0)) for k in sorted(call_seconds)],
+    )
+    out.family(
+        "bazi_ephemeris_call_seconds_total", "counter", "Time spent in ephemeris calls.",
+        [({"call": k}, v) for k, v in sorted(call_seconds.items())],
+    )
+    out.family(
+        "bazi_events_total", "counter", "Other timing counters (recorded with BAZI_TIMING=1).",
+        [({"event": k}, v) for k, v in sorted(totals.items()) if k not in call_seconds],
+    )
+
+    caches = sorted(_cache_stats().items())
+    out.family("bazi_cache_hits_total", "counter", "Cache hits.",
+               [({"cache": n}, c["hits"]) for n, c in caches])
+    out.family("bazi_cache_misses_total", "counter", "Cache misses.",
+               [({"cache": n}, c["misses"]) for n, c in caches])
+    out.family("bazi_cache_hit_ratio", "gauge", "Hits / (hits + misses) since start.",
+               [({"cache": n}, c["hits"] / (c["hits"] + c["misses"]))
+                for n, c in caches if c["hits"] + c["misses"] > 0])
+    out.family("bazi_cache_entries", "gauge", "Entries currently cached.",
+               [({"cache": n}, c["size"]) for n, c in caches])
+    out.family("bazi_cache_capacity", "gauge", "Maximum number of entries.",
+               [({"cache": n}, c["maxsize"]) for n, c in caches if c.get("maxsize")])
+
+    pool = _threadpool()
+    if pool is not None:
+        out.family("bazi_threadpool_busy", "gauge", "Worker threads in use.", [({}, pool["busy"])])
+        out.family("bazi_threadpool_capacity", "gauge", "Worker thread limit.", [({}, pool["capacity"])])
+        out.family("bazi_threadpool_queued", "gauge", "Tasks waiting for a worker thread.",
+                   [({}, pool["queued"])])
+
+    with _gauges_lock:
+        gauges = sorted(_gauges.items())
+    for name, (help_text, fn) in gauges:
+        try:
+            value = float(fn())
+        except Exception:
+            continue
+        out.family(name, "gauge", help_text, [({}, value)])
+
+    rss = _rss_bytes()
+    if rss is not None:
+        out.family("process_resident_memory_bytes", "gauge", "Resident memory size in bytes.", [({}, rss)])
+    out.family("process_max_resident_memory_bytes", "gauge", "Peak resident memory size in bytes.",
+               [({}, _max_rss_bytes())])
+    out.family("process_cpu_seconds_total", "counter", "User and system CPU time in seconds.",
+               [({}, time.process_time())])
+    out.family("process_start_time_seconds", "gauge", "Start time since the Unix epoch in seconds.",
+               [({}, _START_TIME)])
+
+    return out.text()
@@ -0,0 +1,549 @@
+"""
+services/vector_index.py — Cosine-similarity index over Wu-Xing / sector vectors.
+
+"Which stored charts are most (or least) in harmony with this one?" is a
+nearest-neighbour query under the measure of ``calculate_harmony_index``:
+the dot product of L2-normalized vectors. The index normalizes vectors on
+insert, so the harmony of a query with every stored vector is a single
+matrix-vector product. Works for any dimension; 5 (Wu-Xing, WUXING_ORDER)
+and 12 (zodiac-sector soulprints) are the intended ones.
+
+Modes:
+    exact        brute force over all rows — the default, and the right
+                 choice up to a few hundred thousand vectors.
+    partitioned  after ``partition(n_lists)`` rows are grouped by spherical
+                 k-means; a query scans only the ``n_probe`` lists whose
+                 centroid is closest (harmony) or farthest (anti-harmony).
+    quantized    ``quantized=True`` stores int8 codes (round(x * 127))
+                 instead of float32: 4x smaller, scores within ~1e-2.
+
+Scores are raw cosines in [-1, 1] (``calculate_harmony_index`` additionally
+clamps at 0 and rounds to 4 places). With numpy installed the kernels run
+vectorized; without it the same code paths run in pure Python.
+
+Persistence: ``save(path)`` writes one flat file; ``VectorIndex.load(path)``
+memory-maps it, so a multi-million-row index opens without parsing and is
+paged in on demand. Adding to a loaded index copies it into memory first.
+
+File format (little-endian):
+  Header  ``<8sHHIQQI4x`` — magic, version, flags (1 = quantized), dim,
+          rows, next auto id, number of lists.
+  Data    ids int64[rows], centroids float32[lists * dim],
+          list of each row int32[rows] (only if lists > 0),
+          vectors float32 or int8 [rows * dim].
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import mmap
+import os
+import random
+import struct
+import sys
+import threading
+from array import array
+from dataclasses import dataclass
+from operator import mul
+from pathlib import Path
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from ..exc import InputError
+from ..wuxing.constants import WUXING_ORDER
+
+__all__ = ["Neighbor", "VectorIndex"]
+
+_MAGIC = b"BZVECIDX"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHHIQQI4x")
+_FLAG_QUANTIZED = 1
+_QSCALE = 127.0
+_BLOCK = 4096         # rows per matmul block (assignment, k-means, pairs)
+_SCAN_BLOCK = 1 << 16  # rows decoded at a time when scanning int8 codes
+
+
+@dataclass(frozen=True, slots=True)
+class Neighbor:
+    """One query hit: caller id and cosine similarity to the query."""
+    id: int
+    score: float
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - only without numpy
+        return None
+    return numpy
+
+
+def _as_floats(vector: Any, dim: int) -> List[float]:
+    """Components of a WuXingVector, element mapping or plain sequence."""
+    if hasattr(vector, "to_list"):
+        values = list(vector.to_list())
+    elif isinstance(vector, Mapping):
+        values = [vector[e] for e in WUXING_ORDER]
+    else:
+        values = list(vector)
+    if len(values) != dim:
+        raise InputError(f"Expected a {dim}-dimensional vector, got {len(values)} components",
+                         detail={"dim": dim, "got": len(values)})
+    return [float(x) for x in values]
+
+
+def _unit(values: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in values))
+    if norm == 0.0 or not math.isfinite(norm):
+        raise InputError("Cannot index a zero or non-finite vector (harmony is undefined)")
+    return [x / norm for x in values]
+
+
+class VectorIndex:
+    """In-process cosine index with top-k harmony / anti-harmony queries.
+
+    After ``partition`` the rows are stored grouped by list, so probing a
+    list scans one contiguous block; rows added later are kept in a small
+    per-list tail until the next ``partition`` or ``save``.
+
+    Thread-safe: inserts, partitioning and queries take one lock.
+    """
+
+    def __init__(self, dim: int, *, quantized: bool = False) -> None:
+        if dim < 1:
+            raise InputError("Vector dimension must be positive", detail={"dim": dim})
+        self.dim = dim
+        self.quantized = quantized
+        self._ids: Any = array("q")
+        self._vecs: Any = array("b" if quantized else "f")
+        self._centroids: Any = array("f")
+        self._assign: Any = array("i")
+        self._offsets: List[int] = []          # list bounds of the grouped rows
+        self._tail: List["array[int]"] = []    # rows added after grouping, per list
+        self._next_id = 0
+        self._mmap: Optional[mmap.mmap] = None
+        self._lock = threading.RLock()
+
+    # ── size / layout ─────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def n_lists(self) -> int:
+        """Number of k-means lists (0 = not partitioned, queries are exact)."""
+        return len(self._centroids) // self.dim
+
+    def nbytes(self) -> int:
+        """Bytes held by ids, vectors, centroids and list assignments."""
+        return sum(len(a) * a.itemsize for a in (self._ids, self._vecs, self._centroids, self._assign))
+
+    # ── insertion ─────────────────────────────────────────────────────────────
+
+    def add(self, vectors: Iterable[Any], ids: Optional[Iterable[int]] = None) -> List[int]:
+        """Normalize and append vectors; returns their ids.
+
+        ``vectors`` may be an (N, dim) numpy array, or an iterable of
+        WuXingVectors, element mappings or sequences. Without ``ids``,
+        consecutive ids after the largest one seen are assigned. Ids are
+        not checked for uniqueness. On a partitioned index new rows join
+        the list of their nearest centroid (centroids are not retrained).
+        """
+        np = _numpy()
+        unit: Any
+        if np is not None and type(vectors).__module__ == "numpy":
+            mat = np.asarray(vectors, dtype=np.float64).reshape(-1, self.dim)
+            norms = np.sqrt((mat * mat).sum(axis=1))
+            if not np.all(np.isfinite(norms) & (norms > 0)):
+                raise InputError("Cannot index a zero or non-finite vector (harmony is undefined)")
+            unit = mat / norms[:, None]
+        else:
+            unit = [_unit(_as_floats(v, self.dim)) for v in vectors]
+        n_new = len(unit)
+        given = None if ids is None else [int(i) for i in ids]
+        if given is not None and len(given) != n_new:
+            raise InputError("ids and vectors differ in length",
+                             detail={"ids": len(given), "vectors": n_new})
+        if not n_new:
+            return []
+
+        with self._lock:
+            new_ids = given if given is not None else list(range(self._next_id, self._next_id + n_new))
+            self._ensure_writable()
+            if type(unit).__module__ == "numpy":
+                encoded = (np.rint(unit * _QSCALE).astype(np.int8) if self.quantized
+                           else unit.astype(np.float32))
+                self._vecs.frombytes(encoded.tobytes())
+            else:
+                for row in unit:
+                    self._vecs.extend(self._encode(row))
+            first = len(self._ids)
+            self._ids.extend(new_ids)
+            self._next_id = max(self._next_id, max(new_ids) + 1)
+            if self.n_lists:
+                assign = self._nearest_lists(first, len(self._ids))
+                self._assign.extend(assign)
+                for row, lst in enumerate(assign, start=first):
+                    self._tail[lst].append(row)
+        return new_ids
+
+    def _encode(self, unit: Sequence[float]) -> Sequence[Union[int, float]]:
+        if self.quantized:
+            return [max(-127, min(127, round(x * _QSCALE))) for x in unit]
+        return unit
+
+    def _ensure_writable(self) -> None:
+        """Copy memory-mapped storage into growable arrays (once)."""
+        if self._mmap is None:
+            return
+        fresh = []
+        for view in (self._ids, self._vecs, self._centroids, self._assign):
+            a = array(view.format)
+            a.frombytes(view.tobytes())
+            fresh.append(a)
+            view.release()
+        self._ids, self._vecs, self._centroids, self._assign = fresh
+        self._mmap.close()
+        self._mmap = None
+
+    # ── kernels ───────────────────────────────────────────────────────────────
+
+    def _raw(self, np: Any) -> Any:
+        """Stored vectors as an (n, dim) numpy view (float32 or int8 codes)."""
+        dtype = np.int8 if self.quantized else np.float32
+        return np.frombuffer(self._vecs, dtype=dtype).reshape(-1, self.dim)
+
+    def _floats(self, np: Any, raw: Any) -> Any:
+        return raw.astype(np.float32) / np.float32(_QSCALE) if self.quantized else raw
+
+    def _row(self, r: int) -> List[float]:
+        d = self.dim
+        values = self._vecs[r * d:(r + 1) * d]
+        if self.quantized:
+            return [x / _QSCALE for x in values]
+        return list(values)
+
+    def _range_scores(self, np: Any, q: Any, start: int, stop: int) -> Any:
+        """Cosine of ``q`` with rows [start, stop) (int8 codes in blocks)."""
+        raw = self._raw(np)
+        if not self.quantized:
+            return raw[start:stop] @ q
+        parts = [self._floats(np, raw[b0:min(stop, b0 + _SCAN_BLOCK)]) @ q
+                 for b0 in range(start, stop, _SCAN_BLOCK)]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+    def _scores(self, q: Sequence[float], probe: Optional[Tuple[List[Tuple[int, int]], List[int]]]
+                ) -> Tuple[Optional[Any], Any]:
+        """(rows, cosines) for the probed lists; rows None = every row in order."""
+        np = _numpy()
+        if np is not None:
+            qv = np.asarray(q, dtype=np.float32)
+            if probe is None:
+                return None, self._range_scores(np, qv, 0, len(self._ids))
+            ranges, tail = probe
+            parts = [self._range_scores(np, qv, a, b) for a, b in ranges]
+            rows = [np.arange(a, b) for a, b in ranges]
+            if tail:
+                idx = np.asarray(tail, dtype=np.intp)
+                parts.append(self._floats(np, self._raw(np)[idx]) @ qv)
+                rows.append(idx)
+            if not parts:
+                return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.float32)
+            return np.concatenate(rows), np.concatenate(parts)
+        d = self.dim
+        vecs = self._vecs
+        scale = 1.0 / _QSCALE if self.quantized else 1.0
+        if probe is None:
+            indices: Sequence[int] = range(len(self._ids))
+            row_list = None
+        else:
+            row_list = [r for a, b in probe[0] for r in range(a, b)] + list(probe[1])
+            indices = row_list
+        return row_list, [sum(map(mul, vecs[r * d:(r + 1) * d], q)) * scale for r in indices]
+
+    def _nearest_lists(self, start: int, stop: int) -> List[int]:
+        """Closest centroid (highest cosine) of rows [start, stop)."""
+        np = _numpy()
+        n_lists, d = self.n_lists, self.dim
+        if np is not None:
+            cents = np.frombuffer(self._centroids, dtype=np.float32).reshape(n_lists, d)
+            raw = self._raw(np)
+            out: List[int] = []
+            for b0 in range(start, stop, _BLOCK):
+                block = self._floats(np, raw[b0:min(stop, b0 + _BLOCK)])
+                out.extend((block @ cents.T).argmax(axis=1).tolist())
+            return out
+        cents_py = [list(self._centroids[i * d:(i + 1) * d]) for i in range(n_lists)]
+        result = []
+        for r in range(start, stop):
+            row = self._row(r)
+            result.append(max(range(n_lists), key=lambda c: sum(map(mul, cents_py[c], row))))
+        return result
+
+    # ── partitioning ──────────────────────────────────────────────────────────
+
+    def partition(self, n_lists: int, *, iterations: int = 10, sample_size: int = 100_000,
+                  seed: int = 0) -> None:
+        """Group rows into ``n_lists`` lists by spherical k-means.
+
+        Centroids are trained on at most ``sample_size`` random rows, then
+        every row is assigned to its nearest centroid. ``n_lists <= 1``
+        removes the partitioning (queries become exact again).
+        """
+        with self._lock:
+            self._ensure_writable()
+            n = len(self._ids)
+            if n_lists <= 1 or n == 0:
+                self._centroids = array("f")
+                self._assign = array("i")
+                self._offsets, self._tail = [], []
+                return
+            n_lists = min(n_lists, n)
+            rng = random.Random(seed)
+            sample = sorted(rng.sample(range(n), min(n, max(sample_size, n_lists))))
+            centroids = [self._row(r) for r in rng.sample(sample, n_lists)]
+            for _ in range(iterations):
+                centroids = self._kmeans_step(centroids, sample)
+            self._centroids = array("f", [x for c in centroids for x in c])
+            self._assign = array("i", self._nearest_lists(0, n))
+            self._group()
+
+    def _kmeans_step(self, centroids: List[List[float]], sample: List[int]) -> List[List[float]]:
+        """One assign/update round; empty lists keep their centroid."""
+        np = _numpy()
+        k, d = len(centroids), self.dim
+        if np is not None:
+            cents = np.asarray(centroids, dtype=np.float32)
+            sums = np.zeros((k, d), dtype=np.float64)
+            idx = np.asarray(sample, dtype=np.intp)
+            raw = self._raw(np)
+            for b0 in range(0, len(idx), _BLOCK):
+                block = self._floats(np, raw[idx[b0:b0 + _BLOCK]])
+                labels = (block @ cents.T).argmax(axis=1)
+                for j in range(d):
+                    sums[:, j] += np.bincount(labels, weights=block[:, j], minlength=k)
+            norms = np.sqrt((sums * sums).sum(axis=1))
+            empty = norms == 0
+            sums[~empty] /= norms[~empty, None]
+            sums[empty] = cents[empty]
+            return [list(map(float, row)) for row in sums]
+        acc = [[0.0] * d for _ in range(k)]
+        for r in sample:
+            row = self._row(r)
+            best = max(range(k), key=lambda c: sum(map(mul, centroids[c], row)))
+            acc[best] = [a + x for a, x in zip(acc[best], row)]
+        out = []
+        for c, total in enumerate(acc):
+            norm = math.sqrt(sum(x * x for x in total))
+            out.append([x / norm for x in total] if norm > 0 else centroids[c])
+        return out
+
+    def _group(self) -> None:
+        """Reorder rows by list (stable) and reset the list bounds."""
+        n, d, n_lists = len(self._ids), self.dim, self.n_lists
+        np = _numpy()
+        if np is not None:
+            assign = np.frombuffer(self._assign, dtype=np.int32)
+            order = np.argsort(assign, kind="stable")
+            ids = np.frombuffer(self._ids, dtype=np.int64)[order]
+            vecs = self._raw(np)[order]
+            sorted_assign = assign[order]
+            counts = np.bincount(sorted_assign, minlength=n_lists).tolist()
+            for name, values in (("_ids", ids), ("_vecs", vecs), ("_assign", sorted_assign)):
+                fresh = array(getattr(self, name).typecode)
+                fresh.frombytes(values.tobytes())
+                setattr(self, name, fresh)
+        else:
+            order_py = sorted(range(n), key=self._assign.__getitem__)
+            self._ids = array("q", [self._ids[r] for r in order_py])
+            self._vecs = array(self._vecs.typecode, [x for r in order_py for x in self._vecs[r * d:(r + 1) * d]])
+            self._assign = array("i", [self._assign[r] for r in order_py])
+            counts = [0] * n_lists
+            for lst in self._assign:
+                counts[lst] += 1
+        self._set_offsets(counts)
+
+    def _set_offsets(self, counts: Sequence[int]) -> None:
+        offsets = [0]
+        for c in counts:
+            offsets.append(offsets[-1] + c)
+        self._offsets = offsets
+        self._tail = [array("q") for _ in counts]
+
+    # ── queries ───────────────────────────────────────────────────────────────
+
+    def _probe(self, q: Sequence[float], anti: bool, n_probe: Optional[int]
+               ) -> Optional[Tuple[List[Tuple[int, int]], List[int]]]:
+        """Row ranges and tail rows of the probed lists; None = scan everything."""
+        n_lists, d = self.n_lists, self.dim
+        if not n_lists:
+            return None
+        probe = max(1, n_lists // 8) if n_probe is None else n_probe
+        if probe >= n_lists:
+            return None
+        np = _numpy()
+        if np is not None:
+            cents = np.frombuffer(self._centroids, dtype=np.float32).reshape(n_lists, d)
+            sims = cents @ np.asarray(q, dtype=np.float32)
+            lists = np.argsort(sims if anti else -sims, kind="stable")[:probe].tolist()
+        else:
+            sims_py = [sum(map(mul, self._centroids[i * d:(i + 1) * d], q)) for i in range(n_lists)]
+            pick = heapq.nsmallest if anti else heapq.nlargest
+            lists = pick(probe, range(n_lists), key=sims_py.__getitem__)
+        offsets = self._offsets
+        ranges = [(offsets[lst], offsets[lst + 1]) for lst in lists]
+        tail = [r for lst in lists for r in self._tail[lst]]
+        return ranges, tail
+
+    def _top(self, scores: Any, k: int, anti: bool, rows: Optional[Any]) -> List[Tuple[int, float]]:
+        """(row, score) of the k best (or worst) scores, best first."""
+        n = len(scores)
+        k = min(k, n)
+        if k <= 0:
+            return []
+        if type(scores).__module__ == "numpy":
+            np = _numpy()
+            key = scores if anti else -scores
+            idx = np.argpartition(key, k - 1)[:k] if k < n else np.arange(n)
+            chosen = idx[np.argsort(key[idx], kind="stable")].tolist()
+        else:
+            pick = heapq.nsmallest if anti else heapq.nlargest
+            chosen = pick(k, range(n), key=scores.__getitem__)
+        return [(int(rows[i]) if rows is not None else i, float(scores[i])) for i in chosen]
+
+    def search(self, query: Any, k: int = 10, *, anti: bool = False, n_probe: Optional[int] = None,
+               exclude: Optional[int] = None) -> List[Neighbor]:
+        """Top-k harmony (or, with ``anti``, anti-harmony) neighbours of ``query``.
+
+        ``n_probe`` lists are scanned on a partitioned index (default
+        n_lists // 8, at least 1); ``exclude`` drops one id, e.g. the
+        querying chart itself.
+        """
+        q = _unit(_as_floats(query, self.dim))
+        with self._lock:
+            rows, scores = self._scores(q, self._probe(q, anti, n_probe))
+            hits = self._top(scores, k + (exclude is not None), anti, rows)
+            ids = self._ids
+            out = [Neighbor(ids[r], s) for r, s in hits if ids[r] != exclude]
+        return out[:k]
+
+    def pairs(self, k: int = 10, *, anti: bool = False, n_probe: Optional[int] = None) -> List[Tuple[int, int, float]]:
+        """The k most (``anti``: least) harmonious distinct pairs ``(id_a, id_b, score)``.
+
+        Exact on an unpartitioned index (blocked matrix products with
+        numpy); on a partitioned one each row's partners come from its
+        probed lists.
+        """
+        sign = -1.0 if anti else 1.0
+        best: List[Tuple[float, int, int]] = []   # min-heap of (sign * score, row_a, row_b)
+        offered = set()
+
+        def offer(score: float, a: int, b: int) -> None:
+            if (a, b) in offered:
+                return
+            item = (sign * score, a, b)
+            if len(best) < k:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+            else:
+                return
+            offered.add((a, b))
+
+        with self._lock:
+            n = len(self._ids)
+            np = _numpy()
+            if k <= 0 or n < 2:
+                return []
+            if np is not None and not self.n_lists:
+                full = self._floats(np, self._raw(np))
+                per_row = min(k, n - 1)
+                step = max(1, min(_BLOCK, (1 << 24) // n))   # <= 16M scores per block
+                cols_all = np.arange(n)
+                for b0 in range(0, n - 1, step):
+                    block = full[b0:b0 + step]
+                    sims = (block @ full.T) * np.float32(sign)
+                    # keep pairs (a, b) with a < b only
+                    sims[np.arange(b0, b0 + len(block))[:, None] >= cols_all[None, :]] = -np.inf
+                    cols = np.argpartition(-sims, per_row - 1, axis=1)[:, :per_row]
+                    top = np.take_along_axis(sims, cols, axis=1)
+                    finite = np.isfinite(top)
+                    for i, j, s in zip(*np.nonzero(finite), top[finite].tolist()):
+                        offer(sign * s, b0 + int(i), int(cols[i, j]))
+            else:
+                for a in range(n):
+                    q = self._row(a)
+                    rows, scores = self._scores(q, self._probe(q, anti, n_probe))
+                    for b, s in self._top(scores, k + 1, anti, rows):
+                        if b != a:
+                            offer(s, min(a, b), max(a, b))
+            ids = self._ids
+            ranked = sorted(best, key=lambda item: (-item[0], item[1], item[2]))
+            return [(ids[a], ids[b], sign * signed) for signed, a, b in ranked]
+
+    # ── persistence ───────────────────────────────────────────────────────────
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the index to ``path`` (atomically, via a temp file)."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with self._lock:
+            if any(self._tail):
+                self._group()
+            header = _HEADER.pack(_MAGIC, _VERSION, _FLAG_QUANTIZED if self.quantized else 0,
+                                  self.dim, len(self._ids), self._next_id, self.n_lists)
+            with open(tmp, "wb") as fh:
+                fh.write(header)
+                for part in (self._ids, self._centroids, self._assign, self._vecs):
+                    if sys.byteorder == "big":  # pragma: no cover - format is little-endian
+                        part = array(part.typecode if isinstance(part, array) else part.format, part)
+                        part.byteswap()
+                    fh.write(bytes(part))
+                fh.flush()
+                os.fsync(fh.fileno())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> VectorIndex:
+        """Open an index written by ``save``, memory-mapped read-only."""
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size < _HEADER.size:
+                raise InputError(f"{path}: not a vector index file")
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags, dim, n, next_id, n_lists = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            mm.close()
+            raise InputError(f"{path}: not a vector index file (or unsupported version)",
+                             detail={"version": version})
+        index = cls(dim, quantized=bool(flags & _FLAG_QUANTIZED))
+        index._next_id = next_id
+        layout = (("q", n), ("f", n_lists * dim), ("i", n if n_lists else 0),
+                  ("b" if index.quantized else "f", n * dim))
+        expected = _HEADER.size + sum(count * array(code).itemsize for code, count in layout)
+        if size < expected:
+            mm.close()
+            raise InputError(f"{path}: truncated vector index file",
+                             detail={"size": size, "expected": expected})
+        views: List[Any] = []
+        offset = _HEADER.size
+        with memoryview(mm) as base:
+            for code, count in layout:
+                nbytes = count * array(code).itemsize
+                views.append(base[offset:offset + nbytes].cast(code))  # type: ignore[call-overload]
+                offset += nbytes
+        index._ids, index._centroids, index._assign, index._vecs = views
+        index._mmap = mm
+        if sys.byteorder == "big":  # pragma: no cover - format is little-endian
+            index._ensure_writable()
+            for part in (index._ids, index._centroids, index._assign, index._vecs):
+                part.byteswap()
+        if n_lists:
+            np = _numpy()
+            if np is not None:
+                counts = np.bincount(np.frombuffer(index._assign, dtype=np.int32), minlength=n_lists).tolist()
+            else:
+                counts = [0] * n_lists
+                for lst in index._assign:
+                    counts[lst] += 1
+            index._set_offsets(counts)
+        return index
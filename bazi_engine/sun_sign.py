@@ -0,0 +1,76 @@
+"""
+sun_sign.py — Tropical Sun position and sign without a full chart.
+
+Callers that only need the Sun's zodiac sign (GET /api, the webhook
+summary) used to compute a complete Western chart: 14 bodies, houses and
+aspects. Here the sign comes from a table of sign ingresses (Sun crossing
+0°, 30°, ... 330°), built per calendar year with 14 ``swe.solcross_ut``
+calls and then answered by bisection. The ingress instants are those of
+the configured ephemeris, so the sign agrees with ``compute_western_chart``
+up to solcross precision (well below a second of time).
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import swisseph as swe
+
+from . import timing
+from .ephemeris import SwissEphBackend, datetime_utc_to_jd_ut
+
+__all__ = ["sun_position", "sun_sign_index", "sun_sign_at", "ingress_cache_info"]
+
+# Ingresses of one table: 270° (December of the previous year) through 300°
+# (January of the following year), i.e. signs Capricorn .. Aquarius.
+_FIRST_SIGN = 9
+_N_INGRESSES = 14
+
+
+def sun_position(jd_ut: float, backend: Optional[SwissEphBackend] = None) -> float:
+    """Apparent tropical longitude of the Sun (degrees, [0, 360)); one calc_ut."""
+    return (backend or SwissEphBackend()).sun_lon_deg_ut(jd_ut)
+
+
+@lru_cache(maxsize=256)
+def _ingresses(year: int, flags: int) -> Optional[Tuple[float, ...]]:
+    """Sign ingress JDs covering calendar ``year`` (UT); None if unavailable."""
+    jd = swe.julday(year - 1, 12, 1, 0.0)
+    out: List[float] = []
+    solcross = timing.timed("swe.solcross_ut", swe.solcross_ut)
+    for k in range(_N_INGRESSES):
+        target = 30.0 * ((_FIRST_SIGN + k) % 12)
+        try:
+            jd = float(solcross(target, jd, flags))
+        except (swe.Error, TypeError, ValueError):
+            return None
+        out.append(jd)
+        jd += 1e-6
+    return tuple(out)
+
+
+def sun_sign_index(jd_ut: float, backend: Optional[SwissEphBackend] = None) -> int:
+    """Tropical zodiac sign of the Sun (0 = Aries .. 11 = Pisces)."""
+    be = backend or SwissEphBackend()
+    year = swe.revjul(jd_ut, swe.GREG_CAL)[0]
+    table = _ingresses(year, be.flags)
+    if table is not None:
+        i = bisect_right(table, jd_ut) - 1
+        if 0 <= i < _N_INGRESSES - 1:
+            return (_FIRST_SIGN + i) % 12
+    # Outside the ephemeris range of solcross: one direct position.
+    return int(be.sun_lon_deg_ut(jd_ut) // 30.0) % 12
+
+
+def sun_sign_at(dt_utc: datetime, backend: Optional[SwissEphBackend] = None) -> int:
+    """``sun_sign_index`` for an aware UTC datetime."""
+    with timing.span("sun_sign.lookup"):
+        return sun_sign_index(datetime_utc_to_jd_ut(dt_utc), backend)
+
+
+def ingress_cache_info() -> Dict[str, int]:
+    """Hit/miss counters and size of the per-year ingress tables."""
+    info = _ingresses.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize or 0}
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+from array import array
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
-from typing import Literal, Optional, Tuple
+from typing import Dict, List, Literal, Optional, Sequence, Tuple, Union
 
+from . import timing
 from .exc import InputError
+from .types import BaziInput, DayBoundary, Fold, TimeStandard
+from .tz_index import classify_local, local_seconds, transition_index
 
 
 class LocalTimeError(InputError, ValueError):
@@ -38,6 +44,41 @@ class LocalTimeResolution:
     tz_abbrev: Optional[str] = None
     adjusted_minutes: int = 0
     warning: Optional[str] = None
+    gap_minutes: int = 0
+
+
+@lru_cache(maxsize=1024)
+def _zone(tz_name: str) -> ZoneInfo:
+    return ZoneInfo(tz_name)
+
+
+def get_zone(tz_name: str) -> ZoneInfo:
+    """ZoneInfo for an IANA name, memoized; LocalTimeError for unknown names.
+
+    ZoneInfo's own cache is weak beyond a handful of entries, so a service
+    seeing many zones would otherwise re-read TZif files per request.
+    """
+    try:
+        return _zone(tz_name)
+    except (ZoneInfoNotFoundError, KeyError, ValueError) as e:
+        raise LocalTimeError(
+            f"Unknown timezone: '{tz_name}'. Use an IANA timezone name (e.g. 'Europe/Berlin').",
+        ) from e
+
+
+def zone_cache_info() -> Dict[str, int]:
+    """Hit/miss counters and size of the get_zone memo."""
+    info = _zone.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize or 0}
+
+
+def _parse_naive(birth_local_iso: str) -> datetime:
+    try:
+        return datetime.fromisoformat(birth_local_iso)
+    except (ValueError, TypeError) as e:
+        raise LocalTimeError(
+            f"Invalid date/time format: '{birth_local_iso}'. Expected ISO 8601 (e.g. '2024-02-10T14:30:00').",
+        ) from e
 
 
 def _roundtrip_ok(naive_local: datetime, tz: ZoneInfo, fold: int) -> bool:
@@ -46,6 +87,15 @@ def _roundtrip_ok(naive_local: datetime, tz: ZoneInfo, fold: int) -> bool:
     return back.replace(tzinfo=None) == naive_local
 
 
+def _shift_minutes_roundtrip(naive: datetime, tz: ZoneInfo) -> Optional[int]:
+    """Minute-by-minute search (fallback for years the tz index does not cover)."""
+    for minutes in range(1, 181):
+        candidate = naive + timedelta(minutes=minutes)
+        if _roundtrip_ok(candidate, tz, fold=0) or _roundtrip_ok(candidate, tz, fold=1):
+            return minutes
+    return None
+
+
 def resolve_local_iso(
     birth_local_iso: str,
     tz_name: str,
@@ -58,28 +108,38 @@ def resolve_local_iso(
     - Ambiguous times (DST fall-back): choose ``earlier`` (fold=0) or ``later`` (fold=1).
     - Nonexistent times (DST spring-forward gap):
         ``error``: raise LocalTimeError (default).
-        ``shift_forward``: advance minute-by-minute to the next valid local time.
+        ``shift_forward``: advance by whole minutes to the first valid local time.
+          ``adjusted_minutes`` is that shift, ``gap_minutes`` the size of the gap.
+
+    Gap/fold detection uses the per-zone transition index (``tz_index``).
     """
-    try:
-        naive = datetime.fromisoformat(birth_local_iso)
-    except ValueError as e:
-        raise LocalTimeError(
-            f"Invalid date/time format: '{birth_local_iso}'. Expected ISO 8601 (e.g. '2024-02-10T14:30:00').",
-        ) from e
-    try:
-        tz = ZoneInfo(tz_name)
-    except (ZoneInfoNotFoundError, KeyError) as e:
-        raise LocalTimeError(
-            f"Unknown timezone: '{tz_name}'. Use an IANA timezone name (e.g. 'Europe/Berlin').",
-        ) from e
+    return _resolve_naive(
+        _parse_naive(birth_local_iso), birth_local_iso, tz_name,
+        ambiguous=ambiguous, nonexistent=nonexistent,
+    )
 
-    ok0 = _roundtrip_ok(naive, tz, fold=0)
-    ok1 = _roundtrip_ok(naive, tz, fold=1)
 
-    dt0 = naive.replace(tzinfo=tz, fold=0)
-    dt1 = naive.replace(tzinfo=tz, fold=1)
-    is_ambiguous = ok0 and ok1 and dt0.utcoffset() != dt1.utcoffset()
-    is_nonexistent = (not ok0) and (not ok1)
+def _resolve_naive(
+    naive: datetime,
+    birth_local_iso: str,
+    tz_name: str,
+    *,
+    ambiguous: AmbiguousTimeChoice,
+    nonexistent: NonexistentTimePolicy,
+) -> Tuple[datetime, LocalTimeResolution]:
+    tz = get_zone(tz_name)
+
+    cls = classify_local(naive, tz)
+    if cls is not None:
+        is_ambiguous = cls.status == "ambiguous"
+        is_nonexistent = cls.status == "nonexistent"
+    else:
+        ok0 = _roundtrip_ok(naive, tz, fold=0)
+        ok1 = _roundtrip_ok(naive, tz, fold=1)
+        dt0 = naive.replace(tzinfo=tz, fold=0)
+        dt1 = naive.replace(tzinfo=tz, fold=1)
+        is_ambiguous = ok0 and ok1 and dt0.utcoffset() != dt1.utcoffset()
+        is_nonexistent = (not ok0) and (not ok1)
 
     chosen_fold = 0 if ambiguous == "earlier" else 1
 
@@ -89,26 +149,35 @@ def resolve_local_iso(
                 f"Nonexistent local time due to DST transition: {birth_local_iso} in {tz_name}. "
                 "Provide a valid time or set nonexistentTime='shift_forward'."
             )
-        # Shift forward to next valid minute (DST gaps are typically 30-60 min).
-        for minutes in range(1, 181):
-            candidate = naive + timedelta(minutes=minutes)
-            if _roundtrip_ok(candidate, tz, fold=0) or _roundtrip_ok(candidate, tz, fold=1):
-                dt = candidate.replace(tzinfo=tz, fold=0)
-                return dt, LocalTimeResolution(
-                    tz=tz_name,
-                    status="nonexistent_shifted",
-                    fold=0,
-                    input_local_iso=birth_local_iso,
-                    resolved_local_iso=dt.isoformat(),
-                    resolved_utc_iso=dt.astimezone(timezone.utc).isoformat(),
-                    tz_abbrev=dt.tzname(),
-                    adjusted_minutes=minutes,
-                    warning=f"Input local time did not exist (DST gap). "
-                            f"Shifted forward by {minutes} min to {dt.isoformat()}.",
-                )
-        raise LocalTimeError(
-            f"Could not resolve nonexistent time within 180 minutes: "
-            f"{birth_local_iso} in {tz_name}."
+        # Shift forward by whole minutes to the first valid local time.
+        gap_end = cls.gap_end_local_seconds if cls is not None else None
+        if cls is not None and gap_end is not None:
+            wall = naive.replace(tzinfo=None)
+            behind_us = (gap_end - local_seconds(wall)) * 1_000_000 - wall.microsecond
+            shift: Optional[int] = -(-behind_us // 60_000_000)
+            gap_minutes = cls.gap_seconds // 60
+        else:
+            shift = _shift_minutes_roundtrip(naive, tz)
+            gap_minutes = 0
+        if shift is None:
+            raise LocalTimeError(
+                f"Could not resolve nonexistent time within 180 minutes: "
+                f"{birth_local_iso} in {tz_name}."
+            )
+        minutes = int(shift)
+        dt = (naive + timedelta(minutes=minutes)).replace(tzinfo=tz, fold=0)
+        return dt, LocalTimeResolution(
+            tz=tz_name,
+            status="nonexistent_shifted",
+            fold=0,
+            input_local_iso=birth_local_iso,
+            resolved_local_iso=dt.isoformat(),
+            resolved_utc_iso=dt.astimezone(timezone.utc).isoformat(),
+            tz_abbrev=dt.tzname(),
+            adjusted_minutes=minutes,
+            warning=f"Input local time did not exist (DST gap). "
+                    f"Shifted forward by {minutes} min to {dt.isoformat()}.",
+            gap_minutes=gap_minutes,
         )
 
     # Normal or ambiguous
@@ -132,19 +201,277 @@ def resolve_local_iso(
     )
 
 
+# ── Request normalization ────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class NormalizedBirth:
+    """A birth instant parsed and DST-resolved once per request.
+
+    Routers build this from the raw request fields and hand it to every
+    downstream computation (``bazi_input()`` for compute_bazi, ``utc_dt`` for
+    the western chart); ``key`` identifies the resolved instant independent
+    of how the input was spelled ("14:30" vs "14:30:00").
+    """
+    input_local: datetime          # parsed input, as given
+    local_dt: datetime             # resolved, aware (zone + fold)
+    resolution: LocalTimeResolution
+    longitude_deg: float
+    latitude_deg: float
+
+    @property
+    def tz_id(self) -> str:
+        return self.resolution.tz
+
+    @property
+    def fold(self) -> Fold:
+        return 1 if self.resolution.fold else 0
+
+    @property
+    def utc_dt(self) -> datetime:
+        return self.local_dt.astimezone(timezone.utc)
+
+    @property
+    def input_local_iso(self) -> str:
+        """Canonical spelling of the input local time."""
+        return self.input_local.replace(tzinfo=None).isoformat()
+
+    @property
+    def key(self) -> Tuple[str, str, str, int, float, float]:
+        return (
+            self.input_local_iso,
+            self.tz_id,
+            self.resolution.resolved_local_iso,
+            self.resolution.fold,
+            float(self.longitude_deg),
+            float(self.latitude_deg),
+        )
+
+    def bazi_input(
+        self,
+        *,
+        time_standard: TimeStandard = "CIVIL",
+        day_boundary: DayBoundary = "midnight",
+        **kwargs: object,
+    ) -> BaziInput:
+        """BaziInput carrying the resolved datetime (no second parse)."""
+        return BaziInput(
+            birth_local=self.local_dt.replace(tzinfo=None).isoformat(),
+            timezone=self.tz_id,
+            longitude_deg=self.longitude_deg,
+            latitude_deg=self.latitude_deg,
+            time_standard=time_standard,
+            day_boundary=day_boundary,
+            strict_local_time=True,
+            fold=self.fold,
+            birth_local_dt=self.local_dt,
+            **kwargs,  # type: ignore[arg-type]
+        )
+
+
+def normalize_birth_input(
+    birth_local_iso: str,
+    tz_name: str,
+    longitude_deg: float,
+    latitude_deg: float,
+    *,
+    ambiguous: AmbiguousTimeChoice = "earlier",
+    nonexistent: NonexistentTimePolicy = "error",
+) -> NormalizedBirth:
+    """Parse and resolve a birth time once (see ``resolve_local_iso``)."""
+    with timing.span("time.resolve"):
+        naive = _parse_naive(birth_local_iso)
+        dt, resolution = _resolve_naive(
+            naive, birth_local_iso, tz_name, ambiguous=ambiguous, nonexistent=nonexistent,
+        )
+    return NormalizedBirth(
+        input_local=naive,
+        local_dt=dt,
+        resolution=resolution,
+        longitude_deg=longitude_deg,
+        latitude_deg=latitude_deg,
+    )
+
+
+# ── Bulk resolution ──────────────────────────────────────────────────────────
+
+# Status codes used in LocalTimeBatch.status.
+STATUS_OK = 0
+STATUS_AMBIGUOUS = 1
+STATUS_NONEXISTENT_SHIFTED = 2
+STATUS_NONEXISTENT = 3   # only with errors="mark"
+STATUS_INVALID = 4       # unparsable input or unknown zone, only with errors="mark"
+
+STATUS_NAMES = {
+    STATUS_OK: "ok",
+    STATUS_AMBIGUOUS: "ambiguous",
+    STATUS_NONEXISTENT_SHIFTED: "nonexistent_shifted",
+    STATUS_NONEXISTENT: "nonexistent",
+    STATUS_INVALID: "invalid",
+}
+
+_STATUS_CODES = {name: code for code, name in STATUS_NAMES.items()}
+
+BatchErrorPolicy = Literal["raise", "mark"]
+
+_ISO_FAST = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{3}|\d{6}))?)?"
+)
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _days_from_civil(y: int, m: int, d: int) -> int:
+    """Days since 1970-01-01 for a proleptic Gregorian date."""
+    y -= m <= 2
+    era = (y if y >= 0 else y - 399) // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _parse_local_seconds(s: str) -> Tuple[int, int]:
+    """(whole local seconds since the epoch, microseconds) of a wall-clock ISO
+    string. Any UTC offset in the string is ignored, as in resolve_local_iso.
+
+    Raises ValueError for malformed input.
+    """
+    m = _ISO_FAST.fullmatch(s)
+    if m is not None:
+        y, mo, d, hh, mi = (int(m.group(i)) for i in range(1, 6))
+        ss = int(m.group(6) or 0)
+        frac = m.group(7)
+        leap = mo == 2 and y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)
+        if (1 <= y and 1 <= mo <= 12 and 1 <= d <= _DAYS_IN_MONTH[mo] + leap
+                and hh < 24 and mi < 60 and ss < 60):
+            us = int(frac.ljust(6, "0")) if frac else 0
+            return _days_from_civil(y, mo, d) * 86400 + hh * 3600 + mi * 60 + ss, us
+    dt = datetime.fromisoformat(s).replace(tzinfo=None)
+    return local_seconds(dt), dt.microsecond
+
+
+# utc_ns is int64: keep a day of margin inside 1677-09-21 .. 2262-04-11.
+_MIN_BULK_SECONDS = _days_from_civil(1677, 9, 23) * 86400
+_MAX_BULK_SECONDS = _days_from_civil(2262, 4, 10) * 86400
+
+
+@dataclass
+class LocalTimeBatch:
+    """Column-oriented result of resolve_local_many (one row per input).
+
+    utc_ns            UTC instant, integer nanoseconds since the Unix epoch
+    fold              PEP 495 fold of the resolved local time
+    status            STATUS_* code
+    adjusted_minutes  minutes shifted forward out of a DST gap (else 0)
+    """
+    utc_ns: array = field(default_factory=lambda: array("q"))
+    fold: array = field(default_factory=lambda: array("b"))
+    status: array = field(default_factory=lambda: array("b"))
+    adjusted_minutes: array = field(default_factory=lambda: array("l"))
+
+    def __len__(self) -> int:
+        return len(self.utc_ns)
+
+    def utc_datetime(self, i: int) -> datetime:
+        """Row *i* as an aware UTC datetime (microsecond precision)."""
+        return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(microseconds=self.utc_ns[i] // 1000)
+
+
+def resolve_local_many(
+    iso_strings: Sequence[str],
+    tz_names: Union[str, Sequence[str]],
+    *,
+    ambiguous: AmbiguousTimeChoice = "earlier",
+    nonexistent: NonexistentTimePolicy = "error",
+    errors: BatchErrorPolicy = "raise",
+) -> LocalTimeBatch:
+    """Resolve many local ISO datetimes at once.
+
+    Same semantics as :func:`resolve_local_iso` per row, without building a
+    ZoneInfo or aware datetime per item: rows are grouped by zone, parsed
+    with a fast fixed-format ISO parser and resolved against the zone's
+    transition index. *tz_names* is one zone for all rows or one per row.
+
+    ``errors="raise"`` raises LocalTimeError (naming the row) where
+    resolve_local_iso would, and for times outside the int64-nanosecond
+    range (years 1677–2262); ``errors="mark"`` records STATUS_INVALID /
+    STATUS_NONEXISTENT with ``utc_ns = 0`` instead.
+    """
+    n = len(iso_strings)
+    if isinstance(tz_names, str):
+        zones: Sequence[str] = [tz_names] * n
+    else:
+        zones = tz_names
+        if len(zones) != n:
+            raise ValueError(f"iso_strings and tz_names differ in length ({n} != {len(zones)})")
+
+    out = LocalTimeBatch(
+        utc_ns=array("q", bytes(8 * n)),
+        fold=array("b", bytes(n)),
+        status=array("b", bytes(n)),
+        adjusted_minutes=array("l", [0]) * n,
+    )
+    chosen_fold = 0 if ambiguous == "earlier" else 1
+
+    def fail(i: int, code: int, message: str) -> None:
+        if errors == "raise":
+            raise LocalTimeError(f"Row {i}: {message}")
+        out.status[i] = code
+
+    groups: Dict[str, List[int]] = {}
+    for i, name in enumerate(zones):
+        groups.setdefault(name, []).append(i)
+
+    for name, rows in groups.items():
+        try:
+            tz = get_zone(name)
+        except LocalTimeError:
+            for i in rows:
+                fail(i, STATUS_INVALID, f"Unknown timezone: '{name}'.")
+            continue
+        idx = transition_index(tz)
+        parsed: List[Tuple[int, int, int]] = []
+        for i in rows:
+            s = iso_strings[i]
+            try:
+                ls, us = _parse_local_seconds(s)
+            except (ValueError, TypeError):
+                fail(i, STATUS_INVALID, f"Invalid date/time format: '{s}'.")
+                continue
+            if not (_MIN_BULK_SECONDS <= ls < _MAX_BULK_SECONDS):
+                fail(i, STATUS_INVALID, f"Local time outside the int64 nanosecond range: '{s}'.")
+                continue
+            parsed.append((i, ls, us))
+        if not parsed:
+            continue
+
+        table = idx.local_table(min(p[1] for p in parsed), max(p[1] for p in parsed))
+        for i, ls, us in parsed:
+            kind, j = table.lookup(ls)
+            if kind < 0:
+                utc_s = ls - table.offset_ok(j)
+                out.fold[i] = chosen_fold
+            elif kind == 0:
+                utc_s = ls - (table.before[j] if chosen_fold == 0 else table.after[j])
+                out.status[i] = STATUS_AMBIGUOUS
+                out.fold[i] = chosen_fold
+            else:
+                if nonexistent == "error":
+                    fail(i, STATUS_NONEXISTENT,
+                         f"Nonexistent local time due to DST transition: {iso_strings[i]} in {name}.")
+                    continue
+                gap_end = table.utc[j] + table.after[j]
+                minutes = -(-((gap_end - ls) * 1_000_000 - us) // 60_000_000)
+                utc_s = ls + minutes * 60 - table.after[j]
+                out.status[i] = STATUS_NONEXISTENT_SHIFTED
+                out.adjusted_minutes[i] = minutes
+            out.utc_ns[i] = (utc_s * 1_000_000 + us) * 1000
+    return out
+
+
+
 def parse_local_iso(birth_local_iso: str, tz_name: str, *, strict: bool, fold: int) -> datetime:
-    try:
-        naive = datetime.fromisoformat(birth_local_iso)
-    except ValueError as e:
-        raise LocalTimeError(
-            f"Invalid date/time format: '{birth_local_iso}'. Expected ISO 8601 (e.g. '2024-02-10T14:30:00').",
-        ) from e
-    try:
-        tz = ZoneInfo(tz_name)
-    except (ZoneInfoNotFoundError, KeyError) as e:
-        raise LocalTimeError(
-            f"Unknown timezone: '{tz_name}'. Use an IANA timezone name (e.g. 'Europe/Berlin').",
-        ) from e
+    naive = _parse_naive(birth_local_iso)
+    tz = get_zone(tz_name)
     dt = naive.replace(tzinfo=tz, fold=fold)
 
     if not strict:
@@ -0,0 +1,283 @@
+"""
+timing.py — Per-request stage timing and ephemeris call counters.
+
+Computation code marks its stages; whether anything is measured is decided
+per request by whoever opens a ``recording()`` (the HTTP middleware does so
+when BAZI_TIMING=1). Outside a recording every hook is a context-variable
+lookup and a ``None`` check.
+
+Two ways to mark stages:
+
+    with timing.span("bafe.validate"):
+        ...
+
+    laps = timing.laps("western")      # consecutive stages of one function
+    ...                                # planets
+    laps.lap("planets")
+    ...                                # houses
+    laps.lap("houses")
+
+Ephemeris calls are counted and timed by calling through
+``timing.timed("swe.calc_ut", swe.calc_ut)``, which returns the function
+itself when nothing is recorded; plain counters use ``timing.count``.
+
+Finished recordings are folded into process-wide per-stage histograms
+(``stage_histograms()``); a single recording renders as a ``Server-Timing``
+header value.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
+
+__all__ = [
+    "TIMING_ENV",
+    "HISTOGRAM_BUCKETS_MS",
+    "StageRecorder",
+    "StageHistograms",
+    "count",
+    "current",
+    "laps",
+    "recording",
+    "route_histograms",
+    "span",
+    "stage_histograms",
+    "timed",
+    "timing_enabled",
+]
+
+TIMING_ENV = "BAZI_TIMING"
+
+#: Upper bucket bounds (milliseconds) of the per-stage histograms.
+HISTOGRAM_BUCKETS_MS: Tuple[float, ...] = (
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0,
+)
+
+_recorder: ContextVar[Optional["StageRecorder"]] = ContextVar("bazi_timing_recorder", default=None)
+
+_TOKEN_UNSAFE = re.compile(r"[^A-Za-z0-9!#$%&'*+\-.^_`|~]")
+
+
+def timing_enabled() -> bool:
+    return os.environ.get(TIMING_ENV, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+class StageRecorder:
+    """Stage durations, counters and timed-call totals (seconds) of one request."""
+
+    __slots__ = ("durations", "counts", "call_seconds")
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.call_seconds: Dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.durations[stage] = self.durations.get(stage, 0.0) + seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def add_call(self, name: str, seconds: float) -> None:
+        self.counts[name] = self.counts.get(name, 0) + 1
+        self.call_seconds[name] = self.call_seconds.get(name, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` header value: stages with dur (ms), counters as desc."""
+        parts = [
+            f"{_TOKEN_UNSAFE.sub('-', stage)};dur={seconds * 1e3:.3f}"
+            for stage, seconds in self.durations.items()
+        ]
+        for name, n in self.counts.items():
+            token = _TOKEN_UNSAFE.sub("-", name)
+            seconds = self.call_seconds.get(name)
+            if seconds is None:
+                parts.append(f'{token};desc="{n}"')
+            else:
+                parts.append(f'{token};dur={seconds * 1e3:.3f};desc="{n}"')
+        return ", ".join(parts)
+
+
+def current() -> Optional[StageRecorder]:
+    """Recorder of the running request, or None when timing is off."""
+    return _recorder.get()
+
+
+def count(name: str, n: int = 1) -> None:
+    rec = _recorder.get()
+    if rec is not None:
+        rec.count(name, n)
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def timed(name: str, fn: F) -> F:
+    """``fn`` itself, or (while recording) a wrapper counting and timing each call."""
+    rec = _recorder.get()
+    if rec is None:
+        return fn
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            rec.add_call(name, time.perf_counter() - t0)
+
+    return wrapper  # type: ignore[return-value]
+
+
+class _Span:
+    __slots__ = ("_rec", "_stage", "_t0")
+
+    def __init__(self, rec: StageRecorder, stage: str) -> None:
+        self._rec = rec
+        self._stage = stage
+        self._t0 = 0.0
+
+    def __enter__(self) -> None:
+        self._t0 = time.perf_counter()
+
+    def __exit__(self, *exc: object) -> None:
+        self._rec.add(self._stage, time.perf_counter() - self._t0)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def lap(self, stage: str) -> None:
+        return None
+
+
+_NULL = _NullSpan()
+
+
+def span(stage: str) -> Union[_Span, _NullSpan]:
+    """Context manager timing one stage of the current request."""
+    rec = _recorder.get()
+    return _NULL if rec is None else _Span(rec, stage)
+
+
+class _Laps:
+    __slots__ = ("_rec", "_prefix", "_t")
+
+    def __init__(self, rec: StageRecorder, prefix: str) -> None:
+        self._rec = rec
+        self._prefix = prefix
+        self._t = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """Record the time since the previous lap (or creation) as ``prefix.stage``."""
+        now = time.perf_counter()
+        self._rec.add(f"{self._prefix}.{stage}", now - self._t)
+        self._t = now
+
+
+def laps(prefix: str) -> Union[_Laps, _NullSpan]:
+    """Lap timer for consecutive stages of one function."""
+    rec = _recorder.get()
+    return _NULL if rec is None else _Laps(rec, prefix)
+
+
+@contextmanager
+def recording(observe: bool = True) -> Iterator[StageRecorder]:
+    """Record stages for the enclosed work; fold them into the histograms on exit."""
+    rec = StageRecorder()
+    token = _recorder.set(rec)
+    try:
+        yield rec
+    finally:
+        _recorder.reset(token)
+        if observe:
+            _HISTOGRAMS.observe(rec)
+
+
+class StageHistograms:
+    """Latency histograms by key (stage or route) plus counter totals."""
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = HISTOGRAM_BUCKETS_MS) -> None:
+        self.buckets_ms = buckets_ms
+        self._lock = threading.Lock()
+        # stage -> [count per bucket..., count above last bucket]
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._totals: Dict[str, int] = {}
+        self._call_seconds: Dict[str, float] = {}
+
+    def _observe_locked(self, key: str, seconds: float) -> None:
+        ms = seconds * 1e3
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets_ms) + 1)
+            self._sums[key] = 0.0
+        i = 0
+        while i < len(self.buckets_ms) and ms > self.buckets_ms[i]:
+            i += 1
+        counts[i] += 1
+        self._sums[key] += seconds
+
+    def observe_value(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._observe_locked(key, seconds)
+
+    def observe(self, rec: StageRecorder) -> None:
+        with self._lock:
+            for stage, seconds in rec.durations.items():
+                self._observe_locked(stage, seconds)
+            for name, n in rec.counts.items():
+                self._totals[name] = self._totals.get(name, 0) + n
+            for name, seconds in rec.call_seconds.items():
+                self._call_seconds[name] = self._call_seconds.get(name, 0.0) + seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """stage -> {"buckets": [(le_ms, cumulative count)], "sum_seconds", "count"}."""
+        out: Dict[str, Dict[str, object]] = {}
+        with self._lock:
+            for stage, counts in self._counts.items():
+                cumulative, buckets = 0, []
+                for le, c in zip(self.buckets_ms + (float("inf"),), counts):
+                    cumulative += c
+                    buckets.append((le, cumulative))
+                out[stage] = {"buckets": buckets, "sum_seconds": self._sums[stage], "count": cumulative}
+        return out
+
+    def counter_totals(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._totals)
+
+    def call_seconds_totals(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._call_seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+            self._totals.clear()
+            self._call_seconds.clear()
+
+
+_HISTOGRAMS = StageHistograms()
+_ROUTE_HISTOGRAMS = StageHistograms()
+
+
+def stage_histograms() -> StageHistograms:
+    """Per-stage histograms and counter totals of all recorded requests."""
+    return _HISTOGRAMS
+
+
+def route_histograms() -> StageHistograms:
+    """End-to-end request latency per ``METHOD route`` (always recorded)."""
+    return _ROUTE_HISTOGRAMS
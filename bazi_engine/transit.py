@@ -13,7 +13,11 @@ from typing import Any, Dict, List, Optional
 import swisseph as swe
 from cachetools import TTLCache  # type: ignore[import-untyped]
 
+from . import timing
 from .ephemeris import SwissEphBackend, assert_no_moseph_fallback, datetime_utc_to_jd_ut
+from .ephemeris_cache import shared_position_cache
+from .phases.lunar_phase import LUNAR_PHASES
+from .phases.moon_table import moon_events_between
 
 # Planet IDs for transit calculation (7 classical planets)
 TRANSIT_PLANETS = {
@@ -43,12 +47,36 @@ PLANET_WEIGHTS = {
     "saturn": 1.5,
 }
 
+# lunar_phase events fire when a principal phase is exact within this window
+LUNAR_EVENT_WINDOW = timedelta(hours=12)
+
+_LUNAR_CONTEXT_DE = {
+    0: "Ein neuer Mondzyklus beginnt",
+    2: "Der zunehmende Mond verlangt Entscheidungen",
+    4: "Der Mondzyklus erreicht seinen Höhepunkt",
+    6: "Zeit, Abgeschlossenes loszulassen",
+}
+
 # Cache: 1 hour TTL, max 64 entries (keyed by truncated hour)
 _transit_cache: TTLCache = TTLCache(maxsize=64, ttl=3600)
 
 # Timeline cache: 24h TTL (ADR-1), keyed by date+days
 _timeline_cache: TTLCache = TTLCache(maxsize=16, ttl=86400)
 
+# [hits, misses] per cache, for /metrics
+_cache_stats: Dict[str, List[int]] = {"transit": [0, 0], "timeline": [0, 0]}
+
+
+def transit_cache_info() -> Dict[str, Dict[str, int]]:
+    """Hits, misses, size and capacity of the transit and timeline caches."""
+    return {
+        name: {"hits": stats[0], "misses": stats[1], "size": len(cache), "maxsize": int(cache.maxsize)}
+        for name, stats, cache in (
+            ("transit", _cache_stats["transit"], _transit_cache),
+            ("timeline", _cache_stats["timeline"], _timeline_cache),
+        )
+    }
+
 
 def _cache_key(dt: datetime) -> str:
     """Truncate to hour for cache key."""
@@ -74,16 +102,23 @@ def compute_transit_now(
 
     key = _cache_key(dt_utc)
     if key in _transit_cache:
+        _cache_stats["transit"][0] += 1
+        timing.count("transit_cache.hit")
         return _transit_cache[key]
+    _cache_stats["transit"][1] += 1
+    laps = timing.laps("transit")
 
-    backend = SwissEphBackend(ephe_path=ephe_path)
+    # Positions are reported to 0.1° / 0.01°/day: the interpolated cache
+    # (< 0.1″) is indistinguishable from exact calls here.
+    backend = SwissEphBackend(ephe_path=ephe_path, exact=False)
     jd_ut = datetime_utc_to_jd_ut(dt_utc)
     flags = backend.flags | swe.FLG_SPEED
+    calc_ut = timing.timed("swe.calc_ut", swe.calc_ut) if backend.exact else shared_position_cache().calc_ut
 
     planets: Dict[str, Dict[str, Any]] = {}
 
     for name, pid in TRANSIT_PLANETS.items():
-        (lon_deg, _lat, _dist, speed_lon, _, _), ret = swe.calc_ut(jd_ut, pid, flags)
+        (lon_deg, _lat, _dist, speed_lon, _, _), ret = calc_ut(jd_ut, pid, flags)
         assert_no_moseph_fallback(flags, ret)
         sector = int(lon_deg // 30) % 12
         planets[name] = {
@@ -92,18 +127,11 @@ def compute_transit_now(
             "sign": ZODIAC_SIGNS[sector],
             "speed": round(speed_lon, 2),
         }
+    laps.lap("planets")
 
-    # Sector intensity: weighted sum of planet presence per sector
-    sector_intensity = [0.0] * 12
-    for name, pdata in planets.items():
-        weight = PLANET_WEIGHTS.get(name, 1.0)
-        sector_intensity[pdata["sector"]] += weight
-
-    # Normalize to 0-1 range
-    max_val = max(sector_intensity, default=0.0)
-    if math.isnan(max_val) or max_val <= 0:
-        max_val = 1.0
-    sector_intensity = [round(v / max_val, 2) for v in sector_intensity]
+    sector_intensity = _sector_intensity(
+        {name: pdata["sector"] for name, pdata in planets.items()}
+    )
 
     result = {
         "computed_at": dt_utc.strftime("%Y-%m-%dT%H:%M:%SZ"),
@@ -115,6 +143,35 @@ def compute_transit_now(
     return result
 
 
+def _sector_intensity(sectors: Dict[str, int]) -> List[float]:
+    """Weighted planet presence per sector, normalized to 0-1 (2 decimals)."""
+    sector_intensity = [0.0] * 12
+    for name, sector in sectors.items():
+        weight = PLANET_WEIGHTS.get(name, 1.0)
+        sector_intensity[sector] += weight
+
+    # Normalize to 0-1 range
+    max_val = max(sector_intensity, default=0.0)
+    if math.isnan(max_val) or max_val <= 0:
+        max_val = 1.0
+    return [round(v / max_val, 2) for v in sector_intensity]
+
+
+def natal_soulprint(positions: List[Dict[str, Any]]) -> List[float]:
+    """
+    12-sector soulprint from natal chart positions (POST /chart "positions").
+
+    Same weighting as the transit sector intensity, over the seven
+    classical planets of the birth chart.
+    """
+    sectors = {
+        p["name"].lower(): int(p["sign_index"]) % 12
+        for p in positions
+        if p.get("name", "").lower() in PLANET_WEIGHTS
+    }
+    return _sector_intensity(sectors)
+
+
 def compute_transit_state(
     soulprint_sectors: List[float],
     quiz_sectors: List[float],
@@ -164,7 +221,10 @@ def compute_transit_state(
     ]
 
     # Detect events (pass ring_sectors for dominance_shift detection)
-    events = _detect_events(transit_now, soulprint_sectors, impact, ring_sectors)
+    with timing.span("transit.events"):
+        events = _detect_events(
+            transit_now, soulprint_sectors, impact, ring_sectors, dt_utc=dt_utc,
+        )
 
     return {
         "schema": "TRANSIT_STATE_v1",
@@ -188,17 +248,21 @@ def _detect_events(
     impact: List[float],
     ring_sectors: Optional[List[float]] = None,
     avg_30d_sectors: Optional[List[float]] = None,
+    dt_utc: Optional[datetime] = None,
 ) -> List[Dict[str, Any]]:
     """
     Detect transit events: resonance jumps, dominance shifts, moon events.
 
-    Three MVP triggers:
+    Triggers:
     - resonance_jump: planet on user's peak sector, impact >= 0.18
     - dominance_shift: current dominant sector != 30-day avg dominant (margin >= 0.08)
     - moon_event: moon on high-impact sector (>= 0.5)
+    - lunar_phase: new moon, quarter or full moon exact within ±12 h of dt_utc
 
     dominance_shift requires avg_30d_sectors (History Store, T-03).
     Guard clause: skipped when avg_30d_sectors is None (Addendum 3.4).
+    lunar_phase requires dt_utc; instants come from the precomputed
+    moon event table (1800-2200), no ephemeris call.
     """
     events: List[Dict[str, Any]] = []
 
@@ -252,6 +316,20 @@ def _detect_events(
             "personal_context": "Emotionale Resonanz heute besonders stark",
         })
 
+    if dt_utc is not None:
+        for ev in moon_events_between(dt_utc - LUNAR_EVENT_WINDOW, dt_utc + LUNAR_EVENT_WINDOW):
+            events.append({
+                "type": "lunar_phase",
+                "priority": 2,
+                "sector": moon_sector,
+                "trigger_planet": "moon",
+                "description_de": (
+                    f"{LUNAR_PHASES[ev.phase_index][1]} um "
+                    f"{ev.datetime_utc.strftime('%H:%M')} UTC"
+                ),
+                "personal_context": _LUNAR_CONTEXT_DE[ev.phase_index],
+            })
+
     return events
 
 
@@ -278,7 +356,9 @@ def compute_transit_timeline(
 
     cache_key = f"timeline:{start_utc.strftime('%Y-%m-%d')}:{days}"
     if cache_key in _timeline_cache:
+        _cache_stats["timeline"][0] += 1
         return _timeline_cache[cache_key]
+    _cache_stats["timeline"][1] += 1
 
     result_days: List[Dict[str, Any]] = []
     for i in range(days):
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Literal, Optional, Sequence
+from typing import Any, Dict, ItemsView, Iterator, List, Literal, Mapping, Optional, Sequence, Tuple, Union, ValuesView
 
 from .constants import STEMS, BRANCHES
 
@@ -11,28 +12,39 @@ DayBoundary = Literal["midnight", "zi"]
 EphemerisBackendName = Literal["swisseph", "skyfield"]
 Fold = Literal[0, 1]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Pillar:
     stem_index: int
     branch_index: int
     def __str__(self) -> str:
         return f"{STEMS[self.stem_index]}{BRANCHES[self.branch_index]}"
 
-@dataclass(frozen=True)
+# Pillars are immutable, so every (stem, branch) pair needs one instance only.
+_PILLARS: Tuple[Tuple[Pillar, ...], ...] = tuple(
+    tuple(Pillar(s, b) for b in range(len(BRANCHES))) for s in range(len(STEMS))
+)
+
+def pillar_of(stem_index: int, branch_index: int) -> Pillar:
+    """Shared ``Pillar`` instance for a stem/branch pair."""
+    if 0 <= stem_index < len(STEMS) and 0 <= branch_index < len(BRANCHES):
+        return _PILLARS[stem_index][branch_index]
+    return Pillar(stem_index, branch_index)
+
+@dataclass(frozen=True, slots=True)
 class FourPillars:
     year: Pillar
     month: Pillar
     day: Pillar
     hour: Pillar
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SolarTerm:
     index: int
     target_lon_deg: float
     utc_dt: datetime
     local_dt: datetime
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BaziInput:
     birth_local: str
     timezone: str
@@ -55,7 +67,15 @@ class BaziInput:
     # v0.4 Month Boundary Scheme
     month_boundary_scheme: Literal["jie_only", "all_24"] = "jie_only"
 
-@dataclass(frozen=True)
+    # Pre-resolved aware local datetime (time_utils.NormalizedBirth); when
+    # set, birth_local/timezone/fold are not parsed and resolved again.
+    birth_local_dt: Optional[datetime] = None
+
+    # Diagnostics only; callers that never read solar_terms_local_dt can
+    # skip the 24-term search.
+    include_solar_terms: bool = True
+
+@dataclass(frozen=True, slots=True)
 class BaziResult:
     input: BaziInput
     pillars: FourPillars
@@ -78,3 +98,193 @@ class BaziResult:
     lichun_next_local_dt: Optional[datetime] = None
 
     solar_terms_local_dt: Optional[Sequence[SolarTerm]] = None
+
+    # Provenance id of the ephemeris backend that computed this result
+    ephemeris_id: Optional[str] = None
+
+
+# ── Body data as struct-of-arrays ────────────────────────────────────────────
+
+class _Missing:
+    """Marks an attribute a body does not have; pickles as the singleton."""
+
+    __slots__ = ()
+
+    def __reduce__(self) -> str:
+        return "_MISSING"
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+_MISSING: Any = _Missing()
+
+_Column = Union["array[float]", "array[int]", Tuple[Any, ...]]
+
+
+class _Layout:
+    """Attribute names of a BodyTable and their column positions (shared)."""
+
+    __slots__ = ("keys", "index")
+
+    def __init__(self, keys: Tuple[str, ...]) -> None:
+        self.keys = keys
+        self.index: Dict[str, int] = {k: i for i, k in enumerate(keys)}
+
+
+_layouts: Dict[Tuple[str, ...], _Layout] = {}
+
+
+def _layout_for(keys: Tuple[str, ...]) -> _Layout:
+    layout = _layouts.get(keys)
+    if layout is None:
+        layout = _layouts.setdefault(keys, _Layout(keys))
+    return layout
+
+
+def _pack(values: List[Any]) -> _Column:
+    """array('d') / array('q') for all-float / all-int columns, else a tuple."""
+    kinds = {type(v) for v in values}
+    if kinds == {float}:
+        return array("d", values)
+    if kinds == {int}:
+        return array("q", values)
+    return tuple(values)
+
+
+class BodyRow(Mapping[str, Any]):
+    """Read-only view of one body in a ``BodyTable`` (behaves like its dict)."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: BodyTable, row: int) -> None:
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._table._columns[self._table._layout.index[key]][self._row]
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        col = self._table._layout.index.get(key)
+        if col is None:
+            return default
+        value = self._table._columns[col][self._row]
+        return default if value is _MISSING else value
+
+    def __contains__(self, key: object) -> bool:
+        col = self._table._layout.index.get(key)  # type: ignore[call-overload]
+        return col is not None and self._table._columns[col][self._row] is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        row = self._row
+        for key, column in zip(self._table._layout.keys, self._table._columns):
+            if column[row] is not _MISSING:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class BodyTable(Mapping[str, Mapping[str, Any]]):
+    """Western body data (name -> attributes) stored column-wise.
+
+    ``compute_western_chart`` returns one dict per body; holding many charts
+    that way costs a dict plus boxed floats per body. A table keeps one
+    ``array('d')`` per float attribute (``array('q')`` for ints, a tuple
+    for anything else) and hands out read-only row views, so
+    ``table["Sun"]["longitude"]``, ``"error" in row`` and ``.items()``
+    work as with the original dicts. Tables with the same attribute names
+    share one layout.
+    """
+
+    __slots__ = ("_names", "_layout", "_columns")
+
+    def __init__(self, names: Sequence[str], keys: Sequence[str], columns: Sequence[_Column]) -> None:
+        self._names = tuple(names)
+        self._layout = _layout_for(tuple(keys))
+        self._columns = tuple(columns)
+
+    @classmethod
+    def from_bodies(cls, bodies: Mapping[str, Mapping[str, Any]]) -> BodyTable:
+        """Build a table from the ``bodies`` dict of a Western chart."""
+        rows = list(bodies.values())
+        keys: Dict[str, None] = {}
+        for data in rows:
+            keys.update(dict.fromkeys(data))
+        columns = [_pack([data.get(key, _MISSING) for data in rows]) for key in keys]
+        return cls(list(bodies), list(keys), columns)
+
+    def items(self) -> ItemsView[str, Mapping[str, Any]]:
+        return _BodyItems(self)
+
+    def values(self) -> ValuesView[Mapping[str, Any]]:
+        return _BodyValues(self)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        try:
+            return BodyRow(self, self._names.index(name))
+        except ValueError:
+            return default
+
+    def __getitem__(self, name: str) -> BodyRow:
+        try:
+            return BodyRow(self, self._names.index(name))
+        except ValueError:
+            raise KeyError(name) from None
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def column(self, key: str) -> _Column:
+        """All values of one attribute in body order.
+
+        Raises KeyError if the attribute is absent or missing for some body.
+        """
+        column = self._columns[self._layout.index[key]]
+        if isinstance(column, tuple) and _MISSING in column:
+            raise KeyError(key)
+        return column
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (BodyTable, (self._names, self._layout.keys, self._columns))
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Plain ``{name: {attribute: value}}`` copy."""
+        return {name: dict(self[name]) for name in self._names}
+
+    def __repr__(self) -> str:
+        return f"BodyTable({self.to_dict()!r})"
+
+
+class _BodyItems(ItemsView[str, Mapping[str, Any]]):
+    """``items()`` of a BodyTable without a name lookup per row."""
+
+    _mapping: BodyTable
+
+    def __iter__(self) -> Iterator[Tuple[str, Mapping[str, Any]]]:
+        table = self._mapping
+        for row, name in enumerate(table._names):
+            yield name, BodyRow(table, row)
+
+
+class _BodyValues(ValuesView[Mapping[str, Any]]):
+    """``values()`` of a BodyTable without a name lookup per row."""
+
+    _mapping: BodyTable
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        table = self._mapping
+        for row in range(len(table._names)):
+            yield BodyRow(table, row)
@@ -0,0 +1,279 @@
+"""
+tz_index.py — Lazily built UTC-offset transition index per ZoneInfo.
+
+Classifying a naive local time as ok / ambiguous (DST fold) / nonexistent
+(DST gap) used to take two local→UTC→local round trips, and resolving a gap
+walked forward minute by minute. With the zone's transitions as sorted
+``(utc_instant, offset_before, offset_after)`` arrays the same answers are a
+bisect plus integer arithmetic, and the exact gap size falls out for free.
+
+Transition instants come from the zone's TZif file (same search order as
+``zoneinfo``: TZPATH, then the ``tzdata`` package); the offsets on either side
+are taken from the ZoneInfo itself, so results agree with ``datetime``
+arithmetic by construction. Beyond the file's explicit table (POSIX footer
+rules, "slim" TZif files, or zones without a file) the offset is sampled every
+6 hours and each change bisected to the exact second. Both are filled in one
+UTC year at a time on first use.
+"""
+from __future__ import annotations
+
+import struct
+import threading
+import zoneinfo
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Literal, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+LocalStatus = Literal["ok", "ambiguous", "nonexistent"]
+
+_EPOCH = datetime(1970, 1, 1)
+_SAMPLE_STEP = 6 * 3600
+# Offsets stay within ±26 h and no gap/fold exceeds 24 h, so any transition
+# that can affect a local time lies within two days of it.
+_WINDOW = 2 * 86400
+_MIN_YEAR = 2
+_MAX_YEAR = 9998
+
+
+@dataclass(frozen=True)
+class LocalClassification:
+    """Where a naive local time falls relative to the zone's transitions.
+
+    ``transition_utc`` / ``offset_before`` / ``offset_after`` (seconds) describe
+    the transition responsible for a gap or fold; ``gap_seconds`` is the size
+    of the gap (positive) or fold (negative), 0 for ordinary times.
+    """
+    status: LocalStatus
+    transition_utc: Optional[int] = None
+    offset_before: Optional[int] = None
+    offset_after: Optional[int] = None
+
+    @property
+    def gap_seconds(self) -> int:
+        if self.offset_before is None or self.offset_after is None:
+            return 0
+        return self.offset_after - self.offset_before
+
+    @property
+    def gap_end_local_seconds(self) -> Optional[int]:
+        """First valid local wall-clock second after a gap (epoch-based)."""
+        if self.status != "nonexistent" or self.transition_utc is None or self.offset_after is None:
+            return None
+        return self.transition_utc + self.offset_after
+
+
+def local_seconds(naive: datetime) -> int:
+    """Whole seconds of a naive wall-clock time since 1970-01-01T00:00 (floor)."""
+    return (naive - _EPOCH) // timedelta(seconds=1)
+
+
+def _year_start(year: int) -> int:
+    return local_seconds(datetime(year, 1, 1))
+
+
+def _read_tzif(key: str) -> Optional[bytes]:
+    parts = key.split("/")
+    if not key or any(p in ("", ".", "..") for p in parts):
+        return None
+    for root in zoneinfo.TZPATH:
+        try:
+            with open(f"{root}/{key}", "rb") as f:
+                return f.read()
+        except OSError:
+            continue
+    try:
+        from importlib import resources
+        return resources.files("tzdata.zoneinfo").joinpath(*parts).read_bytes()
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+def parse_tzif(data: bytes) -> Optional[Tuple[List[int], Optional[str]]]:
+    """(explicit transition instants in UTC epoch seconds, POSIX footer) from a
+    TZif blob (RFC 8536); the footer is None for version-1 files."""
+    if len(data) < 44 or data[:4] != b"TZif":
+        return None
+    isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = struct.unpack(">6l", data[20:44])
+    if data[4:5] == b"\x00":
+        return list(struct.unpack(f">{timecnt}l", data[44:44 + 4 * timecnt])), None
+    # v2+: skip the 32-bit block, read the 64-bit one.
+    off = 44 + timecnt * 5 + typecnt * 6 + charcnt + leapcnt * 8 + isstdcnt + isutcnt
+    if data[off:off + 4] != b"TZif":
+        return None
+    isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = struct.unpack(">6l", data[off + 20:off + 44])
+    start = off + 44
+    times = list(struct.unpack(f">{timecnt}q", data[start:start + 8 * timecnt]))
+    end = start + timecnt * 9 + typecnt * 6 + charcnt + leapcnt * 12 + isstdcnt + isutcnt
+    footer = data[end:].strip(b"\n").decode("ascii", "replace")
+    return times, footer
+
+
+class TransitionIndex:
+    """Sorted offset transitions for one zone, filled in per UTC year."""
+
+    def __init__(self, tz: ZoneInfo) -> None:
+        self.tz = tz
+        self._years: Dict[int, Tuple[array, array, array]] = {}
+        self._start_offsets: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        data = _read_tzif(tz.key) if tz.key else None
+        parsed = parse_tzif(data) if data else None
+        # Explicit instants cover everything up to the last one; later
+        # instants only exist if the POSIX footer has DST rules ("," in it).
+        # Without a readable file every year is sampled.
+        self._explicit: List[int] = sorted(set(parsed[0])) if parsed else []
+        self._explicit_end: Optional[int] = self._explicit[-1] if self._explicit else None
+        footer = parsed[1] if parsed else None
+        self._sample_after_explicit = parsed is None or footer is None or "," in footer
+        # Footer rules give two changes a year, never within a day of each other.
+        self._step = _SAMPLE_STEP if parsed is None else 86400
+
+    def _offset(self, t: int) -> int:
+        off = datetime.fromtimestamp(t, timezone.utc).astimezone(self.tz).utcoffset()
+        return int(off.total_seconds()) if off is not None else 0
+
+    def _append(self, out: Tuple[array, array, array], t: int, before: int, after: int) -> None:
+        out[0].append(t)
+        out[1].append(before)
+        out[2].append(after)
+
+    def _probe(self, start: int, end: int, out: Tuple[array, array, array]) -> None:
+        """Append offset changes at instants in ``(start, end)``."""
+        t_prev, off_prev = start, self._offset(start)
+        t = start
+        while t < end:
+            t = min(t + self._step, end)
+            off = self._offset(t)
+            if off != off_prev:
+                lo, hi = t_prev, t  # offset(lo) == off_prev, offset(hi) == off
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    if self._offset(mid) == off_prev:
+                        lo = mid
+                    else:
+                        hi = mid
+                # A change exactly at ``end`` belongs to the next range.
+                if hi < end:
+                    self._append(out, hi, off_prev, off)
+            t_prev, off_prev = t, off
+
+    def _build_year(self, year: int) -> Tuple[array, array, array]:
+        start, end = _year_start(year), _year_start(year + 1)
+        out: Tuple[array, array, array] = (array("q"), array("q"), array("q"))
+        explicit_end = self._explicit_end
+        if explicit_end is not None and start <= explicit_end:
+            i = bisect_left(self._explicit, start)
+            j = bisect_left(self._explicit, end)
+            for t in self._explicit[i:j]:
+                before, after = self._offset(t - 1), self._offset(t)
+                if before != after:  # isdst/abbreviation-only changes
+                    self._append(out, t, before, after)
+        if self._sample_after_explicit and (explicit_end is None or explicit_end < end - 1):
+            self._probe(start if explicit_end is None else max(start, explicit_end), end, out)
+        return out
+
+    def year(self, year: int) -> Tuple[array, array, array]:
+        """(utc_instants, offsets_before, offsets_after) for one UTC year."""
+        cached = self._years.get(year)
+        if cached is None:
+            cached = self._build_year(year)
+            start_offset = self._offset(_year_start(year))
+            with self._lock:
+                self._start_offsets.setdefault(year, start_offset)
+                self._years.setdefault(year, cached)
+        return cached
+
+    def offset_at_utc(self, u: int) -> int:
+        """UTC offset (seconds) in effect at UTC epoch second *u*."""
+        y = datetime.fromtimestamp(u, timezone.utc).year
+        utc, _before, after = self.year(y)
+        i = bisect_right(utc, u)
+        return after[i - 1] if i else self._start_offsets[y]
+
+    def transitions_between(self, t0: int, t1: int) -> List[Tuple[int, int, int]]:
+        """All transitions with ``t0 <= utc_instant < t1`` (epoch seconds)."""
+        y0 = datetime.fromtimestamp(t0, timezone.utc).year
+        y1 = datetime.fromtimestamp(t1, timezone.utc).year
+        out: List[Tuple[int, int, int]] = []
+        for y in range(y0, y1 + 1):
+            utc, before, after = self.year(y)
+            i = bisect_left(utc, t0)
+            j = bisect_right(utc, t1 - 1)
+            out.extend((utc[k], before[k], after[k]) for k in range(i, j))
+        return out
+
+    def local_table(self, ls_min: int, ls_max: int) -> "LocalTable":
+        """Flattened transitions covering local seconds ``[ls_min, ls_max]``."""
+        t0, t1 = ls_min - _WINDOW, ls_max + _WINDOW
+        rows = self.transitions_between(t0, t1)
+        base = self.offset_at_utc(t0)
+        return LocalTable(rows, base)
+
+    def classify_seconds(self, ls: int) -> LocalClassification:
+        """Classify the local wall time starting at epoch-based second *ls*.
+
+        Gap/fold bounds are whole seconds, so sub-second parts never change
+        the answer.
+        """
+        for t, b, a in self.transitions_between(ls - _WINDOW, ls + _WINDOW):
+            lo, hi = (t + b, t + a) if a > b else (t + a, t + b)
+            if lo <= ls < hi:
+                return LocalClassification(
+                    status="nonexistent" if a > b else "ambiguous",
+                    transition_utc=t,
+                    offset_before=b,
+                    offset_after=a,
+                )
+        return LocalClassification(status="ok")
+
+    def classify(self, naive: datetime) -> LocalClassification:
+        """Classify a naive local datetime; ``naive.tzinfo`` is ignored."""
+        return self.classify_seconds(local_seconds(naive.replace(tzinfo=None)))
+
+
+class LocalTable:
+    """Transitions of one zone over a bounded span, laid out for bulk lookups.
+
+    ``lo[i]``/``hi[i]`` bound the local wall-clock seconds of the gap or fold
+    created by transition *i*; they are sorted because transitions are days
+    apart. One ``bisect`` per local time gives status and offset.
+    """
+
+    __slots__ = ("utc", "before", "after", "lo", "hi", "base")
+
+    def __init__(self, rows: List[Tuple[int, int, int]], base: int) -> None:
+        self.utc = array("q", (t for t, _b, _a in rows))
+        self.before = array("q", (b for _t, b, _a in rows))
+        self.after = array("q", (a for _t, _b, a in rows))
+        self.lo = array("q", (t + min(a, b) for t, b, a in rows))
+        self.hi = array("q", (t + max(a, b) for t, b, a in rows))
+        self.base = base
+
+    def lookup(self, ls: int) -> Tuple[int, int]:
+        """(k, j): k = -1 ok / 0 ambiguous / 1 nonexistent, j = transition
+        index (-1 before the first). For ok times the offset is
+        ``after[j]`` (or ``base`` when j == -1)."""
+        j = bisect_right(self.lo, ls) - 1
+        if j >= 0 and ls < self.hi[j]:
+            return (1 if self.after[j] > self.before[j] else 0), j
+        return -1, j
+
+    def offset_ok(self, j: int) -> int:
+        return self.after[j] if j >= 0 else self.base
+
+
+@lru_cache(maxsize=None)
+def transition_index(tz: ZoneInfo) -> TransitionIndex:
+    """Shared index per ZoneInfo (ZoneInfo instances are themselves cached by key)."""
+    return TransitionIndex(tz)
+
+
+def classify_local(naive: datetime, tz: ZoneInfo) -> Optional[LocalClassification]:
+    """Classify *naive* in *tz*; None for years outside the indexable range."""
+    if not (_MIN_YEAR <= naive.year <= _MAX_YEAR):
+        return None
+    return transition_index(tz).classify(naive)
@@ -8,6 +8,8 @@ import swisseph as swe
 from .aspects import compute_aspects
 from .constants import AYANAMSHA_MODES
 from .ephemeris import SwissEphBackend, assert_no_moseph_fallback, datetime_utc_to_jd_ut
+from .ephemeris_cache import shared_position_cache
+from . import timing
 
 _SWE_LOCK = threading.Lock()
 
@@ -28,7 +30,7 @@ PLANETS = {
     "TrueNorthNode": swe.TRUE_NODE
 }
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WesternBody:
     name: str
     longitude: float
@@ -46,22 +48,28 @@ def compute_western_chart(
     alt: float = 0.0,
     ephe_path: Optional[str] = None,
     zodiac_mode: str = "tropical",
+    exact: bool = True,
 ) -> Dict[str, Any]:
     """
     Compute basic western chart: Planets + Houses.
     Includes True Node, Retrograde status, and High-Latitude fallback.
+
+    exact=False answers planet positions from the interpolated position
+    cache (ephemeris_cache, < 0.1 arcsec); houses are always exact.
     """
-    backend = SwissEphBackend(ephe_path=ephe_path)
+    laps = timing.laps("western")
+    backend = SwissEphBackend(ephe_path=ephe_path, exact=exact)
     
     # JD (UT)
     jd_ut = datetime_utc_to_jd_ut(birth_utc_dt)
     
     bodies = {}
     flags = backend.flags | swe.FLG_SPEED
-    
+    calc_ut = timing.timed("swe.calc_ut", swe.calc_ut) if backend.exact else shared_position_cache().calc_ut
+
     for name, pid in PLANETS.items():
         try:
-            (lon_deg, lat_deg, dist, speed_lon, _, _), ret = swe.calc_ut(jd_ut, pid, flags)
+            (lon_deg, lat_deg, dist, speed_lon, _, _), ret = calc_ut(jd_ut, pid, flags)
             assert_no_moseph_fallback(flags, ret)
             bodies[name] = {
                 "longitude": lon_deg,
@@ -74,6 +82,7 @@ def compute_western_chart(
             }
         except swe.Error as e:
             bodies[name] = {"error": str(e)}
+    laps.lap("planets")
 
     # Houses with Fallback
     # Default: Placidus ('P')
@@ -88,9 +97,10 @@ def compute_western_chart(
     used_sys = None
     fallback_reason: Optional[str] = None
 
+    houses_fn = timing.timed("swe.houses", swe.houses)
     for sys_char in house_systems:
         try:
-            c, a = swe.houses(jd_ut, lat, lon, sys_char)
+            c, a = houses_fn(jd_ut, lat, lon, sys_char)
             # Check for validity (sometimes it returns 0s without error if it fails silently)
             if c[1] == 0.0 and c[2] == 0.0:
                  continue
@@ -113,6 +123,7 @@ def compute_western_chart(
             "flag": "exact",
             "system": used_label,
             "requested": requested_label,
+            "reason": None,
         }
     else:
         fallback_reason = (
@@ -165,8 +176,11 @@ def compute_western_chart(
         for key in angles:
             angles[key] = (angles[key] - ayanamsha) % 360
 
+    laps.lap("houses")
+
     # Compute planetary aspects (after any sidereal adjustment)
     aspects = compute_aspects(bodies)
+    laps.lap("aspects")
 
     return {
         "jd_ut": jd_ut,
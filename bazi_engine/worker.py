@@ -0,0 +1,50 @@
+"""
+worker.py — Background job workers as their own process.
+
+    python -m bazi_engine.worker [--workers N]
+
+Claims jobs from the queue that POST /jobs fills (JOB_STORE_PATH, shared with
+the API process on the same host) and runs them until SIGTERM/SIGINT; a job
+interrupted that way goes back to the queue and continues from its last
+checkpoint. Idle workers delete finished jobs older than JOB_RETENTION_SECONDS.
+
+The API process starts no workers by default (JOB_WORKERS=0), so job chunks
+never compete with requests for the interpreter; see services/jobs.py.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import threading
+
+# Importing the router registers the job types.
+from .routers import jobs as _job_types  # noqa: F401
+from .services.jobs import get_job_store, start_job_workers, stop_job_workers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background job workers.")
+    parser.add_argument(
+        "--workers", type=int, default=int(os.environ.get("JOB_WORKERS") or 1),
+        help="Worker threads (default: JOB_WORKERS, or 1 if unset or 0)",
+    )
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    stopping = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stopping.set())
+
+    start_job_workers(args.workers)
+    logging.info("job workers: %d on %s", args.workers, get_job_store().path)
+    stopping.wait()
+    logging.info("stopping job workers")
+    stop_job_workers()
+
+
+if __name__ == "__main__":
+    main()
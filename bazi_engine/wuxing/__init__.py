@@ -5,7 +5,7 @@ Re-exports everything for backwards compatibility with
 ``from bazi_engine.fusion import WuXingVector, PLANET_TO_WUXING, ...``
 """
 from .constants import PLANET_TO_WUXING, WUXING_ORDER, WUXING_INDEX
-from .vector import WuXingVector
+from .vector import ElementMap, WuXingVector
 from .analysis import (
     planet_to_wuxing,
     calculate_wuxing_vector_from_planets,
@@ -16,6 +16,15 @@ from .analysis import (
     calculate_harmony_index,
     interpret_harmony,
 )
+from .pillar_table import (
+    JIAZI_CODES,
+    PillarSet,
+    jiazi_codes,
+    pillar_code,
+    pillar_code_from_names,
+    wuxing_batch,
+    wuxing_from_codes,
+)
 from .zones import (
     ZoneResult,
     ZoneLabel,
@@ -31,6 +40,7 @@ __all__ = [
     "WUXING_ORDER",
     "WUXING_INDEX",
     "WuXingVector",
+    "ElementMap",
     "planet_to_wuxing",
     "calculate_wuxing_vector_from_planets",
     "calculate_wuxing_vector_from_planets_with_ledger",
@@ -39,6 +49,14 @@ __all__ = [
     "calculate_wuxing_from_bazi_with_ledger",
     "calculate_harmony_index",
     "interpret_harmony",
+    # integer-indexed pillar table
+    "JIAZI_CODES",
+    "PillarSet",
+    "jiazi_codes",
+    "pillar_code",
+    "pillar_code_from_names",
+    "wuxing_batch",
+    "wuxing_from_codes",
     # Logik B — Zonenklassifikation
     "ZoneResult",
     "ZoneLabel",
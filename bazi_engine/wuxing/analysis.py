@@ -11,11 +11,28 @@ Contains:
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Mapping, Optional
 
 from .constants import PLANET_TO_WUXING, WUXING_INDEX
+from .pillar_table import (  # noqa: F401  (_BRANCH_HIDDEN/_STEM_TO_ELEMENT re-exported)
+    _BRANCH_HIDDEN,
+    _STEM_TO_ELEMENT,
+    BRANCH_INDEX,
+    NO_BRANCH,
+    NO_STEM,
+    PILLAR_TENTHS,
+    STEM_INDEX,
+    PillarSet,
+    ledger_for_code,
+    pillar_code,
+    pillar_code_from_names,
+    wuxing_from_codes,
+)
 from .vector import WuXingVector
 
+_STEM_CODE = {name: pillar_code(i, 0) for name, i in STEM_INDEX.items()}
+_NO_STEM_CODE = pillar_code(NO_STEM, 0)
+
 
 def planet_to_wuxing(planet_name: str, is_night: bool = False) -> str:
     """Return the Wu-Xing element for a planet.
@@ -44,7 +61,7 @@ def is_night_chart(sun_longitude: float, ascendant: Optional[float] = None) -> b
 
 
 def calculate_wuxing_vector_from_planets(
-    bodies: Dict[str, Dict[str, Any]],
+    bodies: Mapping[str, Mapping[str, Any]],
     use_retrograde_weight: bool = True,
     ascendant: Optional[float] = None,
 ) -> WuXingVector:
@@ -133,33 +150,7 @@ def calculate_wuxing_vector_from_planets_with_ledger(
     return WuXingVector(*values), ledger
 
 
-# Hidden stems in Earthly Branches (藏干) with traditional Qi weights.
-# Main Qi (主气) = 1.0, Middle Qi (中气) = 0.5, Residual Qi (余气) = 0.3
-_BRANCH_HIDDEN: Dict[str, List[tuple[str, float]]] = {
-    "Zi":   [("Wasser", 1.0)],
-    "Chou": [("Erde", 1.0), ("Wasser", 0.5), ("Metall", 0.3)],
-    "Yin":  [("Holz", 1.0), ("Feuer", 0.5), ("Erde", 0.3)],
-    "Mao":  [("Holz", 1.0)],
-    "Chen": [("Erde", 1.0), ("Holz", 0.5), ("Wasser", 0.3)],
-    "Si":   [("Feuer", 1.0), ("Metall", 0.5), ("Erde", 0.3)],
-    "Wu":   [("Feuer", 1.0), ("Erde", 0.5)],
-    "Wei":  [("Erde", 1.0), ("Feuer", 0.5), ("Holz", 0.3)],
-    "Shen": [("Metall", 1.0), ("Wasser", 0.5), ("Erde", 0.3)],
-    "You":  [("Metall", 1.0)],
-    "Xu":   [("Erde", 1.0), ("Metall", 0.5), ("Feuer", 0.3)],
-    "Hai":  [("Wasser", 1.0), ("Holz", 0.5)],
-}
-
-_STEM_TO_ELEMENT: Dict[str, str] = {
-    "Jia": "Holz", "Yi": "Holz",
-    "Bing": "Feuer", "Ding": "Feuer",
-    "Wu": "Erde", "Ji": "Erde",
-    "Geng": "Metall", "Xin": "Metall",
-    "Ren": "Wasser", "Gui": "Wasser",
-}
-
-
-def calculate_wuxing_from_bazi(pillars: Dict[str, Dict[str, str]]) -> WuXingVector:
+def calculate_wuxing_from_bazi(pillars: Mapping[str, Mapping[str, str]]) -> WuXingVector:
     """Extract Wu-Xing vector from BaZi pillars.
 
     Each pillar contributes via:
@@ -167,58 +158,33 @@ def calculate_wuxing_from_bazi(pillars: Dict[str, Dict[str, str]]) -> WuXingVect
     - Earthly Branch → hidden stems with traditional Qi weights
 
     Supports both English keys (stem/branch) and German keys (stamm/zweig).
+    The contributions come from the precomputed pillar table
+    (``pillar_table.PILLAR_TENTHS``); a ``PillarSet`` is summed by code.
     """
-    values = [0.0, 0.0, 0.0, 0.0, 0.0]
-
-    for _pillar_name, pillar_data in pillars.items():
-        stem = pillar_data.get("stem", pillar_data.get("stamm", ""))
-        branch = pillar_data.get("branch", pillar_data.get("zweig", ""))
-
-        if stem in _STEM_TO_ELEMENT:
-            values[WUXING_INDEX[_STEM_TO_ELEMENT[stem]]] += 1.0
-
-        for elem, weight in _BRANCH_HIDDEN.get(branch, []):
-            values[WUXING_INDEX[elem]] += weight
-
-    return WuXingVector(*values)
+    if isinstance(pillars, PillarSet):
+        return wuxing_from_codes(pillars.codes)
+    h = f = e = m = w = 0
+    for p in pillars.values():
+        stem = p.get("stem", p.get("stamm", ""))
+        branch = p.get("branch", p.get("zweig", ""))
+        r = PILLAR_TENTHS[_STEM_CODE.get(stem, _NO_STEM_CODE) + BRANCH_INDEX.get(branch, NO_BRANCH)]
+        h += r[0]
+        f += r[1]
+        e += r[2]
+        m += r[3]
+        w += r[4]
+    return WuXingVector(h / 10, f / 10, e / 10, m / 10, w / 10)
 
 
 def calculate_wuxing_from_bazi_with_ledger(
     pillars: Dict[str, Dict[str, str]],
 ) -> tuple[WuXingVector, list[dict[str, Any]]]:
     """Extract Wu-Xing vector from BaZi pillars with per-contribution ledger."""
-    values = [0.0, 0.0, 0.0, 0.0, 0.0]
+    codes = [(name, pillar_code_from_names(p)) for name, p in pillars.items()]
     ledger: list[dict[str, Any]] = []
-    _QI_LABELS = {1.0: "hidden_main", 0.5: "hidden_middle", 0.3: "hidden_residual"}
-
-    for pillar_name, pillar_data in pillars.items():
-        stem = pillar_data.get("stem", pillar_data.get("stamm", ""))
-        branch = pillar_data.get("branch", pillar_data.get("zweig", ""))
-
-        if stem in _STEM_TO_ELEMENT:
-            element = _STEM_TO_ELEMENT[stem]
-            values[WUXING_INDEX[element]] += 1.0
-            ledger.append({
-                "pillar": pillar_name,
-                "source": "stem",
-                "stem_name": stem,
-                "element": element,
-                "weight": 1.0,
-                "category": "traditional",
-            })
-
-        for elem, weight in _BRANCH_HIDDEN.get(branch, []):
-            values[WUXING_INDEX[elem]] += weight
-            ledger.append({
-                "pillar": pillar_name,
-                "source": _QI_LABELS.get(weight, "hidden"),
-                "branch_name": branch,
-                "element": elem,
-                "weight": weight,
-                "category": "traditional",
-            })
-
-    return WuXingVector(*values), ledger
+    for name, code in codes:
+        ledger.extend(ledger_for_code(name, code))
+    return wuxing_from_codes(code for _, code in codes), ledger
 
 
 def calculate_harmony_index(
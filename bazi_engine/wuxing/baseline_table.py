@@ -0,0 +1,293 @@
+"""
+wuxing/baseline_table.py — Monte-Carlo-Baselines des Harmony Index je Inputdichte.
+
+Für jede ganzzahlige Dichte (n_west, n_bazi) mit 0 ≤ n_west ≤ n_west_max und
+0 ≤ n_bazi ≤ n_bazi_max enthält die Tabelle Mittelwert, Standardabweichung
+und Quantile von H = cos(W, B) zweier zufälliger, unabhängiger Charts dieser
+Dichte. ``calibrate_harmony`` liest daraus H_baseline / H_sigma per direktem
+Array-Index; Dichten oberhalb des Gitters werden auf den Rand geklemmt.
+
+Simulationsmodell (``simulate_baselines``) — dieselben Funktionen wie im
+Produktivpfad, nur mit zufälligen Eingaben:
+  West  die ersten n_west Körper aus ``WEST_BODIES`` (Reihenfolge der Engine,
+        Chiron zuletzt, da er ohne Asteroidendatei fehlt), Körper j rückläufig
+        mit Wahrscheinlichkeit ``RETROGRADE_SHARE``, Nachtchart mit
+        Wahrscheinlichkeit p_night; Vektor aus
+        ``calculate_wuxing_vector_from_planets``.
+  BaZi  ⌈n_bazi / 3⌉ unabhängige, gleichverteilte Jiazi-Pfeiler (die
+        Kalibrierung zählt 3 Beiträge je Pfeiler, d. h. vier Pfeiler ergeben
+        immer n_bazi = 12); Vektor aus ``calculate_wuxing_from_bazi``.
+
+Vektorisierung: Der West-Vektor hängt nur von Tag/Nacht und den
+Rückläufigkeits-Flags ab. Jede in einem Block gezogene Kombination wird
+einmal durch ``calculate_wuxing_vector_from_planets`` gerechnet und dann per
+Index verteilt. ``calculate_wuxing_from_bazi`` ist additiv über die Pfeiler,
+also ist ein BaZi-Vektor ``Multinomial(k, 1/60) @ Pfeilermatrix`` mit den
+60 Einzelpfeiler-Vektoren der Funktion als Zeilen. Die Stichproben werden
+blockweise für alle Partner-Dichten wiederverwendet (je Zelle unverzerrt).
+Quantile stammen aus einem Histogramm mit ``_BINS`` Klassen über [0, 1]
+(linear interpoliert).
+
+Die Tabelle wird einmalig erzeugt (``scripts/build_baseline_table.py``, numpy
+erforderlich) und als ``harmony_baselines.bin`` mit dem Paket ausgeliefert.
+
+Dateiformat (little-endian):
+  Header  ``<8sHHHHQQd`` — Magic, Version, n_west_max, n_bazi_max, Anzahl
+          Quantil-Niveaus, Stichproben je Zelle, Seed, p_night.
+  Daten   ``float64``: Quantil-Niveaus [L], Mittelwerte [Z], Standard-
+          abweichungen [Z], Quantile [Z × L] mit Z = (n_west_max + 1) ·
+          (n_bazi_max + 1) Zellen, Zeile n_west, Spalte n_bazi.
+"""
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .analysis import calculate_wuxing_from_bazi, calculate_wuxing_vector_from_planets
+from .constants import PLANET_TO_WUXING
+from .pillar_table import JIAZI_CODES, NO_BRANCH, NO_STEM, _BRANCH_HIDDEN, _STEM_TO_ELEMENT
+
+TABLE_PATH = Path(__file__).with_name("harmony_baselines.bin")
+
+_MAGIC = b"BZHBASEL"
+_VERSION = 2
+_HEADER = struct.Struct("<8sHHHHQQd")
+_BINS = 4096
+
+#: Körper des West-Vektors in der Reihenfolge von ``western.PLANETS``;
+#: Chiron zuletzt (fehlt ohne seas_18.se1, z. B. unter MOSEPH).
+WEST_BODIES: Tuple[str, ...] = tuple(
+    sorted(PLANET_TO_WUXING, key=lambda name: name == "Chiron")
+)
+
+#: Anteil der Zeit mit negativer Längengeschwindigkeit (1900–2100, Swiss
+#: Ephemeris, 20 000 Zufallszeitpunkte); Chiron aus der Literatur (≈ 5 Monate
+#: je Jahr). Sonne, Mond und Lilith (mittleres Apogäum) sind nie rückläufig.
+RETROGRADE_SHARE: Dict[str, float] = {
+    "Mercury": 0.191, "Venus": 0.075, "Mars": 0.094, "Jupiter": 0.305,
+    "Saturn": 0.364, "Uranus": 0.411, "Neptune": 0.430, "Pluto": 0.442,
+    "Chiron": 0.39, "NorthNode": 1.0, "TrueNorthNode": 0.740,
+}
+
+#: Qi-Beiträge je Pfeiler, wie ``calibration.input_density`` sie zählt.
+CONTRIBUTIONS_PER_PILLAR = 3
+
+DEFAULT_N_WEST_MAX = len(WEST_BODIES)
+DEFAULT_N_BAZI_MAX = 8 * CONTRIBUTIONS_PER_PILLAR
+DEFAULT_SAMPLES = 1_000_000
+DEFAULT_SEED = 20260
+DEFAULT_P_NIGHT = 0.5
+DEFAULT_LEVELS: Tuple[float, ...] = (0.01, 0.05, 0.10, 0.25, 0.50, 0.75, 0.90, 0.95, 0.99)
+
+
+class BaselineTable:
+    """H-Baselines auf dem (n_west, n_bazi)-Gitter mit Index-Lookup."""
+
+    __slots__ = ("n_west_max", "n_bazi_max", "samples", "seed", "p_night",
+                 "levels", "mean", "std", "quantiles")
+
+    def __init__(
+        self,
+        n_west_max: int,
+        n_bazi_max: int,
+        levels: Sequence[float],
+        mean: Sequence[float],
+        std: Sequence[float],
+        quantiles: Sequence[float],
+        *,
+        samples: int,
+        seed: int,
+        p_night: float,
+    ) -> None:
+        cells = (n_west_max + 1) * (n_bazi_max + 1)
+        if len(mean) != cells or len(std) != cells or len(quantiles) != cells * len(levels):
+            raise ValueError("Baseline-Tabelle: Arraylängen passen nicht zum Gitter")
+        self.n_west_max = n_west_max
+        self.n_bazi_max = n_bazi_max
+        self.samples = samples
+        self.seed = seed
+        self.p_night = p_night
+        self.levels = array("d", levels)
+        self.mean = array("d", mean)
+        self.std = array("d", std)
+        self.quantiles = array("d", quantiles)
+
+    def index(self, n_west: int, n_bazi: int) -> int:
+        """Zellindex der (auf das Gitter geklemmten) Dichte."""
+        w = min(max(n_west, 0), self.n_west_max)
+        b = min(max(n_bazi, 0), self.n_bazi_max)
+        return w * (self.n_bazi_max + 1) + b
+
+    def baseline(self, n_west: int, n_bazi: int) -> Tuple[float, float]:
+        """(H_baseline_mean, H_baseline_std) der Dichte."""
+        i = self.index(n_west, n_bazi)
+        return self.mean[i], self.std[i]
+
+    def quantiles_at(self, n_west: int, n_bazi: int) -> Dict[float, float]:
+        """Quantil-Niveau → H-Wert der Dichte."""
+        n = len(self.levels)
+        i = self.index(n_west, n_bazi) * n
+        return dict(zip(self.levels, self.quantiles[i:i + n]))
+
+
+# ── Binärformat ──────────────────────────────────────────────────────────────
+
+def encode_table(table: BaselineTable) -> bytes:
+    """Kodiert eine Baseline-Tabelle ins Binärformat."""
+    data = array("d", table.levels)
+    data.extend(table.mean)
+    data.extend(table.std)
+    data.extend(table.quantiles)
+    if sys.byteorder == "big":  # pragma: no cover - Format ist little-endian
+        data.byteswap()
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, table.n_west_max, table.n_bazi_max, len(table.levels),
+        table.samples, table.seed, table.p_night,
+    )
+    return header + data.tobytes()
+
+
+def decode_table(data: bytes) -> BaselineTable:
+    """Gegenstück zu ``encode_table``."""
+    if len(data) < _HEADER.size:
+        raise ValueError("Keine Baseline-Tabelle (Header fehlt)")
+    magic, version, nw, nb, n_levels, samples, seed, p_night = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Keine Baseline-Tabelle (Magic/Version unbekannt)")
+    cells = (nw + 1) * (nb + 1)
+    count = n_levels + 2 * cells + cells * n_levels
+    values = array("d")
+    values.frombytes(data[_HEADER.size:_HEADER.size + 8 * count])
+    if len(values) != count:
+        raise ValueError("Baseline-Tabelle ist abgeschnitten")
+    if sys.byteorder == "big":  # pragma: no cover
+        values.byteswap()
+    a, b, c = n_levels, n_levels + cells, n_levels + 2 * cells
+    return BaselineTable(
+        nw, nb, values[:a], values[a:b], values[b:c], values[c:],
+        samples=samples, seed=seed, p_night=p_night,
+    )
+
+
+@lru_cache(maxsize=4)
+def load_baseline_table(path: Optional[str] = None) -> BaselineTable:
+    """Lädt (einmalig) die ausgelieferte oder eine eigene Tabelle."""
+    return decode_table(Path(path or TABLE_PATH).read_bytes())
+
+
+# ── Erzeugung (einmalig, vektorisiert mit numpy) ─────────────────────────────
+
+def _pillar_vectors() -> List[List[float]]:
+    """Vektoren der 60 Jiazi-Pfeiler einzeln, aus ``calculate_wuxing_from_bazi``."""
+    stems = list(_STEM_TO_ELEMENT)
+    branches = list(_BRANCH_HIDDEN)
+    rows = []
+    for code in JIAZI_CODES:
+        stem, branch = divmod(code, NO_BRANCH + 1)
+        assert stem != NO_STEM and branch != NO_BRANCH
+        pillar = {"stem": stems[stem], "branch": branches[branch]}
+        rows.append(calculate_wuxing_from_bazi({"pillar": pillar}).to_list())
+    return rows
+
+
+def _west_vector(n_west: int, night: bool, retrograde: Sequence[bool]) -> List[float]:
+    """West-Vektor der ersten ``n_west`` Körper, aus ``calculate_wuxing_vector_from_planets``.
+
+    Sonne bei 0°, Aszendent bei 90° (Nacht: Sonne unter dem Horizont) bzw. 270°.
+    """
+    bodies = {
+        name: {"longitude": 0.0, "is_retrograde": retro}
+        for name, retro in zip(WEST_BODIES[:n_west], retrograde)
+    }
+    ascendant = 90.0 if night else 270.0
+    return calculate_wuxing_vector_from_planets(bodies, ascendant=ascendant).to_list()
+
+
+def simulate_baselines(
+    n_west_max: int = DEFAULT_N_WEST_MAX,
+    n_bazi_max: int = DEFAULT_N_BAZI_MAX,
+    samples: int = DEFAULT_SAMPLES,
+    *,
+    seed: int = DEFAULT_SEED,
+    p_night: float = DEFAULT_P_NIGHT,
+    levels: Sequence[float] = DEFAULT_LEVELS,
+    chunk: int = 1 << 16,
+) -> BaselineTable:
+    """Simuliert die Baseline-Tabelle (deterministisch für gleichen Seed).
+
+    Zellen mit n_west = 0 oder n_bazi = 0 (Nullvektor, "degenerate") erhalten
+    Mittelwert, Streuung und Quantile 0. n_west über ``len(WEST_BODIES)``
+    wird wie der volle Körpersatz simuliert.
+    """
+    import numpy as np
+
+    rng = np.random.Generator(np.random.PCG64(seed))
+    n_bodies = min(n_west_max, len(WEST_BODIES))
+    p_retro = np.array([RETROGRADE_SHARE.get(name, 0.0) for name in WEST_BODIES[:n_bodies]])
+    pillar_mat = np.array(_pillar_vectors())
+    n_pillars = -(-n_bazi_max // CONTRIBUTIONS_PER_PILLAR)
+    nw1, nb1 = n_west_max + 1, n_bazi_max + 1
+
+    total = np.zeros((nw1, n_pillars + 1))
+    total_sq = np.zeros((nw1, n_pillars + 1))
+    hist = np.zeros((nw1, n_pillars + 1, _BINS), dtype=np.int64)
+    west_cache: Dict[Tuple[int, int], Any] = {}
+
+    def unit(v: Any) -> Any:
+        return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+    def west_unit(nw: int, night: Any, retro: Any) -> Any:
+        n = min(nw, n_bodies)
+        # Kombination als Bitmuster: Bit 0 = Nacht, Bit j + 1 = Körper j rückläufig
+        bits = night.astype(np.int64) | (retro[:, :n].astype(np.int64) << np.arange(1, n + 1)).sum(axis=1)
+        keys, inverse = np.unique(bits, return_inverse=True)
+        rows = []
+        for key in keys.tolist():
+            if (n, key) not in west_cache:
+                flags = [bool(key >> (j + 1) & 1) for j in range(n)]
+                west_cache[(n, key)] = _west_vector(n, bool(key & 1), flags)
+            rows.append(west_cache[(n, key)])
+        return unit(np.array(rows))[inverse.reshape(-1)]
+
+    done = 0
+    while done < samples:
+        size = min(chunk, samples - done)
+        night = rng.random(size) < p_night
+        retro = rng.random((size, n_bodies)) < p_retro
+        b_unit = [
+            unit(rng.multinomial(k, [1 / 60] * 60, size=size) @ pillar_mat)
+            for k in range(1, n_pillars + 1)
+        ]
+        for nw in range(1, nw1):
+            w = west_unit(nw, night, retro)
+            for k in range(1, n_pillars + 1):
+                h = np.einsum("ij,ij->i", w, b_unit[k - 1])
+                total[nw, k] += h.sum()
+                total_sq[nw, k] += (h * h).sum()
+                bins = np.minimum((h * _BINS).astype(np.intp), _BINS - 1)
+                hist[nw, k] += np.bincount(bins, minlength=_BINS)
+        done += size
+
+    # Spalte n_bazi → ⌈n_bazi / 3⌉ Pfeiler
+    column = [-(-nb // CONTRIBUTIONS_PER_PILLAR) for nb in range(nb1)]
+    mean = (total / samples)[:, column]
+    mean_sq = (total_sq / samples)[:, column]
+    std = np.sqrt(np.maximum(mean_sq - mean * mean, 0.0) * samples / max(samples - 1, 1))
+    quantiles = np.zeros((nw1, nb1, len(levels)))
+    edges = np.arange(_BINS + 1) / _BINS
+    for nw in range(1, nw1):
+        for k in range(1, n_pillars + 1):
+            cdf = np.concatenate(([0.0], np.cumsum(hist[nw, k]) / samples))
+            q = np.interp(levels, cdf, edges)
+            for nb in range(1, nb1):
+                if column[nb] == k:
+                    quantiles[nw, nb] = q
+    return BaselineTable(
+        n_west_max, n_bazi_max, levels,
+        mean.ravel().tolist(), std.ravel().tolist(), quantiles.ravel().tolist(),
+        samples=samples, seed=seed, p_night=p_night,
+    )
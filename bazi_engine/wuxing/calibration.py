@@ -14,10 +14,15 @@ zufälligen Charts gleicher Dichte?
 
 Wobei H_baseline = empirischer Erwartungswert für die gegebene Input-Dichte.
 
-KALIBRIERUNGSPARAMETER (empirisch aus 5000 Simulationen je Dichtekonfiguration):
+KALIBRIERUNGSPARAMETER (Monte Carlo mit den Vektorfunktionen der Engine,
+1M Stichproben je Dichte, siehe wuxing/baseline_table.py):
   - n_west:  Anzahl nicht-Error-Planeten
   - n_bazi:  Gesamtzahl Qi-Beiträge aus Vier Pfeilern (Stämme + verborgene Stämme)
 
+H_baseline / H_sigma kommen per Array-Index aus der ausgelieferten Tabelle
+für die exakte Dichte (n_west, n_bazi); nur wenn die Tabellendatei fehlt,
+greift die alte 3×3-Bucket-Tabelle.
+
 Das Ergebnis H_calibrated liegt in [0, 1]:
   0.0  = genau so (un)ähnlich wie zwei zufällige Charts
   1.0  = maximale Strukturkongruenz
@@ -31,11 +36,13 @@ Zusätzlich wird ein Qualitätsflag ausgegeben:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Literal
+from functools import lru_cache
+from typing import Any, Literal, Mapping, Optional, Tuple
 
+from .baseline_table import CONTRIBUTIONS_PER_PILLAR, BaselineTable, load_baseline_table
 from .vector import WuXingVector
 
-# ── Kalibrierungstabelle (empirisch, 5000 Simulationen je Zelle) ─────────────
+# ── Fallback-Tabelle (empirisch, 5000 Simulationen je Zelle) ─────────────────
 # Format: (n_west_bucket, n_bazi_bucket) → (H_baseline_mean, H_baseline_std)
 #
 # n_west_bucket: 1–3 → "sparse", 4–8 → "medium", 9+ → "dense"
@@ -74,21 +81,50 @@ def _n_bazi_bucket(n: int) -> str:
     return "dense"
 
 
-def _count_bazi_contributions(bazi_pillars: dict) -> int:
+def _count_bazi_contributions(bazi_pillars: Mapping[str, Any]) -> int:
     """Zählt die Gesamtzahl der Qi-Beiträge aus Vier Pfeilern.
 
     Jeder Stamm = 1 Beitrag, jeder Zweig = 1-3 Beiträge (verborgene Stämme).
-    Näherung: durchschnittlich 3 Beiträge pro Pfeiler (1 Stamm + ~2 Zweig-Qi).
+    Näherung: durchschnittlich 3 Beiträge pro Pfeiler (1 Stamm + ~2 Zweig-Qi),
+    vier Pfeiler also immer 12 — die Baseline-Tabelle simuliert genauso.
     """
-    return len(bazi_pillars) * 3
+    return len(bazi_pillars) * CONTRIBUTIONS_PER_PILLAR
 
 
-def _count_west_planets(western_bodies: dict) -> int:
+def _count_west_planets(western_bodies: Mapping[str, Mapping[str, Any]]) -> int:
     """Zählt Planeten ohne Error-Key."""
     return sum(1 for data in western_bodies.values() if "error" not in data)
 
 
-@dataclass(frozen=True)
+def input_density(
+    western_bodies: Mapping[str, Mapping[str, Any]],
+    bazi_pillars: Mapping[str, Any],
+) -> Tuple[int, int]:
+    """Inputdichte (n_west, n_bazi) eines Charts, wie sie die Kalibrierung zählt."""
+    return _count_west_planets(western_bodies), _count_bazi_contributions(bazi_pillars)
+
+
+@lru_cache(maxsize=1)
+def _baseline_source() -> Optional[BaselineTable]:
+    """Ausgelieferte Tabelle, oder None (Bucket-Fallback) wenn die Datei fehlt.
+
+    Auch das Fehlen wird gecacht — kein Dateizugriff je Aufruf.
+    """
+    try:
+        return load_baseline_table()
+    except FileNotFoundError:
+        return None
+
+
+def harmony_baseline(n_west: int, n_bazi: int) -> Tuple[float, float]:
+    """Baseline (H_baseline_mean, H_baseline_std) für die gegebene Inputdichte."""
+    table = _baseline_source()
+    if table is None:
+        return _BASELINE_TABLE[(_n_west_bucket(n_west), _n_bazi_bucket(n_bazi))]
+    return table.baseline(n_west, n_bazi)
+
+
+@dataclass(frozen=True, slots=True)
 class CalibrationResult:
     """Kalibriertes H mit Qualitätsmeta."""
     h_raw:        float          # Originaler H-Wert aus calculate_harmony_index()
@@ -123,8 +159,8 @@ class CalibrationResult:
 
 def calibrate_harmony(
     h_raw: float,
-    western_bodies: dict,
-    bazi_pillars: dict,
+    western_bodies: Mapping[str, Mapping[str, Any]],
+    bazi_pillars: Mapping[str, Any],
     western_vector: WuXingVector,
     bazi_vector: WuXingVector,
 ) -> CalibrationResult:
@@ -140,8 +176,7 @@ def calibrate_harmony(
     Returns:
         CalibrationResult mit h_calibrated, quality, sigma_above.
     """
-    n_west = _count_west_planets(western_bodies)
-    n_bazi = _count_bazi_contributions(bazi_pillars)
+    n_west, n_bazi = input_density(western_bodies, bazi_pillars)
 
     # Nullvektor-Check
     if western_vector.magnitude() == 0.0 or bazi_vector.magnitude() == 0.0:
@@ -157,9 +192,7 @@ def calibrate_harmony(
         quality = "sparse"
 
     # Baseline aus Tabelle
-    wb = _n_west_bucket(n_west)
-    bb = _n_bazi_bucket(n_bazi)
-    h_baseline, h_sigma = _BASELINE_TABLE[(wb, bb)]
+    h_baseline, h_sigma = harmony_baseline(n_west, n_bazi)
 
     # Kontrastnormierung
     if h_sigma < 1e-9:
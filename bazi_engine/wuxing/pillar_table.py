@@ -0,0 +1,223 @@
+"""
+wuxing/pillar_table.py — Integer-indexed Wu-Xing contributions of BaZi pillars.
+
+Every (stem, branch) combination gets a precomputed row: the 5-element
+contribution (stem element 1.0 plus the branch's hidden stems) and the
+ledger fragments that explain it. A chart's BaZi vector is then the sum of
+four rows instead of four rounds of string lookups.
+
+Pillars are addressed by a *pillar code* ``stem * 13 + branch`` with
+stem 0–9 / branch 0–11 in the usual Jia/Zi order; stem 10 and branch 12
+stand for a missing or unknown name and contribute nothing. Sexagenary
+(60-Jiazi) indices convert with ``JIAZI_CODES``.
+
+Rows are kept in integer tenths — all Qi weights are multiples of 0.1 —
+so sums are exact and independent of pillar order; vectors are the
+tenths divided by ten.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+from .constants import WUXING_INDEX
+from .vector import WuXingVector
+
+# Hidden stems in Earthly Branches (藏干) with traditional Qi weights.
+# Main Qi (主气) = 1.0, Middle Qi (中气) = 0.5, Residual Qi (余气) = 0.3
+_BRANCH_HIDDEN: Dict[str, List[tuple[str, float]]] = {
+    "Zi":   [("Wasser", 1.0)],
+    "Chou": [("Erde", 1.0), ("Wasser", 0.5), ("Metall", 0.3)],
+    "Yin":  [("Holz", 1.0), ("Feuer", 0.5), ("Erde", 0.3)],
+    "Mao":  [("Holz", 1.0)],
+    "Chen": [("Erde", 1.0), ("Holz", 0.5), ("Wasser", 0.3)],
+    "Si":   [("Feuer", 1.0), ("Metall", 0.5), ("Erde", 0.3)],
+    "Wu":   [("Feuer", 1.0), ("Erde", 0.5)],
+    "Wei":  [("Erde", 1.0), ("Feuer", 0.5), ("Holz", 0.3)],
+    "Shen": [("Metall", 1.0), ("Wasser", 0.5), ("Erde", 0.3)],
+    "You":  [("Metall", 1.0)],
+    "Xu":   [("Erde", 1.0), ("Metall", 0.5), ("Feuer", 0.3)],
+    "Hai":  [("Wasser", 1.0), ("Holz", 0.5)],
+}
+
+_STEM_TO_ELEMENT: Dict[str, str] = {
+    "Jia": "Holz", "Yi": "Holz",
+    "Bing": "Feuer", "Ding": "Feuer",
+    "Wu": "Erde", "Ji": "Erde",
+    "Geng": "Metall", "Xin": "Metall",
+    "Ren": "Wasser", "Gui": "Wasser",
+}
+
+_QI_LABELS = {1.0: "hidden_main", 0.5: "hidden_middle", 0.3: "hidden_residual"}
+
+STEM_INDEX: Dict[str, int] = {name: i for i, name in enumerate(_STEM_TO_ELEMENT)}
+BRANCH_INDEX: Dict[str, int] = {name: i for i, name in enumerate(_BRANCH_HIDDEN)}
+NO_STEM = 10
+NO_BRANCH = 12
+_N_BRANCH_SLOTS = 13
+N_CODES = 11 * _N_BRANCH_SLOTS
+
+
+def pillar_code(stem_index: int, branch_index: int) -> int:
+    """Code of a pillar given stem (0–9, 10 = none) and branch (0–11, 12 = none)."""
+    return stem_index * _N_BRANCH_SLOTS + branch_index
+
+
+#: Pillar code of each sexagenary index 0–59 (Jia-Zi, Yi-Chou, ...).
+JIAZI_CODES: Tuple[int, ...] = tuple(pillar_code(i % 10, i % 12) for i in range(60))
+
+
+def pillar_code_from_names(pillar: Mapping[str, str]) -> int:
+    """Code of a pillar dict with stem/branch (or stamm/zweig) names."""
+    stem = pillar.get("stem", pillar.get("stamm", ""))
+    branch = pillar.get("branch", pillar.get("zweig", ""))
+    return pillar_code(STEM_INDEX.get(stem, NO_STEM), BRANCH_INDEX.get(branch, NO_BRANCH))
+
+
+_STEM_NAMES: Tuple[str, ...] = tuple(STEM_INDEX)
+_BRANCH_NAMES: Tuple[str, ...] = tuple(BRANCH_INDEX)
+PILLAR_NAMES: Tuple[str, ...] = ("year", "month", "day", "hour")
+
+
+class PillarSet(Mapping[str, Mapping[str, str]]):
+    """Four pillars held as pillar codes, readable like the pillar dict.
+
+    ``ps["day"]`` returns a fresh ``{"stem": ..., "branch": ...}`` dict (names
+    of missing parts are left out), so code written for the
+    ``{"year": {"stem": "Jia", "branch": "Zi"}, ...}`` form keeps working;
+    ``ps.codes`` gives the codes for the table functions directly.
+    """
+
+    __slots__ = ("codes",)
+
+    def __init__(self, codes: Iterable[int]) -> None:
+        self.codes: Tuple[int, ...] = tuple(codes)
+        if len(self.codes) != len(PILLAR_NAMES):
+            raise ValueError(f"PillarSet needs {len(PILLAR_NAMES)} codes, got {len(self.codes)}")
+
+    @classmethod
+    def from_names(cls, pillars: Mapping[str, Mapping[str, str]]) -> PillarSet:
+        """Build from a year/month/day/hour dict of stem/branch names."""
+        return cls(pillar_code_from_names(pillars[name]) for name in PILLAR_NAMES)
+
+    def __getitem__(self, name: str) -> Dict[str, str]:
+        try:
+            stem, branch = divmod(self.codes[PILLAR_NAMES.index(name)], _N_BRANCH_SLOTS)
+        except ValueError:
+            raise KeyError(name) from None
+        out: Dict[str, str] = {}
+        if stem != NO_STEM:
+            out["stem"] = _STEM_NAMES[stem]
+        if branch != NO_BRANCH:
+            out["branch"] = _BRANCH_NAMES[branch]
+        return out
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PILLAR_NAMES)
+
+    def __len__(self) -> int:
+        return len(PILLAR_NAMES)
+
+    def __repr__(self) -> str:
+        return f"PillarSet({dict(self.items())!r})"
+
+
+def _build() -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[Dict[str, Any], ...], ...]]:
+    stems: List[Any] = list(_STEM_TO_ELEMENT) + [None]
+    branches: List[Any] = list(_BRANCH_HIDDEN) + [None]
+    rows: List[Tuple[int, ...]] = []
+    ledgers: List[Tuple[Dict[str, Any], ...]] = []
+    for stem in stems:
+        for branch in branches:
+            tenths = [0] * 5
+            frags: List[Dict[str, Any]] = []
+            if stem is not None:
+                element = _STEM_TO_ELEMENT[stem]
+                tenths[WUXING_INDEX[element]] += 10
+                frags.append({
+                    "source": "stem",
+                    "stem_name": stem,
+                    "element": element,
+                    "weight": 1.0,
+                    "category": "traditional",
+                })
+            if branch is not None:
+                for elem, weight in _BRANCH_HIDDEN[branch]:
+                    tenths[WUXING_INDEX[elem]] += round(weight * 10)
+                    frags.append({
+                        "source": _QI_LABELS.get(weight, "hidden"),
+                        "branch_name": branch,
+                        "element": elem,
+                        "weight": weight,
+                        "category": "traditional",
+                    })
+            rows.append(tuple(tenths))
+            ledgers.append(tuple(frags))
+    return tuple(rows), tuple(ledgers)
+
+
+#: Contribution of each pillar code in tenths, element order WUXING_ORDER.
+PILLAR_TENTHS, _PILLAR_LEDGER = _build()
+
+
+def wuxing_from_codes(codes: Iterable[int]) -> WuXingVector:
+    """BaZi Wu-Xing vector of the pillars with the given codes."""
+    h = f = e = m = w = 0
+    for code in codes:
+        r = PILLAR_TENTHS[code]
+        h += r[0]
+        f += r[1]
+        e += r[2]
+        m += r[3]
+        w += r[4]
+    return WuXingVector(h / 10, f / 10, e / 10, m / 10, w / 10)
+
+
+def ledger_for_code(pillar_name: str, code: int) -> List[Dict[str, Any]]:
+    """Ledger entries of one pillar (fresh dicts, in stem, main, middle, residual order)."""
+    return [{"pillar": pillar_name, **frag} for frag in _PILLAR_LEDGER[code]]
+
+
+def wuxing_batch(codes: Any) -> Any:
+    """Wu-Xing vectors for many charts at once.
+
+    ``codes`` holds one row of pillar codes per chart (typically (N, 4);
+    see ``JIAZI_CODES`` for sexagenary indices). A numpy integer array
+    yields an (N, 5) float64 array; other sequences yield ``array('d')``
+    with five values per chart in WUXING_ORDER.
+    """
+    if type(codes).__module__ == "numpy":
+        import numpy as np
+        table = np.asarray(PILLAR_TENTHS, dtype=np.int64)
+        return table[np.asarray(codes, dtype=np.intp)].sum(axis=1) / 10.0
+    out = array("d")
+    for row in codes:
+        out.extend(wuxing_from_codes(row).to_list())
+    return out
+
+
+def jiazi_codes(indices: Sequence[Any]) -> Any:
+    """Pillar codes for sexagenary indices (0–59), same shape as the input."""
+    if type(indices).__module__ == "numpy":
+        import numpy as np
+        return np.asarray(JIAZI_CODES, dtype=np.intp)[np.asarray(indices, dtype=np.intp)]
+    return [[JIAZI_CODES[i] for i in row] for row in indices]
+
+
+__all__ = [
+    "BRANCH_INDEX",
+    "JIAZI_CODES",
+    "NO_BRANCH",
+    "NO_STEM",
+    "N_CODES",
+    "PILLAR_NAMES",
+    "PILLAR_TENTHS",
+    "PillarSet",
+    "STEM_INDEX",
+    "jiazi_codes",
+    "ledger_for_code",
+    "pillar_code",
+    "pillar_code_from_names",
+    "wuxing_batch",
+    "wuxing_from_codes",
+]
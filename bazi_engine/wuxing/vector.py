@@ -1,49 +1,119 @@
 """
-wuxing/vector.py — WuXingVector dataclass.
+wuxing/vector.py — WuXingVector and ElementMap.
 
 A normalized 5-dimensional vector representing the Wu-Xing
-(Five Elements) distribution of a chart or planet set.
+(Five Elements) distribution of a chart or planet set, plus a compact
+read-only element -> value mapping for storing per-element features.
+
+Both keep their five values in one ``array('d')`` (or a tuple for
+non-float values) in WUXING_ORDER instead of a per-instance ``__dict__``.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
+from array import array
 from math import sqrt
-from typing import Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple, Union
+
+from .constants import WUXING_INDEX, WUXING_ORDER
+
+
+def _component(i: int) -> property:
+    def get(self: WuXingVector) -> float:
+        return self._v[i]
+
+    def set(self: WuXingVector, value: float) -> None:
+        self._v[i] = value
+
+    return property(get, set)
 
 
-@dataclass
 class WuXingVector:
     """Elemental distribution as a 5D vector (Holz, Feuer, Erde, Metall, Wasser)."""
 
-    holz: float
-    feuer: float
-    erde: float
-    metall: float
-    wasser: float
+    __slots__ = ("_v",)
+
+    def __init__(self, holz: float, feuer: float, erde: float, metall: float, wasser: float) -> None:
+        self._v = array("d", (holz, feuer, erde, metall, wasser))
+
+    holz = _component(0)
+    feuer = _component(1)
+    erde = _component(2)
+    metall = _component(3)
+    wasser = _component(4)
+
+    def __repr__(self) -> str:
+        h, f, e, m, w = self._v
+        return f"WuXingVector(holz={h!r}, feuer={f!r}, erde={e!r}, metall={m!r}, wasser={w!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._v == other._v  # type: ignore[attr-defined, no-any-return]
+
+    __hash__ = None  # type: ignore[assignment]
 
     def to_list(self) -> List[float]:
-        return [self.holz, self.feuer, self.erde, self.metall, self.wasser]
+        return self._v.tolist()
 
     def to_dict(self) -> Dict[str, float]:
-        return {
-            "Holz":   self.holz,
-            "Feuer":  self.feuer,
-            "Erde":   self.erde,
-            "Metall": self.metall,
-            "Wasser": self.wasser,
-        }
+        return dict(zip(WUXING_ORDER, self._v))
 
     def magnitude(self) -> float:
         """L2 norm of the vector."""
-        return sqrt(sum(x ** 2 for x in self.to_list()))
+        return sqrt(sum(x ** 2 for x in self._v))
 
     def normalize(self) -> WuXingVector:
         """Return unit vector. Returns self unchanged if magnitude is zero."""
         mag = self.magnitude()
         if mag == 0:
             return self
-        return WuXingVector(*[x / mag for x in self.to_list()])
+        return WuXingVector(*[x / mag for x in self._v])
 
     @staticmethod
     def zero() -> WuXingVector:
         return WuXingVector(0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+class ElementMap(Mapping[str, Any]):
+    """Read-only mapping of the five elements (WUXING_ORDER) to values.
+
+    A drop-in for the ``{"Holz": ..., ...}`` dicts of per-element features
+    (``[]``, ``get``, ``items``, equality with dicts) at a fraction of the
+    size: numbers live in an ``array('d')`` (and read back as floats),
+    anything else in a tuple.
+    """
+
+    __slots__ = ("_v",)
+
+    def __init__(self, values: Iterable[Any]) -> None:
+        items = values if isinstance(values, (list, tuple)) else list(values)
+        if len(items) != len(WUXING_ORDER):
+            raise ValueError(f"ElementMap needs {len(WUXING_ORDER)} values, got {len(items)}")
+        self._v: Union[array[float], Tuple[Any, ...]]
+        try:
+            self._v = array("d", items)
+        except TypeError:
+            self._v = tuple(items)
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, Any]) -> ElementMap:
+        """Build from a dict keyed by element name (all five required)."""
+        return cls([values[e] for e in WUXING_ORDER])
+
+    def __getitem__(self, element: str) -> Any:
+        return self._v[WUXING_INDEX[element]]
+
+    def __contains__(self, element: object) -> bool:
+        return element in WUXING_INDEX
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(WUXING_ORDER)
+
+    def __len__(self) -> int:
+        return len(WUXING_ORDER)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(WUXING_ORDER, self._v))
+
+    def __repr__(self) -> str:
+        return f"ElementMap({self.to_dict()!r})"
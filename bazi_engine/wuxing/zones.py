@@ -44,7 +44,7 @@ _NEXT: Dict[str, str] = {
 _PREV: Dict[str, str] = {v: k for k, v in _NEXT.items()}
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ZoneResult:
     """Klassifikationsergebnis für alle fünf Elemente."""
     zones:  Dict[str, ZoneLabel]
@@ -0,0 +1,40 @@
+"""
+benchmarks — Latency benchmarks for the engine and the HTTP API.
+
+Each case is timed in two modes:
+    warm  repeated calls with every in-process cache populated
+    cold  each sample preceded by ``reset_caches()`` (ruleset, zone,
+          fingerprint, artifact-hash, position and transit caches); imports
+          and ephemeris file handles stay loaded
+
+Results are written as JSON and can be compared against a stored baseline;
+the comparison fails when p50 or p95 regress beyond a threshold.
+
+Usage:
+    python -m benchmarks run [--filter bazi] [--output results.json]
+    python -m benchmarks compare baseline.json results.json [--threshold 0.15]
+    python -m benchmarks list
+
+EPHEMERIS_MODE=MOSEPH works when no SE1 files are present.
+"""
+from __future__ import annotations
+
+from .runner import (
+    Case,
+    Stats,
+    compare_results,
+    percentile,
+    reset_caches,
+    run_cases,
+    summarize,
+)
+
+__all__ = [
+    "Case",
+    "Stats",
+    "compare_results",
+    "percentile",
+    "reset_caches",
+    "run_cases",
+    "summarize",
+]
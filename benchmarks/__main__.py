@@ -0,0 +1,103 @@
+"""Command line entry point: ``python -m benchmarks {run,compare,list}``."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .cases import all_cases
+from .runner import STATS_HEADER, compare_results, format_stats_row, run_cases
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _cmd_list(args: argparse.Namespace) -> int:
+    for case in all_cases():
+        print(f"{case.group:<8}{case.name}")
+    return 0
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    cases = [c for c in all_cases() if not args.filter or any(f in c.name for f in args.filter)]
+    if args.group:
+        cases = [c for c in cases if c.group == args.group]
+    if not cases:
+        print("no benchmark matches the filter", file=sys.stderr)
+        return 2
+
+    print(STATS_HEADER)
+    doc = run_cases(
+        cases,
+        iterations=args.iterations,
+        warmup=args.warmup,
+        cold_iterations=args.cold,
+        progress=lambda name, stats: print(format_stats_row(name, stats), flush=True),
+    )
+    if args.output:
+        Path(args.output).write_text(json.dumps(doc, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\nresults written to {args.output}")
+    if args.baseline:
+        return _report(json.loads(Path(args.baseline).read_text(encoding="utf-8")), doc, args)
+    return 0
+
+
+def _report(baseline: dict, current: dict, args: argparse.Namespace) -> int:
+    regressions = compare_results(
+        baseline, current, threshold=args.threshold, min_delta_ms=args.min_delta_ms,
+    )
+    if not regressions:
+        print(f"\nno p50/p95 regression beyond {args.threshold:.0%}")
+        return 0
+    print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+    for r in regressions:
+        print(f"  {r.case:<28}{r.mode:<6}{r.stat:<5}{r.baseline_ms:>10.3f} -> {r.current_ms:>10.3f} ms"
+              f"  ({r.ratio:.2f}x)")
+    return 1
+
+
+def _cmd_compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    return _report(baseline, current, args)
+
+
+def _add_gate_options(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--threshold", type=float, default=0.15,
+                   help="allowed relative slowdown of p50/p95 (default 0.15)")
+    p.add_argument("--min-delta-ms", type=float, default=0.05,
+                   help="ignore absolute differences below this (default 0.05 ms)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    sys.path.insert(0, str(ROOT))
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Engine and API latency benchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_list = sub.add_parser("list", help="list benchmark cases")
+    p_list.set_defaults(func=_cmd_list)
+
+    p_run = sub.add_parser("run", help="run benchmarks")
+    p_run.add_argument("--filter", action="append", help="substring of case names (repeatable)")
+    p_run.add_argument("--group", choices=("engine", "http"))
+    p_run.add_argument("--iterations", type=int, default=50, help="warm samples per case")
+    p_run.add_argument("--warmup", type=int, default=5, help="untimed calls before warm samples")
+    p_run.add_argument("--cold", type=int, default=5, help="cold samples per case (0 disables)")
+    p_run.add_argument("--output", help="write results as JSON")
+    p_run.add_argument("--baseline", help="compare against this results file; exit 1 on regression")
+    _add_gate_options(p_run)
+    p_run.set_defaults(func=_cmd_run)
+
+    p_cmp = sub.add_parser("compare", help="compare two result files; exit 1 on regression")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    _add_gate_options(p_cmp)
+    p_cmp.set_defaults(func=_cmd_compare)
+
+    args = parser.parse_args(argv)
+    return int(args.func(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+benchmarks/cases.py — Benchmark case definitions.
+
+Engine cases call the library directly with a fixed Berlin birth; HTTP
+cases go through the ASGI app in-process (Starlette TestClient), so they
+include routing, request validation, serialization and middleware.
+"""
+from __future__ import annotations
+
+import copy
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from .runner import Case
+
+BIRTH_LOCAL = "2024-02-10T14:30:00"
+TZ = "Europe/Berlin"
+LON, LAT = 13.405, 52.52
+BIRTH_UTC = datetime(2024, 2, 10, 13, 30, tzinfo=timezone.utc)
+TRANSIT_UTC = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+QUIZ = [0.30, 0.25, 0.40, 0.35, 0.20, 0.15, 0.50, 0.30, 0.18, 0.10, 0.22, 0.45]
+SOULPRINT = [0.12, 0.05, 0.08, 0.20, 0.04, 0.10, 0.06, 0.09, 0.03, 0.11, 0.07, 0.05]
+
+_WEBHOOK_SECRET = "bench-secret"
+
+VALIDATE_PAYLOAD: Dict[str, Any] = {
+    "validate_level": "FULL",
+    "now_utc_override": "2026-01-01T00:00:00Z",
+    "engine_config": {
+        "engine_version": "1.0.0-rc0",
+        "parameter_set_id": "standard",
+        "deterministic": True,
+        "compliance_mode": "RELAXED",
+        "bazi_ruleset_id": "standard_bazi_2026",
+        "refdata": {
+            "refdata_pack_id": "refpack-bench-001",
+            "refdata_mode": "BUNDLED_OFFLINE",
+            "allow_network": False,
+            "refdata_root_path": None,
+            "ephemeris_id": "swisseph-2026",
+            "tzdb_version_id": "tzdb-2026a",
+            "leaps_source_id": "leaps-iers",
+            "eop_source_id": None,
+            "verification_policy": {
+                "tzdb_gpg_required": False,
+                "ephemeris_hash_required": False,
+                "leaps_expiry_enforced": False,
+                "eop_redundancy_required": False,
+            },
+        },
+    },
+}
+
+
+def _bazi(include_solar_terms: bool) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        from bazi_engine import BaziInput, compute_bazi
+
+        inp = BaziInput(
+            birth_local=BIRTH_LOCAL, timezone=TZ, longitude_deg=LON, latitude_deg=LAT,
+            include_solar_terms=include_solar_terms,
+        )
+        return lambda: compute_bazi(inp)
+    return setup
+
+
+def _western(zodiac_mode: str) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        from bazi_engine.western import compute_western_chart
+
+        return lambda: compute_western_chart(BIRTH_UTC, LAT, LON, zodiac_mode=zodiac_mode)
+    return setup
+
+
+def _fusion() -> Callable[[], object]:
+    from bazi_engine import BaziInput, compute_bazi
+    from bazi_engine.fusion import compute_fusion_analysis
+    from bazi_engine.routers.shared import format_pillar
+    from bazi_engine.western import compute_western_chart
+
+    res = compute_bazi(BaziInput(birth_local=BIRTH_LOCAL, timezone=TZ, longitude_deg=LON, latitude_deg=LAT))
+    pillars = {
+        name: {k: format_pillar(p)[k] for k in ("stamm", "zweig")}
+        for name, p in (("year", res.pillars.year), ("month", res.pillars.month),
+                        ("day", res.pillars.day), ("hour", res.pillars.hour))
+    }
+    bodies = compute_western_chart(BIRTH_UTC, LAT, LON)["bodies"]
+    return lambda: compute_fusion_analysis(
+        birth_utc_dt=BIRTH_UTC, latitude=LAT, longitude=LON,
+        bazi_pillars=pillars, western_bodies=bodies,
+    )
+
+
+def _validate() -> Callable[[], object]:
+    from bazi_engine.bafe import validate_request
+
+    return lambda: validate_request(copy.deepcopy(VALIDATE_PAYLOAD))
+
+
+def _transit_now() -> Callable[[], object]:
+    from bazi_engine.transit import compute_transit_now
+
+    return lambda: compute_transit_now(dt_utc=TRANSIT_UTC)
+
+
+def _transit_timeline() -> Callable[[], object]:
+    from bazi_engine.transit import compute_transit_timeline
+
+    return lambda: compute_transit_timeline(days=7, start_utc=TRANSIT_UTC)
+
+
+def _transit_state() -> Callable[[], object]:
+    from bazi_engine.transit import compute_transit_state
+
+    return lambda: compute_transit_state(SOULPRINT, QUIZ, dt_utc=TRANSIT_UTC)
+
+
+def _research() -> Callable[[], object]:
+    from bazi_engine.research.dataset_generator import generate_synthetic_dataset
+
+    return lambda: generate_synthetic_dataset(n_total=240, seed=7, solar_from_dates=True)
+
+
+def _http(method: str, path: str, body: Any = None) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        os.environ.setdefault("ELEVENLABS_TOOL_SECRET", _WEBHOOK_SECRET)
+        from fastapi.testclient import TestClient
+
+        from bazi_engine.app import app
+
+        client = TestClient(app)
+        headers = {"x-api-key": os.environ["ELEVENLABS_TOOL_SECRET"]}
+
+        def request() -> object:
+            r = client.request(method, path, json=body, headers=headers)
+            r.raise_for_status()
+            return r
+        return request
+    return setup
+
+
+_CHART_BODY = {"local_datetime": BIRTH_LOCAL, "tz_id": TZ, "geo_lon_deg": LON, "geo_lat_deg": LAT}
+
+
+def all_cases() -> List[Case]:
+    return [
+        Case("bazi.compute", _bazi(True)),
+        Case("bazi.compute_no_terms", _bazi(False)),
+        Case("western.tropical", _western("tropical")),
+        Case("western.sidereal", _western("sidereal_lahiri")),
+        Case("fusion.analysis", _fusion),
+        Case("bafe.validate", _validate),
+        Case("transit.now", _transit_now),
+        Case("transit.timeline", _transit_timeline),
+        Case("transit.state", _transit_state),
+        Case("research.generate_240", _research),
+        Case("http.chart", _http("POST", "/chart", _CHART_BODY), group="http"),
+        Case("http.calculate_bazi", _http("POST", "/calculate/bazi", {
+            "date": BIRTH_LOCAL, "tz": TZ, "lon": LON, "lat": LAT}), group="http"),
+        Case("http.calculate_western", _http("POST", "/calculate/western", {
+            "date": BIRTH_LOCAL, "tz": TZ, "lon": LON, "lat": LAT}), group="http"),
+        Case("http.calculate_fusion", _http("POST", "/calculate/fusion", {
+            "date": BIRTH_LOCAL, "tz": TZ, "lon": LON, "lat": LAT}), group="http"),
+        Case("http.validate", _http("POST", "/validate", VALIDATE_PAYLOAD), group="http"),
+        Case("http.transit_state", _http("POST", "/transit/state", {
+            "soulprint_sectors": SOULPRINT, "quiz_sectors": QUIZ}), group="http"),
+        Case("http.webhook_chart", _http("POST", "/api/webhooks/chart", {
+            "birthDate": "1990-06-15", "birthTime": "08:00", "birthLat": LAT,
+            "birthLon": LON, "birthTz": TZ}), group="http"),
+        Case("http.api_sun_sign", _http("GET", "/api?datum=2024-02-10&zeit=14:30"), group="http"),
+    ]
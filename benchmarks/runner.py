@@ -0,0 +1,195 @@
+"""
+benchmarks/runner.py — Timing loop, percentile statistics and baseline comparison.
+"""
+from __future__ import annotations
+
+import math
+import os
+import platform
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+#: Statistics checked by ``compare_results``.
+GATED_STATS = ("p50", "p95")
+
+
+@dataclass(frozen=True)
+class Case:
+    """One benchmark: ``setup()`` returns the zero-argument callable to time."""
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    group: str = "engine"
+
+
+@dataclass(frozen=True)
+class Stats:
+    """Latency summary in milliseconds."""
+
+    n: int
+    mean: float
+    min: float
+    p50: float
+    p90: float
+    p95: float
+    p99: float
+    max: float
+
+
+def percentile(sorted_samples: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (``q`` in [0, 100]) of pre-sorted samples."""
+    if not sorted_samples:
+        raise ValueError("no samples")
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_samples)))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+def summarize(samples_ms: Iterable[float]) -> Stats:
+    s = sorted(samples_ms)
+    return Stats(
+        n=len(s),
+        mean=sum(s) / len(s),
+        min=s[0],
+        p50=percentile(s, 50),
+        p90=percentile(s, 90),
+        p95=percentile(s, 95),
+        p99=percentile(s, 99),
+        max=s[-1],
+    )
+
+
+def reset_caches() -> None:
+    """Empty every in-process cache the request path consults."""
+    from bazi_engine import time_utils, transit
+    from bazi_engine.bafe.artifact_hash import default_hash_cache
+    from bazi_engine.bafe.canonical_json import fingerprint_cache_clear
+    from bazi_engine.bafe.ruleset_loader import load_ruleset
+    from bazi_engine.ephemeris_cache import shared_position_cache
+    from bazi_engine.sun_sign import _ingresses
+
+    load_ruleset.cache_clear()
+    time_utils._zone.cache_clear()
+    fingerprint_cache_clear()
+    default_hash_cache().clear()
+    shared_position_cache().clear()
+    transit._transit_cache.clear()
+    transit._timeline_cache.clear()
+    _ingresses.cache_clear()
+
+
+def _time_ms(fn: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1e3
+
+
+def measure(
+    fn: Callable[[], object],
+    *,
+    iterations: int,
+    warmup: int,
+    cold_iterations: int,
+) -> Dict[str, Stats]:
+    """Warm and cold statistics for one callable."""
+    cold: List[float] = []
+    for _ in range(cold_iterations):
+        reset_caches()
+        cold.append(_time_ms(fn))
+    for _ in range(warmup):
+        fn()
+    warm = [_time_ms(fn) for _ in range(iterations)]
+    out = {"warm": summarize(warm)}
+    if cold:
+        out["cold"] = summarize(cold)
+    return out
+
+
+def environment() -> Dict[str, Any]:
+    from bazi_engine import __version__
+
+    return {
+        "engine_version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "ephemeris_mode": os.environ.get("EPHEMERIS_MODE", "auto"),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def run_cases(
+    cases: Sequence[Case],
+    *,
+    iterations: int = 50,
+    warmup: int = 5,
+    cold_iterations: int = 5,
+    progress: Optional[Callable[[str, Dict[str, Stats]], None]] = None,
+) -> Dict[str, Any]:
+    """Run ``cases`` and return the JSON-serializable result document."""
+    results: Dict[str, Any] = {}
+    for case in cases:
+        fn = case.setup()
+        stats = measure(fn, iterations=iterations, warmup=warmup, cold_iterations=cold_iterations)
+        results[case.name] = {"group": case.group, **{mode: asdict(s) for mode, s in stats.items()}}
+        if progress is not None:
+            progress(case.name, stats)
+    return {
+        "environment": environment(),
+        "settings": {"iterations": iterations, "warmup": warmup, "cold_iterations": cold_iterations},
+        "results": results,
+    }
+
+
+@dataclass(frozen=True)
+class Regression:
+    case: str
+    mode: str
+    stat: str
+    baseline_ms: float
+    current_ms: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ms / self.baseline_ms if self.baseline_ms else math.inf
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    *,
+    threshold: float = 0.15,
+    min_delta_ms: float = 0.05,
+) -> List[Regression]:
+    """Gated statistics slower than ``baseline * (1 + threshold)``.
+
+    Differences below ``min_delta_ms`` are ignored so that sub-millisecond
+    cases do not fail on timer noise. Cases or modes missing from either
+    document are skipped.
+    """
+    regressions: List[Regression] = []
+    base_results = baseline.get("results", {})
+    for name, cur in sorted(current.get("results", {}).items()):
+        base = base_results.get(name)
+        if base is None:
+            continue
+        for mode in ("warm", "cold"):
+            if mode not in base or mode not in cur:
+                continue
+            for stat in GATED_STATS:
+                b, c = float(base[mode][stat]), float(cur[mode][stat])
+                if c > b * (1.0 + threshold) and c - b > min_delta_ms:
+                    regressions.append(Regression(name, mode, stat, b, c))
+    return regressions
+
+
+def format_stats_row(name: str, stats: Dict[str, Stats]) -> str:
+    warm = stats["warm"]
+    cold = stats.get("cold")
+    cold_cols = f"{cold.p50:>10.3f}{cold.p95:>10.3f}" if cold else f"{'-':>10}{'-':>10}"
+    return f"{name:<28}{warm.p50:>10.3f}{warm.p95:>10.3f}{warm.p99:>10.3f}{cold_cols}"
+
+
+STATS_HEADER = f"{'case':<28}{'warm p50':>10}{'warm p95':>10}{'warm p99':>10}{'cold p50':>10}{'cold p95':>10}"
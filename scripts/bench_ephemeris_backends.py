@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Compare SwissEphBackend and SkyfieldBackend on batch workloads.
+
+Times Sun longitudes for N instants and solar-term crossings for N
+(target, start) pairs, per-call on Swiss Ephemeris vs. one vectorized call on
+Skyfield, and reports the largest disagreement.
+
+Usage:
+    python scripts/bench_ephemeris_backends.py [--n 20000] [--kernel de440s.bsp]
+
+Needs the skyfield extra and a JPL kernel (SKYFIELD_KERNEL or --kernel).
+EPHEMERIS_MODE=MOSEPH works for the Swiss side when no SE1 files are present.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _timed(fn: Callable[[], object]) -> Tuple[float, object]:
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=20000, help="batch size")
+    parser.add_argument("--kernel", default=None, help="path to a DE4xx .bsp kernel")
+    parser.add_argument("--jd-start", type=float, default=2415020.5, help="first JD(UT) (default 1900-01-01)")
+    parser.add_argument("--jd-end", type=float, default=2488069.5, help="last JD(UT) (default 2100-01-01)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    from bazi_engine.ephemeris import SwissEphBackend
+    from bazi_engine.ephemeris_skyfield import SkyfieldBackend
+
+    swiss = SwissEphBackend()
+    sky = SkyfieldBackend(kernel_path=args.kernel)
+    rnd = random.Random(42)
+    jds = [rnd.uniform(args.jd_start, args.jd_end) for _ in range(args.n)]
+    targets = [15.0 * rnd.randrange(24) for _ in range(args.n)]
+
+    sky.sun_lon_deg_ut_many(jds[:10])  # warm up kernel pages and timescale
+
+    rows = []
+    t_swe, lon_swe = _timed(lambda: swiss.sun_lon_deg_ut_many(jds))
+    t_sky, lon_sky = _timed(lambda: sky.sun_lon_deg_ut_many(jds))
+    diff = max(abs((a - b + 180.0) % 360.0 - 180.0) for a, b in zip(lon_swe, lon_sky))  # type: ignore[call-overload]
+    rows.append(("sun longitude", t_swe, t_sky, f'{diff * 3600:.3f}"'))
+
+    t_swe, x_swe = _timed(lambda: swiss.solcross_ut_many(targets, jds))
+    t_sky, x_sky = _timed(lambda: sky.solcross_ut_many(targets, jds))
+    diff = max(abs(a - b) for a, b in zip(x_swe, x_sky))  # type: ignore[call-overload]
+    rows.append(("solar-term crossing", t_swe, t_sky, f"{diff * 86400:.3f} s"))
+
+    print(f"kernel: {sky.kernel_path}   swisseph mode: {swiss.mode}   n = {args.n}")
+    print(f"{'workload':<22}{'swisseph':>12}{'skyfield':>12}{'speed-up':>10}  max |diff|")
+    for name, a, b, d in rows:
+        print(f"{name:<22}{a * 1000:>10.1f}ms{b * 1000:>10.1f}ms{a / b:>9.2f}x  {d}")
+
+
+if __name__ == "__main__":
+    main()
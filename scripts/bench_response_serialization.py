@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Measure response serialization overhead per endpoint, default vs. fast mode.
+
+For each endpoint the payload is produced once, then timed through
+  default  response_model validation + JSON dump + JSONResponse render
+           (what FastAPI does for a returned dict)
+  fast     FastJSONResponse render only (BAZI_FAST_RESPONSES=1)
+and, end to end, the median request latency through the ASGI app in both
+modes.
+
+Usage:
+    python scripts/bench_response_serialization.py [--n 200]
+
+EPHEMERIS_MODE=MOSEPH works when no SE1 files are present.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_SECRET = "bench-secret"
+
+
+def _per_call_us(fn: Callable[[], object], n: int) -> float:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def _median_ms(fn: Callable[[], object], n: int) -> float:
+    fn()
+    samples: List[float] = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200, help="iterations per measurement")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    os.environ.setdefault("ELEVENLABS_TOOL_SECRET", _SECRET)
+    from fastapi.responses import JSONResponse
+    from fastapi.testclient import TestClient
+
+    from bazi_engine.app import app
+    from bazi_engine.routers.chart import ChartResponse
+    from bazi_engine.routers.fusion import FusionResponse
+    from bazi_engine.routers.shared import FAST_RESPONSES_ENV, FastJSONResponse
+    from bazi_engine.routers.webhooks import WebhookChartResponse
+
+    cases: List[tuple[str, Dict[str, Any], Any]] = [
+        ("/chart", {"local_datetime": "2024-02-10T14:30:00", "tz_id": "Europe/Berlin",
+                    "geo_lon_deg": 13.405, "geo_lat_deg": 52.52}, ChartResponse),
+        ("/calculate/fusion", {"date": "2024-02-10T14:30:00", "tz": "Europe/Berlin",
+                               "lon": 13.405, "lat": 52.52}, FusionResponse),
+        ("/api/webhooks/chart", {"birthDate": "1990-06-15", "birthTime": "08:00", "birthLat": 52.52,
+                                 "birthLon": 13.405, "birthTz": "Europe/Berlin"}, WebhookChartResponse),
+    ]
+    client = TestClient(app)
+    headers = {"x-api-key": os.environ["ELEVENLABS_TOOL_SECRET"]}
+
+    print(f"{'endpoint':<22}{'default µs':>12}{'fast µs':>10}{'ratio':>8}"
+          f"{'default ms':>13}{'fast ms':>10}")
+    for path, body, model in cases:
+        def request() -> object:
+            r = client.post(path, json=body, headers=headers)
+            r.raise_for_status()
+            return r
+
+        payload = request().json()  # type: ignore[attr-defined]
+
+        def default() -> bytes:
+            return JSONResponse(model.model_validate(payload).model_dump(mode="json")).body
+
+        def fast() -> bytes:
+            return FastJSONResponse(payload).body
+
+        ser_default = _per_call_us(default, args.n)
+        ser_fast = _per_call_us(fast, args.n)
+
+        os.environ.pop(FAST_RESPONSES_ENV, None)
+        req_default = _median_ms(request, max(args.n // 10, 5))
+        os.environ[FAST_RESPONSES_ENV] = "1"
+        req_fast = _median_ms(request, max(args.n // 10, 5))
+        os.environ.pop(FAST_RESPONSES_ENV, None)
+
+        print(f"{path:<22}{ser_default:>12.1f}{ser_fast:>10.1f}{ser_default / ser_fast:>7.1f}x"
+              f"{req_default:>13.2f}{req_fast:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
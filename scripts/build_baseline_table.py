@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Regenerate bazi_engine/wuxing/harmony_baselines.bin by Monte Carlo simulation.
+
+Simulates the Harmony Index H of random charts against random pillars for
+every integer input density (n_west, n_bazi) on the grid, with the engine's
+own calculate_wuxing_vector_from_planets / calculate_wuxing_from_bazi, and
+writes mean, std and quantiles per cell — the baselines ``calibrate_harmony``
+looks up. Vectorized with numpy (required); 1M samples per cell take about
+half a minute.
+
+Usage:
+    python scripts/build_baseline_table.py [--samples N] [--seed S] [--out PATH] [--check]
+
+--check compares the packaged table with a fresh, independent build (other
+seed; use a smaller --samples for a quick check): means must agree within
+the sampling error.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def main() -> int:
+    sys.path.insert(0, str(ROOT))
+    from bazi_engine.wuxing.baseline_table import (
+        DEFAULT_N_BAZI_MAX, DEFAULT_N_WEST_MAX, DEFAULT_P_NIGHT, DEFAULT_SAMPLES, DEFAULT_SEED,
+        TABLE_PATH, decode_table, encode_table, simulate_baselines,
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="samples per cell")
+    parser.add_argument("--seed", type=int, default=None, help=f"default {DEFAULT_SEED} (+1 with --check)")
+    parser.add_argument("--n-west-max", type=int, default=DEFAULT_N_WEST_MAX)
+    parser.add_argument("--n-bazi-max", type=int, default=DEFAULT_N_BAZI_MAX)
+    parser.add_argument("--p-night", type=float, default=DEFAULT_P_NIGHT, help="share of night charts")
+    parser.add_argument("--out", default=None, help="output path (default: packaged table)")
+    parser.add_argument("--check", action="store_true", help="compare with the packaged table, write nothing")
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else DEFAULT_SEED + int(args.check)
+    t0 = time.perf_counter()
+    table = simulate_baselines(
+        args.n_west_max, args.n_bazi_max, args.samples, seed=seed, p_night=args.p_night,
+    )
+    elapsed = time.perf_counter() - t0
+
+    if args.check:
+        shipped = decode_table(TABLE_PATH.read_bytes())
+        if (shipped.n_west_max, shipped.n_bazi_max) != (table.n_west_max, table.n_bazi_max):
+            print("FAIL: grid differs")
+            return 1
+        # 5 standard errors of the smaller sample, plus the shipped table's own error
+        worst = 0.0
+        for i, (a, b, s) in enumerate(zip(shipped.mean, table.mean, shipped.std)):
+            tol = 5 * s * (1 / math.sqrt(args.samples) + 1 / math.sqrt(shipped.samples)) + 1e-12
+            worst = max(worst, abs(a - b) / tol)
+        print(f"max |mean diff| = {worst:.2f} tolerances ({elapsed:.1f}s)")
+        return 0 if worst <= 1.0 else 1
+
+    data = encode_table(table)
+    out = Path(args.out) if args.out else TABLE_PATH
+    out.write_bytes(data)
+    cells = (table.n_west_max + 1) * (table.n_bazi_max + 1)
+    print(f"{cells} cells x {args.samples} samples, {len(data)} bytes -> {out} ({elapsed:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
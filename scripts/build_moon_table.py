@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Regenerate bazi_engine/phases/moon_events.bin from Swiss Ephemeris.
+
+Computes every 45° Moon–Sun elongation crossing (new moon, quarters, full
+moon and the octants in between) for 1800–2200 and writes the compact
+binary table shipped with the package.
+
+Usage:
+    python scripts/build_moon_table.py [--out PATH] [--check]
+
+Uses SE1 files when available (SE_EPHE_PATH); EPHEMERIS_MODE=MOSEPH builds
+from the analytical Moshier ephemeris instead. The mode is recorded in the
+file header. --check verifies the shipped table against a fresh build.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default=None, help="output path (default: packaged table)")
+    parser.add_argument("--check", action="store_true", help="compare with the packaged table, write nothing")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    from bazi_engine.phases.moon_table import (
+        TABLE_PATH, build_moon_event_table, decode_table, encode_table,
+    )
+
+    t0 = time.perf_counter()
+    k0, jds, mode = build_moon_event_table()
+    data = encode_table(k0, jds, mode)
+    elapsed = time.perf_counter() - t0
+
+    if args.check:
+        shipped = decode_table(TABLE_PATH.read_bytes())
+        fresh = decode_table(data)
+        if shipped.k0 != fresh.k0 or len(shipped) != len(fresh):
+            print("FAIL: event count or phase alignment differs")
+            return 1
+        worst = max(abs(a - b) for a, b in zip(shipped.jd, fresh.jd)) * 86400.0
+        print(f"max |diff| vs packaged table: {worst:.1f} s ({shipped.mode} vs {fresh.mode})")
+        return 0 if worst <= 60.0 else 1
+
+    out = Path(args.out) if args.out else TABLE_PATH
+    out.write_bytes(data)
+    print(f"{len(jds)} events, mode {mode}, {len(data)} bytes -> {out} ({elapsed:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -52,6 +52,27 @@ def clear_transit_caches():
     _timeline_cache.clear()
 
 
+@pytest.fixture(autouse=True)
+def clear_position_cache():
+    """Clear the shared interpolated position cache between tests.
+
+    Segments fitted while a test mocks swe.calc_ut must not answer later tests.
+    """
+    from bazi_engine.ephemeris_cache import shared_position_cache
+    shared_position_cache().clear()
+    yield
+    shared_position_cache().clear()
+
+
+@pytest.fixture
+def exact_ephemeris(monkeypatch):
+    """Force exact swe.calc_ut calls (no interpolated position cache).
+
+    For tests that mock swe.calc_ut with fixed positions per planet.
+    """
+    monkeypatch.setenv("EPHEMERIS_EXACT", "1")
+
+
 @pytest.fixture(autouse=True)
 def clear_ephemeris_cache():
     """Clear ensure_ephemeris_files LRU cache between tests."""
@@ -0,0 +1,175 @@
+"""
+test_baseline_table.py — Tests für bazi_engine/wuxing/baseline_table.py
+
+Testet:
+  A) Ausgelieferte Tabelle: Gitter, Stichprobenzahl, plausible Werte
+  B) calibrate_harmony nutzt die exakte Dichte per Index (Fallback ohne Datei)
+  C) Binärformat: Roundtrip, fremde / abgeschnittene Dateien
+  D) Simulation: deterministisch, Quantile konsistent, nahe an der Tabelle
+     und am Nullmodell der Engine-Funktionen
+"""
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+
+from bazi_engine.wuxing import baseline_table, calibration
+from bazi_engine.wuxing.baseline_table import (
+    BaselineTable,
+    decode_table,
+    encode_table,
+    load_baseline_table,
+    simulate_baselines,
+)
+from bazi_engine.wuxing.analysis import calculate_wuxing_from_bazi, calculate_wuxing_vector_from_planets
+from bazi_engine.wuxing.calibration import calibrate_harmony, harmony_baseline
+from bazi_engine.wuxing.pillar_table import _BRANCH_HIDDEN, _STEM_TO_ELEMENT
+from bazi_engine.wuxing.vector import WuXingVector
+
+_V = WuXingVector(1.5, 2.0, 0.8, 1.2, 0.9)
+
+
+def _density(n_west, n_pillars):
+    bodies = {f"P{i}": {"longitude": 0.0} for i in range(n_west)}
+    pillars = {f"p{i}": {"stem": "Jia", "branch": "Zi"} for i in range(n_pillars)}
+    return bodies, pillars
+
+
+class TestShippedTable:
+    def test_grid_and_samples(self):
+        table = load_baseline_table()
+        assert (table.n_west_max, table.n_bazi_max) == (14, 24)
+        assert table.samples >= 1_000_000
+        assert list(table.levels) == pytest.approx(baseline_table.DEFAULT_LEVELS)
+
+    def test_values_plausible(self):
+        table = load_baseline_table()
+        for nw in range(1, 15):
+            for nb in range(1, 25):
+                mean, std = table.baseline(nw, nb)
+                assert 0.15 <= mean <= 0.9 and 0.05 <= std <= 0.45, (nw, nb)
+                qs = list(table.quantiles_at(nw, nb).values())
+                assert qs == sorted(qs)
+        assert table.baseline(0, 12) == (0.0, 0.0)
+
+    def test_more_pillars_have_higher_baseline(self):
+        table = load_baseline_table()
+        means = [table.baseline(13, 3 * k)[0] for k in range(1, 9)]
+        assert means == sorted(means)
+
+    def test_columns_of_one_pillar_count_are_equal(self):
+        table = load_baseline_table()
+        assert table.baseline(13, 10) == table.baseline(13, 11) == table.baseline(13, 12)
+        assert table.quantiles_at(13, 10) == table.quantiles_at(13, 12)
+
+    def test_production_density(self):
+        # Vier Pfeiler zählen immer 12, MOSEPH liefert 13 Körper (ohne Chiron);
+        # Referenz: direkte Simulation mit den Engine-Funktionen
+        mean, std = load_baseline_table().baseline(13, 12)
+        assert mean == pytest.approx(0.788, abs=0.003)
+        assert std == pytest.approx(0.115, abs=0.003)
+
+    def test_clamped_to_grid(self):
+        table = load_baseline_table()
+        assert table.baseline(40, 100) == table.baseline(14, 24)
+        assert table.index(-1, 3) == table.index(0, 3)
+
+
+class TestCalibrationLookup:
+    def test_exact_density(self):
+        table = load_baseline_table()
+        assert harmony_baseline(7, 12) == table.baseline(7, 12)
+        assert harmony_baseline(7, 12) != harmony_baseline(8, 12)
+
+    def test_calibrate_harmony_uses_table(self):
+        bodies, pillars = _density(7, 4)
+        mean, std = load_baseline_table().baseline(7, 12)
+        result = calibrate_harmony(0.9, bodies, pillars, _V, _V)
+        assert result.h_baseline == round(mean, 4)
+        assert result.h_sigma == round(std, 4)
+        assert result.sigma_above == round((0.9 - mean) / std, 3)
+
+    def test_fallback_without_table_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(baseline_table, "TABLE_PATH", tmp_path / "missing.bin")
+        calls = []
+        monkeypatch.setattr(calibration, "load_baseline_table", lambda: calls.append(1) or load_baseline_table())
+        load_baseline_table.cache_clear()
+        calibration._baseline_source.cache_clear()
+        try:
+            assert harmony_baseline(7, 12) == calibration._BASELINE_TABLE[("medium", "medium")]
+            assert harmony_baseline(2, 20) == calibration._BASELINE_TABLE[("sparse", "dense")]
+            assert len(calls) == 1  # das Fehlen der Datei ist gecacht
+        finally:
+            load_baseline_table.cache_clear()
+            calibration._baseline_source.cache_clear()
+
+
+class TestBinaryFormat:
+    def test_roundtrip(self):
+        table = simulate_baselines(2, 3, 500, seed=1)
+        back = decode_table(encode_table(table))
+        assert (back.n_west_max, back.n_bazi_max, back.samples, back.seed, back.p_night) == (2, 3, 500, 1, 0.5)
+        assert back.mean == table.mean and back.std == table.std and back.quantiles == table.quantiles
+
+    def test_rejects_foreign_and_truncated(self):
+        data = encode_table(simulate_baselines(2, 3, 500, seed=1))
+        with pytest.raises(ValueError):
+            decode_table(b"BZMOONEV" + data[8:])
+        with pytest.raises(ValueError):
+            decode_table(data[:-8])
+        with pytest.raises(ValueError):
+            decode_table(b"short")
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            BaselineTable(1, 1, [0.5], [0.0] * 3, [0.0] * 4, [0.0] * 4, samples=1, seed=0, p_night=0.5)
+
+
+class TestSimulation:
+    def test_deterministic(self):
+        a = simulate_baselines(3, 6, 2000, seed=7, chunk=512)
+        b = simulate_baselines(3, 6, 2000, seed=7, chunk=512)
+        assert encode_table(a) == encode_table(b)
+
+    def test_median_between_quartiles(self):
+        table = simulate_baselines(4, 12, 5000, seed=3)
+        q = table.quantiles_at(4, 12)
+        mean, std = table.baseline(4, 12)
+        assert q[0.25] <= q[0.5] <= q[0.75]
+        assert q[0.25] < mean < q[0.75]
+        assert std > 0
+
+    def test_agrees_with_shipped_table(self):
+        fresh = simulate_baselines(14, 24, 20_000, seed=99)
+        shipped = load_baseline_table()
+        for nw, nb in ((3, 12), (7, 12), (13, 12), (10, 24)):
+            assert fresh.baseline(nw, nb)[0] == pytest.approx(shipped.baseline(nw, nb)[0], abs=0.01)
+
+    def test_matches_engine_null_model(self):
+        """Tabelle = H zufälliger Charts, Schritt für Schritt durch die Engine-Funktionen."""
+        rng = random.Random(11)
+        stems, branches = list(_STEM_TO_ELEMENT), list(_BRANCH_HIDDEN)
+        bodies_13 = baseline_table.WEST_BODIES[:13]
+        hs = []
+        for _ in range(20_000):
+            bodies = {
+                name: {
+                    "longitude": rng.uniform(0.0, 360.0),
+                    "is_retrograde": rng.random() < baseline_table.RETROGRADE_SHARE.get(name, 0.0),
+                }
+                for name in bodies_13
+            }
+            west = calculate_wuxing_vector_from_planets(bodies, ascendant=rng.uniform(0.0, 360.0))
+            pillars = {}
+            for p in ("year", "month", "day", "hour"):
+                k = rng.randrange(60)
+                pillars[p] = {"stem": stems[k % 10], "branch": branches[k % 12]}
+            bazi = calculate_wuxing_from_bazi(pillars)
+            hs.append(sum(a * b for a, b in zip(west.normalize().to_list(), bazi.normalize().to_list())))
+        mean = sum(hs) / len(hs)
+        std = math.sqrt(sum((h - mean) ** 2 for h in hs) / (len(hs) - 1))
+        table_mean, table_std = load_baseline_table().baseline(13, 12)
+        assert mean == pytest.approx(table_mean, abs=0.004)
+        assert std == pytest.approx(table_std, abs=0.004)
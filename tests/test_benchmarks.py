@@ -0,0 +1,88 @@
+"""Tests for the benchmark runner (percentiles, result documents, regression gate)."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from benchmarks import Case, compare_results, percentile, run_cases, summarize
+from benchmarks.__main__ import main
+from benchmarks.cases import all_cases
+
+
+def _doc(**cases):
+    return {"results": {
+        name: {"warm": {"p50": p50, "p95": p95}} for name, (p50, p95) in cases.items()
+    }}
+
+
+class TestStatistics:
+
+    def test_percentile_nearest_rank(self):
+        s = [float(i) for i in range(1, 101)]
+        assert percentile(s, 50) == 50.0
+        assert percentile(s, 95) == 95.0
+        assert percentile(s, 100) == 100.0
+        assert percentile(s, 0) == 1.0
+
+    def test_percentile_single_sample(self):
+        assert percentile([3.0], 99) == 3.0
+
+    def test_percentile_empty(self):
+        with pytest.raises(ValueError):
+            percentile([], 50)
+
+    def test_summarize(self):
+        st = summarize([4.0, 1.0, 3.0, 2.0])
+        assert (st.n, st.min, st.max, st.mean, st.p50) == (4, 1.0, 4.0, 2.5, 2.0)
+
+
+class TestCompare:
+
+    def test_no_regression_within_threshold(self):
+        assert compare_results(_doc(a=(10.0, 20.0)), _doc(a=(11.0, 22.0)), threshold=0.15) == []
+
+    def test_p95_regression(self):
+        regs = compare_results(_doc(a=(10.0, 20.0)), _doc(a=(10.0, 30.0)), threshold=0.15)
+        assert [(r.case, r.mode, r.stat) for r in regs] == [("a", "warm", "p95")]
+        assert regs[0].ratio == pytest.approx(1.5)
+
+    def test_noise_floor(self):
+        assert compare_results(_doc(a=(0.01, 0.02)), _doc(a=(0.03, 0.04)), min_delta_ms=0.05) == []
+
+    def test_missing_cases_skipped(self):
+        assert compare_results(_doc(a=(1.0, 1.0)), _doc(b=(9.0, 9.0))) == []
+
+    def test_cli_compare_exit_code(self, tmp_path):
+        base, cur = tmp_path / "base.json", tmp_path / "cur.json"
+        base.write_text(json.dumps(_doc(a=(10.0, 20.0))))
+        cur.write_text(json.dumps(_doc(a=(15.0, 20.0))))
+        assert main(["compare", str(base), str(base)]) == 0
+        assert main(["compare", str(base), str(cur)]) == 1
+        assert main(["compare", str(base), str(cur), "--threshold", "0.6"]) == 0
+
+
+class TestRun:
+
+    def test_run_cases_document(self):
+        calls = []
+        doc = run_cases([Case("noop", lambda: lambda: calls.append(1))],
+                        iterations=4, warmup=1, cold_iterations=2)
+        assert len(calls) == 7
+        result = doc["results"]["noop"]
+        assert result["warm"]["n"] == 4 and result["cold"]["n"] == 2
+        assert doc["settings"] == {"iterations": 4, "warmup": 1, "cold_iterations": 2}
+        assert "engine_version" in doc["environment"]
+        json.dumps(doc)
+
+    def test_case_names_unique(self):
+        names = [c.name for c in all_cases()]
+        assert len(names) == len(set(names))
+
+    def test_run_filtered_case_with_output(self, tmp_path, capsys):
+        out = tmp_path / "r.json"
+        rc = main(["run", "--filter", "bazi.compute_no_terms", "--iterations", "2",
+                   "--warmup", "0", "--cold", "1", "--output", str(out)])
+        assert rc == 0
+        assert list(json.loads(out.read_text())["results"]) == ["bazi.compute_no_terms"]
@@ -0,0 +1,195 @@
+"""
+test_canonical_json.py — Streaming canonical encoder and fingerprint memo.
+
+Both optimizations must be byte-identical to the original one-shot path:
+``sha256(canonical_json_dumps(payload))``.
+"""
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+
+from bazi_engine.bafe import canonical_json as cj
+from bazi_engine.bafe.canonical_json import (
+    canonical_json_dumps,
+    canonical_json_update,
+    config_fingerprint,
+    fingerprint_cache_clear,
+    fingerprint_cache_info,
+    sha256_hex,
+)
+
+DOCS = [
+    {},
+    [],
+    {"b": 1, "a": [1, 2.5, None, True, False], "c": {"z": "ü", "y": " \n\"\\"}},
+    {"f": [0.1, 1e-7, 1e22, -0.0, 123456789.123456789, 2.675]},
+    {"nested": [[{"x": 1.0}], ({"t": (1, 2)},)], "emoji": "\U0001F600"},
+    {"ctrl": "\x00\x1f\x7f", "big": 2**70},
+    "plain",
+    3.14159,
+]
+
+
+def _reference(obj, **kw) -> str:
+    return hashlib.sha256(canonical_json_dumps(obj, **kw).encode("utf-8")).hexdigest()
+
+
+def _streamed(obj, **kw) -> str:
+    h = hashlib.sha256()
+    canonical_json_update(h, obj, **kw)
+    return h.hexdigest()
+
+
+class TestStreamingEncoder:
+    @pytest.mark.parametrize("doc", DOCS)
+    @pytest.mark.parametrize("sorted_keys", [True, False])
+    @pytest.mark.parametrize("utf8", [True, False])
+    def test_shortest_roundtrip_byte_identical(self, doc, sorted_keys, utf8):
+        kw = dict(sorted_keys=sorted_keys, utf8=utf8)
+        assert _streamed(doc, **kw) == _reference(doc, **kw)
+
+    @pytest.mark.parametrize("doc", DOCS)
+    @pytest.mark.parametrize("decimals", [0, 3, 9])
+    def test_fixed_mode_byte_identical(self, doc, decimals):
+        kw = dict(float_mode="fixed", fixed_decimals=decimals)
+        assert _streamed(doc, **kw) == _reference(doc, **kw)
+
+    def test_large_document_flushes_in_chunks(self):
+        doc = {f"k{i:05d}": [i, i / 7.0, "x" * 50] for i in range(5000)}
+        chunks = []
+
+        class _Recorder:
+            def update(self, b):
+                chunks.append(b)
+
+        canonical_json_update(_Recorder(), doc)
+        assert len(chunks) > 1
+        assert b"".join(chunks) == canonical_json_dumps(doc).encode("utf-8")
+
+    def test_rejects_nan_like_one_shot(self):
+        with pytest.raises(ValueError):
+            canonical_json_dumps({"x": float("nan")})
+        with pytest.raises(ValueError):
+            _streamed({"x": float("nan")})
+
+    def test_fixed_mode_requires_decimals(self):
+        with pytest.raises(ValueError):
+            _streamed({}, float_mode="fixed")
+
+    def test_unknown_float_mode(self):
+        with pytest.raises(ValueError):
+            _streamed({}, float_mode="banker")
+
+
+def _fp_args(cfg):
+    return dict(
+        ruleset_id="standard_bazi_2026",
+        ruleset_version="2026.0",
+        refdata_pack_id="refpack-test-001",
+        float_format_policy=cfg["float_format_policy"],
+        json_canonicalization=cfg["json_canonicalization"],
+    )
+
+
+def _one_shot_fingerprint(cfg, *, ruleset_id, ruleset_version, refdata_pack_id,
+                          float_format_policy, json_canonicalization):
+    payload = {
+        "engine_config": cfg,
+        "ruleset": {"id": ruleset_id, "version": ruleset_version},
+        "refdata": {"refdata_pack_id": refdata_pack_id},
+    }
+    return sha256_hex(canonical_json_dumps(
+        payload,
+        sorted_keys=json_canonicalization.get("sorted_keys", True),
+        utf8=json_canonicalization.get("utf8", True),
+        float_mode=float_format_policy.get("mode", "shortest_roundtrip"),
+        fixed_decimals=float_format_policy.get("fixed_decimals"),
+    ))
+
+
+def _cfg(**over):
+    cfg = {
+        "engine_version": "1.0.0-rc0",
+        "parameter_set_id": "standard",
+        "deterministic": True,
+        "zi_apex_deg": 270.0,
+        "refdata": {"refdata_pack_id": "refpack-test-001", "allow_network": False},
+        "json_canonicalization": {"sorted_keys": True, "utf8": True},
+        "float_format_policy": {"mode": "shortest_roundtrip", "fixed_decimals": None},
+    }
+    cfg.update(over)
+    return cfg
+
+
+class TestFingerprintMemo:
+    def setup_method(self):
+        fingerprint_cache_clear()
+
+    @pytest.mark.parametrize("cfg", [
+        _cfg(),
+        _cfg(zi_apex_deg=270),
+        _cfg(float_format_policy={"mode": "fixed", "fixed_decimals": 2}, zi_apex_deg=270.123456),
+        _cfg(json_canonicalization={"sorted_keys": False, "utf8": False}, label="Zürich"),
+    ])
+    def test_matches_one_shot_hash(self, cfg):
+        args = _fp_args(cfg)
+        expected = _one_shot_fingerprint(cfg, **args)
+        assert config_fingerprint(cfg, **args) == expected  # miss
+        assert config_fingerprint(cfg, **args) == expected  # hit
+
+    def test_hit_for_equal_config_with_different_key_order(self):
+        a = _cfg()
+        b = dict(reversed(list(a.items())))
+        config_fingerprint(a, **_fp_args(a))
+        config_fingerprint(b, **_fp_args(b))
+        info = fingerprint_cache_info()
+        assert info["misses"] == 1
+        assert info["hits"] == 1
+
+    def test_unsorted_keys_key_order_is_part_of_the_key(self):
+        canon = {"sorted_keys": False, "utf8": True}
+        a = _cfg(json_canonicalization=canon, extra={"a": 1, "b": 2})
+        b = _cfg(json_canonicalization=canon, extra={"b": 2, "a": 1})
+        fa = config_fingerprint(a, **_fp_args(a))
+        fb = config_fingerprint(b, **_fp_args(b))
+        assert fa == _one_shot_fingerprint(a, **_fp_args(a))
+        assert fb == _one_shot_fingerprint(b, **_fp_args(b))
+        assert fa != fb
+        assert fingerprint_cache_info()["misses"] == 2
+
+    @pytest.mark.parametrize("left,right", [
+        (270, 270.0),
+        (1, True),
+        (0, False),
+        ([1], (1,)),  # list and tuple serialize identically — may share an entry
+    ])
+    def test_json_distinct_values_get_distinct_entries(self, left, right):
+        a, b = _cfg(zi_apex_deg=left), _cfg(zi_apex_deg=right)
+        fa = config_fingerprint(a, **_fp_args(a))
+        fb = config_fingerprint(b, **_fp_args(b))
+        assert fa == _one_shot_fingerprint(a, **_fp_args(a))
+        assert fb == _one_shot_fingerprint(b, **_fp_args(b))
+
+    def test_mutating_config_after_call_does_not_poison_cache(self):
+        cfg = _cfg()
+        first = config_fingerprint(cfg, **_fp_args(cfg))
+        cfg["refdata"]["allow_network"] = True
+        second = config_fingerprint(cfg, **_fp_args(cfg))
+        assert first != second
+        assert second == _one_shot_fingerprint(cfg, **_fp_args(cfg))
+
+    def test_non_str_keys_bypass_cache(self):
+        cfg = _cfg(extra={1: "one"})
+        args = _fp_args(cfg)
+        assert config_fingerprint(cfg, **args) == _one_shot_fingerprint(cfg, **args)
+        assert fingerprint_cache_info()["size"] == 0
+
+    def test_cache_is_bounded(self, monkeypatch):
+        from cachetools import LRUCache
+        monkeypatch.setattr(cj, "_FINGERPRINT_CACHE", LRUCache(maxsize=4))
+        for i in range(10):
+            cfg = _cfg(zi_apex_deg=float(i))
+            config_fingerprint(cfg, **_fp_args(cfg))
+        assert fingerprint_cache_info()["size"] == 4
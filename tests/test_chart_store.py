@@ -0,0 +1,164 @@
+"""Tests for the chart store and persisted chart endpoints."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from bazi_engine.app import app
+from bazi_engine.routers import chart as chart_router
+from bazi_engine.services.chart_store import (
+    ChartStore,
+    chart_id_for,
+    decode_payload,
+    encode_payload,
+)
+
+client = TestClient(app)
+
+BERLIN_PAYLOAD = {
+    "local_datetime": "2024-02-10T14:30:00",
+    "tz_id": "Europe/Berlin",
+    "geo_lon_deg": 13.405,
+    "geo_lat_deg": 52.52,
+}
+
+QUIZ = [0.30, 0.25, 0.40, 0.35, 0.20, 0.15, 0.50, 0.30, 0.18, 0.10, 0.22, 0.45]
+
+
+@pytest.fixture(autouse=True)
+def isolated_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHART_STORE_PATH", str(tmp_path / "charts.sqlite3"))
+
+
+class TestChartStore:
+
+    def test_payload_roundtrip(self):
+        payload = {"a": [1, 2.5, None], "b": {"ä": "x"}}
+        assert decode_payload(encode_payload(payload)) == payload
+
+    def test_unknown_codec_rejected(self):
+        with pytest.raises(ValueError):
+            decode_payload(b"\x09" + encode_payload({})[1:])
+
+    def test_wal_journal(self, tmp_path):
+        store = ChartStore(tmp_path / "s.sqlite3")
+        assert store.journal_mode() == "wal"
+
+    def test_put_get(self, tmp_path):
+        store = ChartStore(tmp_path / "s.sqlite3")
+        store.put("ab" * 16, {"x": 1}, engine_version="1.0")
+        assert "ab" * 16 in store
+        assert store.get("ab" * 16) == {"x": 1}
+        assert store.get("cd" * 16) is None
+        assert len(store) == 1
+
+    def test_put_keeps_first_entry(self, tmp_path):
+        store = ChartStore(tmp_path / "s.sqlite3")
+        store.put("ab" * 16, {"x": 1}, engine_version="1.0")
+        store.put("ab" * 16, {"x": 2}, engine_version="1.0")
+        assert store.get("ab" * 16) == {"x": 1}
+
+    def test_prune_evicts_other_versions_then_oldest(self, tmp_path):
+        store = ChartStore(tmp_path / "s.sqlite3", max_rows=2)
+        for i, version in enumerate(["1.0", "2.0", "2.0", "2.0"]):
+            store.put(f"{i:032x}", {"i": i}, engine_version=version)
+            store._connect().execute("UPDATE charts SET created_at = ? WHERE chart_id = ?", (1000 + i, f"{i:032x}"))
+        assert store.prune(engine_version="2.0") == 2
+        assert f"{0:032x}" not in store          # other engine version
+        assert f"{1:032x}" not in store          # oldest of the current version
+        assert len(store) == 2
+
+    def test_prune_ttl(self, tmp_path):
+        store = ChartStore(tmp_path / "s.sqlite3", max_rows=0, ttl_seconds=60)
+        store.put("ab" * 16, {"x": 1}, engine_version="1.0")
+        assert store.prune(engine_version="1.0") == 0
+        assert store.prune(engine_version="1.0", now=time.time() + 120) == 1
+        assert len(store) == 0
+
+    def test_put_applies_cap(self, tmp_path, monkeypatch):
+        from bazi_engine.services import chart_store
+        monkeypatch.setattr(chart_store, "PRUNE_EVERY", 3)
+        monkeypatch.setenv("CHART_STORE_MAX_ROWS", "2")
+        store = ChartStore(tmp_path / "s.sqlite3")
+        assert store.max_rows == 2 and store.ttl_seconds == 0
+        for i in range(5):
+            store.put(f"{i:032x}", {"i": i}, engine_version="1.0")
+        assert len(store) == 4  # pruned to 2 on the 3rd insert, +2 since
+
+    def test_chart_id_deterministic(self):
+        a = chart_id_for(BERLIN_PAYLOAD, engine_version="1", parameter_set_id="p")
+        b = chart_id_for(dict(reversed(list(BERLIN_PAYLOAD.items()))), engine_version="1", parameter_set_id="p")
+        assert a == b
+        assert len(a) == 32
+
+    def test_chart_id_depends_on_inputs_and_version(self):
+        base = chart_id_for(BERLIN_PAYLOAD, engine_version="1", parameter_set_id="p")
+        assert chart_id_for({**BERLIN_PAYLOAD, "geo_lat_deg": 48.1}, engine_version="1", parameter_set_id="p") != base
+        assert chart_id_for(BERLIN_PAYLOAD, engine_version="2", parameter_set_id="p") != base
+
+
+class TestPersistedChartEndpoints:
+
+    def test_default_request_has_no_chart_id(self):
+        data = client.post("/chart", json=BERLIN_PAYLOAD).json()
+        assert data["chart_id"] is None
+
+    def test_persist_returns_chart_id(self):
+        data = client.post("/chart", json={**BERLIN_PAYLOAD, "persist": True}).json()
+        assert len(data["chart_id"]) == 32
+
+    def test_repeat_served_from_store(self, monkeypatch):
+        first = client.post("/chart", json={**BERLIN_PAYLOAD, "persist": True}).json()
+        calls = []
+        monkeypatch.setattr(chart_router, "_compute_chart", lambda *args: calls.append(args))
+        second = client.post("/chart", json={**BERLIN_PAYLOAD, "persist": True}).json()
+        assert calls == []
+        assert second == first
+
+    def test_chart_id_uses_normalized_input(self):
+        a = client.post("/chart", json={**BERLIN_PAYLOAD, "persist": True}).json()
+        b = client.post("/chart", json={
+            **BERLIN_PAYLOAD, "local_datetime": "2024-02-10T14:30", "persist": True,
+        }).json()
+        assert a["chart_id"] == b["chart_id"]
+
+    def test_get_returns_persisted_chart(self):
+        posted = client.post("/chart", json={**BERLIN_PAYLOAD, "persist": True}).json()
+        r = client.get(f"/chart/{posted['chart_id']}")
+        assert r.status_code == 200
+        assert r.json() == posted
+
+    def test_get_unknown_chart_is_404(self):
+        r = client.get("/chart/" + "0" * 32)
+        assert r.status_code == 404
+        assert r.json()["error"] == "not_found"
+
+    def test_get_malformed_chart_id_is_422(self):
+        assert client.get("/chart/not-a-chart-id").status_code == 422
+
+
+class TestTransitStateFromChart:
+
+    def test_state_with_chart_id(self):
+        chart_id = client.post("/chart", json={**BERLIN_PAYLOAD, "persist": True}).json()["chart_id"]
+        r = client.post(f"/transit/state?chart_id={chart_id}", json={"quiz_sectors": QUIZ})
+        assert r.status_code == 200
+        assert len(r.json()["ring"]["sectors"]) == 12
+
+    def test_unknown_chart_id_is_404(self):
+        r = client.post("/transit/state?chart_id=" + "0" * 32, json={"quiz_sectors": QUIZ})
+        assert r.status_code == 404
+
+    def test_chart_id_and_soulprint_is_422(self):
+        r = client.post(
+            "/transit/state?chart_id=" + "0" * 32,
+            json={"soulprint_sectors": QUIZ, "quiz_sectors": QUIZ},
+        )
+        assert r.status_code == 422
+
+    def test_neither_chart_id_nor_soulprint_is_422(self):
+        r = client.post("/transit/state", json={"quiz_sectors": QUIZ})
+        assert r.status_code == 422
@@ -0,0 +1,212 @@
+"""Tests for the slotted / array-backed value types (types.py, wuxing/vector.py, PillarSet)."""
+
+from __future__ import annotations
+
+import dataclasses
+import pickle
+import random
+from array import array
+
+import pytest
+
+from bazi_engine import BaziInput, BodyTable, compute_bazi
+from bazi_engine.phases.jieqi_phase import classify_jieqi_phase
+from bazi_engine.phases.lunar_phase import classify_lunar_phase
+from bazi_engine.research.dataset_generator import generate_synthetic_dataset
+from bazi_engine.types import Pillar, pillar_of
+from bazi_engine.wuxing.analysis import (
+    calculate_wuxing_from_bazi,
+    calculate_wuxing_vector_from_planets,
+)
+from bazi_engine.wuxing.calibration import calibrate_harmony
+from bazi_engine.wuxing.pillar_table import PillarSet
+from bazi_engine.wuxing.vector import ElementMap, WuXingVector
+from bazi_engine.wuxing.zones import classify_zones
+
+BODIES = {
+    "Sun": {"longitude": 321.5, "latitude": 0.0, "is_retrograde": False, "zodiac_sign": 10},
+    "Moon": {"longitude": 12.25, "latitude": -4.1, "is_retrograde": False, "zodiac_sign": 0},
+    "Mercury": {"longitude": 300.0, "latitude": 1.2, "is_retrograde": True, "zodiac_sign": 10},
+    "Chiron": {"error": "ephemeris file missing"},
+}
+
+PILLARS = {
+    "year": {"stem": "Jia", "branch": "Chen"},
+    "month": {"stem": "Bing", "branch": "Yin"},
+    "day": {"stem": "Xin", "branch": "Hai"},
+    "hour": {"stem": "Gui", "branch": "Wei"},
+}
+
+
+class TestSlots:
+
+    def test_domain_objects_have_no_instance_dict(self):
+        res = compute_bazi(BaziInput(
+            birth_local="2024-02-10T14:30:00", timezone="Europe/Berlin",
+            longitude_deg=13.405, latitude_deg=52.52,
+        ))
+        zones = classify_zones({"Holz": 1.0, "Feuer": 0, "Erde": 0, "Metall": 0, "Wasser": 0},
+                               {"Holz": 0, "Feuer": 1.0, "Erde": 0, "Metall": 0, "Wasser": 0})
+        chart = generate_synthetic_dataset(n_total=3, seed=1)[0]
+        for obj in (res, res.input, res.pillars, res.pillars.day, zones,
+                    classify_jieqi_phase(solar_longitude=10.0),
+                    classify_lunar_phase(moon_sun_angle=10.0),
+                    chart, chart.calibration, WuXingVector.zero()):
+            assert not hasattr(obj, "__dict__"), type(obj).__name__
+
+    def test_still_frozen(self):
+        chart = generate_synthetic_dataset(n_total=3, seed=1)[0]
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            chart.h_raw = 0.5  # type: ignore[misc]
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            pillar_of(0, 0).stem_index = 1  # type: ignore[misc]
+
+
+class TestPillarInterning:
+
+    def test_shared_instances(self):
+        assert pillar_of(3, 7) is pillar_of(3, 7)
+        assert pillar_of(3, 7) == Pillar(3, 7)
+        assert str(pillar_of(0, 0)) == str(Pillar(0, 0))
+
+    def test_out_of_range_not_interned(self):
+        assert pillar_of(12, 0) == Pillar(12, 0)
+
+    def test_compute_bazi_uses_shared_pillars(self):
+        a = compute_bazi(BaziInput(birth_local="1990-06-15T08:00:00", timezone="Europe/Berlin",
+                                   longitude_deg=13.4, latitude_deg=52.5))
+        b = compute_bazi(BaziInput(birth_local="1990-06-15T08:10:00", timezone="Europe/Berlin",
+                                   longitude_deg=13.4, latitude_deg=52.5))
+        assert a.pillars.year is b.pillars.year
+        assert a.pillars.day is b.pillars.day
+
+
+class TestWuXingVector:
+
+    def test_array_backed_fields(self):
+        v = WuXingVector(1.0, 2.0, 3.0, 4.0, 5.0)
+        assert isinstance(v._v, array)
+        assert (v.holz, v.feuer, v.erde, v.metall, v.wasser) == (1.0, 2.0, 3.0, 4.0, 5.0)
+        v.erde = 9.0
+        assert v.to_list() == [1.0, 2.0, 9.0, 4.0, 5.0]
+
+    def test_keyword_construction_repr_eq(self):
+        v = WuXingVector(holz=1.0, feuer=0.0, erde=0.5, metall=0.0, wasser=2.0)
+        assert repr(v) == "WuXingVector(holz=1.0, feuer=0.0, erde=0.5, metall=0.0, wasser=2.0)"
+        assert v == WuXingVector(1.0, 0.0, 0.5, 0.0, 2.0)
+        assert v != WuXingVector.zero()
+        assert v.to_dict() == {"Holz": 1.0, "Feuer": 0.0, "Erde": 0.5, "Metall": 0.0, "Wasser": 2.0}
+
+    def test_unhashable_like_mutable_dataclass(self):
+        with pytest.raises(TypeError):
+            hash(WuXingVector.zero())
+
+    def test_pickle(self):
+        v = WuXingVector(0.1, 0.2, 0.3, 0.4, 0.5)
+        assert pickle.loads(pickle.dumps(v)) == v
+
+
+class TestElementMap:
+
+    def test_reads_like_dict(self):
+        d = {"Holz": 0.1, "Feuer": 0.2, "Erde": 0.3, "Metall": 0.4, "Wasser": 0.5}
+        m = ElementMap.from_mapping(d)
+        assert m == d and d == m
+        assert list(m) == list(d)
+        assert m["Erde"] == 0.3
+        assert m.get("Luft") is None
+        assert "Luft" not in m
+        assert isinstance(m._v, array)
+
+    def test_non_numeric_values_in_tuple(self):
+        m = ElementMap(["TENSION", "NEUTRAL", "NEUTRAL", "STRENGTH", "DEVELOPMENT"])
+        assert isinstance(m._v, tuple)
+        assert m["Metall"] == "STRENGTH"
+
+    def test_needs_five_values(self):
+        with pytest.raises(ValueError):
+            ElementMap([1.0, 2.0])
+
+
+class TestPillarSet:
+
+    def test_round_trip(self):
+        ps = PillarSet.from_names(PILLARS)
+        assert ps == PILLARS
+        assert len(ps.codes) == 4
+
+    def test_missing_parts_left_out(self):
+        ps = PillarSet.from_names({**PILLARS, "hour": {}})
+        assert ps["hour"] == {}
+        assert ps["day"] == {"stem": "Xin", "branch": "Hai"}
+        with pytest.raises(KeyError):
+            ps["week"]
+
+    def test_vector_matches_dict(self):
+        assert calculate_wuxing_from_bazi(PillarSet.from_names(PILLARS)) == \
+            calculate_wuxing_from_bazi(PILLARS)
+
+
+class TestBodyTable:
+
+    def test_round_trip(self):
+        table = BodyTable.from_bodies(BODIES)
+        assert table.to_dict() == BODIES
+        assert table == BODIES
+        assert list(table) == list(BODIES)
+        assert isinstance(table["Moon"]["is_retrograde"], bool)
+        assert isinstance(table["Sun"]["zodiac_sign"], int)
+
+    def test_missing_attributes(self):
+        table = BodyTable.from_bodies(BODIES)
+        assert "error" in table["Chiron"]
+        assert "error" not in table["Sun"]
+        assert "longitude" not in table["Chiron"]
+        assert table["Chiron"].get("longitude", 0) == 0
+        with pytest.raises(KeyError):
+            table["Chiron"]["longitude"]
+        with pytest.raises(KeyError):
+            table["Pluto"]
+        assert table.get("Pluto") is None
+
+    def test_columns(self):
+        table = BodyTable.from_bodies({k: v for k, v in BODIES.items() if k != "Chiron"})
+        assert isinstance(table.column("longitude"), array)
+        assert list(table.column("longitude")) == [321.5, 12.25, 300.0]
+        with pytest.raises(KeyError):
+            BodyTable.from_bodies(BODIES).column("longitude")
+
+    def test_layout_shared(self):
+        a = BodyTable.from_bodies(BODIES)
+        b = pickle.loads(pickle.dumps(a))
+        assert b == a
+        assert b._layout is a._layout
+
+    def test_consumers_agree_with_dicts(self):
+        table = BodyTable.from_bodies(BODIES)
+        v_dict = calculate_wuxing_vector_from_planets(BODIES)
+        v_table = calculate_wuxing_vector_from_planets(table)
+        assert v_table == v_dict
+        v_bazi = calculate_wuxing_from_bazi(PILLARS)
+        assert calibrate_harmony(0.8, table, PillarSet.from_names(PILLARS), v_table, v_bazi) == \
+            calibrate_harmony(0.8, BODIES, PILLARS, v_dict, v_bazi)
+
+
+class TestSyntheticCharts:
+
+    def test_compact_fields(self):
+        for chart in generate_synthetic_dataset(n_total=24, seed=5):
+            assert isinstance(chart.bazi_pillars, PillarSet)
+            assert isinstance(chart.western_bodies, BodyTable)
+            for m in (chart.western_vector, chart.bazi_vector, chart.diffs, chart.resonance, chart.zones):
+                assert isinstance(m, ElementMap)
+
+    def test_features_recompute_from_compact_inputs(self):
+        rng = random.Random(3)
+        for chart in rng.sample(generate_synthetic_dataset(n_total=48, seed=5), 8):
+            bodies = chart.western_bodies.to_dict()
+            pillars = dict(chart.bazi_pillars.items())
+            v_west = calculate_wuxing_vector_from_planets(bodies).normalize()
+            v_bazi = calculate_wuxing_from_bazi(pillars).normalize()
+            assert chart.western_vector == v_west.to_dict()
+            assert chart.bazi_vector == v_bazi.to_dict()
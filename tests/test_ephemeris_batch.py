@@ -0,0 +1,122 @@
+"""
+tests/test_ephemeris_batch.py — Batch JD helpers and JD-space month boundaries.
+
+The array helpers must agree with the scalar conversions to float rounding,
+and compute_bazi's JD-float month search must pick the same month as the
+datetime comparison it replaced.
+"""
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import swisseph as swe
+
+from bazi_engine.bazi import _LocalDatetimesFromJD, compute_bazi
+from bazi_engine.ephemeris import (
+    JD_UNIX_EPOCH,
+    datetime_utc_to_jd_ut,
+    datetimes_utc_to_jd_ut,
+    delta_t_seconds_many,
+    jd_tt_from_jd_ut_many,
+    jd_ut_from_unix_seconds,
+    jd_ut_to_datetime_utc,
+    unix_seconds_from_jd_ut,
+)
+from bazi_engine.types import BaziInput
+
+# 1 µs in days, plus float slack at JD ~2.4e6.
+_JD_TOL = 1.2e-6 / 86400.0 + 1e-9
+
+
+def _random_utc(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    base = datetime(1850, 1, 1, tzinfo=timezone.utc)
+    return [base + timedelta(seconds=rnd.randrange(0, 300 * 365 * 86400), microseconds=rnd.randrange(10**6))
+            for _ in range(n)]
+
+
+class TestBatchConversions:
+    def test_datetimes_match_scalar(self):
+        dts = _random_utc(500)
+        for dt, jd in zip(dts, datetimes_utc_to_jd_ut(dts)):
+            assert abs(jd - datetime_utc_to_jd_ut(dt)) <= _JD_TOL
+
+    def test_offset_datetimes_are_normalized(self):
+        cet = timezone(timedelta(hours=1))
+        dt = datetime(2024, 2, 4, 10, 0, tzinfo=cet)
+        (jd,) = datetimes_utc_to_jd_ut([dt])
+        assert abs(jd - datetime_utc_to_jd_ut(dt.astimezone(timezone.utc))) <= _JD_TOL
+
+    def test_naive_rejected(self):
+        with pytest.raises(ValueError):
+            datetimes_utc_to_jd_ut([datetime(2024, 1, 1)])
+
+    def test_unix_roundtrip(self):
+        secs = [0.0, 1.5, -86400.0 * 365 * 100, 1_700_000_000.25]
+        jds = jd_ut_from_unix_seconds(secs)
+        assert jds[0] == JD_UNIX_EPOCH
+        back = unix_seconds_from_jd_ut(jds)
+        for s, b in zip(secs, back):
+            assert b == pytest.approx(s, abs=1e-4)
+
+    def test_jd_back_to_datetime(self):
+        dts = _random_utc(200, seed=11)
+        for dt, jd in zip(dts, datetimes_utc_to_jd_ut(dts)):
+            assert abs(jd_ut_to_datetime_utc(jd) - dt) <= timedelta(microseconds=60)
+
+    def test_delta_t_matches_swisseph(self):
+        jds = [2415020.5, 2451545.0, 2460000.5]
+        assert list(delta_t_seconds_many(jds)) == [swe.deltat(j) * 86400.0 for j in jds]
+        assert list(jd_tt_from_jd_ut_many(jds)) == [j + swe.deltat(j) for j in jds]
+
+
+class TestLocalBoundarySequence:
+    def test_matches_eager_list(self):
+        tz = timezone(timedelta(hours=8))
+        jds = [2460000.5 + 30.4 * k for k in range(13)]
+        eager = [jd_ut_to_datetime_utc(j).astimezone(tz) for j in jds]
+        lazy = _LocalDatetimesFromJD(jds, tz)
+        assert len(lazy) == 13
+        assert lazy[5] == eager[5]
+        assert lazy[-1] == eager[-1]
+        assert lazy[2:4] == eager[2:4]
+        assert list(lazy) == eager
+        assert lazy == eager
+        with pytest.raises(IndexError):
+            lazy[13]
+
+
+class TestMonthIndexInJDSpace:
+    @pytest.mark.parametrize("seed", [1, 2])
+    def test_month_index_agrees_with_datetime_search(self, seed):
+        rnd = random.Random(seed)
+        for _ in range(15):
+            local = datetime(1950, 1, 1) + timedelta(minutes=rnd.randrange(0, 90 * 525600))
+            res = compute_bazi(BaziInput(
+                birth_local=local.isoformat(),
+                timezone="Asia/Shanghai",
+                longitude_deg=116.4, latitude_deg=39.9,
+                strict_local_time=False,
+            ))
+            bounds = list(res.month_boundaries_local_dt)
+            expected = 11
+            for k in range(12):
+                if bounds[k] <= res.chart_local_dt < bounds[k + 1]:
+                    expected = k
+                    break
+            assert res.month_index == expected, local
+            assert res.month_boundaries_local_dt[res.month_index] <= res.chart_local_dt
+
+
+class TestSolarTermsOptional:
+    def test_skipping_solar_terms_keeps_pillars(self):
+        kwargs = dict(birth_local="2024-02-10T14:30:00", timezone="Europe/Berlin",
+                      longitude_deg=13.405, latitude_deg=52.52)
+        full = compute_bazi(BaziInput(**kwargs))
+        lean = compute_bazi(BaziInput(**kwargs, include_solar_terms=False))
+        assert full.solar_terms_local_dt is not None
+        assert lean.solar_terms_local_dt is None
+        assert lean.pillars == full.pillars
+        assert list(lean.month_boundaries_local_dt) == list(full.month_boundaries_local_dt)
@@ -0,0 +1,109 @@
+"""
+tests/test_ephemeris_cache.py — Interpolated Chebyshev position cache.
+"""
+from __future__ import annotations
+
+import random
+from datetime import datetime, timezone
+
+import pytest
+import swisseph as swe
+
+from bazi_engine.ephemeris import SwissEphBackend
+from bazi_engine.ephemeris_cache import PositionCache, shared_position_cache
+
+BODIES = (swe.SUN, swe.MOON, swe.MERCURY, swe.VENUS, swe.MARS,
+          swe.JUPITER, swe.SATURN, swe.PLUTO, swe.MEAN_NODE)
+
+
+@pytest.fixture
+def flags():
+    return SwissEphBackend().flags | swe.FLG_SPEED
+
+
+def _arcsec(a: float, b: float) -> float:
+    return abs((a - b + 180.0) % 360.0 - 180.0) * 3600.0
+
+
+class TestAccuracy:
+    def test_within_tolerance(self, flags):
+        cache = PositionCache(tolerance_arcsec=0.1)
+        rng = random.Random(36)
+        for body in BODIES:
+            for _ in range(40):
+                jd = rng.uniform(2415020.5, 2488069.5)
+                got, _ = cache.calc_ut(jd, body, flags)
+                want, _ = swe.calc_ut(jd, body, flags)
+                assert _arcsec(got[0], want[0]) <= 0.1, (body, jd)
+                assert abs(got[1] - want[1]) * 3600.0 <= 0.1, (body, jd)
+                assert abs(got[2] - want[2]) / want[2] < 1e-6
+                # Speeds come from the polynomial derivative.
+                assert abs(got[3] - want[3]) * 3600.0 < 2.0, (body, jd)
+
+    def test_no_speed_flag_gives_zero_speeds(self, flags):
+        got, _ = PositionCache().calc_ut(2460000.5, swe.MARS, flags & ~swe.FLG_SPEED)
+        assert got[3:] == (0.0, 0.0, 0.0)
+
+    def test_wraps_longitude(self, flags):
+        cache = PositionCache()
+        # Sun crosses 0° at the March equinox 2024 (JD ≈ 2460389.6).
+        for k in range(40):
+            jd = 2460385.0 + 0.25 * k
+            got, _ = cache.calc_ut(jd, swe.SUN, flags)
+            assert 0.0 <= got[0] < 360.0
+            assert _arcsec(got[0], swe.calc_ut(jd, swe.SUN, flags)[0][0]) <= 0.1
+
+
+class TestCacheBehaviour:
+    def test_warm_equals_cold(self, flags):
+        jds = [2460600.0 + 0.37 * k for k in range(30)]
+        warm = PositionCache()
+        first = [warm.calc_ut(jd, swe.MOON, flags)[0] for jd in jds]
+        again = [warm.calc_ut(jd, swe.MOON, flags)[0] for jd in reversed(jds)]
+        assert first == list(reversed(again))
+        cold = [PositionCache().calc_ut(jd, swe.MOON, flags)[0] for jd in jds]
+        assert cold == first
+        assert warm.info()["hits"] > warm.info()["misses"]
+
+    def test_lru_eviction(self, flags):
+        cache = PositionCache(max_segments=2)
+        for day in range(5):
+            cache.calc_ut(2460600.5 + day, swe.MOON, flags)
+        assert cache.info()["size"] == 2
+
+    def test_uncacheable_flags_are_exact(self, flags):
+        cache = PositionCache()
+        eq = flags | swe.FLG_EQUATORIAL
+        assert cache.calc_ut(2460600.3, swe.MARS, eq) == swe.calc_ut(2460600.3, swe.MARS, eq)
+        assert cache.calc_ut(2460600.3, swe.TRUE_NODE, flags) == swe.calc_ut(2460600.3, swe.TRUE_NODE, flags)
+        assert cache.info()["size"] == 0
+
+    def test_rejects_non_positive_tolerance(self):
+        with pytest.raises(ValueError):
+            PositionCache(tolerance_arcsec=0.0)
+
+
+class TestBackendSwitch:
+    def test_exact_false_uses_shared_cache(self, monkeypatch):
+        monkeypatch.delenv("EPHEMERIS_EXACT", raising=False)
+        shared_position_cache().clear()
+        backend = SwissEphBackend(exact=False)
+        got, _ = backend.calc_ut(2460600.3, swe.VENUS, swe.FLG_SPEED)
+        want, _ = SwissEphBackend().calc_ut(2460600.3, swe.VENUS, swe.FLG_SPEED)
+        assert _arcsec(got[0], want[0]) <= 0.1
+        assert shared_position_cache().info()["misses"] == 1
+
+    def test_env_forces_exact(self, monkeypatch):
+        monkeypatch.setenv("EPHEMERIS_EXACT", "1")
+        assert SwissEphBackend(exact=False).exact is True
+
+    def test_transit_matches_exact(self, monkeypatch):
+        from bazi_engine.transit import _transit_cache, compute_transit_now
+
+        dt = datetime(2026, 10, 19, 9, 0, tzinfo=timezone.utc)
+        monkeypatch.setenv("EPHEMERIS_EXACT", "1")
+        exact = compute_transit_now(dt_utc=dt)
+        _transit_cache.clear()
+        monkeypatch.delenv("EPHEMERIS_EXACT", raising=False)
+        cached = compute_transit_now(dt_utc=dt)
+        assert cached == exact
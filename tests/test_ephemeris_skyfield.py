@@ -0,0 +1,159 @@
+"""
+tests/test_ephemeris_skyfield.py — Optional Skyfield/JPL ephemeris backend.
+
+Selection and error paths run everywhere; the numerical checks need the
+``skyfield`` extra and use the small DE441 excerpt shipped with Skyfield's
+own test data (late July 1969), or SKYFIELD_KERNEL if set.
+"""
+from __future__ import annotations
+
+import math
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from bazi_engine.app import app
+from bazi_engine.ephemeris import SwissEphBackend, make_backend
+from bazi_engine.ephemeris_skyfield import resolve_kernel_path
+from bazi_engine.exc import EphemerisUnavailableError, NotSupportedError
+
+client = TestClient(app)
+
+
+class TestSelection:
+    def test_swisseph_is_default(self):
+        assert isinstance(make_backend("swisseph"), SwissEphBackend)
+
+    def test_unknown_backend(self):
+        with pytest.raises(NotSupportedError):
+            make_backend("jpl-horizons")
+
+    def test_missing_extra_is_501(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "skyfield", None)
+        monkeypatch.setitem(sys.modules, "skyfield.api", None)
+        with pytest.raises(NotSupportedError):
+            make_backend("skyfield")
+
+    def test_missing_kernel(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("SKYFIELD_KERNEL", raising=False)
+        with pytest.raises(EphemerisUnavailableError) as exc:
+            resolve_kernel_path(ephe_path=str(tmp_path))
+        assert str(tmp_path / "de440s.bsp") in exc.value.detail["searched"]
+
+    def test_kernel_from_env(self, tmp_path, monkeypatch):
+        kernel = tmp_path / "de421.bsp"
+        kernel.write_bytes(b"")
+        monkeypatch.setenv("SKYFIELD_KERNEL", str(kernel))
+        assert resolve_kernel_path() == kernel
+
+    def test_request_selects_backend(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("SKYFIELD_KERNEL", raising=False)
+        monkeypatch.setenv("SE_EPHE_PATH", str(tmp_path))
+        r = client.post("/calculate/bazi", json={
+            "date": "2024-02-10T14:30:00", "tz": "Europe/Berlin", "ephemeris": "skyfield",
+        })
+        # Without a kernel (or without the extra) the request must fail
+        # loudly, never fall back to Swiss Ephemeris silently.
+        assert r.status_code in (501, 503), r.text
+
+
+def _kernel_path() -> Path:
+    env = os.environ.get("SKYFIELD_KERNEL")
+    if env:
+        return Path(env)
+    skyfield = pytest.importorskip("skyfield")
+    return Path(skyfield.__file__).parent / "tests" / "data" / "de441-1969.bsp"
+
+
+@pytest.fixture(scope="module")
+def sky():
+    pytest.importorskip("skyfield")
+    kernel = _kernel_path()
+    if not kernel.is_file():
+        pytest.skip("no JPL kernel available")
+    from bazi_engine.ephemeris_skyfield import SkyfieldBackend
+    return SkyfieldBackend(kernel_path=str(kernel))
+
+
+# Inside the 1969 excerpt; any full kernel covers it too.
+JD0 = 2440431.0
+
+
+class TestSkyfieldNumerics:
+    def test_sun_longitude_matches_swisseph(self, sky):
+        swiss = SwissEphBackend()
+        jds = [JD0 + 0.25 * k for k in range(12)]
+        lons = sky.sun_lon_deg_ut_many(jds)
+        for jd, lon in zip(jds, lons):
+            # Moshier (the test default) is good to a few arcsec.
+            assert abs(lon - swiss.sun_lon_deg_ut(jd)) < 5.0 / 3600.0
+        assert sky.sun_lon_deg_ut(jds[3]) == pytest.approx(lons[3], abs=1e-9)
+
+    def test_solcross_matches_swisseph(self, sky):
+        swiss = SwissEphBackend()
+        for target in (125.5, 126.0, 126.5):
+            a = sky.solcross_ut(target, JD0)
+            b = swiss.solcross_ut(target, JD0)
+            assert a is not None and b is not None
+            assert abs(a - b) * 86400.0 < 10.0
+            lon = sky.sun_lon_deg_ut(a)
+            assert abs((lon - target + 180.0) % 360.0 - 180.0) < 1e-6
+
+    def test_batch_equals_scalar(self, sky):
+        targets = [125.4, 125.9, 126.3, 126.8]
+        many = sky.solcross_ut_many(targets, [JD0] * len(targets))
+        for t, jd in zip(targets, many):
+            assert jd == pytest.approx(sky.solcross_ut(t, JD0), abs=1e-8)
+        assert list(many) == sorted(many)
+
+    def test_start_on_target(self, sky):
+        lon = sky.sun_lon_deg_ut(JD0)
+        assert sky.solcross_ut(lon, JD0) == JD0
+
+    def test_ephemeris_id_names_kernel(self, sky):
+        assert sky.ephemeris_id == f"skyfield_{_kernel_path().stem}"
+
+    def test_delta_t_close_to_swisseph(self, sky):
+        swiss = SwissEphBackend()
+        assert abs(sky.delta_t_seconds(JD0) - swiss.delta_t_seconds(JD0)) < 1.0
+        assert not math.isnan(sky.jd_tt_from_jd_ut(JD0))
+
+    def test_backend_shared_per_kernel(self, sky, monkeypatch):
+        from bazi_engine.ephemeris_skyfield import skyfield_backend
+        monkeypatch.setenv("SKYFIELD_KERNEL", str(_kernel_path()))
+        first = make_backend("skyfield")
+        assert make_backend("skyfield") is first
+        assert skyfield_backend(kernel_path=str(_kernel_path())) is first
+
+
+class TestJieqiBatch:
+    def test_batch_matches_scalar_search(self, sky):
+        from bazi_engine.jieqi import find_crossing, find_crossings
+        targets = [125.5, 126.0, 126.5, 127.0]
+        starts = [JD0, JD0, JD0 + 0.5, JD0 + 1.0]
+        batch = find_crossings(sky, targets, starts, accuracy_seconds=1.0)
+        for t, s, jd in zip(targets, starts, batch):
+            assert jd == pytest.approx(find_crossing(sky, t, s, accuracy_seconds=1.0), abs=1e-8)
+
+    def test_nan_rows_fall_back_to_scalar_search(self):
+        from bazi_engine.jieqi import find_crossings
+
+        class HalfBatch:
+            swiss = SwissEphBackend()
+
+            def sun_lon_deg_ut(self, jd):
+                return self.swiss.sun_lon_deg_ut(jd)
+
+            def solcross_ut(self, target, start):
+                return None
+
+            def solcross_ut_many(self, targets, starts):
+                return [float("nan"), self.swiss.solcross_ut(targets[1], starts[1])]
+
+        swiss = SwissEphBackend()
+        got = find_crossings(HalfBatch(), [125.5, 126.0], [JD0, JD0], accuracy_seconds=0.5)
+        assert got[0] == pytest.approx(swiss.solcross_ut(125.5, JD0), abs=1.0 / 86400.0)
+        assert got[1] == swiss.solcross_ut(126.0, JD0)
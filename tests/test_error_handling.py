@@ -22,7 +22,9 @@ from bazi_engine.exc import (
     InputError,
     EphemerisUnavailableError,
     CalculationError,
+    ConflictError,
     NotSupportedError,
+    TooManyRequestsError,
 )
 from bazi_engine.time_utils import LocalTimeError
 
@@ -57,6 +59,8 @@ class TestExceptionHierarchy:
         assert EphemerisUnavailableError.http_status == 503
         assert CalculationError.http_status == 500
         assert NotSupportedError.http_status == 501
+        assert TooManyRequestsError.http_status == 429
+        assert ConflictError.http_status == 409
 
     def test_error_codes_are_strings(self):
         assert isinstance(InputError.error_code, str)
@@ -17,11 +17,11 @@ BAZI_PAYLOAD = {
     "lat": 52.52,
 }
 
-# Map each endpoint to the router module that owns resolve_local_iso
+# Map each endpoint to the time-resolution entry point its router calls first
 _ENDPOINT_PATCH_TARGETS = {
-    "/calculate/bazi": "bazi_engine.routers.bazi.resolve_local_iso",
+    "/calculate/bazi": "bazi_engine.routers.bazi.normalize_birth_input",
     "/calculate/western": "bazi_engine.routers.western.resolve_local_iso",
-    "/calculate/fusion": "bazi_engine.routers.fusion.resolve_local_iso",
+    "/calculate/fusion": "bazi_engine.routers.fusion.normalize_birth_input",
     "/calculate/wuxing": "bazi_engine.routers.fusion.resolve_local_iso",
 }
 
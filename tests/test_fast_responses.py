@@ -0,0 +1,133 @@
+"""Fast response mode (BAZI_FAST_RESPONSES): payloads must match the response models.
+
+In fast mode the endpoints skip FastAPI's per-request response_model
+validation, so these tests are the place where conformance is enforced:
+every fast payload must validate against its model and be byte-for-byte
+the same JSON document as the validated default response.
+"""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from bazi_engine.app import app
+from bazi_engine.routers.chart import ChartResponse
+from bazi_engine.routers.fusion import FusionResponse
+from bazi_engine.exc import CalculationError
+from bazi_engine.routers import shared
+from bazi_engine.routers.shared import FAST_RESPONSES_ENV, FastJSONResponse, dumps_compact
+from bazi_engine.routers.webhooks import WebhookChartResponse
+
+client = TestClient(app)
+
+_SECRET = "test-secret"
+
+CASES = [
+    (
+        "/chart",
+        {"local_datetime": "2024-02-10T14:30:00", "tz_id": "Europe/Berlin",
+         "geo_lon_deg": 13.405, "geo_lat_deg": 52.52},
+        ChartResponse,
+    ),
+    (
+        "/chart",
+        {"local_datetime": "1990-06-15T08:00:00", "tz_id": "America/New_York",
+         "geo_lon_deg": -74.006, "geo_lat_deg": 40.7128, "include_validation": True},
+        ChartResponse,
+    ),
+    (
+        "/calculate/fusion",
+        {"date": "2024-02-10T14:30:00", "tz": "Europe/Berlin", "lon": 13.405, "lat": 52.52},
+        FusionResponse,
+    ),
+    (
+        "/api/webhooks/chart",
+        {"birthDate": "1990-06-15", "birthTime": "08:00",
+         "birthLat": 52.52, "birthLon": 13.405, "birthTz": "Europe/Berlin"},
+        WebhookChartResponse,
+    ),
+    (
+        "/api/webhooks/chart",
+        {"birthDate": "1985-12-01", "birthLat": 48.14, "birthLon": 11.58, "birthTz": "Europe/Berlin"},
+        WebhookChartResponse,
+    ),
+]
+
+
+@pytest.fixture(autouse=True)
+def webhook_secret(monkeypatch):
+    monkeypatch.setenv("ELEVENLABS_TOOL_SECRET", _SECRET)
+
+
+def _post(path, body, model=None):
+    r = client.post(path, json=body, headers={"x-api-key": _SECRET})
+    assert r.status_code == 200, r.text
+    if model is not None:
+        model.model_validate_json(r.content)
+    data = r.json()
+    # Wall-clock stamp differs between the two requests.
+    data.get("provenance", {}).pop("computation_timestamp", None)
+    return data
+
+
+@pytest.mark.parametrize("path,body,model", CASES)
+def test_fast_payload_matches_response_model(monkeypatch, path, body, model):
+    validated = _post(path, body)
+    monkeypatch.setenv(FAST_RESPONSES_ENV, "1")
+    assert _post(path, body, model) == validated
+
+
+def test_persisted_chart_fast_path(monkeypatch, tmp_path):
+    monkeypatch.setenv("CHART_STORE_PATH", str(tmp_path / "charts.sqlite3"))
+    body = {**CASES[0][1], "persist": True}
+    validated = _post("/chart", body)
+    monkeypatch.setenv(FAST_RESPONSES_ENV, "1")
+    assert _post("/chart", body) == validated
+    assert client.get(f"/chart/{validated['chart_id']}").json() == validated
+
+
+def test_fast_json_response_is_compact_utf8():
+    body = FastJSONResponse({"zeichen": "Löwe", "x": [1, 2.5]}).body
+    assert body.decode("utf-8") == '{"zeichen":"Löwe","x":[1,2.5]}'
+
+
+@pytest.mark.parametrize("encoder", ["orjson", "json"])
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_non_finite_floats_rejected_by_both_encoders(monkeypatch, encoder, value):
+    if encoder == "json":
+        monkeypatch.setattr(shared, "_orjson", None)
+    elif shared._orjson is None:
+        pytest.skip("orjson not installed")
+    payload = {"ok": [1, 2.5], "harmony": [[0.5, 0.25], [0.125, value]], "rows": [{"h": 1.0}]}
+    with pytest.raises(CalculationError) as info:
+        dumps_compact(payload)
+    assert info.value.detail == {"path": ["harmony", 1, 1]}
+    with pytest.raises(CalculationError):
+        FastJSONResponse({"rows": [{"h": value}]})
+
+
+def test_finite_payloads_unchanged():
+    payload = {"a": [1, 2.5, True, None, "x", [1e308, 1e308]], "b": {"c": -0.0}}
+    assert dumps_compact(payload) == b'{"a":[1,2.5,true,null,"x",[1e308,1e308]],"b":{"c":-0.0}}'
+
+
+def test_nan_payload_is_500_in_fast_mode(monkeypatch):
+    from bazi_engine.services import harmony_matrix
+    monkeypatch.setenv(FAST_RESPONSES_ENV, "1")
+    real = harmony_matrix.harmony_matrix
+
+    def with_nan(rows, columns):
+        result = real(rows, columns)
+        result.harmony[0][0] = float("nan")
+        return result
+
+    monkeypatch.setattr("bazi_engine.routers.fusion.harmony_matrix", with_nan)
+    client_ = TestClient(app, raise_server_exceptions=False)
+    resp = client_.post("/fusion/matrix", json={"charts": [
+        {"date": "2024-02-10T14:30:00", "tz": "Europe/Berlin", "lon": 13.405, "lat": 52.52},
+    ]})
+    assert resp.status_code == 500
+    assert resp.json()["error"] == "calculation_error"
+    assert resp.json()["detail"] == {"path": ["harmony", 0, 0]}
+
@@ -0,0 +1,201 @@
+"""Tests for the harmony matrix kernel (services/harmony_matrix.py) and POST /fusion/matrix."""
+
+from __future__ import annotations
+
+import json
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from bazi_engine.app import app
+from bazi_engine.services import harmony_matrix
+from bazi_engine.services.harmony_matrix import ChartVectors, harmony_blocks, harmony_matrix as matrix_of
+from bazi_engine.wuxing.analysis import calculate_harmony_index
+from bazi_engine.wuxing.calibration import calibrate_harmony
+from bazi_engine.wuxing.vector import WuXingVector
+
+client = TestClient(app)
+
+CHARTS = [
+    {"date": "2024-02-10T14:30:00", "tz": "Europe/Berlin", "lon": 13.405, "lat": 52.52},
+    {"date": "1990-06-15T08:00:00", "tz": "America/New_York", "lon": -74.006, "lat": 40.7128},
+    {"date": "1985-12-01T23:10:00", "tz": "Europe/Berlin", "lon": 11.58, "lat": 48.14},
+]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def kernels(request, monkeypatch):
+    """Run each kernel test with numpy and with the pure-Python fallback."""
+    if request.param == "python":
+        monkeypatch.setattr(harmony_matrix, "_numpy", lambda: None)
+    return request.param
+
+
+@pytest.fixture(autouse=True)
+def isolated_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHART_STORE_PATH", str(tmp_path / "charts.sqlite3"))
+
+
+def _random_charts(n, seed):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        west = WuXingVector(*(rng.random() * rng.choice([0, 1, 3]) for _ in range(5)))
+        bazi = WuXingVector(*(rng.random() * 2 for _ in range(5)))
+        out.append(ChartVectors(west, bazi, n_west=rng.randint(1, 12), n_bazi=rng.choice([3, 9, 12, 18])))
+    return out
+
+
+def _density_inputs(cv):
+    bodies = {f"P{i}": {"longitude": 0.0} for i in range(cv.n_west)}
+    pillars = {f"p{i}": {} for i in range(cv.n_bazi // 3)}
+    return bodies, pillars
+
+
+class TestKernel:
+
+    def test_cells_match_single_chart_functions(self, kernels):
+        rows, cols = _random_charts(9, seed=1), _random_charts(7, seed=2)
+        m = matrix_of(rows, cols)
+        for i, r in enumerate(rows):
+            for j, c in enumerate(cols):
+                h = calculate_harmony_index(r.western, c.bazi)["harmony_index"]
+                assert m.harmony[i][j] == pytest.approx(h, abs=1e-4)
+                bodies, _ = _density_inputs(r)
+                _, pillars = _density_inputs(c)
+                cal = calibrate_harmony(m.harmony[i][j], bodies, pillars, r.western, c.bazi)
+                assert m.h_calibrated[i][j] == pytest.approx(cal.h_calibrated, abs=1e-4)
+                assert m.sigma_above[i][j] == pytest.approx(cal.sigma_above, abs=1e-3)
+
+    def test_degenerate_cells(self, kernels):
+        zero = ChartVectors(WuXingVector.zero(), WuXingVector.zero(), n_west=0, n_bazi=12)
+        other = _random_charts(2, seed=3)
+        m = matrix_of([zero, *other], [zero, *other])
+        assert m.harmony[0] == [0.0, 0.0, 0.0]
+        assert m.h_calibrated[0] == [0.0, 0.0, 0.0]
+        assert [line[0] for line in m.sigma_above] == [0.0, 0.0, 0.0]
+
+    def test_blocks_cover_matrix(self, kernels):
+        rows, cols = _random_charts(23, seed=4), _random_charts(5, seed=5)
+        blocks = list(harmony_blocks(rows, cols, block_cells=20))
+        assert [b.start for b in blocks] == [0, 4, 8, 12, 16, 20]
+        assert sum((b.cosmic_state for b in blocks), []) == matrix_of(rows, cols).cosmic_state
+
+    def test_kernels_agree(self, monkeypatch):
+        rows, cols = _random_charts(30, seed=6), _random_charts(40, seed=7)
+        fast = matrix_of(rows, cols)
+        monkeypatch.setattr(harmony_matrix, "_numpy", lambda: None)
+        slow = matrix_of(rows, cols)
+        for name in ("harmony", "cosmic_state", "h_calibrated", "sigma_above"):
+            for a, b in zip(getattr(fast, name), getattr(slow, name)):
+                assert a == pytest.approx(b, abs=1e-3), name
+
+    def test_empty(self):
+        assert list(harmony_blocks([], _random_charts(2, seed=8))) == []
+
+
+class TestEndpoint:
+
+    def test_diagonal_matches_fusion(self):
+        resp = client.post("/fusion/matrix", json={"charts": CHARTS})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert len(data["rows"]) == len(data["columns"]) == 3
+        for i, chart in enumerate(CHARTS):
+            fusion = client.post("/calculate/fusion", json=chart).json()
+            assert data["harmony"][i][i] == pytest.approx(fusion["harmony_index"]["harmony_index"], abs=1e-4)
+            assert data["cosmic_state"][i][i] == pytest.approx(fusion["cosmic_state"], abs=1e-4)
+            assert data["h_calibrated"][i][i] == pytest.approx(fusion["calibration"]["h_calibrated"], abs=1e-4)
+            assert data["rows"][i]["wu_xing_vectors"] == fusion["wu_xing_vectors"]
+            assert data["rows"][i]["n_west"] == fusion["calibration"]["n_west"]
+
+    def test_one_against_many(self):
+        resp = client.post("/fusion/matrix", json={"charts": CHARTS[:1], "against": CHARTS})
+        data = resp.json()
+        assert len(data["harmony"]) == 1 and len(data["harmony"][0]) == 3
+        full = client.post("/fusion/matrix", json={"charts": CHARTS}).json()
+        assert data["harmony"][0] == full["harmony"][0]
+
+    def test_stored_chart_ids(self):
+        stored = client.post("/chart", json={
+            "local_datetime": "2024-02-10T14:30:00", "tz_id": "Europe/Berlin",
+            "geo_lon_deg": 13.405, "geo_lat_deg": 52.52, "persist": True,
+        }).json()
+        resp = client.post("/fusion/matrix", json={
+            "charts": [{"chart_id": stored["chart_id"]}], "against": CHARTS[1:],
+        })
+        assert resp.status_code == 200
+        row = resp.json()["rows"][0]
+        assert row["chart_id"] == stored["chart_id"]
+        assert row["input"] is None
+        assert row["n_bazi_contributions"] == 12
+
+    def test_stored_chart_row_equals_birth_input_row(self):
+        # Night chart: the Ascendant changes the western vector, so a stored
+        # chart must not fall back to the day-chart ``wuxing.from_planets``.
+        stored = client.post("/chart", json={
+            "local_datetime": "1990-03-14T13:15:00", "tz_id": "Europe/Berlin",
+            "geo_lon_deg": 13.405, "geo_lat_deg": 52.52, "persist": True,
+        }).json()
+        birth = {"date": "1990-03-14T13:15:00", "tz": "Europe/Berlin", "lon": 13.405, "lat": 52.52}
+        by_id = client.post("/fusion/matrix", json={"charts": [{"chart_id": stored["chart_id"]}], "against": CHARTS}).json()
+        by_input = client.post("/fusion/matrix", json={"charts": [birth], "against": CHARTS}).json()
+        for key in ("harmony", "cosmic_state", "h_calibrated", "sigma_above"):
+            assert by_id[key] == by_input[key], key
+        for key in ("wu_xing_vectors", "n_west", "n_bazi_contributions"):
+            assert by_id["rows"][0][key] == by_input["rows"][0][key], key
+
+    def test_unknown_chart_id(self):
+        resp = client.post("/fusion/matrix", json={"charts": [CHARTS[0], {"chart_id": "ab" * 16}]})
+        assert resp.status_code == 404
+        assert resp.json()["detail"]["index"] == 1
+
+    @pytest.mark.parametrize("chart", [
+        {"date": "2024-02-10T14:30:00"},
+        {"chart_id": "ab" * 16, "date": "2024-02-10T14:30:00", "lon": 0.0, "lat": 0.0},
+        {"chart_id": "not-an-id"},
+    ])
+    def test_invalid_chart_inputs(self, chart):
+        assert client.post("/fusion/matrix", json={"charts": [chart]}).status_code == 422
+
+    def test_json_cell_cap(self, monkeypatch):
+        from bazi_engine.routers import fusion
+        monkeypatch.setattr(fusion, "MAX_JSON_CELLS", 4)
+        resp = client.post("/fusion/matrix", json={"charts": CHARTS})
+        assert resp.status_code == 422
+        assert resp.json()["detail"]["cells"] == 9
+
+    def test_json_cell_cap_before_any_chart_is_resolved(self, monkeypatch):
+        from bazi_engine.routers import fusion
+        monkeypatch.setattr(fusion, "MAX_JSON_CELLS", 4)
+        monkeypatch.setattr(fusion, "_matrix_chart", lambda *a: pytest.fail("chart resolved"))
+        resp = client.post("/fusion/matrix", json={"charts": [{"chart_id": "ab" * 16}] * 2, "against": CHARTS})
+        assert resp.status_code == 422
+        assert resp.json()["detail"]["cells"] == 6
+
+    def test_birth_chart_cap(self, monkeypatch):
+        from bazi_engine.routers import fusion
+        monkeypatch.setattr(fusion, "MAX_MATRIX_BIRTH_CHARTS", 2)
+        monkeypatch.setattr(fusion, "_matrix_chart", lambda *a: pytest.fail("chart resolved"))
+        resp = client.post("/fusion/matrix", json={"charts": CHARTS, "format": "ndjson"})
+        assert resp.status_code == 422
+        assert resp.json()["detail"] == {"birth_charts": 3, "max_birth_charts": 2}
+
+    def test_birth_chart_cap_counts_distinct_inputs(self, monkeypatch):
+        from bazi_engine.routers import fusion
+        monkeypatch.setattr(fusion, "MAX_MATRIX_BIRTH_CHARTS", 3)
+        resp = client.post("/fusion/matrix", json={"charts": CHARTS, "against": CHARTS[::-1]})
+        assert resp.status_code == 200
+
+    def test_ndjson_stream(self, monkeypatch):
+        monkeypatch.setattr(harmony_matrix, "BLOCK_CELLS", 3)
+        resp = client.post("/fusion/matrix", json={"charts": CHARTS, "format": "ndjson"})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        header, *blocks = [json.loads(line) for line in resp.text.splitlines()]
+        assert header["shape"] == [3, 3]
+        assert "provenance" in header
+        full = client.post("/fusion/matrix", json={"charts": CHARTS}).json()
+        assert sum((b["harmony"] for b in blocks), []) == full["harmony"]
+        assert header["rows"] == full["rows"]
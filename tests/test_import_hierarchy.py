@@ -31,12 +31,17 @@ ENGINE_ROOT = REPO_ROOT / "bazi_engine"
 LAYERS: Dict[str, int] = {
     "constants":   0,
     "exc":         0,  # exception hierarchy — zero internal deps
+    "timing":      0,  # stage timing / counters — stdlib only
     "provenance":  1,  # only imports __version__ — no domain deps
     "types":       1,
     "ephemeris":   2,
+    "ephemeris_skyfield": 2,  # optional backend, lazily imported by ephemeris
+    "ephemeris_cache":    2,  # interpolated calc_ut cache, lazily imported by ephemeris
     "time_utils":  2,
+    "tz_index":    2,  # stdlib-only tz transition index used by time_utils
     "solar_time":  2,
     "jieqi":       3,
+    "sun_sign":    3,
     "aspects":     4,
     "bazi":        4,
     "western":     4,
@@ -48,16 +53,22 @@ LAYERS: Dict[str, int] = {
     "wuxing.analysis":       4,
     "wuxing.zones":          4,
     "wuxing.calibration":    4,
+    "wuxing.baseline_table": 4,
+    "wuxing.pillar_table":   4,
     # phases — Level 2 (pure computation, no domain imports upward)
     "phases":                2,
     "phases.jieqi_phase":    2,
     "phases.lunar_phase":    2,
+    "phases.solar_model":    2,
+    "phases.moon_table":     2,
     # research — Level 5 (imports from all lower levels for analysis)
     "research":              5,
     "research.dataset_generator": 5,
     "research.pattern_analysis":  5,
+    "research.streaming_stats":   5,
     "app":         5,
     "cli":         5,
+    "worker":      5,
     # bafe sub-modules all live at Layer 5
     "bafe.service":         5,
     "bafe.mapping":         5,
@@ -66,6 +77,8 @@ LAYERS: Dict[str, int] = {
     "bafe.kernel":          5,
     "bafe.harmonics":       5,
     "bafe.canonical_json":  5,
+    "bafe.schema_compiler": 5,
+    "bafe.artifact_hash":   5,
     "bafe.errors":          5,
     "bafe.ruleset_loader":  2,  # pure data loader: stdlib-only, no internal deps
     # routers and services also live at Layer 5
@@ -77,8 +90,14 @@ LAYERS: Dict[str, int] = {
     "routers.validate":     5,
     "routers.chart":        5,
     "routers.webhooks":     5,
+    "routers.jobs":         5,
     "services.geocoding":   5,
     "services.auth":        5,
+    "services.chart_store": 5,
+    "services.metrics":     5,
+    "services.harmony_matrix": 5,
+    "services.vector_index": 5,
+    "services.jobs":        5,
 }
 
 # Modules that are explicitly allowed to bypass the layer rule
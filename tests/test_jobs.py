@@ -0,0 +1,380 @@
+"""Tests for the background job queue (services/jobs.py) and the /jobs endpoints."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from bazi_engine.app import app
+from bazi_engine.research import analyse_feature_by_phase, generate_synthetic_dataset
+from bazi_engine.services import jobs
+from bazi_engine.services.jobs import JobCaps, JobRunner, JobStore, JobType, encode_records, register_job_type
+from bazi_engine.services.metrics import render_metrics
+
+client = TestClient(app)
+
+CHART = {
+    "local_datetime": "2024-02-10T14:30:00",
+    "tz_id": "Europe/Berlin",
+    "geo_lon_deg": 13.405,
+    "geo_lat_deg": 52.52,
+}
+
+
+def _squares(params, start, stop, state):
+    total = (state or 0) + sum(range(start, stop))
+    return [{"i": i, "sq": i * i} for i in range(start, stop)], total
+
+
+class _Crash(BaseException):
+    """Stands in for the process dying mid-chunk (not caught by the runner)."""
+
+
+register_job_type(JobType("test_squares", count=lambda p: p["n"], run_chunk=_squares,
+                          finish=lambda p, s: {"sum": s}, default_chunk=4))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(tmp_path / "jobs.sqlite3")
+
+
+@pytest.fixture
+def api_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("JOB_STORE_PATH", str(tmp_path / "api-jobs.sqlite3"))
+    monkeypatch.setenv("CHART_STORE_PATH", str(tmp_path / "charts.sqlite3"))
+    return jobs.get_job_store()
+
+
+def _lines(store, job_id):
+    return [json.loads(line) for line in b"".join(store.iter_result(job_id)).splitlines()]
+
+
+class TestRunner:
+
+    def test_chunks_and_summary(self, store):
+        job = store.submit("test_squares", {"n": 10})
+        assert (job.status, job.total, job.chunk_size) == ("queued", 10, 4)
+        done = JobRunner(store).run_once()
+        assert done is not None and done.status == "succeeded"
+        assert (done.done, done.progress) == (10, 1.0)
+        lines = _lines(store, job.job_id)
+        assert [r["sq"] for r in lines[:-1]] == [i * i for i in range(10)]
+        assert lines[-1] == {"summary": {"sum": 45}}
+        assert store.load_state(job.job_id) is None
+
+    def test_columnar(self, store):
+        job = store.submit("test_squares", {"n": 6}, fmt="columnar")
+        JobRunner(store).run_once()
+        first, second, summary = _lines(store, job.job_id)
+        assert first == {"start": 0, "count": 4, "columns": {"i": [0, 1, 2, 3], "sq": [0, 1, 4, 9]}}
+        assert second["start"] == 4 and second["columns"]["i"] == [4, 5]
+        assert summary == {"summary": {"sum": 15}}
+
+    def test_resume_from_checkpoint(self, store):
+        calls = []
+
+        def flaky(params, start, stop, state):
+            calls.append(start)
+            if start == 8 and len(calls) == 3:
+                raise _Crash
+            return _squares(params, start, stop, state)
+
+        register_job_type(JobType("test_flaky", count=lambda p: p["n"], run_chunk=flaky,
+                                  finish=lambda p, s: {"sum": s}, default_chunk=4))
+        job = store.submit("test_flaky", {"n": 10})
+        runner = JobRunner(store)
+        with pytest.raises(_Crash):
+            runner.run_once()
+        crashed = store.get(job.job_id)
+        assert (crashed.status, crashed.done) == ("running", 8)
+        # Partial garbage after the checkpoint is discarded on resume.
+        with open(store.result_path(job.job_id), "ab") as fh:
+            fh.write(b'{"torn": ')
+        assert store.requeue_orphans() == 1
+        resumed = runner.run_once()
+        assert resumed.status == "succeeded"
+        assert calls == [0, 4, 8, 8]
+        lines = _lines(store, job.job_id)
+        assert [r["i"] for r in lines[:-1]] == list(range(10))
+        assert lines[-1] == {"summary": {"sum": 45}}
+
+    def test_stop_releases_job(self, store):
+        runner = JobRunner(store)
+
+        def stopping(params, start, stop, state):
+            runner._stopping.set()
+            return _squares(params, start, stop, state)
+
+        register_job_type(JobType("test_stop", count=lambda p: p["n"], run_chunk=stopping, default_chunk=4))
+        job = store.submit("test_stop", {"n": 10})
+        runner.run_once()
+        released = store.get(job.job_id)
+        assert (released.status, released.done, released.owner) == ("queued", 4, None)
+
+    def test_result_size_cap(self, store):
+        job = store.submit("test_squares", {"n": 100}, caps=JobCaps(max_result_bytes=200))
+        failed = JobRunner(store).run_once()
+        assert failed.status == "failed"
+        assert failed.error["error"] == "resource_cap"
+        assert failed.error["detail"]["cap"] == "max_result_bytes"
+        assert 0 < failed.result_bytes <= 200
+        assert len(_lines(store, job.job_id)) == failed.done
+
+    def test_time_cap(self, store):
+        store.submit("test_squares", {"n": 100}, caps=JobCaps(max_seconds=1e-9))
+        failed = JobRunner(store).run_once()
+        assert failed.error["detail"]["cap"] == "max_seconds"
+        assert 0 < failed.done < 100
+
+    def test_queue_limit(self, store):
+        from bazi_engine.exc import TooManyRequestsError
+        caps = JobCaps(max_queued=2)
+        store.submit("test_squares", {"n": 4}, caps=caps)
+        store.submit("test_squares", {"n": 4}, caps=caps)
+        with pytest.raises(TooManyRequestsError) as info:
+            store.submit("test_squares", {"n": 4}, caps=caps)
+        assert info.value.detail == {"queued": 2, "max_queued": 2}
+        assert store.count("queued") == 2
+        JobRunner(store).run_once()
+        store.submit("test_squares", {"n": 4}, caps=caps)
+
+    def test_item_cap_and_unknown_type(self, store):
+        from bazi_engine.exc import InputError
+        with pytest.raises(InputError):
+            store.submit("test_squares", {"n": 11}, caps=JobCaps(max_items=10))
+        with pytest.raises(InputError):
+            store.submit("no_such_type", {})
+
+    def test_failure_is_recorded(self, store):
+        def boom(params, start, stop, state):
+            raise ValueError("bad item")
+
+        register_job_type(JobType("test_boom", count=lambda p: 3, run_chunk=boom))
+        job = store.submit("test_boom", {})
+        failed = JobRunner(store).run_once()
+        assert failed.status == "failed"
+        assert "bad item" in failed.error["message"]
+        assert list(store.iter_result(job.job_id)) == []
+
+    def test_fifo_and_empty_queue(self, store):
+        a = store.submit("test_squares", {"n": 1})
+        b = store.submit("test_squares", {"n": 1})
+        runner = JobRunner(store)
+        assert runner.run_once().job_id == a.job_id
+        assert runner.run_once().job_id == b.job_id
+        assert runner.run_once() is None
+
+    def test_worker_threads(self, store):
+        runner = JobRunner(store, workers=2, poll_seconds=0.05)
+        runner.start()
+        try:
+            ids = [store.submit("test_squares", {"n": 20}).job_id for _ in range(3)]
+            runner.notify()
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline and store.count("succeeded") < 3:
+                time.sleep(0.02)
+        finally:
+            runner.stop(timeout=5)
+        assert [store.get(i).status for i in ids] == ["succeeded"] * 3
+
+    def test_retention_purges_finished_jobs(self, store):
+        old = store.submit("test_squares", {"n": 3})
+        JobRunner(store).run_once()
+        queued = store.submit("test_squares", {"n": 3})
+        runner = JobRunner(store, retention_seconds=3600)
+        assert runner.purge(now=time.time() + 60) == 0
+        assert runner.purge(now=time.time() + 7200) == 1
+        assert store.get(old.job_id) is None
+        assert not store.result_path(old.job_id).exists()
+        assert store.get(queued.job_id).status == "queued"
+        assert JobRunner(store, retention_seconds=0).purge(now=time.time() + 1e9) == 0
+
+    def test_retention_from_env(self, store, monkeypatch):
+        monkeypatch.setenv("JOB_RETENTION_SECONDS", "120")
+        assert JobRunner(store).retention_seconds == 120.0
+
+    def test_delete(self, store):
+        job = store.submit("test_squares", {"n": 3})
+        JobRunner(store).run_once()
+        assert store.result_path(job.job_id).exists()
+        assert store.delete(job.job_id) is True
+        assert store.get(job.job_id) is None
+        assert not store.result_path(job.job_id).exists()
+        assert store.delete(job.job_id) is False
+
+    def test_delete_running_job_conflicts(self, store):
+        from bazi_engine.exc import ConflictError
+        job = store.submit("test_squares", {"n": 3})
+        store.claim("other:0")
+        with pytest.raises(ConflictError):
+            store.delete(job.job_id)
+        assert store.get(job.job_id).status == "running"
+
+    def test_caps_limit(self):
+        caps = JobCaps(max_items=5, max_seconds=60, max_result_bytes=1000)
+        assert caps.limit(max_seconds=10, max_result_bytes=5000) == JobCaps(5, 10, 1000)
+        assert caps.limit() == caps
+
+    def test_encode_records_fills_missing_fields(self):
+        line = encode_records([{"a": 1}, {"b": 2}], "columnar", 7)
+        assert json.loads(line) == {"start": 7, "count": 2, "columns": {"a": [1, None], "b": [None, 2]}}
+        assert encode_records([], "columnar", 0) == b""
+
+
+class TestEndpoints:
+
+    def _run(self, job_id):
+        store = jobs.get_job_store()
+        assert JobRunner(store).run_once().job_id == job_id
+        return client.get(f"/jobs/{job_id}").json()
+
+    def test_batch_chart(self, api_store):
+        bad = {**CHART, "local_datetime": "2024-03-31T02:30:00"}
+        resp = client.post("/jobs", json={"type": "batch_chart", "charts": [CHART, bad], "chunk_size": 1})
+        assert resp.status_code == 200
+        job = resp.json()
+        assert (job["status"], job["total"], job["done"]) == ("queued", 2, 0)
+        assert job["result_url"] == f"/jobs/{job['job_id']}/result"
+
+        status = self._run(job["job_id"])
+        assert status["status"] == "succeeded" and status["progress"] == 1.0
+        result = client.get(job["result_url"])
+        assert result.headers["content-type"].startswith("application/x-ndjson")
+        ok, err = [json.loads(line) for line in result.text.splitlines()]
+        assert ok["chart"] == client.post("/chart", json=CHART).json()
+        assert (err["index"], err["status"]) == (1, 422)
+
+    def test_transit_scan(self, api_store):
+        resp = client.post("/jobs", json={
+            "type": "transit_scan", "start": "2024-01-01T00:00:00Z", "days": 2, "step_hours": 12,
+        })
+        job_id = resp.json()["job_id"]
+        assert resp.json()["total"] == 4
+        assert self._run(job_id)["status"] == "succeeded"
+        records = [json.loads(line) for line in client.get(f"/jobs/{job_id}/result").text.splitlines()]
+        assert [r["datetime"] for r in records] == [
+            "2024-01-01T00:00:00Z", "2024-01-01T12:00:00Z", "2024-01-02T00:00:00Z", "2024-01-02T12:00:00Z",
+        ]
+        now = client.get("/transit/now", params={"datetime": "2024-01-01T12:00:00Z"}).json()
+        assert records[1]["planets"] == now["planets"]
+
+    def test_research_run(self, api_store):
+        resp = client.post("/jobs", json={
+            "type": "research_run", "n_total": 96, "chunk_size": 48, "seed": 3, "include_charts": True,
+        })
+        job_id = resp.json()["job_id"]
+        assert self._run(job_id)["status"] == "succeeded"
+        lines = [json.loads(line) for line in client.get(f"/jobs/{job_id}/result").text.splitlines()]
+        rows, summary = lines[:-1], lines[-1]["summary"]
+        assert [r["index"] for r in rows] == list(range(96))
+        assert summary["n_total"] == 96 and summary["bias"]["n_total"] == 96
+        # Same charts as generating the two chunks directly
+        charts = [
+            c for start in (0, 48)
+            for c in generate_synthetic_dataset(n_total=48, seed=(3 << 32) + start)
+        ]
+        assert [r["h_raw"] for r in rows] == [c.h_raw for c in charts]
+        expected = analyse_feature_by_phase(charts, "h_raw")
+        assert summary["features"]["h_raw"].keys() == expected.keys()
+        for phase, stats in expected.items():
+            assert summary["features"]["h_raw"][phase]["median"] == stats.median
+
+    @pytest.mark.parametrize("body", [
+        {"type": "nope"},
+        {"type": "batch_chart", "charts": []},
+        {"type": "transit_scan", "start": "not a date", "days": 1},
+        {"type": "transit_scan", "start": "2024-01-01", "days": 0},
+        {"type": "research_run", "n_total": 100, "chunk_size": 10},
+        {"type": "research_run", "n_total": 100},
+        {"type": "research_run", "n_total": 96, "chunk_size": 36},
+        {"type": "research_run", "n_total": 10, "format": "parquet"},
+    ])
+    def test_invalid_requests(self, api_store, body):
+        assert client.post("/jobs", json=body).status_code == 422
+
+    def test_item_cap(self, api_store, monkeypatch):
+        monkeypatch.setenv("JOB_MAX_ITEMS", "50")
+        resp = client.post("/jobs", json={"type": "research_run", "n_total": 51, "stratify_by_jieqi": False})
+        assert resp.status_code == 422
+        assert resp.json()["detail"] == {"items": 51, "max_items": 50}
+
+    def test_queue_full_is_429(self, api_store, monkeypatch):
+        monkeypatch.setenv("JOB_MAX_QUEUED", "1")
+        assert client.post("/jobs", json={"type": "research_run", "n_total": 24}).status_code == 200
+        resp = client.post("/jobs", json={"type": "research_run", "n_total": 24})
+        assert resp.status_code == 429
+        assert resp.json()["error"] == "too_many_requests"
+        assert api_store.count("queued") == 1
+
+    def test_unstratified_run_any_size(self, api_store):
+        resp = client.post("/jobs", json={
+            "type": "research_run", "n_total": 50, "chunk_size": 7, "stratify_by_jieqi": False,
+        })
+        assert resp.status_code == 200
+
+    def test_requested_caps_cannot_exceed_server_caps(self, api_store, monkeypatch):
+        monkeypatch.setenv("JOB_MAX_SECONDS", "30")
+        resp = client.post("/jobs", json={
+            "type": "research_run", "n_total": 24, "caps": {"max_seconds": 600, "max_result_bytes": 4096},
+        })
+        assert resp.json()["caps"] == {"max_seconds": 30.0, "max_result_bytes": 4096}
+
+    def test_delete_job(self, api_store):
+        job_id = client.post("/jobs", json={"type": "research_run", "n_total": 24}).json()["job_id"]
+        self._run(job_id)
+        resp = client.delete(f"/jobs/{job_id}")
+        assert resp.status_code == 200
+        assert resp.json() == {"job_id": job_id, "deleted": True}
+        assert client.get(f"/jobs/{job_id}").status_code == 404
+        assert client.delete(f"/jobs/{job_id}").status_code == 404
+
+    def test_delete_running_job_is_409(self, api_store):
+        job_id = client.post("/jobs", json={"type": "research_run", "n_total": 24}).json()["job_id"]
+        api_store.claim("other:0")
+        resp = client.delete(f"/jobs/{job_id}")
+        assert resp.status_code == 409
+        assert resp.json()["error"] == "conflict"
+
+    def test_unknown_job(self, api_store):
+        assert client.get("/jobs/" + "ab" * 16).status_code == 404
+        assert client.get("/jobs/" + "ab" * 16 + "/result").status_code == 404
+        assert client.get("/jobs/not-an-id").status_code == 422
+
+    def test_queue_gauge(self, api_store, monkeypatch):
+        monkeypatch.setattr(jobs, "_runner", None)
+        monkeypatch.setattr(jobs, "JobRunner", lambda store, workers: _NoopRunner())
+        jobs.start_job_workers(1)
+        client.post("/jobs", json={"type": "research_run", "n_total": 24})
+        assert "bazi_jobs_queued 1\n" in render_metrics()
+        assert "bazi_jobs_running 0\n" in render_metrics()
+
+    def test_disabled_workers(self, api_store, monkeypatch):
+        monkeypatch.setattr(jobs, "_runner", None)
+        monkeypatch.setenv("JOB_WORKERS", "0")
+        assert jobs.start_job_workers() is None
+
+    def test_no_workers_in_api_process_by_default(self, api_store, monkeypatch):
+        # Workers run in bazi_engine.worker; the gauges stay on the API.
+        monkeypatch.setattr(jobs, "_runner", None)
+        monkeypatch.delenv("JOB_WORKERS", raising=False)
+        assert jobs.start_job_workers() is None
+        client.post("/jobs", json={"type": "research_run", "n_total": 24})
+        assert "bazi_jobs_queued 1\n" in render_metrics()
+
+
+class _NoopRunner:
+    def start(self):
+        pass
+
+    def notify(self):
+        pass
+
+
+def test_results_dir_next_to_store(tmp_path):
+    s = JobStore(tmp_path / "q.sqlite3")
+    assert s.results_dir == tmp_path / "q.results" and os.path.isdir(s.results_dir)
@@ -0,0 +1,104 @@
+"""Tests for the /metrics endpoint (services/metrics.py)."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from bazi_engine import timing
+from bazi_engine.app import app
+from bazi_engine.services import metrics
+from bazi_engine.services.metrics import register_gauge, render_metrics
+
+client = TestClient(app)
+
+CHART_PAYLOAD = {
+    "local_datetime": "2024-02-10T14:30:00",
+    "tz_id": "Europe/Berlin",
+    "geo_lon_deg": 13.405,
+    "geo_lat_deg": 52.52,
+}
+
+_SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[^}]*\})? (-?[0-9.e+-]+|\+Inf|-Inf|NaN)$')
+
+
+def _samples(text):
+    out = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            out[name] = float(value)
+    return out
+
+
+@pytest.fixture(autouse=True)
+def fresh_histograms():
+    timing.route_histograms().clear()
+    timing.stage_histograms().clear()
+    yield
+    with metrics._gauges_lock:
+        metrics._gauges.pop("bazi_test_gauge", None)
+
+
+class TestMetricsEndpoint:
+
+    def test_content_type_and_format(self):
+        r = client.get("/metrics")
+        assert r.status_code == 200
+        assert r.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+        for line in r.text.splitlines():
+            assert line.startswith("# HELP ") or line.startswith("# TYPE ") or _SAMPLE.match(line), line
+
+    def test_type_declared_once_per_family(self):
+        types = [line for line in client.get("/metrics").text.splitlines() if line.startswith("# TYPE ")]
+        assert len(types) == len(set(types))
+
+    def test_route_latency_histogram(self):
+        client.post("/chart", json=CHART_PAYLOAD)
+        client.post("/chart", json=CHART_PAYLOAD)
+        samples = _samples(client.get("/metrics").text)
+        labels = '{method="POST",route="/chart"}'
+        assert samples[f"bazi_request_duration_seconds_count{labels}"] == 2
+        assert samples[f'bazi_request_duration_seconds_bucket{{method="POST",route="/chart",le="+Inf"}}'] == 2
+        assert samples[f"bazi_request_duration_seconds_sum{labels}"] > 0
+
+    def test_route_uses_template_not_path(self):
+        client.get("/chart/" + "0" * 32)
+        text = client.get("/metrics").text
+        assert 'route="/chart/{chart_id}"' in text
+        assert "0" * 32 not in text
+
+    def test_unmatched_route(self):
+        client.get("/no-such-endpoint")
+        assert 'route="unmatched"' in client.get("/metrics").text
+
+    def test_ephemeris_calls_with_timing(self, monkeypatch):
+        monkeypatch.setenv(timing.TIMING_ENV, "1")
+        client.post("/chart", json=CHART_PAYLOAD)
+        samples = _samples(client.get("/metrics").text)
+        assert samples['bazi_ephemeris_calls_total{call="swe.calc_ut"}'] > 0
+        assert samples['bazi_ephemeris_call_seconds_total{call="swe.calc_ut"}'] > 0
+        assert any(k.startswith('bazi_stage_duration_seconds_count{stage="western.planets"}') for k in samples)
+
+    def test_cache_and_process_metrics(self):
+        client.get("/transit/now")
+        client.get("/transit/now")
+        samples = _samples(client.get("/metrics").text)
+        assert samples['bazi_cache_hits_total{cache="transit"}'] >= 1
+        assert 0 < samples['bazi_cache_hit_ratio{cache="transit"}'] <= 1
+        assert samples['bazi_cache_capacity{cache="ruleset"}'] == 8
+        assert samples["bazi_threadpool_capacity"] > 0
+        assert samples["process_max_resident_memory_bytes"] > 0
+
+
+class TestRegisteredGauges:
+
+    def test_register_gauge(self):
+        register_gauge("bazi_test_gauge", "Test gauge.", lambda: 3)
+        assert "bazi_test_gauge 3\n" in render_metrics()
+
+    def test_failing_gauge_is_skipped(self):
+        register_gauge("bazi_test_gauge", "Test gauge.", lambda: 1 / 0)
+        assert "bazi_test_gauge" not in render_metrics()
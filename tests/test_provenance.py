@@ -9,7 +9,9 @@ import pytest
 from fastapi.testclient import TestClient
 
 from bazi_engine import __version__
+from bazi_engine import bazi as bazi_module
 from bazi_engine.app import app
+from bazi_engine.ephemeris import SwissEphBackend
 from bazi_engine.provenance import build_provenance, normalize_house_system
 
 client = TestClient(app)
@@ -114,6 +116,18 @@ class TestProvenanceInBaziEndpoint:
         dt = datetime.fromisoformat(ts)
         assert dt is not None
 
+    def test_bazi_provenance_reports_backend_ephemeris(self, monkeypatch):
+        r = client.post("/calculate/bazi", json=BAZI_PAYLOAD)
+        assert r.json()["provenance"]["ephemeris_id"] == SwissEphBackend().ephemeris_id
+
+        class _OtherBackend(SwissEphBackend):
+            ephemeris_id = "other_backend"  # type: ignore[assignment]
+
+        monkeypatch.setattr(bazi_module, "make_backend", lambda *a, **kw: _OtherBackend())
+        r = client.post("/calculate/bazi", json=BAZI_PAYLOAD)
+        assert r.status_code == 200
+        assert r.json()["provenance"]["ephemeris_id"] == "other_backend"
+
 
 @_skip_no_ephe
 class TestProvenanceInWesternEndpoint:
@@ -0,0 +1,212 @@
+"""
+test_refdata_hash_cache.py — Cached refdata artifact hashing.
+
+The cache must return the same digest as a fresh SHA-256, invalidate on any
+size/mtime/inode change, survive a restart via its sidecar, and hash each
+file at most once when many threads ask concurrently.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from bazi_engine.bafe import artifact_hash
+from bazi_engine.bafe.artifact_hash import (
+    ArtifactHashCache,
+    discover_artifacts,
+    prehash_in_background,
+    sha256_file,
+)
+from bazi_engine.bafe.refdata import evaluate_refdata
+
+
+def _write(path: Path, data: bytes) -> str:
+    path.write_bytes(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def counting(monkeypatch):
+    calls = []
+    real = artifact_hash.sha256_file
+
+    def _spy(path):
+        calls.append(Path(path))
+        return real(path)
+
+    monkeypatch.setattr(artifact_hash, "sha256_file", _spy)
+    return calls
+
+
+class TestArtifactHashCache:
+    def test_digest_matches_hashlib(self, tmp_path):
+        f = tmp_path / "a.se1"
+        expected = _write(f, os.urandom(3 * 1024 * 1024 + 17))
+        assert sha256_file(f) == expected
+        assert ArtifactHashCache().sha256(f) == expected
+
+    def test_second_lookup_is_a_hit(self, tmp_path, counting):
+        f = tmp_path / "a.se1"
+        _write(f, b"x" * 1000)
+        cache = ArtifactHashCache()
+        cache.sha256(f)
+        cache.sha256(f)
+        assert len(counting) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_content_change_invalidates(self, tmp_path):
+        f = tmp_path / "a.se1"
+        _write(f, b"first")
+        cache = ArtifactHashCache()
+        cache.sha256(f)
+        expected = _write(f, b"second, longer")
+        assert cache.sha256(f) == expected
+
+    def test_mtime_change_invalidates(self, tmp_path, counting):
+        f = tmp_path / "a.se1"
+        _write(f, b"same")
+        cache = ArtifactHashCache()
+        cache.sha256(f)
+        st = f.stat()
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        cache.sha256(f)
+        assert len(counting) == 2
+
+    def test_peek_never_hashes(self, tmp_path, counting):
+        f = tmp_path / "a.se1"
+        expected = _write(f, b"abc")
+        cache = ArtifactHashCache()
+        assert cache.peek(f) is None
+        assert cache.peek(tmp_path / "missing") is None
+        cache.sha256(f)
+        assert cache.peek(f) == expected
+        assert len(counting) == 1
+
+    def test_sidecar_survives_restart(self, tmp_path, counting):
+        f = tmp_path / "a.se1"
+        expected = _write(f, b"persist me")
+        sidecar = tmp_path / "cache" / "hashes.json"
+        ArtifactHashCache(sidecar).sha256(f)
+        assert sidecar.exists()
+        assert ArtifactHashCache(sidecar).sha256(f) == expected
+        assert len(counting) == 1
+
+    def test_corrupt_sidecar_is_ignored(self, tmp_path):
+        f = tmp_path / "a.se1"
+        expected = _write(f, b"data")
+        sidecar = tmp_path / "hashes.json"
+        sidecar.write_text("{not json", encoding="utf-8")
+        assert ArtifactHashCache(sidecar).sha256(f) == expected
+        assert json.loads(sidecar.read_text(encoding="utf-8"))["version"] == 1
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(OSError):
+            ArtifactHashCache().sha256(tmp_path / "nope.se1")
+
+    def test_concurrent_callers_hash_once(self, tmp_path, counting):
+        f = tmp_path / "a.se1"
+        expected = _write(f, os.urandom(2 * 1024 * 1024))
+        cache = ArtifactHashCache()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.sha256(f))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results == [expected] * 8
+        assert len(counting) == 1
+
+    def test_path_locks_are_bounded(self, tmp_path):
+        cache = ArtifactHashCache()
+        for i in range(artifact_hash._PATH_LOCKS * 2):
+            f = tmp_path / f"f{i}.se1"
+            f.write_bytes(b"x")
+            cache.sha256(f)
+        assert len(cache._path_locks) == artifact_hash._PATH_LOCKS
+
+    @pytest.mark.parametrize("value", [None, "", "off"])
+    def test_sidecar_is_opt_in(self, monkeypatch, value):
+        if value is None:
+            monkeypatch.delenv("BAFE_REFDATA_HASH_CACHE", raising=False)
+        else:
+            monkeypatch.setenv("BAFE_REFDATA_HASH_CACHE", value)
+        assert artifact_hash._default_sidecar() is None
+
+    def test_sidecar_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("BAFE_REFDATA_HASH_CACHE", str(tmp_path / "h.json"))
+        assert artifact_hash._default_sidecar() == tmp_path / "h.json"
+
+
+class TestBackgroundPrehash:
+    def test_prehash_warms_cache(self, tmp_path):
+        expected = {}
+        for i in range(5):
+            f = tmp_path / f"se{i}.se1"
+            expected[f.resolve()] = _write(f, os.urandom(1024 + i))
+        (tmp_path / "readme.txt").write_text("not an artifact")
+        files = discover_artifacts(tmp_path, None, tmp_path / "missing")
+        assert [p.name for p in files] == [f"se{i}.se1" for i in range(5)]
+
+        cache = ArtifactHashCache()
+        executor, futures = prehash_in_background(files, cache=cache, max_workers=3)
+        try:
+            assert sorted(fut.result(timeout=10) for fut in futures) == sorted(expected.values())
+        finally:
+            executor.shutdown(wait=True)
+        for path, digest in expected.items():
+            assert cache.peek(path) == digest
+
+    def test_startup_prehash_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("BAFE_REFDATA_PREHASH", raising=False)
+        assert artifact_hash.start_startup_prehash() is None
+
+    def test_startup_prehash_covers_refdata_root(self, tmp_path, monkeypatch):
+        f = tmp_path / "leaps.list"
+        expected = _write(f, b"leap seconds")
+        cache = ArtifactHashCache()
+        monkeypatch.setattr(artifact_hash, "_DEFAULT", cache)
+        monkeypatch.setenv("BAFE_REFDATA_PREHASH", "1")
+        monkeypatch.setenv("BAFE_REFDATA_ROOT", str(tmp_path))
+        monkeypatch.setenv("SE_EPHE_PATH", str(tmp_path / "no-ephe"))
+        executor = artifact_hash.start_startup_prehash()
+        assert executor is not None
+        executor.shutdown(wait=True)
+        assert cache.peek(f) == expected
+
+
+class TestEvaluateRefdataUsesCache:
+    def _run(self, root: Path, declared: str):
+        return evaluate_refdata(
+            engine_refdata={
+                "refdata_mode": "BUNDLED_OFFLINE",
+                "allow_network": False,
+                "refdata_pack_id": "p",
+                "refdata_root_path": str(root),
+                "verification_policy": {"ephemeris_hash_required": True},
+            },
+            refdata_manifest={
+                "pack_id": "p",
+                "artifacts": [{"logical_id": "ephemeris", "present": True,
+                               "path": "sepl_18.se1", "hash_sha256": declared}],
+            },
+            now_utc=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        )
+
+    def test_verified_and_mismatch_paths(self, tmp_path, monkeypatch, counting):
+        monkeypatch.setattr(artifact_hash, "_DEFAULT", ArtifactHashCache())
+        digest = _write(tmp_path / "sepl_18.se1", b"ephemeris bytes")
+
+        errors, _, evd, _ = self._run(tmp_path, digest)
+        assert errors == []
+        assert evd["artifacts"]["ephemeris"]["verified"] is True
+
+        errors, _, _, _ = self._run(tmp_path, "0" * 64)
+        assert [e["code"] for e in errors] == ["EPHEMERIS_HASH_MISMATCH"]
+        assert errors[0]["details"]["actual"] == digest
+        assert len(counting) == 1
@@ -53,6 +53,15 @@ class TestDatasetGenerator:
             assert ca.h_raw == cb.h_raw
             assert ca.jieqi.index == cb.jieqi.index
 
+    def test_phase_codes_match_scalar_classification(self, charts_240):
+        from bazi_engine.phases import classify_jieqi_phase, classify_lunar_phase
+
+        for c in charts_240[:60]:
+            assert c.jieqi_index == classify_jieqi_phase(solar_longitude=c.solar_longitude).index
+            assert c.lunar_index == classify_lunar_phase(moon_sun_angle=c.moon_sun_angle).index
+            assert c.jieqi == classify_jieqi_phase(solar_longitude=c.solar_longitude)
+            assert c.lunar == classify_lunar_phase(moon_sun_angle=c.moon_sun_angle)
+
     def test_different_seeds_give_different_results(self):
         a = generate_synthetic_dataset(n_total=10, seed=1)
         b = generate_synthetic_dataset(n_total=10, seed=2)
@@ -262,3 +271,16 @@ class TestAnalyseFeatureByPhase:
         stats = analyse_feature_by_phase(charts_240, "h_calibrated", "jieqi")
         for name, s in stats.items():
             assert s.is_reliable, f"{name}: n={s.n} < 10"
+
+
+class TestSolarFromDates:
+    def test_solar_longitude_follows_birth_date(self):
+        from bazi_engine.phases import classify_jieqi_phase
+        from bazi_engine.phases.solar_model import solar_longitude_at
+
+        charts = generate_synthetic_dataset(n_total=30, seed=7, solar_from_dates=True)
+        assert len(charts) == 30
+        for c in charts:
+            assert 1900 <= c.birth_dt.year < 2100
+            assert c.solar_longitude == solar_longitude_at(c.birth_dt)
+            assert c.jieqi.index == classify_jieqi_phase(solar_longitude=c.solar_longitude).index
@@ -60,6 +60,19 @@ class TestRulesetLoader:
         rs = load_ruleset(RULESET_ID)
         assert isinstance(rs, dict)
 
+    def test_cached_ruleset_is_read_only(self):
+        import copy
+        rs = load_ruleset(RULESET_ID)
+        with pytest.raises(TypeError):
+            rs["ruleset_version"] = "tampered"
+        with pytest.raises(TypeError):
+            rs["hidden_stems"]["branch_to_hidden"].pop("Zi")
+        with pytest.raises(AttributeError):
+            rs["branch_order"].append("X")
+        mutable = copy.deepcopy(rs)
+        mutable["hidden_stems"]["branch_to_hidden"]["Zi"] = ["Jia"]
+        assert load_ruleset(RULESET_ID)["hidden_stems"]["branch_to_hidden"]["Zi"] != ["Jia"]
+
     def test_hidden_stems_for_zi(self):
         """Branch Zi should have hidden stem Gui."""
         rs = load_ruleset(RULESET_ID)
@@ -0,0 +1,177 @@
+"""
+test_schema_compiler.py — Generated /validate checkers agree with Draft7Validator.
+
+The compiled predicates are a fast path only; every verdict must match the
+reference jsonschema implementation bit for bit.
+"""
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+from jsonschema import Draft7Validator
+
+from bazi_engine.bafe import service
+from bazi_engine.bafe import validate_request
+from bazi_engine.bafe.schema_compiler import (
+    UnsupportedSchemaError,
+    compile_validator,
+    compile_validator_source,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+REQ_SCHEMA = json.loads((ROOT / "spec" / "schemas" / "ValidateRequest.schema.json").read_text(encoding="utf-8"))
+RESP_SCHEMA = json.loads((ROOT / "spec" / "schemas" / "ValidateResponse.schema.json").read_text(encoding="utf-8"))
+
+
+def _payload() -> dict:
+    return {
+        "validate_level": "FULL",
+        "now_utc_override": "2026-01-01T00:00:00Z",
+        "engine_config": {
+            "engine_version": "1.0.0-rc0",
+            "parameter_set_id": "standard",
+            "deterministic": True,
+            "compliance_mode": "RELAXED",
+            "bazi_ruleset_id": "standard_bazi_2026",
+            "refdata": {
+                "refdata_pack_id": "refpack-test-001",
+                "refdata_mode": "BUNDLED_OFFLINE",
+                "allow_network": False,
+                "refdata_root_path": None,
+                "ephemeris_id": "swisseph-2026",
+                "tzdb_version_id": "tzdb-2026a",
+                "leaps_source_id": "leaps-iers",
+                "eop_source_id": None,
+                "verification_policy": {
+                    "tzdb_gpg_required": False,
+                    "ephemeris_hash_required": False,
+                    "leaps_expiry_enforced": False,
+                    "eop_redundancy_required": False,
+                },
+            },
+        },
+        "birth_event": {
+            "local_datetime": "2024-02-10T14:30:00",
+            "tz_id": "Europe/Berlin",
+            "geo_lon_deg": 13.405,
+            "geo_lat_deg": 52.52,
+        },
+        "refdata_manifest_inline": {"pack_id": "refpack-test-001", "artifacts": []},
+    }
+
+
+def _mutations():
+    def setp(path, value):
+        def apply(p):
+            node = p
+            for key in path[:-1]:
+                node = node[key]
+            node[path[-1]] = value
+        return apply
+
+    def delp(path):
+        def apply(p):
+            node = p
+            for key in path[:-1]:
+                node = node[key]
+            del node[path[-1]]
+        return apply
+
+    return {
+        "valid": lambda p: None,
+        "unknown_top_level_key": setp(["surprise"], 1),
+        "missing_engine_config": delp(["engine_config"]),
+        "missing_refdata": delp(["engine_config", "refdata"]),
+        "bool_as_number": setp(["birth_event", "geo_lat_deg"], True),
+        "lat_out_of_range": setp(["birth_event", "geo_lat_deg"], 91.0),
+        "lon_at_bound": setp(["birth_event", "geo_lon_deg"], 180),
+        "int_for_number": setp(["birth_event", "geo_lat_deg"], 52),
+        "enum_violation": setp(["validate_level"], "HALF"),
+        "dst_policy_null": setp(["birth_event", "dst_policy"], None),
+        "dst_policy_bad": setp(["birth_event", "dst_policy"], "sometimes"),
+        "tz_offset_float_integer": setp(["birth_event", "tz_offset_sec"], 3600.0),
+        "tz_offset_fraction": setp(["birth_event", "tz_offset_sec"], 3600.5),
+        "string_for_object": setp(["engine_config", "refdata"], "nope"),
+        "allow_network_int": setp(["engine_config", "refdata", "allow_network"], 0),
+        "payload_is_list": lambda p: None,
+    }
+
+
+class TestCompiledMatchesReference:
+    @pytest.mark.parametrize("name", sorted(_mutations()))
+    def test_request_schema_verdicts(self, name):
+        payload = _payload()
+        _mutations()[name](payload)
+        doc = [payload] if name == "payload_is_list" else payload
+        check = compile_validator(REQ_SCHEMA)
+        assert check(doc) == Draft7Validator(REQ_SCHEMA).is_valid(doc)
+
+    def test_response_schema_accepts_real_response(self):
+        resp = validate_request(_payload())
+        check = compile_validator(RESP_SCHEMA)
+        assert check(resp) is True
+        assert Draft7Validator(RESP_SCHEMA).is_valid(resp)
+
+    def test_response_schema_rejects_broken_response(self):
+        resp = validate_request(_payload())
+        broken = copy.deepcopy(resp)
+        broken["compliance_status"] = "MOSTLY_FINE"
+        check = compile_validator(RESP_SCHEMA)
+        assert check(broken) is False
+        assert not Draft7Validator(RESP_SCHEMA).is_valid(broken)
+
+    def test_source_is_plain_python(self):
+        source, _consts, entry = compile_validator_source(REQ_SCHEMA)
+        assert f"def {entry}(x):" in source
+        compile(source, "<test>", "exec")
+
+
+class TestFallback:
+    def test_unsupported_keyword_raises_in_codegen(self):
+        with pytest.raises(UnsupportedSchemaError):
+            compile_validator_source({"type": "object", "dependencies": {"a": ["b"]}})
+
+    def test_unsupported_keyword_falls_back_to_reference(self):
+        schema = {"type": "object", "dependencies": {"a": ["b"]}}
+        check = compile_validator(schema)
+        assert check({"a": 1, "b": 2}) is True
+        assert check({"a": 1}) is False
+
+
+class TestValidateRequestFastPath:
+    def test_invalid_request_keeps_reference_message(self):
+        payload = _payload()
+        payload["validate_level"] = "HALF"
+        with pytest.raises(ValueError, match="ValidateRequest schema violation"):
+            validate_request(payload)
+
+    @pytest.mark.parametrize("mode", ["always", "sampled", "off"])
+    def test_self_check_modes_return_same_response(self, mode):
+        baseline = validate_request(_payload(), self_check="always")
+        assert validate_request(_payload(), self_check=mode) == baseline
+
+    def test_self_check_off_skips_response_validation(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(service, "_RESP_CHECK", lambda doc: calls.append(doc) or True)
+        validate_request(_payload(), self_check="off")
+        assert calls == []
+        validate_request(_payload(), self_check="always")
+        assert len(calls) == 1
+
+    def test_sampled_mode_honours_rate(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(service, "_RESP_CHECK", lambda doc: calls.append(doc) or True)
+        monkeypatch.setenv("BAFE_RESPONSE_SELF_CHECK", "sampled")
+        monkeypatch.setenv("BAFE_RESPONSE_SELF_CHECK_RATE", "0")
+        validate_request(_payload())
+        assert calls == []
+        monkeypatch.setenv("BAFE_RESPONSE_SELF_CHECK_RATE", "1")
+        validate_request(_payload())
+        assert len(calls) == 1
+
+    def test_unknown_env_mode_defaults_to_always(self, monkeypatch):
+        monkeypatch.setenv("BAFE_RESPONSE_SELF_CHECK", "yolo")
+        assert service._self_check_mode(None) == "always"
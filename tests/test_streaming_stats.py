@@ -0,0 +1,173 @@
+"""
+test_streaming_stats.py — Tests für research/streaming_stats.py und PhaseStatsAggregator
+
+Testet:
+  A) RunningMoments: Welford + Merge gleich der Zwei-Pass-Rechnung
+  B) QuantileSketch: exakt bis k, kleiner Rangfehler nach Kompaktierung, Merge
+  C) PhaseStatsAggregator: blockweise / gemergt / gepickelt identisch mit
+     den Einmal-Funktionen und mit der direkten Berechnung aus Listen
+"""
+from __future__ import annotations
+
+import math
+import pickle
+import random
+
+import pytest
+
+from bazi_engine.research import (
+    PhaseStatsAggregator,
+    analyse_feature_by_phase,
+    detect_pipeline_bias,
+    generate_synthetic_dataset,
+    phase_zone_frequencies,
+)
+from bazi_engine.research.pattern_analysis import ALL_FEATURES, _group_by_phase
+from bazi_engine.research.streaming_stats import QuantileSketch, RunningMoments
+
+
+def _two_pass(values):
+    m = sum(values) / len(values)
+    return m, math.sqrt(sum((x - m) ** 2 for x in values) / (len(values) - 1))
+
+
+def _percentile(values, p):
+    s = sorted(values)
+    idx = p * (len(s) - 1)
+    lo = int(idx)
+    hi = min(lo + 1, len(s) - 1)
+    return s[lo] + (idx - lo) * (s[hi] - s[lo])
+
+
+@pytest.fixture(scope="module")
+def charts():
+    return generate_synthetic_dataset(n_total=240, seed=42, stratify_by_jieqi=True)
+
+
+class TestRunningMoments:
+    def test_matches_two_pass(self):
+        rng = random.Random(1)
+        values = [rng.gauss(1e6, 3.0) for _ in range(5000)]
+        rm = RunningMoments()
+        rm.update(values)
+        mean, std = _two_pass(values)
+        assert rm.n == 5000
+        assert rm.mean == pytest.approx(mean, rel=1e-12)
+        assert rm.std == pytest.approx(std, rel=1e-9)
+
+    def test_merge_equals_single_pass(self):
+        rng = random.Random(2)
+        values = [rng.random() for _ in range(1000)]
+        parts = [RunningMoments() for _ in range(4)]
+        for i, x in enumerate(values):
+            parts[i % 4].add(x)
+        merged = RunningMoments()
+        for part in parts:
+            merged.merge(part)
+        merged.merge(RunningMoments())
+        mean, std = _two_pass(values)
+        assert merged.n == 1000
+        assert merged.mean == pytest.approx(mean, abs=1e-12)
+        assert merged.std == pytest.approx(std, abs=1e-12)
+
+    def test_small_n(self):
+        rm = RunningMoments()
+        assert rm.std == 0.0
+        rm.add(3.0)
+        assert (rm.mean, rm.variance) == (3.0, 0.0)
+
+
+class TestQuantileSketch:
+    def test_exact_up_to_k(self):
+        rng = random.Random(3)
+        values = [rng.random() for _ in range(100)]
+        sk = QuantileSketch(k=100)
+        sk.update(values)
+        assert sk.is_exact
+        for p in (0.0, 0.25, 0.5, 0.75, 1.0):
+            assert sk.quantile(p) == _percentile(values, p)
+
+    def test_rank_error_after_compaction(self):
+        rng = random.Random(4)
+        values = [rng.random() for _ in range(50_000)]
+        sk = QuantileSketch(k=256)
+        sk.update(values)
+        assert not sk.is_exact and sk.n == 50_000
+        for p in (0.1, 0.25, 0.5, 0.75, 0.9):
+            # Gleichverteilung: Wert ≈ Rang
+            assert sk.quantile(p) == pytest.approx(p, abs=0.02)
+
+    def test_merge_and_pickle(self):
+        rng = random.Random(5)
+        values = [rng.gauss(0, 1) for _ in range(20_000)]
+        parts = []
+        for i in range(0, 20_000, 5000):
+            sk = QuantileSketch(k=512)
+            sk.update(values[i:i + 5000])
+            parts.append(pickle.loads(pickle.dumps(sk)))
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        assert merged.n == 20_000
+        assert merged.quantile(0.5) == pytest.approx(_percentile(values, 0.5), abs=0.05)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(k=1)
+        with pytest.raises(ValueError):
+            QuantileSketch(k=8).merge(QuantileSketch(k=16))
+        assert QuantileSketch().quantile(0.5) == 0.0
+
+
+class TestPhaseStatsAggregator:
+    def test_matches_direct_lists(self, charts):
+        stats = PhaseStatsAggregator("jieqi").update(charts)
+        groups = _group_by_phase(charts, "jieqi", "diff", "Feuer")
+        got = stats.feature_stats("diff", "Feuer")
+        assert set(got) == set(groups)
+        for name, values in groups.items():
+            mean, std = _two_pass(values) if len(values) > 1 else (values[0], 0.0)
+            assert got[name].n == len(values)
+            assert got[name].mean == round(mean, 5)
+            assert got[name].std == pytest.approx(round(std, 5), abs=1e-5)
+            assert got[name].median == round(_percentile(values, 0.5), 5)
+
+    def test_chunked_and_merged_equal_one_shot(self, charts):
+        parts = [
+            pickle.loads(pickle.dumps(PhaseStatsAggregator("lunar").update(charts[i:i + 50])))
+            for i in range(0, len(charts), 50)
+        ]
+        agg = parts[0]
+        for part in parts[1:]:
+            agg.merge(part)
+        assert agg.n == len(charts)
+        assert agg.bias_report() == detect_pipeline_bias(charts, "lunar")
+        assert agg.zone_frequencies() == phase_zone_frequencies(charts, "lunar")
+        for feature, element in ALL_FEATURES:
+            one_shot = analyse_feature_by_phase(charts, feature, "lunar", element)
+            merged = agg.feature_stats(feature, element)
+            assert set(merged) == set(one_shot)
+            for name in one_shot:
+                a, b = merged[name], one_shot[name]
+                assert (a.n, a.median, a.q25, a.q75) == (b.n, b.median, b.q25, b.q75)
+                # beide auf 5 Stellen gerundet: höchstens eine Rundungsstufe auseinander
+                assert a.mean == pytest.approx(b.mean, abs=1e-5 + 1e-12)
+                assert a.std == pytest.approx(b.std, abs=1e-5 + 1e-12)
+
+    def test_accepts_generator(self, charts):
+        assert analyse_feature_by_phase(iter(charts), "h_raw") == analyse_feature_by_phase(charts, "h_raw")
+
+    def test_incompatible_merge(self):
+        with pytest.raises(ValueError):
+            PhaseStatsAggregator("jieqi").merge(PhaseStatsAggregator("lunar"))
+
+    def test_unknown_feature(self, charts):
+        agg = PhaseStatsAggregator(features=[("h_raw", None)]).update(charts)
+        with pytest.raises(ValueError):
+            agg.feature_stats("h_calibrated")
+
+    def test_empty(self):
+        agg = PhaseStatsAggregator()
+        assert agg.bias_report().n_total == 0
+        assert agg.zone_frequencies() == {}
+        assert agg.feature_stats("h_raw") == {}
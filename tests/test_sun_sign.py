@@ -0,0 +1,72 @@
+"""Tests for the Sun-sign ingress table (sun_sign.py) and its API consumers."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import swisseph as swe
+from fastapi.testclient import TestClient
+
+from bazi_engine import western
+from bazi_engine.app import app
+from bazi_engine.ephemeris import SwissEphBackend, datetime_utc_to_jd_ut
+from bazi_engine.sun_sign import _ingresses, sun_position, sun_sign_at, sun_sign_index
+from bazi_engine.western import compute_western_chart
+
+client = TestClient(app)
+
+
+class TestSunSign:
+
+    def test_agrees_with_direct_longitude(self):
+        backend = SwissEphBackend()
+        rnd = random.Random(3)
+        start = swe.julday(1900, 1, 1, 0.0)
+        for _ in range(500):
+            jd = start + rnd.random() * 200 * 365.25
+            assert sun_sign_index(jd) == int(backend.sun_lon_deg_ut(jd) // 30.0) % 12, jd
+
+    def test_agrees_with_western_chart(self):
+        rnd = random.Random(4)
+        for _ in range(20):
+            dt = datetime(1950, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=rnd.randrange(0, 100 * 525600))
+            chart = compute_western_chart(dt, 52.52, 13.405)
+            assert sun_sign_at(dt) == chart["bodies"]["Sun"]["zodiac_sign"], dt
+
+    def test_ingress_boundaries(self):
+        table = _ingresses(2024, SwissEphBackend().flags)
+        # table[0] is the Capricorn ingress of December 2023
+        for k, jd in enumerate(table[:-1]):
+            sign = (9 + k) % 12
+            assert sun_sign_index(jd + 1e-5) == sign
+            assert sun_sign_index(jd - 1e-5) == (sign - 1) % 12
+
+    def test_year_edges(self):
+        for y in (1999, 2000, 2024):
+            jd = swe.julday(y, 1, 1, 0.0)
+            assert sun_sign_index(jd) == 9  # Capricorn
+            assert sun_sign_index(jd - 1e-6) == 9
+
+    def test_sun_position(self):
+        jd = datetime_utc_to_jd_ut(datetime(2024, 3, 20, 12, tzinfo=timezone.utc))
+        lon = sun_position(jd)
+        assert 0.0 <= lon < 360.0
+        assert abs((lon + 180.0) % 360.0 - 180.0) < 1.0
+
+
+class TestApiUsesIngressTable:
+
+    def test_api_skips_full_chart(self, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("full chart computed")
+        monkeypatch.setattr(western, "compute_western_chart", fail)
+        r = client.get("/api", params={"datum": "2024-02-10", "zeit": "14:30"})
+        assert r.status_code == 200
+        assert r.json()["sonne"] == "Wassermann"
+
+    def test_api_sign_changes_at_ingress(self):
+        # Sun enters Aries 2024-03-20 03:06 UTC (04:06 CET).
+        before = client.get("/api", params={"datum": "2024-03-20", "zeit": "03:50"}).json()
+        after = client.get("/api", params={"datum": "2024-03-20", "zeit": "04:20"}).json()
+        assert (before["sonne"], after["sonne"]) == ("Fische", "Widder")
@@ -7,9 +7,18 @@ from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 from bazi_engine.time_utils import (
+    STATUS_AMBIGUOUS,
+    STATUS_INVALID,
+    STATUS_NAMES,
+    STATUS_NONEXISTENT,
+    STATUS_NONEXISTENT_SHIFTED,
+    STATUS_OK,
     LocalTimeError,
+    get_zone,
+    normalize_birth_input,
     parse_local_iso,
     resolve_local_iso,
+    resolve_local_many,
     LocalTimeResolution,
     lmt_tzinfo,
     to_chart_local,
@@ -245,3 +254,115 @@ class TestResolveLocalIso:
         assert res.tz_abbrev is not None
         assert res.input_local_iso == "2024-06-15T10:00:00"
         assert res.resolved_local_iso == dt.isoformat()
+
+
+class TestResolveLocalMany:
+    """Bulk resolution must match resolve_local_iso row by row."""
+
+    ROWS = [
+        ("2024-02-10T14:30:00", "Europe/Berlin"),
+        ("2024-03-31T02:30:00", "Europe/Berlin"),       # gap
+        ("2024-10-27T02:30:00", "Europe/Berlin"),       # fold
+        ("2024-03-10T02:15:30.250000", "America/New_York"),
+        ("2024-11-03T01:30:00", "America/New_York"),
+        ("1990-07-01 08:00", "Asia/Shanghai"),
+        ("2011-12-30T12:00:00", "Pacific/Apia"),        # 24 h gap
+        ("2024-10-06T02:10:00", "Australia/Lord_Howe"), # 30 min gap
+        ("2050-06-01T12:00:00.123", "Europe/London"),   # beyond the TZif table
+    ]
+
+    @pytest.mark.parametrize("ambiguous", ["earlier", "later"])
+    def test_matches_scalar_resolution(self, ambiguous):
+        isos = [r[0] for r in self.ROWS]
+        zones = [r[1] for r in self.ROWS]
+        batch = resolve_local_many(isos, zones, ambiguous=ambiguous, nonexistent="shift_forward")
+        assert len(batch) == len(self.ROWS)
+        for i, (iso, zone) in enumerate(self.ROWS):
+            dt, res = resolve_local_iso(iso, zone, ambiguous=ambiguous, nonexistent="shift_forward")
+            assert batch.utc_datetime(i) == dt.astimezone(timezone.utc), iso
+            assert batch.fold[i] == res.fold
+            assert STATUS_NAMES[batch.status[i]] == res.status
+            assert batch.adjusted_minutes[i] == res.adjusted_minutes
+
+    def test_status_codes(self):
+        batch = resolve_local_many(
+            ["2024-02-10T14:30:00", "2024-10-27T02:30:00", "2024-03-31T02:30:00"],
+            "Europe/Berlin",
+            nonexistent="shift_forward",
+        )
+        assert list(batch.status) == [STATUS_OK, STATUS_AMBIGUOUS, STATUS_NONEXISTENT_SHIFTED]
+        assert list(batch.adjusted_minutes) == [0, 0, 30]
+
+    def test_utc_ns_is_exact(self):
+        batch = resolve_local_many(["2024-06-01T12:00:00.000001"], "UTC")
+        expected = int(datetime(2024, 6, 1, 12, tzinfo=timezone.utc).timestamp()) * 10**9 + 1000
+        assert batch.utc_ns[0] == expected
+
+    def test_nonexistent_error_names_row(self):
+        with pytest.raises(LocalTimeError, match="Row 1"):
+            resolve_local_many(["2024-02-10T14:30:00", "2024-03-31T02:30:00"], "Europe/Berlin")
+
+    def test_mark_mode_records_failures(self):
+        batch = resolve_local_many(
+            ["2024-03-31T02:30:00", "not a date", "2024-02-30T10:00:00", "1500-01-01T00:00:00", "2024-01-01T00:00:00"],
+            ["Europe/Berlin", "Europe/Berlin", "Europe/Berlin", "Europe/Berlin", "Mars/Olympus"],
+            errors="mark",
+        )
+        assert list(batch.status) == [STATUS_NONEXISTENT] + [STATUS_INVALID] * 4
+        assert list(batch.utc_ns) == [0] * 5
+
+    def test_unknown_zone_raises(self):
+        with pytest.raises(LocalTimeError, match="Unknown timezone"):
+            resolve_local_many(["2024-01-01T00:00:00"], ["Mars/Olympus"])
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            resolve_local_many(["2024-01-01T00:00:00"], ["UTC", "UTC"])
+
+    def test_empty(self):
+        assert len(resolve_local_many([], [])) == 0
+
+
+class TestNormalizeBirthInput:
+    """Parse-once normalization shared by the routers."""
+
+    def test_get_zone_is_memoized(self):
+        assert get_zone("Europe/Berlin") is get_zone("Europe/Berlin")
+
+    def test_get_zone_unknown(self):
+        with pytest.raises(LocalTimeError, match="Unknown timezone"):
+            get_zone("Mars/Olympus_Mons")
+
+    def test_key_ignores_input_spelling(self):
+        a = normalize_birth_input("2024-02-10T14:30", "Europe/Berlin", 13.405, 52.52)
+        b = normalize_birth_input("2024-02-10T14:30:00", "Europe/Berlin", 13.405, 52.52)
+        assert a.key == b.key
+        assert a.input_local_iso == "2024-02-10T14:30:00"
+
+    def test_key_distinguishes_fold(self):
+        a = normalize_birth_input("2024-10-27T02:30:00", "Europe/Berlin", 13.4, 52.5, ambiguous="earlier")
+        b = normalize_birth_input("2024-10-27T02:30:00", "Europe/Berlin", 13.4, 52.5, ambiguous="later")
+        assert a.key != b.key
+        assert (a.fold, b.fold) == (0, 1)
+        assert b.utc_dt - a.utc_dt == timedelta(hours=1)
+
+    def test_shifted_time_resolution(self):
+        birth = normalize_birth_input(
+            "2024-03-31T02:30:00", "Europe/Berlin", 13.4, 52.5, nonexistent="shift_forward",
+        )
+        assert birth.resolution.status == "nonexistent_shifted"
+        assert birth.local_dt.replace(tzinfo=None) == datetime(2024, 3, 31, 3, 0)
+
+    def test_bazi_input_matches_string_path(self):
+        from bazi_engine.bazi import compute_bazi
+        from bazi_engine.types import BaziInput
+
+        birth = normalize_birth_input("2024-10-27T02:30:00", "Europe/Berlin", 13.4, 52.5, ambiguous="later")
+        inp = birth.bazi_input(time_standard="LMT")
+        assert inp.birth_local_dt == birth.local_dt
+        parsed = BaziInput(
+            birth_local="2024-10-27T02:30:00", timezone="Europe/Berlin",
+            longitude_deg=13.4, latitude_deg=52.5, time_standard="LMT", fold=1,
+        )
+        assert compute_bazi(inp).pillars == compute_bazi(parsed).pillars
+        assert compute_bazi(inp).birth_utc_dt == compute_bazi(parsed).birth_utc_dt
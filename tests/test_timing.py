@@ -0,0 +1,133 @@
+"""Tests for per-request stage timing (timing.py) and the Server-Timing header."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from bazi_engine import timing
+from bazi_engine.app import app
+
+client = TestClient(app)
+
+CHART_PAYLOAD = {
+    "local_datetime": "2024-02-10T14:30:00",
+    "tz_id": "Europe/Berlin",
+    "geo_lon_deg": 13.405,
+    "geo_lat_deg": 52.52,
+    "include_validation": True,
+}
+
+
+def _server_timing_entries(header):
+    out = {}
+    for part in header.split(", "):
+        name, _, param = part.partition(";")
+        out[name] = param
+    return out
+
+
+class TestRecorder:
+
+    def test_hooks_are_noops_outside_recording(self):
+        assert timing.current() is None
+        with timing.span("x"):
+            pass
+        timing.laps("y").lap("z")
+        timing.count("swe.calc_ut")
+        assert timing.current() is None
+
+    def test_span_laps_and_counts(self):
+        with timing.recording(observe=False) as rec:
+            with timing.span("a.span"):
+                pass
+            laps = timing.laps("b")
+            laps.lap("one")
+            laps.lap("two")
+            timing.count("swe.calc_ut")
+            timing.count("swe.calc_ut", 4)
+        assert set(rec.durations) == {"a.span", "b.one", "b.two"}
+        assert all(v >= 0 for v in rec.durations.values())
+        assert rec.counts == {"swe.calc_ut": 5}
+        assert timing.current() is None
+
+    def test_repeated_stage_accumulates(self):
+        rec = timing.StageRecorder()
+        rec.add("s", 0.001)
+        rec.add("s", 0.002)
+        assert rec.durations["s"] == pytest.approx(0.003)
+
+    def test_server_timing_format(self):
+        rec = timing.StageRecorder()
+        rec.add("bazi.lichun", 0.0015)
+        rec.count("swe.solcross_ut", 38)
+        assert rec.server_timing() == 'bazi.lichun;dur=1.500, swe.solcross_ut;desc="38"'
+
+    def test_timed_counts_and_times_calls(self):
+        assert timing.timed("f", abs) is abs
+        with timing.recording(observe=False) as rec:
+            f = timing.timed("f", abs)
+            assert f(-2) == 2 and f(3) == 3
+        assert rec.counts == {"f": 2}
+        assert rec.call_seconds["f"] >= 0
+        assert rec.server_timing().startswith("f;dur=")
+
+
+class TestHistograms:
+
+    def test_buckets_are_cumulative(self):
+        hist = timing.StageHistograms(buckets_ms=(1.0, 10.0))
+        for seconds in (0.0005, 0.005, 0.005, 0.5):
+            rec = timing.StageRecorder()
+            rec.add("s", seconds)
+            rec.count("c", 2)
+            hist.observe(rec)
+        snap = hist.snapshot()["s"]
+        assert snap["buckets"] == [(1.0, 1), (10.0, 3), (float("inf"), 4)]
+        assert snap["count"] == 4
+        assert snap["sum_seconds"] == pytest.approx(0.5105)
+        assert hist.counter_totals() == {"c": 8}
+
+    def test_recording_feeds_process_histograms(self):
+        before = timing.stage_histograms().snapshot().get("test.stage", {}).get("count", 0)
+        with timing.recording():
+            with timing.span("test.stage"):
+                pass
+        assert timing.stage_histograms().snapshot()["test.stage"]["count"] == before + 1
+
+
+class TestServerTimingHeader:
+
+    def test_absent_when_disabled(self, monkeypatch):
+        monkeypatch.delenv(timing.TIMING_ENV, raising=False)
+        r = client.post("/chart", json=CHART_PAYLOAD)
+        assert r.status_code == 200
+        assert "server-timing" not in r.headers
+
+    def test_chart_stages_and_ephemeris_counters(self, monkeypatch):
+        monkeypatch.setenv(timing.TIMING_ENV, "1")
+        r = client.post("/chart", json=CHART_PAYLOAD)
+        assert r.status_code == 200
+        entries = _server_timing_entries(r.headers["server-timing"])
+        for stage in (
+            "time.resolve", "western.planets", "western.houses", "western.aspects",
+            "bazi.lichun", "bazi.month_boundaries", "bazi.solar_terms",
+            "chart.wuxing", "bafe.validate",
+        ):
+            assert entries[stage].startswith("dur="), stage
+        assert int(entries["swe.solcross_ut"].split('"')[1]) > 0
+        assert int(entries["swe.calc_ut"].split('"')[1]) >= 14
+
+    def test_fusion_stages(self, monkeypatch):
+        monkeypatch.setenv(timing.TIMING_ENV, "1")
+        r = client.post("/calculate/fusion", json={
+            "date": "2024-02-10T14:30:00", "tz": "Europe/Berlin", "lon": 13.405, "lat": 52.52,
+        })
+        entries = _server_timing_entries(r.headers["server-timing"])
+        assert "fusion.wuxing" in entries and "fusion.harmony" in entries
+
+    def test_requests_do_not_share_recorders(self, monkeypatch):
+        monkeypatch.setenv(timing.TIMING_ENV, "1")
+        first = _server_timing_entries(client.post("/chart", json=CHART_PAYLOAD).headers["server-timing"])
+        second = _server_timing_entries(client.post("/chart", json=CHART_PAYLOAD).headers["server-timing"])
+        assert first["swe.solcross_ut"].split(";")[-1] == second["swe.solcross_ut"].split(";")[-1]
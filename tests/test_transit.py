@@ -4,6 +4,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from unittest.mock import patch
 
+import pytest
 from fastapi.testclient import TestClient
 
 from bazi_engine.transit import _detect_events
@@ -12,6 +13,10 @@ from bazi_engine.app import app
 
 client = TestClient(app)
 
+# These tests mock swe.calc_ut; the interpolated position cache would answer
+# from segments fitted to a mock instead of calling the current one.
+pytestmark = pytest.mark.usefixtures("exact_ephemeris")
+
 # Known planetary longitudes for a fixed date (mock data).
 # We mock swe.calc_ut to return deterministic values.
 # Keys are swisseph planet IDs: SUN=0, MOON=1, MERCURY=2, VENUS=3, MARS=4, JUPITER=5, SATURN=6
@@ -297,3 +302,38 @@ class TestDominanceShift:
         )
         types = [e["type"] for e in events]
         assert "dominance_shift" not in types
+
+
+class TestLunarPhaseEvent:
+    """lunar_phase events from the precomputed moon event table."""
+
+    FAKE_TRANSIT = TestDominanceShift.FAKE_TRANSIT
+    SOULPRINT = [0.1] * 12
+    IMPACT = [0.0] * 12
+
+    def test_fires_near_full_moon(self):
+        # Full moon 2024-01-25 17:54 UTC
+        dt = datetime(2024, 1, 25, 12, 0, tzinfo=timezone.utc)
+        events = _detect_events(self.FAKE_TRANSIT, self.SOULPRINT, self.IMPACT, dt_utc=dt)
+        lunar = [e for e in events if e["type"] == "lunar_phase"]
+        assert len(lunar) == 1
+        assert lunar[0]["description_de"] == "Vollmond um 17:54 UTC"
+        assert lunar[0]["sector"] == 6
+
+    def test_quiet_between_phases(self):
+        dt = datetime(2024, 1, 22, 0, 0, tzinfo=timezone.utc)
+        events = _detect_events(self.FAKE_TRANSIT, self.SOULPRINT, self.IMPACT, dt_utc=dt)
+        assert not any(e["type"] == "lunar_phase" for e in events)
+
+    def test_skipped_without_timestamp(self):
+        events = _detect_events(self.FAKE_TRANSIT, self.SOULPRINT, self.IMPACT)
+        assert not any(e["type"] == "lunar_phase" for e in events)
+
+    def test_narrative_renders(self):
+        from bazi_engine.narrative import generate_narrative
+
+        dt = datetime(2024, 1, 11, 6, 0, tzinfo=timezone.utc)
+        events = _detect_events(self.FAKE_TRANSIT, self.SOULPRINT, self.IMPACT, dt_utc=dt)
+        out = generate_narrative({"events": events})
+        assert out["headline"] == "Neumond um 11:57 UTC"
+        assert "$" not in out["body"] + out["advice"]
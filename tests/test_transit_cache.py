@@ -14,6 +14,10 @@ from bazi_engine.transit import (
     compute_transit_timeline,
 )
 
+# These tests mock swe.calc_ut; the interpolated position cache would answer
+# from segments fitted to a mock instead of calling the current one.
+pytestmark = pytest.mark.usefixtures("exact_ephemeris")
+
 # Deterministic mock for swe.calc_ut
 MOCK_PLANET_DATA = {
     0: (100.0, 0.0, 1.0, 1.01, 0.0, 0.0),   # Sun
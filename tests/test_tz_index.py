@@ -0,0 +1,149 @@
+"""
+test_tz_index.py — Transition index agrees with ZoneInfo round trips.
+
+The index replaces local→UTC→local round trips and the minute-by-minute gap
+walk; it must give the same classification everywhere and exact gap sizes.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from bazi_engine.bafe.time_model import _detect_local_time_status
+from bazi_engine.time_utils import resolve_local_iso
+from bazi_engine.tz_index import (
+    TransitionIndex,
+    classify_local,
+    local_seconds,
+    parse_tzif,
+    transition_index,
+)
+
+ZONES = [
+    "Europe/Berlin", "America/New_York", "Australia/Lord_Howe", "Pacific/Apia",
+    "Asia/Kolkata", "America/Sao_Paulo", "Europe/London", "UTC",
+]
+
+
+def _reference_status(naive: datetime, tz: ZoneInfo) -> str:
+    ok, offsets = [], []
+    for fold in (0, 1):
+        dt = naive.replace(tzinfo=tz, fold=fold)
+        if dt.astimezone(timezone.utc).astimezone(tz).replace(tzinfo=None) == naive:
+            ok.append(fold)
+            offsets.append(dt.utcoffset())
+    if not ok:
+        return "nonexistent"
+    if len(ok) == 2 and offsets[0] != offsets[1]:
+        return "ambiguous"
+    return "ok"
+
+
+def _around_transitions(idx: TransitionIndex, year: int):
+    for t, before, after in zip(*idx.year(year)):
+        for base in (t + before, t + after):
+            for d in (-3601, -1, 0, 1, 1799, 3599, 3600):
+                yield datetime(1970, 1, 1) + timedelta(seconds=base + d)
+
+
+class TestClassification:
+    @pytest.mark.parametrize("zone", ZONES)
+    @pytest.mark.parametrize("year", [1916, 1945, 1985, 2011, 2024, 2050])
+    def test_matches_roundtrip_around_every_transition(self, zone, year):
+        tz = ZoneInfo(zone)
+        for naive in _around_transitions(transition_index(tz), year):
+            assert classify_local(naive, tz).status == _reference_status(naive, tz), naive
+
+    def test_berlin_gap_and_fold(self):
+        tz = ZoneInfo("Europe/Berlin")
+        gap = classify_local(datetime(2024, 3, 31, 2, 30), tz)
+        assert gap.status == "nonexistent"
+        assert gap.gap_seconds == 3600
+        assert gap.gap_end_local_seconds == local_seconds(datetime(2024, 3, 31, 3, 0))
+        fold = classify_local(datetime(2024, 10, 27, 2, 30), tz)
+        assert fold.status == "ambiguous"
+        assert fold.gap_seconds == -3600
+        assert classify_local(datetime(2024, 3, 31, 3, 0), tz).status == "ok"
+        assert classify_local(datetime(2024, 10, 27, 3, 0), tz).status == "ok"
+
+    def test_half_hour_dst(self):
+        gap = classify_local(datetime(2024, 10, 6, 2, 15), ZoneInfo("Australia/Lord_Howe"))
+        assert gap.status == "nonexistent"
+        assert gap.gap_seconds == 1800
+
+    def test_year_arrays_are_sorted(self):
+        idx = transition_index(ZoneInfo("America/New_York"))
+        utc, before, after = idx.year(2024)
+        assert list(utc) == sorted(utc)
+        assert len(utc) == 2
+        assert (before[0], after[0]) == (-5 * 3600, -4 * 3600)
+
+    def test_out_of_range_year_returns_none(self):
+        assert classify_local(datetime(1, 6, 1), ZoneInfo("Europe/Berlin")) is None
+
+    def test_zone_without_key_is_sampled(self):
+        with _open_tzif("Europe/Berlin") as f:
+            tz = ZoneInfo.from_file(f)
+        idx = TransitionIndex(tz)
+        assert list(idx.year(2024)[0]) == list(transition_index(ZoneInfo("Europe/Berlin")).year(2024)[0])
+
+
+def _open_tzif(key: str):
+    import zoneinfo
+    for root in zoneinfo.TZPATH:
+        try:
+            return open(f"{root}/{key}", "rb")
+        except OSError:
+            continue
+    from importlib import resources
+    return resources.files("tzdata.zoneinfo").joinpath(*key.split("/")).open("rb")
+
+
+class TestParseTzif:
+    def test_footer_and_transitions(self):
+        with _open_tzif("Europe/Berlin") as f:
+            parsed = parse_tzif(f.read())
+        assert parsed is not None
+        times, footer = parsed
+        assert times == sorted(times)
+        assert footer is not None and "," in footer
+
+    def test_rejects_garbage(self):
+        assert parse_tzif(b"not a tzif file at all, definitely not" * 2) is None
+
+
+class TestResolveLocalIsoWithIndex:
+    def test_shift_forward_is_exact(self):
+        _, res = resolve_local_iso("2024-03-31T02:30:00", "Europe/Berlin", nonexistent="shift_forward")
+        assert res.adjusted_minutes == 30
+        assert res.gap_minutes == 60
+        assert res.resolved_local_iso == "2024-03-31T03:00:00+02:00"
+
+    def test_shift_keeps_seconds(self):
+        _, res = resolve_local_iso("2024-03-31T02:59:30", "Europe/Berlin", nonexistent="shift_forward")
+        assert res.adjusted_minutes == 1
+        assert res.resolved_local_iso == "2024-03-31T03:00:30+02:00"
+
+    def test_day_long_gap_resolves(self):
+        # Samoa skipped 2011-12-30 entirely; the old 180-minute walk gave up.
+        _, res = resolve_local_iso("2011-12-30T12:00:00", "Pacific/Apia", nonexistent="shift_forward")
+        assert res.status == "nonexistent_shifted"
+        assert res.gap_minutes == 1440
+        assert res.adjusted_minutes == 720
+        assert res.resolved_local_iso == "2011-12-31T00:00:00+14:00"
+
+    def test_ok_time_has_no_gap(self):
+        _, res = resolve_local_iso("2024-06-01T12:00:00", "Europe/Berlin")
+        assert (res.status, res.adjusted_minutes, res.gap_minutes) == ("ok", 0, 0)
+
+
+class TestBafeTimeModel:
+    @pytest.mark.parametrize("naive,expected", [
+        (datetime(2024, 3, 31, 2, 30), ("nonexistent", None)),
+        (datetime(2024, 10, 27, 2, 30), ("ambiguous", 0)),
+        (datetime(2024, 6, 1, 12, 0), ("ok", 0)),
+    ])
+    def test_detect_status(self, naive, expected):
+        assert _detect_local_time_status(naive, ZoneInfo("Europe/Berlin")) == expected
@@ -0,0 +1,222 @@
+"""Tests for the cosine-similarity vector index (services/vector_index.py)."""
+
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+
+from bazi_engine.exc import InputError
+from bazi_engine.services import vector_index
+from bazi_engine.services.vector_index import Neighbor, VectorIndex
+from bazi_engine.wuxing.analysis import calculate_harmony_index
+from bazi_engine.wuxing.vector import WuXingVector
+
+
+@pytest.fixture(params=["numpy", "python"])
+def kernels(request, monkeypatch):
+    """Run each test with the numpy kernels and the pure-Python fallback."""
+    if request.param == "python":
+        monkeypatch.setattr(vector_index, "_numpy", lambda: None)
+    return request.param
+
+
+def _vectors(n, dim, seed=0):
+    rng = random.Random(seed)
+    return [[rng.random() for _ in range(dim)] for _ in range(n)]
+
+
+def _cos(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    return dot / (sum(x * x for x in a) ** 0.5 * sum(y * y for y in b) ** 0.5)
+
+
+def _brute(vectors, q, k, anti=False):
+    ranked = sorted(range(len(vectors)), key=lambda i: _cos(vectors[i], q), reverse=not anti)
+    return ranked[:k]
+
+
+class TestExact:
+
+    def test_matches_brute_force(self, kernels):
+        vecs = _vectors(300, 12)
+        idx = VectorIndex(12)
+        assert idx.add(vecs) == list(range(300))
+        for q in _vectors(5, 12, seed=1):
+            hits = idx.search(q, 7)
+            assert [h.id for h in hits] == _brute(vecs, q, 7)
+            for h in hits:
+                assert h.score == pytest.approx(_cos(vecs[h.id], q), abs=1e-6)
+
+    def test_anti_harmony(self, kernels):
+        vecs = _vectors(200, 5)
+        idx = VectorIndex(5)
+        idx.add(vecs)
+        q = [1.0, 0.0, 0.0, 0.0, 0.0]
+        assert [h.id for h in idx.search(q, 4, anti=True)] == _brute(vecs, q, 4, anti=True)
+
+    def test_harmony_index_agrees(self, kernels):
+        charts = [WuXingVector(*v) for v in _vectors(50, 5, seed=3)]
+        idx = VectorIndex(5)
+        idx.add(charts)
+        mine = WuXingVector(2.0, 1.0, 0.0, 1.3, 0.5)
+        best = idx.search(mine, 1)[0]
+        expected = max(range(50), key=lambda i: calculate_harmony_index(mine, charts[i])["harmony_index"])
+        assert calculate_harmony_index(mine, charts[best.id])["harmony_index"] == \
+            calculate_harmony_index(mine, charts[expected])["harmony_index"]
+        assert round(best.score, 4) == calculate_harmony_index(mine, charts[best.id])["harmony_index"]
+
+    def test_element_mappings_and_exclude(self, kernels):
+        idx = VectorIndex(5)
+        idx.add([{"Holz": 1, "Feuer": 0, "Erde": 0, "Metall": 0, "Wasser": 0},
+                 {"Holz": 1, "Feuer": 1, "Erde": 0, "Metall": 0, "Wasser": 0}], ids=[10, 20])
+        hits = idx.search([1, 0, 0, 0, 0], 2, exclude=10)
+        assert hits == [Neighbor(20, pytest.approx(0.5 ** 0.5))]
+
+    def test_ids(self, kernels):
+        idx = VectorIndex(3)
+        assert idx.add([[1, 0, 0]], ids=[41]) == [41]
+        assert idx.add([[0, 1, 0], [0, 0, 1]]) == [42, 43]
+        assert idx.add([]) == []
+        assert len(idx) == 3
+
+    def test_rejects_bad_vectors(self, kernels):
+        idx = VectorIndex(5)
+        with pytest.raises(InputError):
+            idx.add([[1.0, 2.0]])
+        with pytest.raises(InputError):
+            idx.add([[0.0] * 5])
+        with pytest.raises(InputError):
+            idx.add([[1.0] * 5], ids=[1, 2])
+        with pytest.raises(InputError):
+            idx.search([0.0] * 5)
+        with pytest.raises(InputError):
+            VectorIndex(0)
+
+    def test_numpy_bulk_add(self):
+        mat = np.abs(np.random.default_rng(0).normal(size=(100, 12)))
+        a, b = VectorIndex(12), VectorIndex(12)
+        a.add(mat)
+        b.add(mat.tolist())
+        assert a.search(mat[3], 5) == b.search(mat[3], 5)
+        with pytest.raises(InputError):
+            a.add(np.zeros((1, 12)))
+
+
+class TestPartitioned:
+
+    def test_full_probe_is_exact(self, kernels):
+        vecs = _vectors(400, 5)
+        idx = VectorIndex(5)
+        idx.add(vecs)
+        idx.partition(8, iterations=4)
+        assert idx.n_lists == 8
+        q = vecs[17]
+        assert [h.id for h in idx.search(q, 10, n_probe=8)] == _brute(vecs, q, 10)
+
+    def test_recall_on_default_probe(self):
+        mat = np.abs(np.random.default_rng(1).normal(size=(20000, 12)))
+        idx = VectorIndex(12)
+        idx.add(mat)
+        exact = [{h.id for h in idx.search(mat[i], 10)} for i in range(30)]
+        idx.partition(64)
+        approx = [{h.id for h in idx.search(mat[i], 10)} for i in range(30)]
+        recall = sum(len(e & a) for e, a in zip(exact, approx)) / 300
+        assert recall >= 0.9
+
+    def test_insert_after_partition(self, kernels):
+        vecs = _vectors(300, 5)
+        idx = VectorIndex(5)
+        idx.add(vecs)
+        idx.partition(6, iterations=3)
+        new = [0.9, 0.1, 0.0, 0.0, 0.05]
+        [new_id] = idx.add([new])
+        assert idx.search(new, 1)[0].id == new_id
+
+    def test_unpartition(self, kernels):
+        idx = VectorIndex(5)
+        idx.add(_vectors(50, 5))
+        idx.partition(4, iterations=2)
+        idx.partition(0)
+        assert idx.n_lists == 0
+
+
+class TestQuantized:
+
+    def test_scores_close_to_exact(self, kernels):
+        vecs = _vectors(300, 12, seed=4)
+        exact, quant = VectorIndex(12), VectorIndex(12, quantized=True)
+        exact.add(vecs)
+        quant.add(vecs)
+        assert quant.nbytes() < exact.nbytes()
+        q = _vectors(1, 12, seed=5)[0]
+        for h in quant.search(q, 20):
+            assert h.score == pytest.approx(_cos(vecs[h.id], q), abs=2e-2)
+        assert len({h.id for h in quant.search(q, 10)} & {h.id for h in exact.search(q, 10)}) >= 7
+
+
+class TestPairs:
+
+    def test_best_and_worst_pairs(self, kernels):
+        vecs = _vectors(60, 5, seed=6)
+        idx = VectorIndex(5)
+        idx.add(vecs, ids=range(100, 160))
+        all_pairs = sorted(((_cos(vecs[a], vecs[b]), a + 100, b + 100)
+                            for a in range(60) for b in range(a + 1, 60)), reverse=True)
+        got = idx.pairs(5)
+        assert [(a, b) for a, b, _ in got] == [(a, b) for _, a, b in all_pairs[:5]]
+        assert got[0][2] == pytest.approx(all_pairs[0][0], abs=1e-6)
+        worst = idx.pairs(3, anti=True)
+        assert [(a, b) for a, b, _ in worst] == [(a, b) for _, a, b in sorted(all_pairs)[:3]]
+
+    def test_partitioned_pairs(self, kernels):
+        vecs = _vectors(120, 5, seed=7)
+        idx = VectorIndex(5)
+        idx.add(vecs)
+        exact = idx.pairs(4)
+        idx.partition(4, iterations=3)
+        assert idx.pairs(4, n_probe=4) == pytest.approx(exact)
+
+    def test_small(self, kernels):
+        idx = VectorIndex(5)
+        assert idx.pairs(3) == []
+        idx.add([[1, 0, 0, 0, 0]])
+        assert idx.pairs(3) == []
+
+
+class TestPersistence:
+
+    @pytest.mark.parametrize("quantized", [False, True])
+    def test_round_trip(self, kernels, tmp_path, quantized):
+        vecs = _vectors(500, 12, seed=8)
+        idx = VectorIndex(12, quantized=quantized)
+        idx.add(vecs, ids=range(1000, 1500))
+        idx.partition(8, iterations=3)
+        idx.add(_vectors(5, 12, seed=9))   # tail rows, regrouped by save
+        path = tmp_path / "charts.vidx"
+        idx.save(path)
+
+        loaded = VectorIndex.load(path)
+        assert loaded._mmap is not None
+        assert (len(loaded), loaded.n_lists, loaded.quantized) == (505, 8, quantized)
+        for q in _vectors(3, 12, seed=10):
+            assert loaded.search(q, 5) == idx.search(q, 5)
+            assert loaded.search(q, 5, n_probe=2) == idx.search(q, 5, n_probe=2)
+
+        assert loaded.add([vecs[0]]) == [1505]
+        assert loaded._mmap is None
+        assert len(loaded) == 506
+
+    def test_rejects_foreign_and_truncated_files(self, tmp_path):
+        bad = tmp_path / "bad.vidx"
+        bad.write_bytes(b"not an index at all, just some bytes")
+        with pytest.raises(InputError):
+            VectorIndex.load(bad)
+        idx = VectorIndex(5)
+        idx.add(_vectors(10, 5))
+        good = tmp_path / "good.vidx"
+        idx.save(good)
+        bad.write_bytes(good.read_bytes()[:-8])
+        with pytest.raises(InputError):
+            VectorIndex.load(bad)
@@ -0,0 +1,123 @@
+"""Tests for the integer-indexed pillar contribution table (wuxing/pillar_table.py)."""
+
+from __future__ import annotations
+
+import random
+from math import isclose
+
+import numpy as np
+
+from bazi_engine.wuxing import analysis
+from bazi_engine.wuxing.constants import WUXING_INDEX
+from bazi_engine.wuxing.pillar_table import (
+    JIAZI_CODES,
+    NO_BRANCH,
+    NO_STEM,
+    N_CODES,
+    PILLAR_TENTHS,
+    jiazi_codes,
+    pillar_code,
+    pillar_code_from_names,
+    wuxing_batch,
+    wuxing_from_codes,
+)
+
+STEMS = list(analysis._STEM_TO_ELEMENT)
+BRANCHES = list(analysis._BRANCH_HIDDEN)
+
+
+def _reference(pillars):
+    """String-keyed accumulation the table replaces."""
+    values = [0.0] * 5
+    for p in pillars.values():
+        stem = p.get("stem", p.get("stamm", ""))
+        branch = p.get("branch", p.get("zweig", ""))
+        if stem in analysis._STEM_TO_ELEMENT:
+            values[WUXING_INDEX[analysis._STEM_TO_ELEMENT[stem]]] += 1.0
+        for elem, weight in analysis._BRANCH_HIDDEN.get(branch, []):
+            values[WUXING_INDEX[elem]] += weight
+    return values
+
+
+def _random_pillars(rng):
+    return {p: {"stem": rng.choice(STEMS), "branch": rng.choice(BRANCHES)}
+            for p in ("year", "month", "day", "hour")}
+
+
+class TestTable:
+
+    def test_table_size(self):
+        assert len(PILLAR_TENTHS) == N_CODES == 11 * 13
+
+    def test_row_totals(self):
+        for s, stem in enumerate(STEMS):
+            for b, branch in enumerate(BRANCHES):
+                expected = 10 + sum(round(w * 10) for _, w in analysis._BRANCH_HIDDEN[branch])
+                assert sum(PILLAR_TENTHS[pillar_code(s, b)]) == expected, (stem, branch)
+
+    def test_missing_parts_contribute_nothing(self):
+        assert PILLAR_TENTHS[pillar_code(NO_STEM, NO_BRANCH)] == (0, 0, 0, 0, 0)
+        assert pillar_code_from_names({"stem": "Foo", "branch": "Bar"}) == pillar_code(NO_STEM, NO_BRANCH)
+
+    def test_jiazi_codes(self):
+        assert JIAZI_CODES[0] == pillar_code_from_names({"stem": "Jia", "branch": "Zi"})
+        assert JIAZI_CODES[59] == pillar_code_from_names({"stem": "Gui", "branch": "Hai"})
+        assert len(set(JIAZI_CODES)) == 60
+
+    def test_german_and_english_keys(self):
+        assert pillar_code_from_names({"stamm": "Wu", "zweig": "Wu"}) == \
+            pillar_code_from_names({"stem": "Wu", "branch": "Wu"})
+
+
+class TestVectors:
+
+    def test_matches_string_lookup(self):
+        rng = random.Random(11)
+        for _ in range(2000):
+            pillars = _random_pillars(rng)
+            got = analysis.calculate_wuxing_from_bazi(pillars).to_list()
+            for a, b in zip(got, _reference(pillars)):
+                assert isclose(a, b, abs_tol=1e-12)
+
+    def test_order_independent(self):
+        rng = random.Random(12)
+        codes = [pillar_code_from_names(p) for p in _random_pillars(rng).values()]
+        assert wuxing_from_codes(codes) == wuxing_from_codes(reversed(codes))
+
+    def test_ledger_unchanged(self):
+        pillars = {"year": {"stem": "Jia", "branch": "Chou"}, "day": {"stamm": "Xin", "zweig": "Hai"}}
+        _, ledger = analysis.calculate_wuxing_from_bazi_with_ledger(pillars)
+        assert [(e["pillar"], e["source"], e["element"], e["weight"]) for e in ledger] == [
+            ("year", "stem", "Holz", 1.0),
+            ("year", "hidden_main", "Erde", 1.0),
+            ("year", "hidden_middle", "Wasser", 0.5),
+            ("year", "hidden_residual", "Metall", 0.3),
+            ("day", "stem", "Metall", 1.0),
+            ("day", "hidden_main", "Wasser", 1.0),
+            ("day", "hidden_middle", "Holz", 0.5),
+        ]
+
+    def test_ledger_entries_are_fresh(self):
+        pillars = {"year": {"stem": "Jia", "branch": "Zi"}}
+        _, ledger = analysis.calculate_wuxing_from_bazi_with_ledger(pillars)
+        ledger[0]["weight"] = 99
+        _, again = analysis.calculate_wuxing_from_bazi_with_ledger(pillars)
+        assert again[0]["weight"] == 1.0
+
+
+class TestBatch:
+
+    def test_numpy_batch_matches_scalar(self):
+        rng = np.random.default_rng(5)
+        idx = rng.integers(0, 60, size=(500, 4))
+        out = wuxing_batch(jiazi_codes(idx))
+        assert out.shape == (500, 5)
+        for row, expected in zip(idx[:50], out[:50]):
+            v = wuxing_from_codes(JIAZI_CODES[i] for i in row)
+            assert v.to_list() == list(expected)
+
+    def test_list_batch(self):
+        codes = jiazi_codes([[0, 1, 2, 3], [59, 59, 59, 59]])
+        out = wuxing_batch(codes)
+        assert len(out) == 10
+        assert list(out[:5]) == wuxing_from_codes(codes[0]).to_list()